@@ -0,0 +1,43 @@
+"""Stand-in for the auth service's ``GET /auth/me``, used by ``load_test.py``.
+
+Every bearer token is valid and maps to a stable user id (uuid5 of the
+token), so a load test picks its number of users by the tokens it sends.
+``AUTH_STUB_LATENCY_MS`` adds a fixed delay to each answer.
+
+Run with:
+    python -m uvicorn auth_stub:app --app-dir benchmarks --port 8001
+"""
+import asyncio
+import json
+import os
+from uuid import NAMESPACE_URL, uuid5
+
+LATENCY_SECONDS = float(os.getenv("AUTH_STUB_LATENCY_MS", "0")) / 1000
+
+
+async def _respond(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    if scope["path"] != "/auth/me":
+        await _respond(send, 404, {"detail": "Not Found"})
+        return
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode()
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        await _respond(send, 401, {"detail": "Invalid token"})
+        return
+    if LATENCY_SECONDS:
+        await asyncio.sleep(LATENCY_SECONDS)
+    await _respond(send, 200, {"id": str(uuid5(NAMESPACE_URL, token))})
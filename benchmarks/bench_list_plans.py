@@ -0,0 +1,175 @@
+"""Benchmark: query plans and latency of every filter/sort combination of the video list.
+
+Seeds a library spread over many users, then EXPLAINs the page query for each
+combination of filters (format, created_at range, size range, filename
+substring) and each sort key/direction, reporting the index chosen and the
+median query time. Exits with status 1 when any combination scans the whole
+``videos`` table.
+
+Usage:
+    python benchmarks/bench_list_plans.py [--users 500] [--videos-per-user 200] [--rounds 20]
+
+Set ``BENCH_DATABASE_URL`` to run against Postgres (asyncpg), which is what the
+indexes are tuned for; defaults to an in-memory SQLite database (requires
+``aiosqlite``), where the trigram index does not exist.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from itertools import combinations
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from video_service.application.ports.output.repositories import VIDEO_SORT_FIELDS, VideoQuery  # noqa: E402
+from video_service.infrastructure.adapters.output.persistence.database import Base  # noqa: E402
+from video_service.infrastructure.adapters.output.persistence.models import VideoModel  # noqa: E402
+from video_service.infrastructure.adapters.output.persistence.repositories import (  # noqa: E402
+    SQLAlchemyVideoRepository,
+)
+from video_service.infrastructure.adapters.output.persistence.repositories.video_repository import (  # noqa: E402
+    _find_by_query_stmt,
+)
+
+FORMATS = ("mp4", "mkv", "mov", "webm", "avi")
+WORDS = ("beach", "city", "party", "trip", "concert", "family", "drone", "demo")
+START = datetime(2024, 1, 1)
+FILTERS = {
+    "format": {"format": "mkv"},
+    "created": {"created_from": START + timedelta(days=30), "created_to": START + timedelta(days=60)},
+    "size": {"min_size": 10 * 1024 * 1024, "max_size": 50 * 1024 * 1024},
+    "filename": {"filename_contains": "conc"},
+}
+
+
+def _queries():
+    names = list(FILTERS)
+    for size in range(len(names) + 1):
+        for combo in combinations(names, size):
+            kwargs = {}
+            for name in combo:
+                kwargs.update(FILTERS[name])
+            for sort_by in VIDEO_SORT_FIELDS:
+                for descending in (True, False):
+                    yield "+".join(combo) or "none", VideoQuery(sort_by=sort_by, descending=descending, **kwargs)
+
+
+async def _seed(session_factory, users: int, per_user: int):
+    user_ids = [uuid4() for _ in range(users)]
+    async with session_factory() as session:
+        for n, user_id in enumerate(user_ids):
+            await session.execute(
+                VideoModel.__table__.insert(),
+                [
+                    {
+                        "id": uuid4(),
+                        "user_id": user_id,
+                        "original_filename": f"{WORDS[(n + i) % len(WORDS)]}-{i}.{FORMATS[i % len(FORMATS)]}",
+                        "file_path": f"s3://bench/videos/{user_id}/{i}",
+                        "file_size": (i * 7919 % 500) * 1024 * 1024,
+                        "format": FORMATS[i % len(FORMATS)],
+                        "duration": float(i),
+                        "created_at": START + timedelta(hours=i * 13),
+                    }
+                    for i in range(per_user)
+                ],
+            )
+        await session.commit()
+    return user_ids[len(user_ids) // 2]
+
+
+def _postgres_plan(rows) -> tuple:
+    """(indexes used, whether videos is sequentially scanned) from EXPLAIN (FORMAT JSON)."""
+    plan = rows[0][0]
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    indexes, seq_scan = [], False
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node.get("Index Name"):
+            indexes.append(node["Index Name"])
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") == "videos":
+            seq_scan = True
+        stack.extend(node.get("Plans", []))
+    return indexes, seq_scan
+
+
+def _sqlite_plan(rows) -> tuple:
+    indexes, seq_scan = [], False
+    for row in rows:
+        detail = row[-1]
+        if "USING" in detail and "INDEX" in detail:
+            indexes.append(detail.rsplit("INDEX ", 1)[-1].split(" ")[0])
+        elif detail.startswith("SCAN videos"):
+            seq_scan = True
+    return indexes, seq_scan
+
+
+async def _explain(session: AsyncSession, stmt) -> tuple:
+    dialect = session.bind.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "postgresql":
+        result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        return _postgres_plan(result.all())
+    result = await session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return _sqlite_plan(result.all())
+
+
+async def _time(session: AsyncSession, user_id, query: VideoQuery, rounds: int) -> float:
+    repo = SQLAlchemyVideoRepository(session)
+    await repo.find_by_user_id(user_id, 0, 25, query)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await repo.find_by_user_id(user_id, 0, 25, query)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--videos-per-user", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    user_id = await _seed(session_factory, args.users, args.videos_per_user)
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+    print(f"database={engine.url.drivername} rows={args.users * args.videos_per_user} rounds={args.rounds}")
+    print(f"{'filters':<30} {'sort':<20} {'median ms':>10}  plan")
+    seq_scans = 0
+    async with session_factory() as session:
+        for name, query in _queries():
+            indexes, seq_scan = await _explain(session, _find_by_query_stmt(user_id, query, 0, 25))
+            elapsed = await _time(session, user_id, query, args.rounds)
+            sort = ("-" if query.descending else "") + query.sort_by
+            plan = "SEQ SCAN" if seq_scan else ",".join(dict.fromkeys(indexes)) or "?"
+            seq_scans += seq_scan
+            print(f"{name:<30} {sort:<20} {elapsed:>10.2f}  {plan}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+    print(f"combinations with a sequential scan: {seq_scans}")
+    return 1 if seq_scans else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,95 @@
+"""Benchmark: SNS/SQS message codecs.
+
+Encodes and decodes representative payloads with every installed codec, with
+and without zlib, and reports the time per message and the size of the message
+body as sent (base64 included for binary output). Payloads: a ``VideoUploaded`` event,
+a processing job and a 100-entry batch of status updates.
+
+Usage:
+    python benchmarks/bench_message_codecs.py [--rounds 20000]
+"""
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from video_service.infrastructure.adapters.output.messaging.codecs import (  # noqa: E402
+    CODECS,
+    MessageEncoder,
+    codec_attribute,
+    decode_body,
+)
+
+
+def _payloads() -> dict:
+    user_id = str(uuid4())
+    return {
+        "event": {
+            "event_type": "VideoUploaded",
+            "video_id": str(uuid4()),
+            "user_id": user_id,
+            "filename": "holiday-2024-final-cut.mp4",
+            "file_size": 734003200,
+            "occurred_at": "2024-06-01T12:34:56.789012+00:00",
+        },
+        "job": {
+            "job_id": str(uuid4()),
+            "video_id": str(uuid4()),
+            "user_id": user_id,
+            "s3_key": f"videos/{user_id}/{uuid4()}.mp4",
+            "user_email": "someone@example.com",
+        },
+        "batch": {
+            "updates": [
+                {"video_id": str(uuid4()), "status": "processing", "progress": i % 100}
+                for i in range(100)
+            ]
+        },
+    }
+
+
+def _measure(encoder: MessageEncoder, payload: dict, rounds: int):
+    body, attributes = encoder.encode(payload, schema_version=1)
+    codec = codec_attribute(attributes)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        encoder.encode(payload, schema_version=1)
+    encode = (time.perf_counter() - started) / rounds
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decode_body(body, codec)
+    decode = (time.perf_counter() - started) / rounds
+    return codec, len(body.encode()), encode, decode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"rounds={args.rounds}")
+    print(f"{'payload':>8} {'codec':>13} {'bytes':>7} {'vs json':>8} {'encode us':>10} {'decode us':>10}")
+    for name, payload in _payloads().items():
+        rounds = max(args.rounds // 20, 1) if name == "batch" else args.rounds
+        baseline = None
+        for codec in CODECS.values():
+            if codec.requires and importlib.util.find_spec(codec.requires) is None:
+                continue
+            for compression in (False, True):
+                encoder = MessageEncoder(codec, compression=compression, compress_min_bytes=0)
+                label, size, encode, decode = _measure(encoder, payload, rounds)
+                baseline = baseline or size
+                print(
+                    f"{name:>8} {label:>13} {size:>7} {size / baseline:>7.0%} "
+                    f"{encode * 1e6:>10.1f} {decode * 1e6:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
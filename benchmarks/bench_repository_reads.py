@@ -0,0 +1,131 @@
+"""Benchmark: projected repository reads vs. full ORM entity loads.
+
+Seeds one user's library and pages through it with both read paths, reporting
+rows/sec and allocations per page for page sizes 10..100.
+
+Usage:
+    python benchmarks/bench_repository_reads.py [--rows 2000] [--rounds 200]
+
+Set ``BENCH_DATABASE_URL`` to run against Postgres (asyncpg); defaults to an
+in-memory SQLite database (requires ``aiosqlite``).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from video_service.infrastructure.adapters.output.persistence.database import Base  # noqa: E402
+from video_service.infrastructure.adapters.output.persistence.models import VideoModel  # noqa: E402
+from video_service.infrastructure.adapters.output.persistence.repositories import (  # noqa: E402
+    SQLAlchemyVideoRepository,
+)
+
+PAGE_SIZES = (10, 25, 50, 100)
+
+
+async def _orm_page(session: AsyncSession, user_id, skip: int, limit: int):
+    """Baseline: the previous ``select(VideoModel)`` read path."""
+    stmt = (
+        select(VideoModel)
+        .where(VideoModel.user_id == user_id)
+        .order_by(VideoModel.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    repo = SQLAlchemyVideoRepository(session)
+    return [repo._to_entity(m) for m in result.scalars().all()]
+
+
+async def _projected_page(session: AsyncSession, user_id, skip: int, limit: int):
+    return await SQLAlchemyVideoRepository(session).find_by_user_id(user_id, skip, limit)
+
+
+async def _seed(session_factory, rows: int):
+    user_id = uuid4()
+    now = datetime.now(UTC).replace(tzinfo=None)
+    async with session_factory() as session:
+        await session.execute(
+            VideoModel.__table__.insert(),
+            [
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "original_filename": f"video-{i}.mp4",
+                    "file_path": f"s3://bench/videos/{user_id}/{i}.mp4",
+                    "file_size": 1024 * i,
+                    "format": "mp4",
+                    "duration": float(i),
+                    "created_at": now - timedelta(seconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        await session.commit()
+    return user_id
+
+
+async def _measure(session_factory, reader, user_id, page_size: int, rounds: int, total_rows: int):
+    pages = max(total_rows // page_size, 1)
+    async with session_factory() as session:
+        # Warm-up so statement compilation is not part of the measurement.
+        await reader(session, user_id, 0, page_size)
+        session.expunge_all()
+
+        fetched = 0
+        started = time.perf_counter()
+        for i in range(rounds):
+            fetched += len(await reader(session, user_id, (i % pages) * page_size, page_size))
+            session.expunge_all()
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        snapshot_before = tracemalloc.take_snapshot()
+        await reader(session, user_id, 0, page_size)
+        snapshot_after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = snapshot_after.compare_to(snapshot_before, "filename")
+        blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+
+    return fetched / elapsed, peak, blocks
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    user_id = await _seed(session_factory, args.rows)
+
+    print(f"database={engine.url.drivername} rows={args.rows} rounds={args.rounds}")
+    print(f"{'page':>5} {'path':>10} {'rows/sec':>12} {'peak KiB':>10} {'new blocks':>11}")
+    for page_size in PAGE_SIZES:
+        for name, reader in (("orm", _orm_page), ("projected", _projected_page)):
+            rate, peak, blocks = await _measure(session_factory, reader, user_id, page_size, args.rounds, args.rows)
+            print(f"{page_size:>5} {name:>10} {rate:>12,.0f} {peak / 1024:>10.1f} {blocks:>11}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
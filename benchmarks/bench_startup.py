@@ -0,0 +1,120 @@
+"""Startup-time harness for the API.
+
+Reports two numbers so cold-start regressions are visible:
+
+* import-time breakdown of the app module (``python -X importtime``), listing
+  the slowest top-level packages by cumulative time;
+* time-to-first-request: wall time from spawning uvicorn until ``GET /health``
+  first answers 200, averaged over several runs.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--top 15] [--env APP_ENV=production]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+APP_MODULE = "video_service.infrastructure.adapters.input.api.main"
+
+
+def _environment(extra: list[str]) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT / "src"), env.get("PYTHONPATH")]))
+    for item in extra:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def import_breakdown(env: dict, top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP_MODULE}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, raw_name = line.removeprefix("import time:").split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative), raw_name.strip()))
+
+    # importtime prints children before parents; walk it reversed (parents first) and
+    # charge each third-party package to the point where our code first pulled it in.
+    total_us = 0
+    packages: dict[str, int] = {}
+    roots_by_depth: dict[int, str] = {}
+    for depth, cumulative, name in reversed(entries):
+        root = name.split(".")[0]
+        roots_by_depth[depth] = root
+        if name == APP_MODULE:
+            total_us = cumulative
+        parent_root = roots_by_depth.get(depth - 1)
+        if root != "video_service" and parent_root == "video_service":
+            packages[root] = packages.get(root, 0) + cumulative
+
+    print(f"import {APP_MODULE}: {total_us / 1000:.1f} ms")
+    for name, cumulative in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request(env: dict, timeout: float = 30.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{APP_MODULE}:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("service did not answer /health in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE passed to the app, repeatable")
+    args = parser.parse_args()
+
+    env = _environment(args.env)
+    import_breakdown(env, args.top)
+
+    samples = [time_to_first_request(env) for _ in range(args.runs)]
+    print(
+        f"time-to-first-request over {args.runs} runs: "
+        f"mean {sum(samples) / len(samples) * 1000:.0f} ms, "
+        f"min {min(samples) * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""End-to-end load test against local stand-ins for auth, S3 and SNS.
+
+Starts, as subprocesses:
+
+* a moto server for S3 and SNS (needs ``moto[server]``), with the bucket and
+  topic created up front;
+* ``auth_stub.py``, whose ``/auth/me`` accepts any bearer token as a user;
+* the API under uvicorn, pointed at both and at ``BENCH_DATABASE_URL``
+  (default: a fresh SQLite file, which needs ``aiosqlite``).
+
+Each user gets a few seed videos, then workers run the scenario at the given
+concurrency for ``--duration`` seconds. The report shows, per endpoint,
+requests/sec, latency percentiles and error rate (any status other than
+2xx/304, plus transport errors). The exit status is 1 when the overall error
+rate is above ``--max-error-rate``, so the run can gate a release.
+
+Scenarios (operation weights):
+    mixed       uploads, browsing, lookups and usage checks
+    uploads     uploads only, sizes drawn from --upload-sizes
+    browse      list pages with filters and sort orders
+    get-storm   get-by-id on the seeded videos
+
+Usage:
+    python benchmarks/load_test.py [--scenario mixed] [--concurrency 32] [--duration 30]
+        [--users 20] [--upload-sizes 64K:6,1M:3,8M:1] [--json report.json] [--env KEY=VALUE]
+"""
+import argparse
+import asyncio
+from contextlib import ExitStack, contextmanager
+import json
+import os
+from pathlib import Path
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+APP_MODULE = "video_service.infrastructure.adapters.input.api.main"
+BUCKET = "load-test"
+REGION = "us-east-1"
+
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "mixed": {"upload": 1, "list": 4, "get": 8, "usage": 1},
+    "uploads": {"upload": 1},
+    "browse": {"list": 1},
+    "get-storm": {"get": 1},
+}
+LIST_VARIANTS = (
+    {},
+    {"sort": "-file_size"},
+    {"format": "mp4"},
+    {"filename": "load"},
+    {"sort": "original_filename", "page": "2"},
+)
+SIZE_UNITS = {"K": 1024, "M": 1024 * 1024}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args[:3]} exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except urllib.error.HTTPError:
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"{url} did not answer in time")
+
+
+@contextmanager
+def _process(args: List[str], env: dict, ready_url: str, quiet: bool = False) -> Iterator[subprocess.Popen]:
+    output = subprocess.DEVNULL if quiet else None
+    process = subprocess.Popen(args, env=env, stdout=output, stderr=output)
+    try:
+        _wait_for(ready_url, process)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def parse_sizes(spec: str) -> List[Tuple[int, int]]:
+    """``"64K:6,1M:3,8M"`` -> [(65536, 6), (1048576, 3), (8388608, 1)]."""
+    sizes = []
+    for item in spec.split(","):
+        size, _, weight = item.strip().partition(":")
+        multiplier = SIZE_UNITS.get(size[-1:].upper(), 1)
+        number = size[:-1] if multiplier != 1 else size
+        sizes.append((int(float(number) * multiplier), int(weight or 1)))
+    return sizes
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, seconds: float, status: str, ok: bool) -> None:
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        self.errors[endpoint] = self.errors.get(endpoint, 0) + (not ok)
+        by_status = self.statuses.setdefault(endpoint, {})
+        by_status[status] = by_status.get(status, 0) + 1
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "rps": len(samples) / elapsed,
+                "error_rate": self.errors[endpoint] / len(samples),
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p90_ms": percentile(samples, 0.90) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+                "max_ms": samples[-1] * 1000,
+                "statuses": self.statuses[endpoint],
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        errors = sum(self.errors.values())
+        return {
+            "elapsed_seconds": elapsed,
+            "requests": total,
+            "rps": total / elapsed if elapsed else 0.0,
+            "error_rate": errors / total if total else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+class LoadTest:
+    def __init__(self, base_url: str, users: int, sizes: List[Tuple[int, int]], seed: int = 0):
+        self._base_url = base_url
+        self._tokens = [f"load-user-{i}" for i in range(users)]
+        self._random = random.Random(seed)
+        # One random payload per size, reused by every upload of that size.
+        self._payloads = [(os.urandom(size), weight) for size, weight in sizes]
+        self._video_ids: Dict[str, List[str]] = {token: [] for token in self._tokens}
+        self.recorder = Recorder()
+
+    async def _call(
+        self, client: httpx.AsyncClient, endpoint: str, method: str, path: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.record(endpoint, time.perf_counter() - started, type(exc).__name__, False)
+            return None
+        ok = 200 <= response.status_code < 300 or response.status_code == 304
+        self.recorder.record(endpoint, time.perf_counter() - started, str(response.status_code), ok)
+        return response
+
+    async def upload(self, client: httpx.AsyncClient, token: str, payload: Optional[bytes] = None) -> None:
+        if payload is None:
+            payload = self._random.choices(
+                [body for body, _ in self._payloads], weights=[weight for _, weight in self._payloads]
+            )[0]
+        response = await self._call(
+            client,
+            "POST /videos/upload",
+            "POST",
+            "/videos/upload",
+            headers={"Authorization": f"Bearer {token}"},
+            files=[("files", (f"load-{len(payload)}.mp4", payload, "video/mp4"))],
+        )
+        if response is not None and response.status_code == 201:
+            self._video_ids[token].extend(video["id"] for video in response.json())
+
+    async def list_page(self, client: httpx.AsyncClient, token: str) -> None:
+        params = dict(self._random.choice(LIST_VARIANTS), page_size="20")
+        await self._call(
+            client, "GET /videos/", "GET", "/videos/", params=params, headers={"Authorization": f"Bearer {token}"}
+        )
+
+    async def get(self, client: httpx.AsyncClient, token: str) -> None:
+        video_ids = self._video_ids[token]
+        if not video_ids:
+            await self.upload(client, token)
+            return
+        await self._call(
+            client,
+            "GET /videos/{video_id}",
+            "GET",
+            f"/videos/{self._random.choice(video_ids)}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    async def usage(self, client: httpx.AsyncClient, token: str) -> None:
+        await self._call(client, "GET /videos/usage", "GET", "/videos/usage", headers={"Authorization": f"Bearer {token}"})
+
+    async def seed(self, client: httpx.AsyncClient, per_user: int) -> None:
+        smallest = min((body for body, _ in self._payloads), key=len)
+        for token in self._tokens:
+            for _ in range(per_user):
+                await self.upload(client, token, smallest)
+        self.recorder = Recorder()
+
+    async def run(self, scenario: Dict[str, int], concurrency: int, duration: float, seed_per_user: int) -> dict:
+        operations = {"upload": self.upload, "list": self.list_page, "get": self.get, "usage": self.usage}
+        names = list(scenario)
+        weights = [scenario[name] for name in names]
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=self._base_url, timeout=60.0, limits=limits) as client:
+            await self.seed(client, seed_per_user)
+            stop_at = time.perf_counter() + duration
+
+            async def worker() -> None:
+                while time.perf_counter() < stop_at:
+                    name = self._random.choices(names, weights=weights)[0]
+                    await operations[name](client, self._random.choice(self._tokens))
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return self.recorder.report(time.perf_counter() - started)
+
+
+def _print_report(report: dict, scenario: str, concurrency: int) -> None:
+    print(
+        f"scenario={scenario} concurrency={concurrency} requests={report['requests']} "
+        f"rps={report['rps']:.1f} error_rate={report['error_rate']:.2%}"
+    )
+    print(f"{'endpoint':<26} {'reqs':>7} {'rps':>8} {'err%':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses")
+    for endpoint, stats in report["endpoints"].items():
+        statuses = " ".join(f"{code}x{count}" for code, count in sorted(stats["statuses"].items()))
+        print(
+            f"{endpoint:<26} {stats['requests']:>7} {stats['rps']:>8.1f} {stats['error_rate']:>7.2%} "
+            f"{stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}  {statuses}"
+        )
+
+
+def _environment(extra: List[str]) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT / "src"), env.get("PYTHONPATH")]))
+    env.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    env.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    env["AWS_DEFAULT_REGION"] = REGION
+    for item in extra:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def _create_aws_resources(endpoint_url: str) -> str:
+    import boto3
+
+    session = boto3.session.Session(aws_access_key_id="testing", aws_secret_access_key="testing", region_name=REGION)
+    session.client("s3", endpoint_url=endpoint_url).create_bucket(Bucket=BUCKET)
+    return session.client("sns", endpoint_url=endpoint_url).create_topic(Name="video-events")["TopicArn"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seed-videos", type=int, default=5, help="Videos uploaded per user before measuring")
+    parser.add_argument("--upload-sizes", default="64K:6,1M:3,8M:1", help="SIZE[:WEIGHT],... with K/M suffixes")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE passed to the API, repeatable")
+    args = parser.parse_args()
+
+    env = _environment([])
+    moto_port, auth_port, api_port = _free_port(), _free_port(), _free_port()
+    moto_url = f"http://127.0.0.1:{moto_port}"
+    with ExitStack() as stack:
+        workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="video-load-test-")))
+        stack.enter_context(
+            _process(
+                [sys.executable, "-m", "moto.server", "-p", str(moto_port)],
+                env,
+                f"{moto_url}/moto-api/",
+                quiet=True,
+            )
+        )
+        topic_arn = _create_aws_resources(moto_url)
+        stack.enter_context(
+            _process(
+                [sys.executable, "-m", "uvicorn", "auth_stub:app", "--app-dir", str(Path(__file__).parent),
+                 "--port", str(auth_port), "--log-level", "warning"],
+                env,
+                f"http://127.0.0.1:{auth_port}/auth/me",
+            )
+        )
+        database_url = os.getenv("BENCH_DATABASE_URL") or f"sqlite+aiosqlite:///{workdir / 'videos.db'}"
+        api_env = _environment(
+            [
+                f"DATABASE_URL={database_url}",
+                "DB_CREATE_SCHEMA=true",
+                f"AWS_ENDPOINT_URL={moto_url}",
+                f"S3_BUCKET={BUCKET}",
+                f"SNS_TOPIC_ARN={topic_arn}",
+                f"AUTH_SERVICE_URL=http://127.0.0.1:{auth_port}",
+                "VIDEO_EVENTS_ENABLED=false",
+                "PROCESSING_RESULTS_QUEUE_URL=",
+                *args.env,
+            ]
+        )
+        stack.enter_context(
+            _process(
+                [sys.executable, "-m", "uvicorn", f"{APP_MODULE}:app", "--port", str(api_port), "--log-level", "warning"],
+                api_env,
+                f"http://127.0.0.1:{api_port}/health",
+            )
+        )
+
+        load_test = LoadTest(f"http://127.0.0.1:{api_port}", args.users, parse_sizes(args.upload_sizes))
+        report = asyncio.run(
+            load_test.run(SCENARIOS[args.scenario], args.concurrency, args.duration, args.seed_videos)
+        )
+
+    _print_report(report, args.scenario, args.concurrency)
+    if args.json:
+        Path(args.json).write_text(json.dumps({"scenario": args.scenario, "concurrency": args.concurrency, **report}, indent=2))
+    return 1 if report["error_rate"] > args.max_error_rate else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
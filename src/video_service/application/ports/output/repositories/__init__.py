@@ -1,4 +1,18 @@
 """Repository Interfaces."""
-from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.application.ports.output.repositories.video_repository import (
+    VIDEO_SORT_FIELDS,
+    IVideoRepository,
+    UsageRepairBatch,
+    UserUsage,
+    VideoQuery,
+    VideoStatusUpdate,
+)
 
-__all__ = ["IVideoRepository"]
+__all__ = [
+    "VIDEO_SORT_FIELDS",
+    "IVideoRepository",
+    "UsageRepairBatch",
+    "UserUsage",
+    "VideoQuery",
+    "VideoStatusUpdate",
+]
@@ -1,16 +1,67 @@
 """Video Repository Interface."""
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Collection, List, Optional, Tuple
 from uuid import UUID
 
+from video_service.domain.entities.storage_quota import StorageQuota
 from video_service.domain.entities.video import Video
 
 
+@dataclass
+class VideoStatusUpdate:
+    video_id: UUID
+    status: str
+    progress: int = 0
+
+
+VIDEO_SORT_FIELDS = ("created_at", "file_size", "original_filename")
+
+
+@dataclass(frozen=True)
+class VideoQuery:
+    """Filters (all optional, combined with AND) and ordering for a user's video list."""
+
+    format: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    # Case-insensitive substring of original_filename.
+    filename_contains: Optional[str] = None
+    sort_by: str = "created_at"
+    descending: bool = True
+
+    @property
+    def is_default(self) -> bool:
+        return self == VideoQuery()
+
+
+@dataclass
+class UserUsage:
+    video_count: int = 0
+    total_bytes: int = 0
+
+
+@dataclass
+class UsageRepairBatch:
+    # Keyset cursor for the next batch; None once every user was checked.
+    last_user_id: Optional[UUID] = None
+    checked: int = 0
+    repaired: int = 0
+
+
 class IVideoRepository(ABC):
     """Interface for Video Repository."""
 
     @abstractmethod
-    async def save(self, video: Video) -> Video:
+    async def save(self, video: Video, quota: Optional[StorageQuota] = None) -> Video:
+        """Add the video to its owner's usage, raising QuotaExceededError if it would not fit the quota.
+
+        The check and the usage update are one atomic step, so concurrent saves
+        of the same user cannot together go over the quota.
+        """
         pass
 
     @abstractmethod
@@ -18,7 +69,19 @@ class IVideoRepository(ABC):
         pass
 
     @abstractmethod
-    async def find_by_user_id(self, user_id: UUID, skip: int = 0, limit: int = 10) -> List[Video]:
+    async def find_by_ids(self, video_ids: List[UUID]) -> List[Video]:
+        """Return the videos matching any of the given ids (missing ids are skipped)."""
+        pass
+
+    @abstractmethod
+    async def find_by_user_id(
+        self,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 10,
+        query: Optional[VideoQuery] = None,
+    ) -> List[Video]:
+        """Page through the user's videos, newest first unless query says otherwise."""
         pass
 
     @abstractmethod
@@ -26,5 +89,57 @@ class IVideoRepository(ABC):
         pass
 
     @abstractmethod
-    async def count_by_user_id(self, user_id: UUID) -> int:
+    async def delete_by_ids(self, video_ids: List[UUID], user_id: UUID) -> List[Tuple[UUID, str]]:
+        """Delete the user's videos among the given ids, returning ``(id, file_path)`` of each deleted row."""
+        pass
+
+    @abstractmethod
+    async def count_by_user_id(self, user_id: UUID, query: Optional[VideoQuery] = None) -> int:
+        pass
+
+    @abstractmethod
+    async def get_change_marker(self, user_id: UUID) -> int:
+        """Return a value that changes whenever any of the user's videos is added, changed or removed."""
+        pass
+
+    @abstractmethod
+    async def get_usage(self, user_id: UUID) -> UserUsage:
+        """Return the user's video count and stored bytes, kept up to date by save and delete."""
+        pass
+
+    @abstractmethod
+    async def repair_usage(self, after_user_id: Optional[UUID] = None, batch_size: int = 500) -> UsageRepairBatch:
+        """Recompute the usage of the next batch of users (by id, after after_user_id) from their videos."""
+        pass
+
+    @abstractmethod
+    async def apply_status_updates(self, updates: List[VideoStatusUpdate]) -> List[Tuple[UUID, UUID]]:
+        """Apply processing status updates (at most one per video) that move a video forward.
+
+        Updates that would move a video back, or touch one already completed or
+        failed, are skipped. Returns ``(video_id, user_id)`` of each updated video.
+        """
+        pass
+
+    @abstractmethod
+    async def fail_stale_pending(
+        self, created_before: datetime, keep: Collection[UUID] = (), limit: int = 100
+    ) -> List[Tuple[UUID, UUID]]:
+        """Mark failed up to ``limit`` videos still pending that were created before ``created_before``.
+
+        Videos in ``keep`` are left alone. Returns ``(video_id, user_id)`` of each failed video.
+        """
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Commit the changes made so far; side effects that must not outlive a rollback go after it."""
+        pass
+
+    @abstractmethod
+    def iter_file_paths(self, path_prefix: str, batch_size: int = 1000) -> AsyncIterator[str]:
+        """Stream stored file paths starting with path_prefix in binary (byte) order.
+
+        Archived videos are included: their objects are still referenced.
+        """
         pass
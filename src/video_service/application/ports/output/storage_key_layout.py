@@ -0,0 +1,20 @@
+"""Storage Key Layout Interface."""
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+
+class IStorageKeyLayout(ABC):
+    """Where new video files are stored.
+
+    A video's key is persisted in its file_path, so changing the layout only
+    affects new uploads; existing files stay where they are.
+    """
+
+    @abstractmethod
+    def key_for(self, user_id: UUID, video_id: UUID, file_format: str) -> str:
+        pass
+
+    @abstractmethod
+    def partition(self, key: str) -> str:
+        """The prefix a key is counted under in request-rate metrics; few distinct values."""
+        pass
@@ -1,22 +1,45 @@
 """Storage Service Interface."""
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, List, Optional
+
+
+@dataclass
+class StoredObject:
+    path: str
+    last_modified: datetime
 
 
 class IStorageService(ABC):
     """Interface for Storage Service (S3)."""
 
     @abstractmethod
-    async def upload_file(self, file: BinaryIO, key: str, content_type: str) -> str:
-        """Upload file and return the storage path."""
+    async def upload_file(self, file: BinaryIO, key: str, content_type: str, region: Optional[str] = None) -> str:
+        """Upload file and return the storage path; region hints where the client is."""
         pass
 
     @abstractmethod
     async def get_presigned_url(self, key: str, expires_in: int = 3600) -> str:
-        """Get presigned URL for download."""
+        """Get presigned URL for download of a key or a path returned by upload_file."""
         pass
 
     @abstractmethod
     async def delete_file(self, key: str) -> bool:
         """Delete file from storage."""
         pass
+
+    @abstractmethod
+    async def delete_files(self, paths: List[str]) -> List[str]:
+        """Delete many files by the paths returned from upload_file; return the paths that failed."""
+        pass
+
+    @abstractmethod
+    def storage_path(self, key: str, region: Optional[str] = None) -> str:
+        """Return the storage path upload_file would return for key and region."""
+        pass
+
+    @abstractmethod
+    def iter_objects(self, prefix: str) -> AsyncIterator[StoredObject]:
+        """Stream stored objects under a key prefix, ordered by path."""
+        pass
@@ -0,0 +1,39 @@
+"""Upload Staging Interface."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class StagedUpload:
+    video_id: UUID
+    user_id: UUID
+    filename: str
+    storage_key: str
+    content_type: str
+    file_size: int
+    region: Optional[str] = None
+
+
+class IUploadStaging(ABC):
+    """Interface for the durable holding area of accepted uploads not yet in storage."""
+
+    @abstractmethod
+    async def stage(self, upload: StagedUpload, file: BinaryIO) -> None:
+        """Persist the upload's content and metadata; it is listed only once fully written."""
+        pass
+
+    @abstractmethod
+    def open(self, video_id: UUID) -> BinaryIO:
+        """Open the staged content for reading; the caller closes it."""
+        pass
+
+    @abstractmethod
+    async def discard(self, video_id: UUID) -> None:
+        pass
+
+    @abstractmethod
+    async def list_staged(self) -> List[StagedUpload]:
+        """Every complete staged upload, e.g. to resume them after a restart."""
+        pass
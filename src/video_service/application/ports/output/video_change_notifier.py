@@ -0,0 +1,26 @@
+"""Video Change Notifier Interface."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+
+VIDEO_UPLOADED = "video.uploaded"
+VIDEO_STATUS_CHANGED = "video.status_changed"
+
+
+@dataclass
+class VideoChange:
+    user_id: UUID
+    video_id: UUID
+    kind: str
+    status: str
+    progress: int = 0
+
+
+class IVideoChangeNotifier(ABC):
+    """Interface for pushing video changes to the owner's live connections."""
+
+    @abstractmethod
+    async def notify(self, changes: List[VideoChange]) -> None:
+        """Best effort: delivery failures must not fail the caller."""
+        pass
@@ -1,6 +1,26 @@
 """Use Cases."""
 from video_service.application.use_cases.upload_video import UploadVideoUseCase
+from video_service.application.use_cases.accept_video_upload import AcceptVideoUploadUseCase
+from video_service.application.use_cases.complete_video_upload import CompleteVideoUploadUseCase
 from video_service.application.use_cases.get_video import GetVideoUseCase
 from video_service.application.use_cases.list_videos import ListVideosUseCase
+from video_service.application.use_cases.batch_get_videos import BatchGetVideosUseCase
+from video_service.application.use_cases.delete_videos import DeleteVideosUseCase
+from video_service.application.use_cases.reconcile_storage import ReconcileStorageUseCase
+from video_service.application.use_cases.apply_processing_results import ApplyProcessingResultsUseCase
+from video_service.application.use_cases.get_usage import GetUsageUseCase
+from video_service.application.use_cases.repair_usage import RepairUsageUseCase
 
-__all__ = ["UploadVideoUseCase", "GetVideoUseCase", "ListVideosUseCase"]
+__all__ = [
+    "UploadVideoUseCase",
+    "AcceptVideoUploadUseCase",
+    "CompleteVideoUploadUseCase",
+    "GetVideoUseCase",
+    "ListVideosUseCase",
+    "BatchGetVideosUseCase",
+    "DeleteVideosUseCase",
+    "ReconcileStorageUseCase",
+    "ApplyProcessingResultsUseCase",
+    "GetUsageUseCase",
+    "RepairUsageUseCase",
+]
@@ -0,0 +1,93 @@
+"""Accept Video Upload Use Case."""
+from dataclasses import dataclass
+from typing import Optional
+
+from video_service.domain.entities.storage_quota import StorageQuota
+from video_service.domain.entities.video import Video
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.application.ports.output.storage_key_layout import IStorageKeyLayout
+from video_service.application.ports.output.storage_service import IStorageService
+from video_service.application.ports.output.upload_staging import IUploadStaging, StagedUpload
+from video_service.application.use_cases.upload_video import (
+    UploadVideoInput,
+    VideoOutput,
+    check_quota,
+    validate_upload,
+)
+
+
+@dataclass
+class AcceptVideoUploadOutput:
+    video: VideoOutput
+    upload: StagedUpload
+
+
+class AcceptVideoUploadUseCase:
+    """Use Case: Accept a video for a later transfer to storage.
+
+    The file is staged and the video saved as pending; CompleteVideoUploadUseCase
+    moves it to storage afterwards.
+    """
+
+    def __init__(
+        self,
+        video_repository: IVideoRepository,
+        storage_service: IStorageService,
+        staging: IUploadStaging,
+        key_layout: IStorageKeyLayout,
+        quota: Optional[StorageQuota] = None,
+    ):
+        self._video_repository = video_repository
+        self._storage_service = storage_service
+        self._staging = staging
+        self._quota = quota
+        self._key_layout = key_layout
+
+    async def execute(self, input_data: UploadVideoInput) -> AcceptVideoUploadOutput:
+        file_format = validate_upload(input_data.filename, input_data.file_size)
+        await check_quota(self._video_repository, self._quota, input_data.user_id, input_data.file_size)
+
+        video_id = Video.new_id()
+        upload = StagedUpload(
+            video_id=video_id,
+            user_id=input_data.user_id,
+            filename=input_data.filename,
+            storage_key=self._key_layout.key_for(input_data.user_id, video_id, file_format),
+            content_type=input_data.content_type,
+            file_size=input_data.file_size,
+            region=input_data.region,
+        )
+        await self._staging.stage(upload, input_data.file)
+
+        # The path the file will have once transferred, so the video can be read and deleted meanwhile.
+        video = Video(
+            id=video_id,
+            user_id=input_data.user_id,
+            original_filename=input_data.filename,
+            file_path=self._storage_service.storage_path(upload.storage_key, upload.region),
+            file_size=input_data.file_size,
+            format=file_format,
+            created_at=Video.id_timestamp(video_id),
+            status=Video.STATUS_PENDING,
+        )
+        try:
+            saved_video = await self._video_repository.save(video, quota=self._quota)
+        except Exception:
+            await self._staging.discard(video_id)
+            raise
+
+        return AcceptVideoUploadOutput(
+            video=VideoOutput(
+                id=saved_video.id,
+                user_id=saved_video.user_id,
+                original_filename=saved_video.original_filename,
+                file_path=saved_video.file_path,
+                file_size=saved_video.file_size,
+                format=saved_video.format,
+                created_at=saved_video.created_at,
+                version=saved_video.version,
+                status=saved_video.status,
+                progress=saved_video.progress,
+            ),
+            upload=upload,
+        )
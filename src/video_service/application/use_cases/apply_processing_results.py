@@ -0,0 +1,65 @@
+"""Apply Processing Results Use Case."""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository, VideoStatusUpdate
+from video_service.application.ports.output.video_change_notifier import (
+    VIDEO_STATUS_CHANGED,
+    IVideoChangeNotifier,
+    VideoChange,
+)
+from video_service.domain.entities.video import Video
+
+
+@dataclass
+class ApplyProcessingResultsOutput:
+    received: int = 0
+    applied: int = 0
+    ignored: int = 0
+
+
+class ApplyProcessingResultsUseCase:
+    """Use Case: Record worker progress and results on the videos they refer to.
+
+    A batch may hold several updates for the same video, possibly out of order;
+    only the most advanced one is written.
+    """
+
+    def __init__(self, video_repository: IVideoRepository, change_notifier: Optional[IVideoChangeNotifier] = None):
+        self._video_repository = video_repository
+        self._change_notifier = change_notifier
+
+    async def execute(self, updates: List[VideoStatusUpdate]) -> ApplyProcessingResultsOutput:
+        output = ApplyProcessingResultsOutput(received=len(updates))
+        latest: Dict[UUID, VideoStatusUpdate] = {}
+        for update in updates:
+            if update.status not in Video.STATUS_RANKS:
+                output.ignored += 1
+                continue
+            update = self._normalize(update)
+            current = latest.get(update.video_id)
+            if current is None or self._position(update) > self._position(current):
+                latest[update.video_id] = update
+
+        applied = await self._video_repository.apply_status_updates(list(latest.values()))
+        # Announced only once committed: listeners refetch the videos and must see the new status.
+        await self._video_repository.commit()
+        output.applied = len(applied)
+        if applied and self._change_notifier is not None:
+            await self._change_notifier.notify(
+                [
+                    VideoChange(user_id, video_id, VIDEO_STATUS_CHANGED, latest[video_id].status, latest[video_id].progress)
+                    for video_id, user_id in applied
+                ]
+            )
+        return output
+
+    @staticmethod
+    def _normalize(update: VideoStatusUpdate) -> VideoStatusUpdate:
+        progress = 100 if update.status == Video.STATUS_COMPLETED else min(max(update.progress, 0), 100)
+        return VideoStatusUpdate(video_id=update.video_id, status=update.status, progress=progress)
+
+    @staticmethod
+    def _position(update: VideoStatusUpdate) -> tuple:
+        return Video.STATUS_RANKS[update.status], update.progress
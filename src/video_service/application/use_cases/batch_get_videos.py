@@ -0,0 +1,46 @@
+"""Batch Get Videos Use Case."""
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.application.use_cases.upload_video import VideoOutput
+
+
+@dataclass
+class BatchVideosOutput:
+    videos: List[VideoOutput]
+    missing_ids: List[UUID]
+
+
+class BatchGetVideosUseCase:
+    """Use Case: Get many videos by ID in a single repository round trip."""
+
+    def __init__(self, video_repository: IVideoRepository):
+        self._video_repository = video_repository
+
+    async def execute(self, video_ids: List[UUID], user_id: UUID) -> BatchVideosOutput:
+        """Get videos by ID, reporting ids that are missing or owned by another user."""
+        requested = list(dict.fromkeys(video_ids))
+        videos = await self._video_repository.find_by_ids(requested)
+        # Videos owned by someone else are reported as missing, like GetVideoUseCase does.
+        owned = {v.id: v for v in videos if v.user_id == user_id}
+
+        return BatchVideosOutput(
+            videos=[
+                VideoOutput(
+                    id=v.id,
+                    user_id=v.user_id,
+                    original_filename=v.original_filename,
+                    file_path=v.file_path,
+                    file_size=v.file_size,
+                    format=v.format,
+                    created_at=v.created_at,
+                    version=v.version,
+                    status=v.status,
+                    progress=v.progress,
+                )
+                for v in (owned[video_id] for video_id in requested if video_id in owned)
+            ],
+            missing_ids=[video_id for video_id in requested if video_id not in owned],
+        )
@@ -0,0 +1,99 @@
+"""Complete Video Upload Use Case."""
+from datetime import datetime
+from typing import Collection, Optional
+from uuid import UUID
+
+from video_service.domain.entities.video import Video
+from video_service.application.ports.output.repositories.video_repository import (
+    IVideoRepository,
+    VideoStatusUpdate,
+)
+from video_service.application.ports.output.storage_service import IStorageService
+from video_service.application.ports.output.event_publisher import IEventPublisher
+from video_service.application.ports.output.upload_staging import IUploadStaging, StagedUpload
+from video_service.application.ports.output.video_change_notifier import (
+    VIDEO_STATUS_CHANGED,
+    VIDEO_UPLOADED,
+    IVideoChangeNotifier,
+    VideoChange,
+)
+
+from video_processor_shared.domain.events import VideoUploadedEvent
+
+
+class CompleteVideoUploadUseCase:
+    """Use Case: Move an accepted upload from staging to storage.
+
+    Only pending videos are transferred, so running it again after a completed
+    transfer does nothing. A transfer interrupted after the upload or the event
+    is repeated whole: the event may be published more than once. The event
+    publisher must raise when the event is not sent, so the video only becomes
+    ``uploaded`` once it is and a failed publish is retried with the transfer.
+    The caller discards the staged file once the status change is committed.
+    """
+
+    def __init__(
+        self,
+        video_repository: IVideoRepository,
+        storage_service: IStorageService,
+        event_publisher: IEventPublisher,
+        staging: IUploadStaging,
+        change_notifier: Optional[IVideoChangeNotifier] = None,
+    ):
+        self._video_repository = video_repository
+        self._storage_service = storage_service
+        self._event_publisher = event_publisher
+        self._staging = staging
+        self._change_notifier = change_notifier
+
+    async def execute(self, upload: StagedUpload) -> bool:
+        """Transfer the upload; returns False when its video is gone or no longer pending."""
+        video = await self._video_repository.find_by_id(upload.video_id)
+        if video is None or video.status != Video.STATUS_PENDING:
+            return False
+
+        with self._staging.open(upload.video_id) as file:
+            await self._storage_service.upload_file(
+                file=file,
+                key=upload.storage_key,
+                content_type=upload.content_type,
+                region=upload.region,
+            )
+
+        await self._event_publisher.publish(
+            VideoUploadedEvent(
+                video_id=video.id,
+                user_id=video.user_id,
+                filename=video.original_filename,
+                file_size=video.file_size,
+            )
+        )
+        await self._set_status(upload, Video.STATUS_UPLOADED, VIDEO_UPLOADED)
+        return True
+
+    async def fail(self, upload: StagedUpload) -> None:
+        """Mark a pending video whose transfer keeps failing as failed."""
+        await self._set_status(upload, Video.STATUS_FAILED, VIDEO_STATUS_CHANGED)
+
+    async def fail_abandoned(self, created_before: datetime, keep: Collection[UUID] = ()) -> int:
+        """Mark failed the pending videos created before ``created_before`` whose upload is not in ``keep``.
+
+        For uploads whose staged file was lost, e.g. with the volume of a pod
+        that is gone; returns how many videos were failed.
+        """
+        failed = await self._video_repository.fail_stale_pending(created_before, keep)
+        await self._video_repository.commit()
+        if failed and self._change_notifier is not None:
+            await self._change_notifier.notify(
+                [
+                    VideoChange(user_id, video_id, VIDEO_STATUS_CHANGED, Video.STATUS_FAILED, 0)
+                    for video_id, user_id in failed
+                ]
+            )
+        return len(failed)
+
+    async def _set_status(self, upload: StagedUpload, status: str, kind: str) -> None:
+        updated = await self._video_repository.apply_status_updates([VideoStatusUpdate(upload.video_id, status)])
+        await self._video_repository.commit()
+        if updated and self._change_notifier is not None:
+            await self._change_notifier.notify([VideoChange(upload.user_id, upload.video_id, kind, status, 0)])
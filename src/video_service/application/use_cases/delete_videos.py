@@ -0,0 +1,42 @@
+"""Delete Videos Use Case."""
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.application.ports.output.storage_service import IStorageService
+
+
+@dataclass
+class DeleteVideosOutput:
+    deleted_ids: List[UUID]
+    missing_ids: List[UUID]
+    storage_failed_ids: List[UUID]
+
+
+class DeleteVideosUseCase:
+    """Use Case: Delete many of a user's videos and their stored files."""
+
+    def __init__(self, video_repository: IVideoRepository, storage_service: IStorageService):
+        self._video_repository = video_repository
+        self._storage_service = storage_service
+
+    async def execute(self, video_ids: List[UUID], user_id: UUID) -> DeleteVideosOutput:
+        """Delete the rows and commit, then delete the files they pointed to.
+
+        A failed commit leaves rows and files in place. Files whose deletion fails
+        are reported in ``storage_failed_ids``; the rows are already gone, so those
+        objects are left for the orphan reconciliation.
+        """
+        requested = list(dict.fromkeys(video_ids))
+        deleted = await self._video_repository.delete_by_ids(requested, user_id)
+        deleted_ids = {video_id for video_id, _ in deleted}
+        await self._video_repository.commit()
+
+        failed_paths = set(await self._storage_service.delete_files([path for _, path in deleted]))
+
+        return DeleteVideosOutput(
+            deleted_ids=[video_id for video_id in requested if video_id in deleted_ids],
+            missing_ids=[video_id for video_id in requested if video_id not in deleted_ids],
+            storage_failed_ids=[video_id for video_id, path in deleted if path in failed_paths],
+        )
@@ -0,0 +1,33 @@
+"""Get Usage Use Case."""
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.domain.entities.storage_quota import StorageQuota
+
+
+@dataclass
+class UsageOutput:
+    video_count: int
+    total_bytes: int
+    # None when the corresponding limit is not enforced.
+    max_videos: Optional[int] = None
+    max_bytes: Optional[int] = None
+
+
+class GetUsageUseCase:
+    """Use Case: Report a user's storage usage against their quota."""
+
+    def __init__(self, video_repository: IVideoRepository, quota: Optional[StorageQuota] = None):
+        self._video_repository = video_repository
+        self._quota = quota or StorageQuota()
+
+    async def execute(self, user_id: UUID) -> UsageOutput:
+        usage = await self._video_repository.get_usage(user_id)
+        return UsageOutput(
+            video_count=usage.video_count,
+            total_bytes=usage.total_bytes,
+            max_videos=self._quota.max_videos or None,
+            max_bytes=self._quota.max_bytes or None,
+        )
@@ -30,4 +30,7 @@ class GetVideoUseCase:
             file_size=video.file_size,
             format=video.format,
             created_at=video.created_at,
+            version=video.version,
+            status=video.status,
+            progress=video.progress,
         )
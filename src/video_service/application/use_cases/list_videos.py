@@ -1,9 +1,9 @@
 """List Videos Use Case."""
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository, VideoQuery
 from video_service.application.use_cases.upload_video import VideoOutput
 
 
@@ -21,16 +21,25 @@ class ListVideosUseCase:
     def __init__(self, video_repository: IVideoRepository):
         self._video_repository = video_repository
 
+    async def get_version(self, user_id: UUID) -> int:
+        """Cheap marker of the user's list state, checked before running the page query.
+
+        Read it *before* execute: a change in between only costs one extra full
+        response, never a stale 304.
+        """
+        return await self._video_repository.get_change_marker(user_id)
+
     async def execute(
         self,
         user_id: UUID,
         page: int = 1,
         page_size: int = 10,
+        query: Optional[VideoQuery] = None,
     ) -> PaginatedVideosOutput:
-        """List videos with pagination."""
+        """List videos with pagination, optionally filtered and sorted."""
         skip = (page - 1) * page_size
-        videos = await self._video_repository.find_by_user_id(user_id, skip, page_size)
-        total = await self._video_repository.count_by_user_id(user_id)
+        videos = await self._video_repository.find_by_user_id(user_id, skip, page_size, query)
+        total = await self._video_repository.count_by_user_id(user_id, query)
 
         return PaginatedVideosOutput(
             videos=[
@@ -42,6 +51,9 @@ class ListVideosUseCase:
                     file_size=v.file_size,
                     format=v.format,
                     created_at=v.created_at,
+                    version=v.version,
+                    status=v.status,
+                    progress=v.progress,
                 )
                 for v in videos
             ],
@@ -0,0 +1,98 @@
+"""Reconcile Storage Use Case."""
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Callable, List, Optional
+
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.application.ports.output.storage_service import IStorageService
+
+ORPHANED_OBJECT = "orphaned_object"
+DANGLING_ROW = "dangling_row"
+
+
+@dataclass
+class ReconcileStorageInput:
+    key_prefix: str = "videos/"
+    dry_run: bool = True
+    # Objects younger than this may belong to an upload whose row is not committed yet.
+    min_object_age: timedelta = timedelta(hours=1)
+    delete_batch_size: int = 1000
+    row_batch_size: int = 1000
+
+
+@dataclass
+class ReconcileStorageOutput:
+    scanned_objects: int = 0
+    scanned_rows: int = 0
+    orphaned_objects: int = 0
+    dangling_rows: int = 0
+    deleted_objects: int = 0
+    failed_deletions: int = 0
+
+
+class ReconcileStorageUseCase:
+    """Use Case: Find stored objects without a video row and rows without an object.
+
+    Both sides are streamed in the same sorted order and merged, so memory use
+    does not depend on the number of objects or rows.
+    """
+
+    def __init__(self, video_repository: IVideoRepository, storage_service: IStorageService):
+        self._video_repository = video_repository
+        self._storage_service = storage_service
+
+    async def execute(
+        self,
+        input_data: ReconcileStorageInput,
+        on_finding: Optional[Callable[[str, str], None]] = None,
+    ) -> ReconcileStorageOutput:
+        """Diff storage against the database, deleting old orphaned objects unless dry_run."""
+        output = ReconcileStorageOutput()
+        report = on_finding or (lambda kind, path: None)
+        cutoff = datetime.now(UTC) - input_data.min_object_age
+        pending_deletes: List[str] = []
+
+        objects = aiter(self._storage_service.iter_objects(input_data.key_prefix))
+        rows = aiter(
+            self._video_repository.iter_file_paths(
+                self._storage_service.storage_path(input_data.key_prefix),
+                batch_size=input_data.row_batch_size,
+            )
+        )
+        obj = await anext(objects, None)
+        row = await anext(rows, None)
+
+        while obj is not None or row is not None:
+            if row is None or (obj is not None and obj.path < row):
+                output.scanned_objects += 1
+                if obj.last_modified <= cutoff:
+                    output.orphaned_objects += 1
+                    report(ORPHANED_OBJECT, obj.path)
+                    if not input_data.dry_run:
+                        pending_deletes.append(obj.path)
+                        if len(pending_deletes) >= input_data.delete_batch_size:
+                            await self._flush_deletes(pending_deletes, output)
+                obj = await anext(objects, None)
+            elif obj is None or row < obj.path:
+                output.scanned_rows += 1
+                output.dangling_rows += 1
+                report(DANGLING_ROW, row)
+                row = await anext(rows, None)
+            else:
+                matched = row
+                output.scanned_objects += 1
+                obj = await anext(objects, None)
+                while row == matched:
+                    output.scanned_rows += 1
+                    row = await anext(rows, None)
+
+        await self._flush_deletes(pending_deletes, output)
+        return output
+
+    async def _flush_deletes(self, paths: List[str], output: ReconcileStorageOutput) -> None:
+        if not paths:
+            return
+        failed = await self._storage_service.delete_files(list(paths))
+        output.failed_deletions += len(failed)
+        output.deleted_objects += len(paths) - len(failed)
+        paths.clear()
@@ -0,0 +1,26 @@
+"""Repair Usage Use Case."""
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from video_service.application.ports.output.repositories.video_repository import IVideoRepository, UsageRepairBatch
+
+
+@dataclass
+class RepairUsageInput:
+    after_user_id: Optional[UUID] = None
+    batch_size: int = 500
+
+
+class RepairUsageUseCase:
+    """Use Case: Reconcile one batch of per-user usage aggregates with the videos table.
+
+    Callers walk all users by passing each batch's ``last_user_id`` to the next
+    call, running every batch in its own transaction.
+    """
+
+    def __init__(self, video_repository: IVideoRepository):
+        self._video_repository = video_repository
+
+    async def execute(self, input_data: RepairUsageInput) -> UsageRepairBatch:
+        return await self._video_repository.repair_usage(input_data.after_user_id, input_data.batch_size)
@@ -1,13 +1,22 @@
 """Upload Video Use Case."""
+from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime
-from typing import BinaryIO
-from uuid import UUID, uuid4
+from typing import BinaryIO, Optional
+from uuid import UUID
 
+from video_service.domain.entities.storage_quota import StorageQuota
 from video_service.domain.entities.video import Video
+from video_service.domain.exceptions import QuotaExceededError
 from video_service.application.ports.output.repositories.video_repository import IVideoRepository
+from video_service.application.ports.output.storage_key_layout import IStorageKeyLayout
 from video_service.application.ports.output.storage_service import IStorageService
 from video_service.application.ports.output.event_publisher import IEventPublisher
+from video_service.application.ports.output.video_change_notifier import (
+    VIDEO_UPLOADED,
+    IVideoChangeNotifier,
+    VideoChange,
+)
 
 from video_processor_shared.domain.events import VideoUploadedEvent
 from video_processor_shared.domain.exceptions import InvalidVideoFormatError, VideoTooLargeError
@@ -20,6 +29,8 @@ class UploadVideoInput:
     file: BinaryIO
     file_size: int
     content_type: str
+    # Where the client is, e.g. a region name; storage may use it to pick a nearby bucket.
+    region: Optional[str] = None
 
 
 @dataclass
@@ -31,6 +42,33 @@ class VideoOutput:
     file_size: int
     format: str
     created_at: datetime
+    version: int = 1
+    status: str = Video.STATUS_UPLOADED
+    progress: int = 0
+
+
+def validate_upload(filename: str, file_size: int) -> str:
+    """Check the format and size of an upload; returns its format."""
+    file_format = filename.rsplit('.', 1)[-1].lower()
+    if file_format not in Video.ALLOWED_FORMATS:
+        raise InvalidVideoFormatError(f"Format {file_format} not supported")
+
+    max_size = Video.MAX_SIZE_MB * 1024 * 1024
+    if file_size > max_size:
+        raise VideoTooLargeError(f"File exceeds {Video.MAX_SIZE_MB}MB limit")
+    return file_format
+
+
+async def check_quota(
+    video_repository: IVideoRepository,
+    quota: Optional[StorageQuota],
+    user_id: UUID,
+    file_size: int,
+) -> None:
+    """Early rejection before anything is staged or stored; ``save`` enforces the quota atomically."""
+    if quota is not None and not quota.is_unlimited:
+        usage = await video_repository.get_usage(user_id)
+        quota.check(usage.video_count, usage.total_bytes, file_size)
 
 
 class UploadVideoUseCase:
@@ -41,32 +79,34 @@ class UploadVideoUseCase:
         video_repository: IVideoRepository,
         storage_service: IStorageService,
         event_publisher: IEventPublisher,
+        key_layout: IStorageKeyLayout,
+        change_notifier: Optional[IVideoChangeNotifier] = None,
+        quota: Optional[StorageQuota] = None,
     ):
         self._video_repository = video_repository
         self._storage_service = storage_service
         self._event_publisher = event_publisher
+        self._change_notifier = change_notifier
+        self._quota = quota
+        self._key_layout = key_layout
 
     async def execute(self, input_data: UploadVideoInput) -> VideoOutput:
         """Execute video upload."""
-        # Validate format
-        file_format = input_data.filename.rsplit('.', 1)[-1].lower()
-        if file_format not in Video.ALLOWED_FORMATS:
-            raise InvalidVideoFormatError(f"Format {file_format} not supported")
+        file_format = validate_upload(input_data.filename, input_data.file_size)
 
-        # Validate size
-        max_size = Video.MAX_SIZE_MB * 1024 * 1024
-        if input_data.file_size > max_size:
-            raise VideoTooLargeError(f"File exceeds {Video.MAX_SIZE_MB}MB limit")
+        # Validate quota before anything is sent to storage
+        await check_quota(self._video_repository, self._quota, input_data.user_id, input_data.file_size)
 
         # Generate storage path
-        video_id = uuid4()
-        storage_key = f"videos/{input_data.user_id}/{video_id}.{file_format}"
+        video_id = Video.new_id()
+        storage_key = self._key_layout.key_for(input_data.user_id, video_id, file_format)
 
         # Upload to storage
         file_path = await self._storage_service.upload_file(
             file=input_data.file,
             key=storage_key,
             content_type=input_data.content_type,
+            region=input_data.region,
         )
 
         # Create entity
@@ -77,10 +117,19 @@ class UploadVideoUseCase:
             file_path=file_path,
             file_size=input_data.file_size,
             format=file_format,
+            created_at=Video.id_timestamp(video_id),
         )
 
-        # Persist
-        saved_video = await self._video_repository.save(video)
+        # Persist and commit before any other call: save locks the user's stats row
+        # until commit, and other uploads and status updates of the user wait on it.
+        try:
+            saved_video = await self._video_repository.save(video, quota=self._quota)
+        except QuotaExceededError:
+            # A concurrent upload took the remaining quota: the stored file has no row.
+            with suppress(Exception):
+                await self._storage_service.delete_file(file_path)
+            raise
+        await self._video_repository.commit()
 
         # Publish event
         event = VideoUploadedEvent(
@@ -91,6 +140,11 @@ class UploadVideoUseCase:
         )
         await self._event_publisher.publish(event)
 
+        if self._change_notifier is not None:
+            await self._change_notifier.notify(
+                [VideoChange(saved_video.user_id, saved_video.id, VIDEO_UPLOADED, saved_video.status, saved_video.progress)]
+            )
+
         return VideoOutput(
             id=saved_video.id,
             user_id=saved_video.user_id,
@@ -99,4 +153,7 @@ class UploadVideoUseCase:
             file_size=saved_video.file_size,
             format=saved_video.format,
             created_at=saved_video.created_at,
+            version=saved_video.version,
+            status=saved_video.status,
+            progress=saved_video.progress,
         )
@@ -1,4 +1,5 @@
 """Domain Entities."""
 from video_service.domain.entities.video import Video
+from video_service.domain.entities.storage_quota import StorageQuota
 
-__all__ = ["Video"]
+__all__ = ["Video", "StorageQuota"]
@@ -0,0 +1,23 @@
+"""Storage Quota Value Object."""
+from dataclasses import dataclass
+
+from video_service.domain.exceptions import QuotaExceededError
+
+
+@dataclass(frozen=True)
+class StorageQuota:
+    """Per-user storage limits; 0 means unlimited."""
+
+    max_bytes: int = 0
+    max_videos: int = 0
+
+    @property
+    def is_unlimited(self) -> bool:
+        return not self.max_bytes and not self.max_videos
+
+    def check(self, video_count: int, total_bytes: int, file_size: int) -> None:
+        """Raise QuotaExceededError when one more video of file_size bytes would not fit."""
+        if self.max_videos and video_count + 1 > self.max_videos:
+            raise QuotaExceededError(f"Video quota of {self.max_videos} videos reached")
+        if self.max_bytes and total_bytes + file_size > self.max_bytes:
+            raise QuotaExceededError(f"Storage quota of {self.max_bytes} bytes exceeded")
@@ -1,8 +1,12 @@
 """Video Entity."""
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+import os
 from typing import Optional
 from uuid import UUID
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MILLISECOND = timedelta(milliseconds=1)
+
 
 class Video:
     """Video Entity - Represents an uploaded video."""
@@ -10,6 +14,16 @@ class Video:
     ALLOWED_FORMATS = ['mp4', 'avi', 'mov', 'mkv', 'webm']
     MAX_SIZE_MB = 500
 
+    # Accepted and staged by the API, not in storage yet (asynchronous uploads).
+    STATUS_PENDING = 'pending'
+    STATUS_UPLOADED = 'uploaded'
+    STATUS_PROCESSING = 'processing'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    # Processing only moves forward: a status never goes back to a lower rank.
+    STATUS_RANKS = {STATUS_PENDING: -1, STATUS_UPLOADED: 0, STATUS_PROCESSING: 1, STATUS_COMPLETED: 2, STATUS_FAILED: 2}
+    TERMINAL_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
     def __init__(
         self,
         id: UUID,
@@ -19,7 +33,10 @@ class Video:
         file_size: int,
         format: str,
         duration: Optional[float] = None,
-        created_at: Optional[datetime] = None
+        created_at: Optional[datetime] = None,
+        version: int = 1,
+        status: str = STATUS_UPLOADED,
+        progress: int = 0,
     ):
         self.id = id
         self.user_id = user_id
@@ -29,6 +46,28 @@ class Video:
         self.format = format.lower()
         self.duration = duration
         self.created_at = created_at or datetime.now(UTC)
+        self.version = version
+        self.status = status
+        self.progress = progress
+
+    @staticmethod
+    def new_id(at: Optional[datetime] = None) -> UUID:
+        """Time-ordered id (UUIDv7) embedding ``at``, by default now, to the millisecond.
+
+        New videos take ``created_at`` from their id (``id_timestamp``), so the
+        creation time can be recovered from the id alone.
+        """
+        millis = ((at or datetime.now(UTC)) - _EPOCH) // _MILLISECOND
+        rand_a, rand_b = divmod(int.from_bytes(os.urandom(10), "big") >> 6, 1 << 62)
+        rand_a &= 0xFFF
+        return UUID(int=(millis << 80) | (0x7 << 76) | (rand_a << 64) | (0b10 << 62) | rand_b)
+
+    @staticmethod
+    def id_timestamp(video_id: UUID) -> Optional[datetime]:
+        """Creation time embedded in an id made by ``new_id``; None for other (random) ids."""
+        if video_id.version != 7:
+            return None
+        return _EPOCH + (video_id.int >> 80) * _MILLISECOND
 
     @property
     def file_size_mb(self) -> float:
@@ -42,6 +81,10 @@ class Video:
     def is_valid_size(self) -> bool:
         return self.file_size_mb <= self.MAX_SIZE_MB
 
+    @property
+    def is_processed(self) -> bool:
+        return self.status in self.TERMINAL_STATUSES
+
     def set_duration(self, duration: float) -> None:
         self.duration = duration
 
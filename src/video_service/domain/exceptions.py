@@ -0,0 +1,5 @@
+"""Video Service Domain Exceptions."""
+
+
+class QuotaExceededError(Exception):
+    """Storing the video would take the user over their storage quota."""
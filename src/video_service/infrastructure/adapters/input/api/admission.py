@@ -0,0 +1,233 @@
+"""Upload admission control.
+
+Uploads are admitted against per-pod budgets of in-flight bytes and
+concurrent uploads *before* the multipart body is read, so an overload burst
+never reaches spool disk, memory or S3 bandwidth. Requests over budget wait in
+a bounded FIFO queue for a short time and are otherwise rejected with ``429``
+and a ``Retry-After`` estimated from recent upload durations.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from video_service.domain.entities.video import Video
+from video_service.infrastructure.config import Settings
+
+INFLIGHT_BYTES = Gauge("video_upload_admission_inflight_bytes", "Declared bytes of uploads currently admitted")
+INFLIGHT_UPLOADS = Gauge("video_upload_admission_inflight_uploads", "Uploads currently admitted")
+QUEUE_DEPTH = Gauge("video_upload_admission_queue_depth", "Uploads waiting for admission")
+REJECTIONS = Counter("video_upload_admission_rejections_total", "Uploads rejected with 429", ["reason"])
+QUEUE_WAIT = Histogram("video_upload_admission_queue_wait_seconds", "Time uploads spent waiting for admission")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class UploadAdmissionController:
+    """Per-pod budget of in-flight upload bytes and concurrent uploads."""
+
+    EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        max_inflight_bytes: int,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        max_retry_after: int = 60,
+    ):
+        self._max_inflight_bytes = max_inflight_bytes
+        self._max_concurrent = max_concurrent
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._max_retry_after = max_retry_after
+        self._inflight_bytes = 0
+        self._inflight = 0
+        self._queued_bytes = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._avg_duration: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "UploadAdmissionController":
+        return cls(
+            max_inflight_bytes=settings.UPLOAD_MAX_INFLIGHT_BYTES,
+            max_concurrent=settings.UPLOAD_MAX_CONCURRENT,
+            max_queue=settings.UPLOAD_MAX_QUEUE,
+            queue_timeout=settings.UPLOAD_QUEUE_TIMEOUT_SECONDS,
+            max_retry_after=settings.UPLOAD_RETRY_AFTER_MAX_SECONDS,
+        )
+
+    @property
+    def inflight_bytes(self) -> int:
+        return self._inflight_bytes
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, nbytes: int) -> None:
+        """Admit an upload of ``nbytes``, waiting in the queue if needed; raise AdmissionRejected otherwise."""
+        if not self._waiters and self._fits(nbytes):
+            self._admit(nbytes)
+            return
+        if len(self._waiters) >= self._max_queue:
+            raise self._reject("queue_full", nbytes)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (nbytes, future)
+        self._waiters.append(entry)
+        self._queued_bytes += nbytes
+        QUEUE_DEPTH.set(len(self._waiters))
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self._queue_timeout)
+        except asyncio.TimeoutError:
+            self._dequeue(entry)
+            raise self._reject("queue_timeout", nbytes)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted in the same tick the client went away: give the slot back.
+                self.release(nbytes)
+            else:
+                self._dequeue(entry)
+            raise
+        finally:
+            QUEUE_WAIT.observe(time.monotonic() - started)
+
+    def release(self, nbytes: int, duration: Optional[float] = None) -> None:
+        self._inflight -= 1
+        self._inflight_bytes -= nbytes
+        if duration is not None:
+            if self._avg_duration is None:
+                self._avg_duration = duration
+            else:
+                self._avg_duration += self.EWMA_ALPHA * (duration - self._avg_duration)
+        self._update_gauges()
+        self._wake()
+
+    def retry_after(self, nbytes: int) -> int:
+        """Seconds until roughly enough uploads have drained for this one to fit.
+
+        Each "wave" of admitted uploads takes about the recent average upload
+        duration and frees either all concurrency slots or the whole byte budget.
+        """
+        if self._avg_duration is None:
+            return 1
+        by_count = (len(self._waiters) + 1) / self._max_concurrent
+        excess_bytes = self._inflight_bytes + self._queued_bytes + nbytes - self._max_inflight_bytes
+        by_bytes = max(excess_bytes, 0) / self._max_inflight_bytes
+        seconds = self._avg_duration * max(by_count, by_bytes)
+        return max(1, min(self._max_retry_after, math.ceil(seconds)))
+
+    def _fits(self, nbytes: int) -> bool:
+        if self._inflight >= self._max_concurrent:
+            return False
+        # A single upload larger than the whole budget is still admitted when the pod is idle.
+        return self._inflight == 0 or self._inflight_bytes + nbytes <= self._max_inflight_bytes
+
+    def _admit(self, nbytes: int) -> None:
+        self._inflight += 1
+        self._inflight_bytes += nbytes
+        self._update_gauges()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            nbytes, future = self._waiters[0]
+            if not future.done() and not self._fits(nbytes):
+                break
+            self._waiters.popleft()
+            self._queued_bytes -= nbytes
+            if not future.done():
+                self._admit(nbytes)
+                future.set_result(None)
+        QUEUE_DEPTH.set(len(self._waiters))
+
+    def _dequeue(self, entry: Tuple[int, asyncio.Future]) -> None:
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        self._queued_bytes -= entry[0]
+        # The leaving request may have been the head blocking smaller ones behind it.
+        self._wake()
+
+    def _reject(self, reason: str, nbytes: int) -> AdmissionRejected:
+        REJECTIONS.labels(reason=reason).inc()
+        return AdmissionRejected(reason, self.retry_after(nbytes))
+
+    def _update_gauges(self) -> None:
+        INFLIGHT_BYTES.set(self._inflight_bytes)
+        INFLIGHT_UPLOADS.set(self._inflight)
+
+
+class UploadAdmissionMiddleware:
+    """ASGI middleware applying an UploadAdmissionController to upload requests."""
+
+    def __init__(
+        self,
+        app,
+        controller: UploadAdmissionController,
+        path: str = "/videos/upload",
+        default_request_bytes: int = Video.MAX_SIZE_MB * 1024 * 1024,
+    ):
+        self.app = app
+        self.controller = controller
+        self.path = path
+        self.default_request_bytes = default_request_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        nbytes = self._declared_bytes(scope)
+        try:
+            await self.controller.acquire(nbytes)
+        except AdmissionRejected as exc:
+            await self._send_rejection(send, exc)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(nbytes, time.monotonic() - started)
+
+    def _declared_bytes(self, scope) -> int:
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    return max(int(value), 0)
+                except ValueError:
+                    break
+        # Chunked bodies are budgeted as a maximum-size upload.
+        return self.default_request_bytes
+
+    @staticmethod
+    async def _send_rejection(send, exc: AdmissionRejected) -> None:
+        body = json.dumps({"detail": "Upload capacity exhausted, retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(exc.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
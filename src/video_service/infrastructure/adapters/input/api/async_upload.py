@@ -0,0 +1,273 @@
+"""Asynchronous uploads: accept now, transfer to storage in the background.
+
+With ``UPLOAD_ASYNC_ENABLED``, an upload sent with ``Prefer: respond-async`` is
+staged in ``UPLOAD_STAGING_DIR`` and saved as a ``pending`` video, and the
+request answers 202 without waiting for S3 or SNS. ``UploadTransferPool`` then
+moves each accepted upload to storage with ``UPLOAD_ASYNC_WORKERS`` workers,
+retrying failures with exponential backoff from ``UPLOAD_ASYNC_RETRY_SECONDS``.
+After ``UPLOAD_ASYNC_MAX_ATTEMPTS`` the video is marked ``failed``. Clients
+follow the status with ``GET /videos/{id}`` or the event stream.
+
+Acceptance commits in its own session before the transfer is queued, so a
+worker never looks for a video not yet visible. The staged file is discarded
+only after the status change is committed. On startup the pool queues every
+upload left in staging: those whose video is gone or no longer pending are
+discarded, the others transferred. With more than
+``UPLOAD_ASYNC_MAX_PENDING`` uploads accepted and not yet transferred, new
+asynchronous uploads are refused with 503.
+
+The staging directory is per pod and must outlive it (see ``local_staging``).
+Its files can still be lost, with the claim of a pod scaled away for good or
+a broken disk, so every pod periodically marks ``failed`` the videos pending
+for more than ``UPLOAD_ASYNC_ABANDONED_MINUTES`` that it is not transferring
+itself. That must be longer than any transfer with its retries, plus the time
+a pod may stay down before it resumes its staged uploads.
+"""
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import logging
+from typing import AsyncContextManager, AsyncIterator, Callable, Optional, Set
+from uuid import UUID
+
+from prometheus_client import Counter, Gauge
+
+from video_service.application.ports.output.upload_staging import IUploadStaging, StagedUpload
+from video_service.application.use_cases import AcceptVideoUploadUseCase, CompleteVideoUploadUseCase
+from video_service.application.use_cases.upload_video import UploadVideoInput, VideoOutput
+from video_service.domain.entities.storage_quota import StorageQuota
+from video_service.infrastructure.adapters.input.api import dependencies
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.tracing import trace_use_case
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_PENDING = Gauge("video_async_uploads_pending", "Accepted uploads not yet transferred to storage")
+TRANSFERS = Counter("video_async_upload_transfers_total", "Background upload transfer attempts", ["outcome"])
+
+
+@dataclass
+class UploadUseCases:
+    accept: AcceptVideoUploadUseCase
+    complete: CompleteVideoUploadUseCase
+
+
+UseCasesFactory = Callable[[], AsyncContextManager[UploadUseCases]]
+
+
+class UploadTransferPool:
+    """Bounded pool of workers moving accepted uploads from staging to storage."""
+
+    def __init__(
+        self,
+        staging: IUploadStaging,
+        use_cases: UseCasesFactory,
+        workers: int = 4,
+        max_pending: int = 100,
+        max_attempts: int = 5,
+        retry_seconds: float = 2.0,
+        abandoned_after: float = 0,
+        sweep_seconds: float = 60.0,
+    ):
+        self._staging = staging
+        self._use_cases = use_cases
+        self._workers = workers
+        self._max_pending = max_pending
+        self._max_attempts = max_attempts
+        self._retry_seconds = retry_seconds
+        self._abandoned_after = abandoned_after
+        self._sweep_seconds = sweep_seconds
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._pending: Set[UUID] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def retry_after(self) -> float:
+        return self._retry_seconds
+
+    def has_capacity(self, count: int = 1) -> bool:
+        return self.pending + count <= self._max_pending
+
+    async def start(self) -> int:
+        """Queue the uploads left in staging and start the workers; returns how many were recovered."""
+        recovered = await self._staging.list_staged()
+        for upload in recovered:
+            self.submit(upload)
+        if recovered:
+            logger.info("Recovered %d staged uploads", len(recovered))
+        for _ in range(self._workers):
+            self._spawn(self._work())
+        if self._abandoned_after:
+            self._spawn(self._sweep_abandoned())
+        return len(recovered)
+
+    async def stop(self) -> None:
+        """Stop the workers; uploads not yet transferred stay staged for the next start."""
+        tasks = list(self._tasks)
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def accept(self, input_data: UploadVideoInput) -> VideoOutput:
+        """Stage and save the upload as a pending video, then queue its transfer."""
+        accepted = None
+        try:
+            async with self._use_cases() as use_cases:
+                accepted = await use_cases.accept.execute(input_data)
+        except Exception:
+            # Saved but not committed: nothing refers to the staged file.
+            if accepted is not None:
+                await self._staging.discard(accepted.upload.video_id)
+            raise
+        self.submit(accepted.upload)
+        return accepted.video
+
+    def submit(self, upload: StagedUpload) -> None:
+        if upload.video_id in self._pending:
+            return
+        self._pending.add(upload.video_id)
+        UPLOADS_PENDING.set(len(self._pending))
+        self._queue.put_nowait((upload, 1))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _work(self) -> None:
+        while True:
+            upload, attempt = await self._queue.get()
+            try:
+                await self._transfer(upload, attempt)
+            except Exception:
+                logger.exception("Could not finish upload %s", upload.video_id)
+                self._done(upload)
+            finally:
+                self._queue.task_done()
+
+    async def _transfer(self, upload: StagedUpload, attempt: int) -> None:
+        try:
+            async with self._use_cases() as use_cases:
+                transferred = await use_cases.complete.execute(upload)
+        except Exception:
+            if attempt < self._max_attempts:
+                delay = self._retry_seconds * 2 ** (attempt - 1)
+                logger.warning(
+                    "Transfer of upload %s failed (attempt %d), retrying in %.1fs",
+                    upload.video_id, attempt, delay, exc_info=True,
+                )
+                TRANSFERS.labels(outcome="retried").inc()
+                self._spawn(self._retry_later(upload, attempt + 1, delay))
+                return
+            logger.exception("Giving up on upload %s after %d attempts", upload.video_id, attempt)
+            TRANSFERS.labels(outcome="failed").inc()
+            async with self._use_cases() as use_cases:
+                await use_cases.complete.fail(upload)
+        else:
+            TRANSFERS.labels(outcome="completed" if transferred else "skipped").inc()
+        await self._staging.discard(upload.video_id)
+        self._done(upload)
+
+    async def _sweep_abandoned(self) -> None:
+        """Fail pending videos older than ``abandoned_after`` that are not staged here."""
+        while True:
+            await asyncio.sleep(self._sweep_seconds)
+            created_before = datetime.now(UTC) - timedelta(seconds=self._abandoned_after)
+            try:
+                async with self._use_cases() as use_cases:
+                    failed = await use_cases.complete.fail_abandoned(created_before, keep=set(self._pending))
+            except Exception:
+                logger.warning("Could not sweep abandoned uploads", exc_info=True)
+                continue
+            if failed:
+                logger.warning("Marked %d abandoned uploads failed", failed)
+                TRANSFERS.labels(outcome="abandoned").inc(failed)
+
+    async def _retry_later(self, upload: StagedUpload, attempt: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._queue.put_nowait((upload, attempt))
+
+    def _done(self, upload: StagedUpload) -> None:
+        self._pending.discard(upload.video_id)
+        UPLOADS_PENDING.set(len(self._pending))
+
+
+def session_use_cases(settings: Settings, staging: IUploadStaging) -> UseCasesFactory:
+    """Use cases on a new database session per transfer, committed when the block exits."""
+
+    @asynccontextmanager
+    async def factory() -> AsyncIterator[UploadUseCases]:
+        from video_service.infrastructure.adapters.output.persistence.database import session_scope
+        from video_service.infrastructure.adapters.output.persistence.repositories import SQLAlchemyVideoRepository
+
+        storage = await dependencies.get_storage_service(settings, dependencies.get_storage_circuit_breaker())
+        # Not deferred: a publish that fails must fail the transfer, so it is retried.
+        publisher = dependencies.get_sns_publisher(settings)
+        async with session_scope() as session:
+            repository = SQLAlchemyVideoRepository(session)
+            yield UploadUseCases(
+                accept=trace_use_case(
+                    AcceptVideoUploadUseCase(
+                        repository,
+                        storage,
+                        staging,
+                        quota=StorageQuota(max_bytes=settings.USER_QUOTA_BYTES, max_videos=settings.USER_QUOTA_VIDEOS),
+                        key_layout=dependencies.get_storage_key_layout(),
+                    )
+                ),
+                complete=trace_use_case(
+                    CompleteVideoUploadUseCase(
+                        repository,
+                        storage,
+                        publisher,
+                        staging,
+                        change_notifier=dependencies.get_change_notifier(),
+                    )
+                ),
+            )
+
+    return factory
+
+
+# Set up by the app lifespan when UPLOAD_ASYNC_ENABLED; None otherwise.
+_pool: Optional[UploadTransferPool] = None
+
+
+def get_upload_pool() -> Optional[UploadTransferPool]:
+    return _pool
+
+
+async def start_async_uploads(settings: Settings) -> Optional[UploadTransferPool]:
+    global _pool
+    if not settings.UPLOAD_ASYNC_ENABLED:
+        return None
+    from video_service.infrastructure.adapters.output.storage.local_staging import LocalUploadStaging
+
+    staging = LocalUploadStaging(settings.UPLOAD_STAGING_DIR)
+    pool = UploadTransferPool(
+        staging,
+        session_use_cases(settings, staging),
+        workers=settings.UPLOAD_ASYNC_WORKERS,
+        max_pending=settings.UPLOAD_ASYNC_MAX_PENDING,
+        max_attempts=settings.UPLOAD_ASYNC_MAX_ATTEMPTS,
+        retry_seconds=settings.UPLOAD_ASYNC_RETRY_SECONDS,
+        abandoned_after=settings.UPLOAD_ASYNC_ABANDONED_MINUTES * 60,
+    )
+    await pool.start()
+    _pool = pool
+    return pool
+
+
+async def stop_async_uploads() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.stop()
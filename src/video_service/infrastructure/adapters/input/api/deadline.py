@@ -0,0 +1,107 @@
+"""Request deadline middleware.
+
+Each request gets a time budget: the per-route value from
+``REQUEST_DEADLINE_ROUTES`` (keyed by ``"METHOD /path/template"``) or
+``REQUEST_DEADLINE_SECONDS``, shortened (never extended) by the client's
+``X-Request-Timeout`` header in seconds. Adapters bound their calls by what
+is left of it (``resilience.deadline_scope``) and raise DeadlineExceededError,
+answered with ``504``. As a backstop the middleware cancels a request that
+has not started its response shortly after the deadline.
+"""
+import asyncio
+import json
+import math
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from starlette.routing import compile_path
+
+from video_service.infrastructure.resilience import reset_deadline, set_deadline
+from video_service.infrastructure.resilience.deadline import DEADLINE_EXCEEDED
+
+DEADLINE_HEADER = "X-Request-Timeout"
+_DEADLINE_HEADER_KEY = DEADLINE_HEADER.lower().encode()
+
+
+class DeadlineMiddleware:
+    """ASGI middleware setting the request deadline and enforcing it as a backstop."""
+
+    # Stage timeouts fire first and report which dependency ran out of time.
+    GRACE_SECONDS = 0.1
+
+    def __init__(self, app, default_budget: float, route_budgets: Optional[Dict[str, float]] = None):
+        self.app = app
+        self.default_budget = default_budget
+        self._routes = self._compile(route_budgets or {})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = self._budget(scope)
+        token = set_deadline(budget)
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                # Streaming bodies are not cut off once the response is under way.
+                timeout.reschedule(None)
+            await send(message)
+
+        try:
+            async with asyncio.timeout(budget + self.GRACE_SECONDS) as timeout:
+                await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            if not timeout.expired() or response_started:
+                raise
+            DEADLINE_EXCEEDED.labels(stage="request").inc()
+            await send_deadline_exceeded(send)
+        finally:
+            reset_deadline(token)
+
+    def _budget(self, scope) -> float:
+        budget = self._route_budget(scope["method"], scope["path"])
+        for name, value in scope.get("headers", []):
+            if name == _DEADLINE_HEADER_KEY:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if math.isfinite(requested) and requested > 0:
+                    budget = min(budget, requested)
+                break
+        return budget
+
+    def _route_budget(self, method: str, path: str) -> float:
+        for route_method, regex, budget in self._routes:
+            if route_method == method and regex.match(path):
+                return budget
+        return self.default_budget
+
+    @staticmethod
+    def _compile(route_budgets: Dict[str, float]) -> List[Tuple[str, Pattern, float]]:
+        routes = []
+        for key, budget in route_budgets.items():
+            method, path = key.split(" ", 1)
+            regex, _, convertors = compile_path(path.strip())
+            routes.append((len(convertors), method.upper(), regex, budget))
+        # Literal paths win over templates, as "/videos/events" over "/videos/{video_id}".
+        routes.sort(key=lambda route: route[0])
+        return [(method, regex, budget) for _, method, regex, budget in routes]
+
+
+async def send_deadline_exceeded(send) -> None:
+    body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
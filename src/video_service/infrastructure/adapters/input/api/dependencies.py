@@ -1,60 +1,209 @@
 """API Dependencies."""
-from typing import Annotated
+from contextlib import asynccontextmanager, nullcontext
+from functools import lru_cache
+import math
+from typing import Annotated, Any, Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import httpx
 
 from video_service.infrastructure.config import get_settings, Settings
 from video_service.application.ports.output.repositories import IVideoRepository
+from video_service.application.ports.output.storage_key_layout import IStorageKeyLayout
 from video_service.application.ports.output.storage_service import IStorageService
 from video_service.application.ports.output.event_publisher import IEventPublisher
-from video_service.infrastructure.adapters.output.persistence.repositories import SQLAlchemyVideoRepository
-from video_service.infrastructure.adapters.output.persistence.database import get_db
+from video_service.application.ports.output.video_change_notifier import IVideoChangeNotifier
+from video_service.domain.entities.storage_quota import StorageQuota
+from video_service.infrastructure.adapters.output.aws_clients import get_aws_clients
+from video_service.infrastructure.adapters.output.storage.key_layouts import key_layout_from_settings
+from video_service.infrastructure.adapters.output.storage.multi_region import MultiRegionStorageService
 from video_service.infrastructure.adapters.output.storage.s3_storage import S3StorageService
+from video_service.infrastructure.adapters.output.messaging.codecs import MessageEncoder
 from video_service.infrastructure.adapters.output.messaging.sns_publisher import SNSEventPublisher
+from video_service.infrastructure.adapters.output.messaging.deferred_publisher import (
+    DeferredEventPublisher,
+    EventBacklog,
+)
+from video_service.infrastructure.adapters.output.messaging.redis_change_notifier import RedisVideoChangeNotifier
+from video_service.infrastructure.adapters.input.api import event_stream
+from video_service.infrastructure.adapters.input.api.readiness import get_auth_client
+from video_service.infrastructure.lazy_import import lazy_import
+from video_service.infrastructure.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    deadline_scope,
+    get_circuit_breaker,
+    remaining,
+)
+from video_service.infrastructure.adapters.input.api.deadline import DEADLINE_HEADER
+from video_service.infrastructure.tracing import inject_headers, span
+
+httpx = lazy_import("httpx")
 
 security = HTTPBearer()
 
 
+async def get_db():
+    # SQLAlchemy is imported on the first request, not when the app module is imported.
+    from video_service.infrastructure.adapters.output.persistence import database
+
+    # Entered as a context manager so request errors reach it and roll back.
+    async with asynccontextmanager(database.get_db)() as session:
+        yield session
+
+
 async def get_video_repository(db=Depends(get_db)) -> IVideoRepository:
+    from video_service.infrastructure.adapters.output.persistence.repositories import SQLAlchemyVideoRepository
+
     return SQLAlchemyVideoRepository(db)
 
 
-async def get_storage_service(
+def get_storage_quota(settings: Annotated[Settings, Depends(get_settings)]) -> StorageQuota:
+    return StorageQuota(max_bytes=settings.USER_QUOTA_BYTES, max_videos=settings.USER_QUOTA_VIDEOS)
+
+
+def get_storage_circuit_breaker() -> Optional[CircuitBreaker]:
+    return get_circuit_breaker("s3")
+
+
+def get_auth_circuit_breaker(
     settings: Annotated[Settings, Depends(get_settings)]
+) -> Optional[CircuitBreaker]:
+    return get_circuit_breaker("auth", slow_call_seconds=settings.AUTH_SLOW_CALL_SECONDS)
+
+
+@lru_cache()
+def get_event_backlog() -> Optional[EventBacklog]:
+    settings = get_settings()
+    breaker = get_circuit_breaker("sns", slow_call_seconds=settings.SNS_SLOW_CALL_SECONDS)
+    if breaker is None:
+        return None
+    return EventBacklog(breaker, max_size=settings.EVENT_BACKLOG_MAX_SIZE)
+
+
+@lru_cache()
+def get_storage_key_layout() -> IStorageKeyLayout:
+    return key_layout_from_settings(get_settings())
+
+
+def get_region_hint(request: Request, settings: Annotated[Settings, Depends(get_settings)]) -> Optional[str]:
+    return request.headers.get(settings.STORAGE_REGION_HINT_HEADER) or None
+
+
+async def get_storage_service(
+    settings: Annotated[Settings, Depends(get_settings)],
+    circuit_breaker: Annotated[Optional[CircuitBreaker], Depends(get_storage_circuit_breaker)] = None,
 ) -> IStorageService:
+    if settings.STORAGE_REGIONS:
+        return MultiRegionStorageService.from_settings(
+            settings,
+            circuit_breaker=circuit_breaker,
+            clients=get_aws_clients(),
+            key_layout=get_storage_key_layout(),
+        )
     return S3StorageService(
         bucket=settings.S3_BUCKET,
         endpoint_url=settings.AWS_ENDPOINT_URL or None,
         region=settings.AWS_DEFAULT_REGION,
+        circuit_breaker=circuit_breaker,
+        clients=get_aws_clients(),
+        key_layout=get_storage_key_layout(),
     )
 
 
-async def get_event_publisher(
-    settings: Annotated[Settings, Depends(get_settings)]
-) -> IEventPublisher:
+@lru_cache()
+def get_message_encoder() -> MessageEncoder:
+    return MessageEncoder.from_settings(get_settings())
+
+
+def get_sns_publisher(settings: Settings) -> SNSEventPublisher:
+    """The SNS publisher itself, which raises when an event is not sent; no deferral."""
     return SNSEventPublisher(
         topic_arn=settings.SNS_TOPIC_ARN,
         endpoint_url=settings.AWS_ENDPOINT_URL or None,
         region=settings.AWS_DEFAULT_REGION,
+        clients=get_aws_clients(),
+        encoder=get_message_encoder(),
+    )
+
+
+async def get_event_publisher(
+    settings: Annotated[Settings, Depends(get_settings)],
+    backlog: Annotated[Optional[EventBacklog], Depends(get_event_backlog)] = None,
+) -> IEventPublisher:
+    publisher = get_sns_publisher(settings)
+    if backlog is None:
+        return publisher
+    return DeferredEventPublisher(publisher, backlog)
+
+
+@lru_cache()
+def get_change_notifier() -> Optional[IVideoChangeNotifier]:
+    settings = get_settings()
+    if not settings.VIDEO_EVENTS_ENABLED:
+        return None
+    return RedisVideoChangeNotifier.from_settings(settings)
+
+
+def get_event_hub(settings: Annotated[Settings, Depends(get_settings)]) -> event_stream.VideoEventHub:
+    return event_stream.get_event_hub(settings)
+
+
+def _auth_unavailable(retry_after: Optional[float] = None) -> HTTPException:
+    headers = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after else None
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Auth service unavailable",
+        headers=headers,
     )
 
 
 async def get_current_user_id(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     settings: Annotated[Settings, Depends(get_settings)],
+    circuit_breaker: Annotated[Optional[CircuitBreaker], Depends(get_auth_circuit_breaker)] = None,
+    auth_client: Annotated[Optional[Any], Depends(get_auth_client)] = None,
 ) -> UUID:
     """Validate token with auth service and return user ID."""
+    started_at = None
+    if circuit_breaker is not None:
+        try:
+            started_at = circuit_breaker.before_call()
+        except CircuitOpenError as exc:
+            raise _auth_unavailable(exc.retry_after)
+
+    headers = {"Authorization": f"Bearer {credentials.credentials}"}
+    budget = remaining()
+    if budget is not None:
+        # Let the auth service give up when we would no longer use its answer.
+        headers[DEADLINE_HEADER] = f"{budget:.3f}"
+    # The client opened at startup when there is one; it keeps its connections to the auth service.
+    client_scope = nullcontext(auth_client) if auth_client is not None else httpx.AsyncClient()
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.AUTH_SERVICE_URL}/auth/me",
-                headers={"Authorization": f"Bearer {credentials.credentials}"},
-            )
-            if response.status_code == 200:
-                return UUID(response.json()["id"])
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        async with deadline_scope("auth"), client_scope as client:
+            with span("auth.me"):
+                response = await client.get(f"{settings.AUTH_SERVICE_URL}/auth/me", headers=inject_headers(headers))
     except httpx.RequestError:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Auth service unavailable")
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
+        raise _auth_unavailable()
+    except DeadlineExceededError:
+        if circuit_breaker is not None:
+            circuit_breaker.record_deadline_exceeded(started_at)
+        raise
+    except BaseException:
+        if circuit_breaker is not None:
+            circuit_breaker.abandon()
+        raise
+
+    if response.status_code >= 500:
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
+        raise _auth_unavailable()
+    if circuit_breaker is not None:
+        circuit_breaker.record_success(started_at)
+    if response.status_code == 200:
+        return UUID(response.json()["id"])
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
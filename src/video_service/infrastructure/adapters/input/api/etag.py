@@ -0,0 +1,27 @@
+"""HTTP conditional request helpers."""
+from hashlib import blake2b
+from typing import Optional
+
+# Bump when the JSON representation of videos changes, so cached bodies are not revalidated as current.
+REPRESENTATION_VERSION = "1"
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from the values that determine a representation."""
+    digest = blake2b(
+        "|".join([REPRESENTATION_VERSION, *(str(part) for part in parts)]).encode(),
+        digest_size=12,
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+def if_none_match_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
@@ -0,0 +1,236 @@
+"""Live video events over Server-Sent Events.
+
+Each pod keeps one Redis pub/sub connection shared by all of its streams and
+subscribes to a user's channel while that user has at least one open stream.
+A reader task fans incoming messages out to small per-connection queues; a
+connection whose queue fills up (a client not reading) is closed instead of
+buffering without bound, and the client resumes with ``Last-Event-ID`` from
+the replay buffer kept in Redis (see ``redis_change_notifier``).
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from prometheus_client import Counter, Gauge
+
+from video_service.infrastructure.adapters.output.messaging.redis_change_notifier import (
+    events_channel,
+    events_stream_key,
+    redis_client_from_settings,
+)
+from video_service.infrastructure.config import Settings
+
+logger = logging.getLogger(__name__)
+
+STREAM_CONNECTIONS = Gauge("video_event_stream_connections", "Open video event streams")
+STREAM_OVERFLOWS = Counter("video_event_stream_overflows_total", "Streams closed because the client fell behind")
+
+RETRY_MILLISECONDS = 3000
+# Sent instead of a replay when events after Last-Event-ID are no longer buffered.
+RESET_EVENT = "event: reset\ndata: {}\n\n"
+
+Event = Tuple[str, str]
+
+
+class EventStreamFull(Exception):
+    pass
+
+
+class _Connection:
+    __slots__ = ("user_id", "queue", "closed")
+
+    def __init__(self, user_id: UUID, max_queued: int):
+        self.user_id = user_id
+        # One slot over the limit, so the close marker (None) always fits.
+        self.queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue(maxsize=max_queued + 1)
+        self.closed = False
+
+
+def _event_id_key(event_id: str) -> Optional[Tuple[int, int]]:
+    """Redis stream ids ("<ms>-<seq>") compare as integer pairs."""
+    ms, _, seq = event_id.partition("-")
+    try:
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+def format_event(event_id: str, data: str) -> str:
+    return f"id: {event_id}\ndata: {data}\n\n"
+
+
+class VideoEventHub:
+    def __init__(self, redis, max_connections: int = 5000, max_queued: int = 32, replay_size: int = 100):
+        self._redis = redis
+        self._max_connections = max_connections
+        self._max_queued = max_queued
+        self._replay_size = replay_size
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._connections: Dict[str, Set[_Connection]] = {}
+        self._count = 0
+
+    @property
+    def is_full(self) -> bool:
+        return self._count >= self._max_connections
+
+    async def connect(self, user_id: UUID) -> _Connection:
+        if self.is_full:
+            raise EventStreamFull()
+        connection = _Connection(user_id, self._max_queued)
+        channel = events_channel(user_id)
+        async with self._lock:
+            listeners = self._connections.get(channel)
+            if not listeners:
+                if self._pubsub is None:
+                    self._pubsub = self._redis.pubsub()
+                await self._pubsub.subscribe(channel)
+                listeners = self._connections[channel] = set()
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.get_running_loop().create_task(self._read())
+            listeners.add(connection)
+            self._count += 1
+            STREAM_CONNECTIONS.set(self._count)
+        return connection
+
+    async def disconnect(self, connection: _Connection) -> None:
+        channel = events_channel(connection.user_id)
+        async with self._lock:
+            listeners = self._connections.get(channel)
+            if not listeners or connection not in listeners:
+                return
+            listeners.discard(connection)
+            self._count -= 1
+            STREAM_CONNECTIONS.set(self._count)
+            if not listeners:
+                del self._connections[channel]
+                try:
+                    await self._pubsub.unsubscribe(channel)
+                except Exception:
+                    logger.warning("Could not unsubscribe from %s", channel, exc_info=True)
+
+    async def replay(self, user_id: UUID, last_event_id: str) -> Optional[List[Event]]:
+        """Buffered events after ``last_event_id``, or None when some of them were already dropped."""
+        last_key = _event_id_key(last_event_id)
+        if last_key is None:
+            return None
+        key = events_stream_key(user_id)
+        # MAXLEN ~ trims lazily, so the stream may hold more than replay_size entries:
+        # read from the resume point, and check separately that nothing after it was trimmed.
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xrange(key, count=1)
+            pipe.xrange(key, min=f"({last_key[0]}-{last_key[1]}", count=self._replay_size + 1)
+            oldest, entries = await pipe.execute()
+        if not oldest or _event_id_key(oldest[0][0]) > last_key or len(entries) > self._replay_size:
+            return None
+        return [(event_id, fields["data"]) for event_id, fields in entries]
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        for listeners in self._connections.values():
+            for connection in listeners:
+                self._close(connection)
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception:
+                # Events may have been missed: make every client reconnect and replay.
+                logger.warning("Video event subscription failed; closing streams", exc_info=True)
+                for listeners in self._connections.values():
+                    for connection in listeners:
+                        self._close(connection)
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            event_id, _, data = message["data"].partition("\n")
+            for connection in list(self._connections.get(message["channel"], ())):
+                if connection.closed:
+                    continue
+                if connection.queue.qsize() >= self._max_queued:
+                    STREAM_OVERFLOWS.inc()
+                    self._close(connection)
+                else:
+                    connection.queue.put_nowait((event_id, data))
+
+    @staticmethod
+    def _close(connection: _Connection) -> None:
+        if not connection.closed:
+            connection.closed = True
+            connection.queue.put_nowait(None)
+
+
+async def stream_events(
+    hub: VideoEventHub,
+    user_id: UUID,
+    last_event_id: Optional[str],
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    """SSE body: optional replay, then live events with ``:`` comment heartbeats while idle."""
+    try:
+        connection = await hub.connect(user_id)
+    except EventStreamFull:
+        return
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        last_key = None
+        if last_event_id:
+            replayed = await hub.replay(user_id, last_event_id)
+            if replayed is None:
+                yield RESET_EVENT
+            else:
+                last_key = _event_id_key(last_event_id)
+                for event_id, data in replayed:
+                    last_key = _event_id_key(event_id)
+                    yield format_event(event_id, data)
+
+        while True:
+            try:
+                item = await asyncio.wait_for(connection.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if item is None:
+                return
+            event_id, data = item
+            key = _event_id_key(event_id)
+            # Live events that the replay already delivered.
+            if last_key is not None and key is not None and key <= last_key:
+                continue
+            last_key = key
+            yield format_event(event_id, data)
+    finally:
+        await hub.disconnect(connection)
+
+
+_hub: Optional[VideoEventHub] = None
+
+
+def get_event_hub(settings: Settings) -> VideoEventHub:
+    global _hub
+    if _hub is None:
+        _hub = VideoEventHub(
+            redis_client_from_settings(settings),
+            max_connections=settings.VIDEO_EVENTS_MAX_CONNECTIONS,
+            max_queued=settings.VIDEO_EVENTS_MAX_QUEUED,
+            replay_size=settings.VIDEO_EVENTS_REPLAY_SIZE,
+        )
+    return _hub
+
+
+async def close_event_hub() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
@@ -0,0 +1,236 @@
+"""Idempotency keys for ``POST /videos/upload``.
+
+Clients retrying an upload send the same ``Idempotency-Key``; keys are scoped
+to the user and their state lives in Redis (``REDIS_URL``). The first request
+takes the key with ``SET NX`` under a lock TTL longer than the upload
+deadline, so a crashed attempt frees it. On success its response is stored
+for ``IDEMPOTENCY_TTL_SECONDS`` and replayed to duplicates with
+``Idempotent-Replayed: true``, without uploading, saving or publishing
+anything; on failure the key is released so the retry runs again, unless
+some files were already stored, in which case the error response listing
+them is stored instead. A
+duplicate arriving while the first is still running waits up to
+``IDEMPOTENCY_WAIT_SECONDS`` and then gets ``409``; a key reused for other
+files (names, sizes, types) gets ``422``.
+
+The check runs after authentication, so a retried body is still received.
+When Redis is unavailable uploads proceed unprotected rather than failing.
+"""
+from abc import ABC, abstractmethod
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from prometheus_client import Counter
+
+from video_service.infrastructure.adapters.output.messaging.redis_change_notifier import redis_client_from_settings
+from video_service.infrastructure.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENT_REQUESTS = Counter(
+    "video_idempotent_requests_total",
+    "Uploads sent with an Idempotency-Key, by outcome",
+    ["outcome"],
+)
+
+# Owner-checked update: only the request holding the lock may complete or release it.
+_FINISH_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current or cjson.decode(current)['owner'] ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] == '' then
+    redis.call('DEL', KEYS[1])
+else
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return 1
+"""
+
+
+class IdempotencyKeyReusedError(Exception):
+    pass
+
+
+class IdempotencyInProgressError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("A request with this Idempotency-Key is still in progress")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    fingerprint: str
+    # None while the first request is still running.
+    response: Optional[StoredResponse] = None
+
+
+def upload_fingerprint(files: List[Tuple[str, int, str]]) -> str:
+    """Digest of the uploaded files' (name, size, content type)."""
+    return hashlib.sha256(json.dumps(files, separators=(",", ":")).encode()).hexdigest()
+
+
+def valid_key(key: str) -> bool:
+    return 0 < len(key) <= MAX_KEY_LENGTH and key.isprintable()
+
+
+class IdempotencyStore(ABC):
+    @abstractmethod
+    async def try_lock(self, key: str, fingerprint: str, owner: str, ttl_seconds: int) -> Optional[IdempotencyRecord]:
+        """Take ``key`` for ``owner``; returns None on success, else the record already there."""
+
+    @abstractmethod
+    async def complete(self, key: str, owner: str, record: IdempotencyRecord, ttl_seconds: int) -> None:
+        pass
+
+    @abstractmethod
+    async def release(self, key: str, owner: str) -> None:
+        pass
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    def __init__(self, redis, prefix: str = "idempotency:upload"):
+        self._redis = redis
+        self._prefix = prefix
+        self._finish = redis.register_script(_FINISH_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    async def try_lock(self, key: str, fingerprint: str, owner: str, ttl_seconds: int) -> Optional[IdempotencyRecord]:
+        value = json.dumps({"owner": owner, "fingerprint": fingerprint})
+        if await self._redis.set(self._key(key), value, nx=True, ex=ttl_seconds):
+            return None
+        current = await self._redis.get(self._key(key))
+        if current is None:
+            # Freed in between; the caller tries again.
+            return IdempotencyRecord(fingerprint=fingerprint)
+        data = json.loads(current)
+        response = data.get("response")
+        return IdempotencyRecord(
+            fingerprint=data["fingerprint"],
+            response=StoredResponse(response["status_code"], response["body"]) if response else None,
+        )
+
+    async def complete(self, key: str, owner: str, record: IdempotencyRecord, ttl_seconds: int) -> None:
+        value = json.dumps(
+            {
+                "owner": owner,
+                "fingerprint": record.fingerprint,
+                "response": {"status_code": record.response.status_code, "body": record.response.body},
+            }
+        )
+        await self._finish(keys=[self._key(key)], args=[owner, value, ttl_seconds])
+
+    async def release(self, key: str, owner: str) -> None:
+        await self._finish(keys=[self._key(key)], args=[owner, "", 0])
+
+
+class IdempotencyGuard:
+    """Runs an action at most once per key, replaying its stored response to duplicates."""
+
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        lock_seconds: int = 330,
+        response_ttl_seconds: int = 86400,
+        wait_seconds: float = 5.0,
+        poll_interval: float = 0.1,
+    ):
+        self._store = store
+        self._lock_seconds = lock_seconds
+        self._response_ttl_seconds = response_ttl_seconds
+        self._wait_seconds = wait_seconds
+        self._poll_interval = poll_interval
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "IdempotencyGuard":
+        return cls(
+            RedisIdempotencyStore(redis_client_from_settings(settings)),
+            lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+            response_ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+        )
+
+    async def run(
+        self,
+        user_id: UUID,
+        key: str,
+        fingerprint: str,
+        action: Callable[[], Awaitable[StoredResponse]],
+    ) -> Tuple[StoredResponse, bool]:
+        """``(response, replayed)``; raises IdempotencyKeyReusedError or IdempotencyInProgressError."""
+        scoped_key = f"{user_id}:{key}"
+        owner = uuid4().hex
+        try:
+            existing = await self._wait_for_lock(scoped_key, fingerprint, owner)
+        except (IdempotencyKeyReusedError, IdempotencyInProgressError):
+            raise
+        except Exception:
+            IDEMPOTENT_REQUESTS.labels(outcome="store_unavailable").inc()
+            logger.warning("Idempotency store unavailable, uploading without protection", exc_info=True)
+            return await action(), False
+        if existing is not None:
+            IDEMPOTENT_REQUESTS.labels(outcome="replayed").inc()
+            return existing, True
+
+        try:
+            response = await action()
+        except BaseException:
+            await self._finish(self._store.release(scoped_key, owner))
+            raise
+        await self._finish(
+            self._store.complete(scoped_key, owner, IdempotencyRecord(fingerprint, response), self._response_ttl_seconds)
+        )
+        IDEMPOTENT_REQUESTS.labels(outcome="executed").inc()
+        return response, False
+
+    async def _wait_for_lock(self, key: str, fingerprint: str, owner: str) -> Optional[StoredResponse]:
+        """None once ``owner`` holds the key, or the stored response of a finished duplicate."""
+        deadline = time.monotonic() + self._wait_seconds
+        while True:
+            record = await self._store.try_lock(key, fingerprint, owner, self._lock_seconds)
+            if record is None:
+                return None
+            if record.fingerprint != fingerprint:
+                IDEMPOTENT_REQUESTS.labels(outcome="key_reused").inc()
+                raise IdempotencyKeyReusedError()
+            if record.response is not None:
+                return record.response
+            if time.monotonic() >= deadline:
+                IDEMPOTENT_REQUESTS.labels(outcome="in_progress").inc()
+                raise IdempotencyInProgressError(retry_after=1.0)
+            await asyncio.sleep(self._poll_interval)
+
+    @staticmethod
+    async def _finish(call: Awaitable[None]) -> None:
+        try:
+            await call
+        except Exception:
+            # The lock still expires on its own TTL.
+            logger.warning("Could not update idempotency key state", exc_info=True)
+
+
+@lru_cache()
+def get_idempotency_guard() -> Optional[IdempotencyGuard]:
+    settings = get_settings()
+    if not settings.IDEMPOTENCY_ENABLED:
+        return None
+    return IdempotencyGuard.from_settings(settings)
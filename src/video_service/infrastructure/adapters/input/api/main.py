@@ -1,20 +1,117 @@
 """FastAPI Application."""
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+from typing import Optional
+import asyncio
+import math
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from prometheus_client import make_asgi_app
 
-from video_service.infrastructure.adapters.input.api.routes import video_router, health_router
-from video_service.infrastructure.adapters.output.persistence.database import init_db
+from video_service.infrastructure.adapters.input.api.admission import (
+    UploadAdmissionController,
+    UploadAdmissionMiddleware,
+)
+from video_service.infrastructure.adapters.input.api import async_upload
+from video_service.infrastructure.adapters.input.api.deadline import DeadlineMiddleware
+from video_service.infrastructure.adapters.input.api.event_stream import close_event_hub
+from video_service.infrastructure.adapters.input.api.profiling import (
+    ProfilingMiddleware,
+    StackSampler,
+    get_profile_store,
+)
+from video_service.infrastructure.adapters.input.api.query_stats import QueryStatsMiddleware
+from video_service.infrastructure.adapters.input.api import readiness
+from video_service.infrastructure.adapters.input.api.routes import admin_router, video_router, health_router
+from video_service.infrastructure.adapters.input.api.tracing import TracingMiddleware
+from video_service.infrastructure.config import get_settings
+from video_service.infrastructure.resilience import CircuitOpenError, DeadlineExceededError
+from video_service.infrastructure.tracing import Tracer, configure_tracer
+
+
+async def init_db() -> None:
+    """Create the engine (and schema, when enabled) inside the lifespan rather than at import."""
+    from video_service.infrastructure.adapters.output.persistence import database
+
+    await database.init_db()
+
+
+async def close_db() -> None:
+    from video_service.infrastructure.adapters.output.persistence import database
+
+    await database.dispose_engine()
+
+
+async def circuit_open_handler(request: Request, exc: CircuitOpenError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"Dependency '{exc.name}' unavailable"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "Request deadline exceeded"},
+    )
+
+
+async def start_readiness() -> None:
+    """Open the shared clients and start warming up and probing dependencies in the background."""
+    await readiness.start_readiness(get_settings())
+
+
+async def stop_readiness() -> None:
+    await readiness.stop_readiness()
+
+
+async def start_async_uploads() -> None:
+    """Start the upload transfer workers, resuming uploads left in staging, when enabled."""
+    await async_upload.start_async_uploads(get_settings())
+
+
+async def stop_async_uploads() -> None:
+    await async_upload.stop_async_uploads()
+
+
+def start_results_consumer() -> Optional[asyncio.Task]:
+    """Run the processing results consumer in the background when its queue is configured."""
+    settings = get_settings()
+    if not settings.PROCESSING_RESULTS_QUEUE_URL:
+        return None
+    from video_service.infrastructure.adapters.input.messaging.processing_results_consumer import (
+        ProcessingResultsConsumer,
+    )
+
+    return asyncio.create_task(ProcessingResultsConsumer.from_settings(settings).run())
+
+
+async def stop_background_task(task: Optional[asyncio.Task]) -> None:
+    if task is None:
+        return
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await start_readiness()
+    await start_async_uploads()
+    results_consumer = start_results_consumer()
     yield
+    await stop_background_task(results_consumer)
+    await stop_async_uploads()
+    await stop_readiness()
+    await close_event_hub()
+    await close_db()
 
 
 def create_app() -> FastAPI:
+    settings = get_settings()
     app = FastAPI(
         title="Video Service",
         description="Video management microservice",
@@ -22,6 +119,7 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Each add_middleware wraps everything added before it: the last one added runs first.
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -29,9 +127,41 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.UPLOAD_ADMISSION_ENABLED:
+        app.add_middleware(
+            UploadAdmissionMiddleware,
+            controller=UploadAdmissionController.from_settings(settings),
+        )
+    if settings.REQUEST_DEADLINE_ENABLED:
+        # Wraps upload admission, so time spent queued for admission counts against the budget.
+        app.add_middleware(
+            DeadlineMiddleware,
+            default_budget=settings.REQUEST_DEADLINE_SECONDS,
+            route_budgets=settings.REQUEST_DEADLINE_ROUTES,
+        )
+    if settings.DB_QUERY_METRICS_ENABLED:
+        app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD)
+    if settings.TRACING_ENABLED:
+        tracer = Tracer.from_settings(settings)
+        configure_tracer(tracer)
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+    if settings.PROFILING_ENABLED:
+        # Added last, so it wraps every other middleware and profiles include admission and deadline handling.
+        app.add_middleware(
+            ProfilingMiddleware,
+            store=get_profile_store(),
+            sampler=StackSampler(settings.PROFILING_INTERVAL_SECONDS, settings.PROFILING_MAX_SECONDS),
+            token=settings.PROFILING_TOKEN,
+            sample_rate=settings.PROFILING_SAMPLE_RATE,
+        )
+
+    app.add_exception_handler(CircuitOpenError, circuit_open_handler)
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
 
     app.include_router(health_router)
     app.include_router(video_router, prefix="/videos", tags=["Videos"])
+    if settings.PROFILING_ENABLED:
+        app.include_router(admin_router, prefix="/admin", tags=["Admin"])
     app.mount("/metrics", make_asgi_app())
 
     return app
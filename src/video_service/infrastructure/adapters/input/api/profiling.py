@@ -0,0 +1,240 @@
+"""On-demand request profiling.
+
+Opt-in with ``PROFILING_ENABLED``; when off the middleware is not installed at
+all. A request is profiled when it sends ``X-Profile-Token`` equal to
+``PROFILING_TOKEN`` or is picked at ``PROFILING_SAMPLE_RATE``; others only pay
+for a header scan. While a profiled request is in flight a sampler thread
+wakes every ``PROFILING_INTERVAL_SECONDS`` and records its stack: the
+event-loop thread's frames while the request's task is running, or the
+coroutine await chain while it is suspended, so time spent waiting on the
+database, S3 or auth lands under the ``await`` that waited. With nothing to
+profile the thread sleeps on an event.
+
+Finished profiles are kept in a ring buffer of ``PROFILING_MAX_PROFILES`` and
+served as collapsed stacks (``frame;frame;frame count``), the input format of
+flamegraph.pl and speedscope.
+"""
+import asyncio
+import collections
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import lru_cache
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from types import CodeType, FrameType
+from typing import Callable, Dict, List, Optional
+from uuid import uuid4
+
+from prometheus_client import Counter
+
+from video_service.infrastructure.config import get_settings
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+ADMIN_PREFIX = "/admin"
+_TOKEN_KEY = PROFILE_TOKEN_HEADER.lower().encode()
+_ID_KEY = PROFILE_ID_HEADER.lower().encode()
+# Leaf of a suspended request: the future its innermost coroutine is waiting on.
+AWAITING = "<awaiting>"
+
+PROFILES_CAPTURED = Counter("video_profiles_captured_total", "Requests profiled", ["trigger"])
+
+
+@dataclass
+class Profile:
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: datetime
+    duration_seconds: float = 0.0
+    samples: int = 0
+    stacks: "collections.Counter[str]" = field(default_factory=collections.Counter)
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """The last max_profiles finished profiles, newest first."""
+
+    def __init__(self, max_profiles: int):
+        self._profiles: "collections.deque[Profile]" = collections.deque(maxlen=max_profiles)
+
+    def add(self, profile: Profile) -> None:
+        self._profiles.appendleft(profile)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def list(self) -> List[Profile]:
+        return list(self._profiles)
+
+
+@lru_cache(maxsize=4096)
+def _label(code: CodeType) -> str:
+    filename = code.co_filename
+    for marker in ("site-packages/", "src/"):
+        _, found, tail = filename.rpartition(marker)
+        if found:
+            filename = tail
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def _await_chain(awaitable) -> List[FrameType]:
+    """Frames of a coroutine and of everything it is awaiting, outermost first."""
+    frames = []
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return frames
+
+
+def sample_stack(task: asyncio.Task, root: FrameType, thread_frame: Optional[FrameType]) -> str:
+    """Collapsed stack of the request, from its root frame down."""
+    coro = task.get_coro()
+    if getattr(coro, "cr_running", False) and thread_frame is not None:
+        frames = []
+        frame = thread_frame
+        while frame is not None:
+            frames.append(frame)
+            if frame is root:
+                return ";".join(_label(frame.f_code) for frame in reversed(frames))
+            frame = frame.f_back
+    chain = _await_chain(coro)
+    if root in chain:
+        chain = chain[chain.index(root):]
+    return ";".join([*(_label(frame.f_code) for frame in chain), AWAITING])
+
+
+class _Target:
+    __slots__ = ("profile", "task", "root", "thread_id", "deadline")
+
+    def __init__(self, profile: Profile, task: asyncio.Task, root: FrameType, deadline: float):
+        self.profile = profile
+        self.task = task
+        self.root = root
+        self.thread_id = threading.get_ident()
+        self.deadline = deadline
+
+
+class StackSampler:
+    """One daemon thread sampling the stacks of the requests being profiled."""
+
+    def __init__(self, interval: float, max_seconds: float):
+        self._interval = interval
+        self._max_seconds = max_seconds
+        self._targets: Dict[str, _Target] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, profile: Profile, task: asyncio.Task, root: FrameType) -> None:
+        with self._lock:
+            self._targets[profile.id] = _Target(profile, task, root, time.monotonic() + self._max_seconds)
+            self._wakeup.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self, profile: Profile) -> None:
+        # Taking the lock waits out a sample in progress, so the profile is final afterwards.
+        with self._lock:
+            self._targets.pop(profile.id, None)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            time.sleep(self._interval)
+            with self._lock:
+                if not self._targets:
+                    self._wakeup.clear()
+                    continue
+                self.sample()
+
+    def sample(self) -> None:
+        frames = sys._current_frames()
+        now = time.monotonic()
+        for target in self._targets.values():
+            if now > target.deadline:
+                continue
+            target.profile.stacks[sample_stack(target.task, target.root, frames.get(target.thread_id))] += 1
+            target.profile.samples += 1
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests picked by token header or sampling rate."""
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore,
+        sampler: StackSampler,
+        token: str = "",
+        sample_rate: float = 0.0,
+        rand: Callable[[], float] = random.random,
+    ):
+        self.app = app
+        self.store = store
+        self.sampler = sampler
+        self._token = token.encode()
+        self._sample_rate = sample_rate
+        self._rand = rand
+
+    async def __call__(self, scope, receive, send):
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(
+            id=uuid4().hex,
+            method=scope["method"],
+            path=scope["path"],
+            trigger=trigger,
+            started_at=datetime.now(UTC),
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (_ID_KEY, profile.id.encode())]}
+            await send(message)
+
+        started = time.perf_counter()
+        self.sampler.start(profile, asyncio.current_task(), sys._getframe())
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.sampler.stop(profile)
+            profile.duration_seconds = time.perf_counter() - started
+            self.store.add(profile)
+            PROFILES_CAPTURED.labels(trigger=trigger).inc()
+
+    def _trigger(self, scope) -> Optional[str]:
+        if scope["path"].startswith(ADMIN_PREFIX):
+            return None
+        if self._token:
+            for name, value in scope.get("headers", []):
+                if name == _TOKEN_KEY:
+                    if hmac.compare_digest(value, self._token):
+                        return "header"
+                    break
+        if self._sample_rate and self._rand() < self._sample_rate:
+            return "sampled"
+        return None
+
+
+@lru_cache()
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(get_settings().PROFILING_MAX_PROFILES)
+
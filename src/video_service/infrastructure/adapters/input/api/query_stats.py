@@ -0,0 +1,33 @@
+"""Per-request SQL statement accounting (see ``persistence.query_metrics``)."""
+from video_service.infrastructure.adapters.output.persistence.query_metrics import (
+    RequestQueryStats,
+    report_request,
+    reset_request_stats,
+    set_request_stats,
+)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware counting the statements each request runs, by route template."""
+
+    def __init__(self, app, n_plus_one_threshold: int):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = set_request_stats(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_request_stats(token)
+            route = scope.get("route")
+            report_request(
+                stats,
+                f"{scope['method']} {route.path}" if route is not None else "unmatched",
+                self.n_plus_one_threshold,
+            )
@@ -0,0 +1,198 @@
+"""Dependency warm-up and readiness.
+
+``start_readiness`` runs in the app lifespan. It opens the long-lived clients,
+the shared auth ``httpx.AsyncClient`` and the S3/SNS clients of
+``aws_clients``, and starts a ``ReadinessMonitor`` task. The task first opens
+``DB_WARMUP_CONNECTIONS`` pool connections, then probes every dependency each
+``READINESS_PROBE_INTERVAL_SECONDS``: ``SELECT 1`` on the database,
+``HeadBucket`` on S3, ``GetTopicAttributes`` on SNS (when a topic is set) and
+``AUTH_HEALTH_PATH`` on the auth service, each bounded by
+``READINESS_PROBE_TIMEOUT_SECONDS``. The probes run through the shared clients,
+so the first round also opens their connections. Startup does not wait for
+any of this; a slow dependency delays readiness, not the process.
+
+``GET /ready`` only reads the last results, so probing it adds no load. It
+answers 503 until the first round has finished and afterwards 200 while every
+dependency in ``READINESS_REQUIRED`` passed its last probe. The others are
+reported without gating: their outages already fail fast through the circuit
+breakers, and every pod would fail the same probe at once.
+"""
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import Gauge
+
+from video_service.infrastructure.adapters.output.aws_clients import (
+    AwsClients,
+    close_aws_clients,
+    open_aws_clients,
+)
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.lazy_import import lazy_import
+
+httpx = lazy_import("httpx")
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[], Awaitable[object]]
+
+DEPENDENCY_UP = Gauge("video_dependency_up", "Whether the last readiness probe of a dependency passed", ["dependency"])
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    ok: bool
+    latency_seconds: float
+    checked_at: datetime
+    error: Optional[str] = None
+
+
+class ReadinessMonitor:
+    """Probes dependencies on an interval and keeps the last result of each."""
+
+    def __init__(
+        self,
+        probes: Dict[str, Probe],
+        required: Iterable[str] = (),
+        interval: float = 10.0,
+        timeout: float = 2.0,
+        warm_up: Optional[Probe] = None,
+    ):
+        self._probes = probes
+        self._required = {name for name in required if name in probes}
+        self._interval = interval
+        self._timeout = timeout
+        self._warm_up = warm_up
+        self._results: Dict[str, ProbeResult] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def required(self) -> frozenset:
+        return frozenset(self._required)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def run(self) -> None:
+        if self._warm_up is not None:
+            try:
+                await asyncio.wait_for(self._warm_up(), self._timeout)
+            except Exception:
+                logger.warning("Dependency warm-up failed", exc_info=True)
+        while True:
+            await self.check()
+            await asyncio.sleep(self._interval)
+
+    async def check(self) -> None:
+        names = list(self._probes)
+        results = await asyncio.gather(*(self._check(self._probes[name]) for name in names))
+        for name, result in zip(names, results):
+            DEPENDENCY_UP.labels(dependency=name).set(1 if result.ok else 0)
+            previous = self._results.get(name)
+            if not result.ok and (previous is None or previous.ok):
+                logger.warning("Readiness probe for %s failed: %s", name, result.error)
+        self._results = dict(zip(names, results))
+
+    async def _check(self, probe: Probe) -> ProbeResult:
+        started = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(probe(), self._timeout)
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except Exception as exc:
+            # The type only: /ready is unauthenticated.
+            error = type(exc).__name__
+        return ProbeResult(error is None, time.perf_counter() - started, datetime.now(UTC), error)
+
+    def status(self) -> Tuple[bool, Dict[str, ProbeResult]]:
+        """``(ready, last result per dependency)``; not ready before the first round."""
+        results = self._results
+        ready = bool(results) and all(results[name].ok for name in self._required)
+        return ready, dict(results)
+
+
+def _database_probe() -> Probe:
+    async def probe():
+        from video_service.infrastructure.adapters.output.persistence import database
+
+        await database.ping()
+
+    return probe
+
+
+def _auth_probe(client, url: str) -> Probe:
+    async def probe():
+        response = await client.get(url)
+        if response.status_code >= 500:
+            raise RuntimeError(f"auth service answered {response.status_code}")
+
+    return probe
+
+
+def build_probes(settings: Settings, aws: AwsClients, auth_client) -> Dict[str, Probe]:
+    probes: Dict[str, Probe] = {"db": _database_probe()}
+    s3 = aws.get("s3")
+    if s3 is not None:
+        probes["s3"] = lambda: s3.head_bucket(Bucket=settings.S3_BUCKET)
+    sns = aws.get("sns")
+    if sns is not None and settings.SNS_TOPIC_ARN:
+        probes["sns"] = lambda: sns.get_topic_attributes(TopicArn=settings.SNS_TOPIC_ARN)
+    probes["auth"] = _auth_probe(auth_client, f"{settings.AUTH_SERVICE_URL}{settings.AUTH_HEALTH_PATH}")
+    return probes
+
+
+# Set up by the app lifespan; None before startup and after shutdown.
+_auth_client = None
+_monitor: Optional[ReadinessMonitor] = None
+
+
+def get_auth_client():
+    """The shared auth service client, or None when requests should open their own."""
+    return _auth_client
+
+
+def get_readiness_monitor() -> Optional[ReadinessMonitor]:
+    return _monitor
+
+
+async def start_readiness(settings: Settings) -> ReadinessMonitor:
+    global _auth_client, _monitor
+    from video_service.infrastructure.adapters.output.persistence import database
+
+    _auth_client = httpx.AsyncClient()
+    aws = await open_aws_clients(settings)
+    monitor = ReadinessMonitor(
+        build_probes(settings, aws, _auth_client),
+        required=settings.READINESS_REQUIRED,
+        interval=settings.READINESS_PROBE_INTERVAL_SECONDS,
+        timeout=settings.READINESS_PROBE_TIMEOUT_SECONDS,
+        warm_up=lambda: database.warm_up_pool(settings.DB_WARMUP_CONNECTIONS),
+    )
+    monitor.start()
+    _monitor = monitor
+    return monitor
+
+
+async def stop_readiness() -> None:
+    global _auth_client, _monitor
+    monitor, _monitor = _monitor, None
+    if monitor is not None:
+        await monitor.stop()
+    await close_aws_clients()
+    client, _auth_client = _auth_client, None
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,39 @@
+"""Admin Routes."""
+import hmac
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from video_service.infrastructure.adapters.input.api.profiling import ProfileStore, get_profile_store
+from video_service.infrastructure.adapters.input.api.schemas import ProfileSummaryResponse
+from video_service.infrastructure.config import Settings, get_settings
+
+
+def require_profiling_token(
+    settings: Annotated[Settings, Depends(get_settings)],
+    x_profile_token: Annotated[Optional[str], Header()] = None,
+) -> None:
+    if not (
+        settings.PROFILING_TOKEN
+        and x_profile_token
+        and hmac.compare_digest(x_profile_token.encode(), settings.PROFILING_TOKEN.encode())
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token")
+
+
+router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+
+@router.get("/profiles", response_model=List[ProfileSummaryResponse])
+async def list_profiles(store: Annotated[ProfileStore, Depends(get_profile_store)]):
+    return store.list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, store: Annotated[ProfileStore, Depends(get_profile_store)]):
+    """Collapsed stacks, one ``frame;frame;frame count`` line each (flamegraph.pl, speedscope)."""
+    profile = store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(profile.collapsed())
@@ -1,5 +1,9 @@
 """Health Check Routes."""
-from fastapi import APIRouter
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Response, status
+
+from video_service.infrastructure.adapters.input.api.readiness import ReadinessMonitor, get_readiness_monitor
 
 router = APIRouter()
 
@@ -7,3 +11,28 @@ router = APIRouter()
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "video-service"}
+
+
+@router.get("/ready")
+async def readiness_check(
+    response: Response,
+    monitor: Annotated[Optional[ReadinessMonitor], Depends(get_readiness_monitor)] = None,
+):
+    """Last background probe of each dependency; never probes on the request itself."""
+    ready, results = monitor.status() if monitor is not None else (False, {})
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if ready else "not_ready",
+        "service": "video-service",
+        "dependencies": {
+            name: {
+                "ok": result.ok,
+                "required": name in monitor.required,
+                "latency_ms": round(result.latency_seconds * 1000, 1),
+                "checked_at": result.checked_at.isoformat(),
+                "error": result.error,
+            }
+            for name, result in results.items()
+        },
+    }
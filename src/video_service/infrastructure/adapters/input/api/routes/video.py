@@ -1,23 +1,94 @@
 """Video API Routes."""
-from typing import Annotated
+from datetime import datetime
+import logging
+import math
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, status, Depends, Query
+from fastapi import APIRouter, File, UploadFile, HTTPException, status, Depends, Query, Header, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from video_service.application.use_cases import UploadVideoUseCase, GetVideoUseCase, ListVideosUseCase
+from video_service.application.use_cases import (
+    UploadVideoUseCase,
+    GetVideoUseCase,
+    ListVideosUseCase,
+    BatchGetVideosUseCase,
+    DeleteVideosUseCase,
+    GetUsageUseCase,
+)
+from video_service.application.ports.output.repositories import VIDEO_SORT_FIELDS, VideoQuery
 from video_service.application.use_cases.upload_video import UploadVideoInput
-from video_service.infrastructure.adapters.input.api.schemas.video import VideoResponse, PaginatedVideoResponse
+from video_service.infrastructure.adapters.input.api.schemas.video import (
+    VideoResponse,
+    PaginatedVideoResponse,
+    BatchGetVideosRequest,
+    BatchGetVideosResponse,
+    BulkDeleteVideosRequest,
+    BulkDeleteVideosResponse,
+    UsageResponse,
+)
+from video_service.infrastructure.adapters.input.api.etag import make_etag, if_none_match_matches
 from video_service.infrastructure.adapters.input.api.dependencies import (
     get_video_repository,
     get_storage_service,
     get_event_publisher,
+    get_change_notifier,
+    get_event_hub,
+    get_storage_quota,
+    get_storage_key_layout,
+    get_region_hint,
     get_current_user_id,
 )
+from video_service.infrastructure.adapters.input.api.async_upload import UploadTransferPool, get_upload_pool
+from video_service.infrastructure.adapters.input.api.event_stream import stream_events
+from video_service.infrastructure.adapters.input.api.idempotency import (
+    REPLAYED_HEADER,
+    IdempotencyGuard,
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    StoredResponse,
+    get_idempotency_guard,
+    upload_fingerprint,
+    valid_key,
+)
+from video_service.infrastructure.config import Settings, get_settings
+from video_service.infrastructure.tracing import trace_use_case
+from video_service.domain.exceptions import QuotaExceededError
 
 from video_processor_shared.domain.exceptions import InvalidVideoFormatError, VideoTooLargeError, VideoNotFoundError
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Clients may keep the body but must revalidate it with If-None-Match every time.
+CACHE_CONTROL = "private, no-cache"
+
+# "created_at" ascending, "-created_at" descending, and so on for each sort field.
+SORT_PATTERN = f"^-?({'|'.join(VIDEO_SORT_FIELDS)})$"
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def _prefers_async(prefer: Optional[str]) -> bool:
+    """Whether a ``Prefer`` header (RFC 7240) asks for ``respond-async``."""
+    if not prefer:
+        return False
+    return any(item.split(";", 1)[0].strip().lower() == "respond-async" for item in prefer.split(","))
+
+
+def _file_size(file: UploadFile) -> int:
+    file.file.seek(0, 2)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
 
 @router.post("/upload", response_model=list[VideoResponse], status_code=status.HTTP_201_CREATED)
 async def upload_video(
@@ -26,88 +97,281 @@ async def upload_video(
     video_repository=Depends(get_video_repository),
     storage_service=Depends(get_storage_service),
     event_publisher=Depends(get_event_publisher),
+    change_notifier=Depends(get_change_notifier),
+    quota=Depends(get_storage_quota),
+    key_layout=Depends(get_storage_key_layout),
+    region_hint: Annotated[Optional[str], Depends(get_region_hint)] = None,
+    idempotency_guard: Annotated[Optional[IdempotencyGuard], Depends(get_idempotency_guard)] = None,
+    idempotency_key: Annotated[Optional[str], Header()] = None,
+    upload_pool: Annotated[Optional[UploadTransferPool], Depends(get_upload_pool)] = None,
+    prefer: Annotated[Optional[str], Header()] = None,
 ):
-    """Upload one or more video files."""
-    try:
-        if not files:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No files provided")
+    """Upload one or more video files; retries with the same Idempotency-Key get the first response.
+
+    With ``Prefer: respond-async`` and asynchronous uploads enabled, the files are
+    accepted as pending videos and the response is 202; see ``async_upload``.
+    Files are stored one by one: when a later file fails under an Idempotency-Key,
+    the error is stored with the videos already created (``uploaded``) and replayed.
+    """
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No files provided")
+    if any(not file.filename for file in files):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File name is required")
+
+    respond_async = upload_pool is not None and _prefers_async(prefer)
+    if respond_async and not upload_pool.has_capacity(len(files)):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many uploads waiting for transfer",
+            headers={"Retry-After": str(max(1, math.ceil(upload_pool.retry_after)))},
+        )
+    success_status = status.HTTP_202_ACCEPTED if respond_async else status.HTTP_201_CREATED
+    success_headers = {"Preference-Applied": "respond-async"} if respond_async else {}
 
-        use_case = UploadVideoUseCase(
+    use_case = trace_use_case(
+        UploadVideoUseCase(
             video_repository=video_repository,
             storage_service=storage_service,
             event_publisher=event_publisher,
+            change_notifier=change_notifier,
+            quota=quota,
+            key_layout=key_layout,
         )
+    )
 
-        responses: list[VideoResponse] = []
-        for file in files:
-            if not file.filename:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File name is required")
-
-            # Get file size
-            file.file.seek(0, 2)
-            file_size = file.file.tell()
-            file.file.seek(0)
+    # Filled as each file is stored and committed, so a failure part way still knows what exists.
+    uploaded: list[VideoResponse] = []
 
-            result = await use_case.execute(
-                UploadVideoInput(
+    async def upload() -> list[VideoResponse]:
+        try:
+            for file in files:
+                input_data = UploadVideoInput(
                     user_id=user_id,
                     filename=file.filename,
                     file=file.file,
-                    file_size=file_size,
+                    file_size=_file_size(file),
                     content_type=file.content_type or "video/mp4",
+                    region=region_hint,
                 )
-            )
+                if respond_async:
+                    result = await upload_pool.accept(input_data)
+                else:
+                    result = await use_case.execute(input_data)
 
-            responses.append(
-                VideoResponse(
-                    id=result.id,
-                    user_id=result.user_id,
-                    original_filename=result.original_filename,
-                    file_size=result.file_size,
-                    format=result.format,
-                    created_at=result.created_at,
+                uploaded.append(
+                    VideoResponse(
+                        id=result.id,
+                        user_id=result.user_id,
+                        original_filename=result.original_filename,
+                        file_size=result.file_size,
+                        format=result.format,
+                        created_at=result.created_at,
+                        status=result.status,
+                        progress=result.progress,
+                    )
                 )
+            return uploaded
+        except InvalidVideoFormatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except VideoTooLargeError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except QuotaExceededError as e:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    if idempotency_key is None or idempotency_guard is None:
+        if not respond_async:
+            return await upload()
+        return JSONResponse(jsonable_encoder(await upload()), status_code=success_status, headers=success_headers)
+    if not valid_key(idempotency_key):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Idempotency-Key")
+
+    async def upload_once() -> StoredResponse:
+        try:
+            return StoredResponse(success_status, jsonable_encoder(await upload()))
+        except Exception as e:
+            if not uploaded:
+                raise
+            # The earlier files are already stored: keep that outcome under the key
+            # instead of releasing it, or the retry would upload them again.
+            if isinstance(e, HTTPException):
+                error_status, detail = e.status_code, e.detail
+            else:
+                logger.exception("Upload failed after %d of %d files", len(uploaded), len(files))
+                error_status, detail = status.HTTP_500_INTERNAL_SERVER_ERROR, "Upload failed"
+            return StoredResponse(error_status, {"detail": detail, "uploaded": jsonable_encoder(uploaded)})
+
+    fingerprint = upload_fingerprint([(file.filename, _file_size(file), file.content_type or "") for file in files])
+    try:
+        response, replayed = await idempotency_guard.run(user_id, idempotency_key, fingerprint, upload_once)
+    except IdempotencyKeyReusedError:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used for a different upload",
+        )
+    except IdempotencyInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+    headers = {"Preference-Applied": "respond-async"} if response.status_code == status.HTTP_202_ACCEPTED else {}
+    if replayed:
+        headers[REPLAYED_HEADER] = "true"
+    return JSONResponse(response.body, status_code=response.status_code, headers=headers)
+
+
+@router.post("/batch-get", response_model=BatchGetVideosResponse)
+async def batch_get_videos(
+    request: BatchGetVideosRequest,
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    video_repository=Depends(get_video_repository),
+):
+    """Get many videos by ID in one request; ids not found or not owned are listed as missing."""
+    use_case = trace_use_case(BatchGetVideosUseCase(video_repository=video_repository))
+    result = await use_case.execute(request.video_ids, user_id)
+    return BatchGetVideosResponse(
+        videos=[
+            VideoResponse(
+                id=v.id,
+                user_id=v.user_id,
+                original_filename=v.original_filename,
+                file_size=v.file_size,
+                format=v.format,
+                created_at=v.created_at,
+                status=v.status,
+                progress=v.progress,
             )
+            for v in result.videos
+        ],
+        missing_ids=result.missing_ids,
+    )
 
-        return responses
-    except InvalidVideoFormatError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except VideoTooLargeError as e:
-        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+@router.post("/bulk-delete", response_model=BulkDeleteVideosResponse)
+async def bulk_delete_videos(
+    request: BulkDeleteVideosRequest,
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    video_repository=Depends(get_video_repository),
+    storage_service=Depends(get_storage_service),
+):
+    """Delete many of the user's videos; partial storage failures are reported, not raised."""
+    use_case = trace_use_case(DeleteVideosUseCase(video_repository=video_repository, storage_service=storage_service))
+    result = await use_case.execute(request.video_ids, user_id)
+    return BulkDeleteVideosResponse(
+        deleted_ids=result.deleted_ids,
+        missing_ids=result.missing_ids,
+        storage_failed_ids=result.storage_failed_ids,
+    )
+
+
+@router.get("/usage", response_model=UsageResponse)
+async def get_usage(
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    video_repository=Depends(get_video_repository),
+    quota=Depends(get_storage_quota),
+):
+    """Video count and stored bytes of the caller, with their quota limits."""
+    result = await trace_use_case(GetUsageUseCase(video_repository=video_repository, quota=quota)).execute(user_id)
+    return UsageResponse(
+        video_count=result.video_count,
+        total_bytes=result.total_bytes,
+        max_videos=result.max_videos,
+        max_bytes=result.max_bytes,
+    )
+
+
+@router.get("/events")
+async def video_events(
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    hub=Depends(get_event_hub),
+    last_event_id: Annotated[Optional[str], Header()] = None,
+):
+    """Server-Sent Events stream of upload and status changes for the caller's videos."""
+    if not settings.VIDEO_EVENTS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if hub.is_full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many event streams, retry later",
+            headers={"Retry-After": "5"},
+        )
+    return StreamingResponse(
+        stream_events(hub, user_id, last_event_id, settings.VIDEO_EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(
     video_id: UUID,
     user_id: Annotated[UUID, Depends(get_current_user_id)],
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
     video_repository=Depends(get_video_repository),
 ):
     """Get video by ID."""
     try:
-        use_case = GetVideoUseCase(video_repository=video_repository)
+        use_case = trace_use_case(GetVideoUseCase(video_repository=video_repository))
         result = await use_case.execute(video_id, user_id)
-        return VideoResponse(
-            id=result.id,
-            user_id=result.user_id,
-            original_filename=result.original_filename,
-            file_size=result.file_size,
-            format=result.format,
-            created_at=result.created_at,
-        )
     except VideoNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Video not found")
 
+    etag = make_etag(result.id, result.version)
+    if if_none_match_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return VideoResponse(
+        id=result.id,
+        user_id=result.user_id,
+        original_filename=result.original_filename,
+        file_size=result.file_size,
+        format=result.format,
+        created_at=result.created_at,
+        status=result.status,
+        progress=result.progress,
+    )
+
 
 @router.get("/", response_model=PaginatedVideoResponse)
 async def list_videos(
     user_id: Annotated[UUID, Depends(get_current_user_id)],
+    response: Response,
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 10,
+    format: Annotated[Optional[str], Query(max_length=50)] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    min_size: Annotated[Optional[int], Query(ge=0)] = None,
+    max_size: Annotated[Optional[int], Query(ge=0)] = None,
+    filename: Annotated[Optional[str], Query(min_length=1, max_length=200)] = None,
+    sort: Annotated[str, Query(pattern=SORT_PATTERN)] = "-created_at",
+    if_none_match: Annotated[Optional[str], Header()] = None,
     video_repository=Depends(get_video_repository),
 ):
-    """List user's videos."""
-    use_case = ListVideosUseCase(video_repository=video_repository)
-    result = await use_case.execute(user_id, page, page_size)
+    """List user's videos, optionally filtered and sorted (``sort=-file_size``)."""
+    query = VideoQuery(
+        format=format,
+        created_from=created_from,
+        created_to=created_to,
+        min_size=min_size,
+        max_size=max_size,
+        filename_contains=filename,
+        sort_by=sort.lstrip("-"),
+        descending=sort.startswith("-"),
+    )
+    use_case = trace_use_case(ListVideosUseCase(video_repository=video_repository))
+    # Decided from the per-user marker alone: a 304 runs neither the page query nor the count.
+    etag = make_etag(user_id, await use_case.get_version(user_id), page, page_size, query)
+    if if_none_match_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    result = await use_case.execute(user_id, page, page_size, query)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return PaginatedVideoResponse(
         videos=[
             VideoResponse(
@@ -117,6 +381,8 @@ async def list_videos(
                 file_size=v.file_size,
                 format=v.format,
                 created_at=v.created_at,
+                status=v.status,
+                progress=v.progress,
             )
             for v in result.videos
         ],
@@ -1,4 +1,22 @@
 """API Schemas."""
-from video_service.infrastructure.adapters.input.api.schemas.video import VideoResponse, PaginatedVideoResponse
+from video_service.infrastructure.adapters.input.api.schemas.admin import ProfileSummaryResponse
+from video_service.infrastructure.adapters.input.api.schemas.video import (
+    VideoResponse,
+    PaginatedVideoResponse,
+    BatchGetVideosRequest,
+    BatchGetVideosResponse,
+    BulkDeleteVideosRequest,
+    BulkDeleteVideosResponse,
+    UsageResponse,
+)
 
-__all__ = ["VideoResponse", "PaginatedVideoResponse"]
+__all__ = [
+    "VideoResponse",
+    "PaginatedVideoResponse",
+    "BatchGetVideosRequest",
+    "BatchGetVideosResponse",
+    "BulkDeleteVideosRequest",
+    "BulkDeleteVideosResponse",
+    "UsageResponse",
+    "ProfileSummaryResponse",
+]
@@ -0,0 +1,15 @@
+"""Admin Schemas."""
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ProfileSummaryResponse(BaseModel):
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: datetime
+    duration_seconds: float
+    samples: int
+    model_config = ConfigDict(from_attributes=True)
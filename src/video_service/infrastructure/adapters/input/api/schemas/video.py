@@ -1,8 +1,11 @@
 """Video Schemas."""
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from pydantic import ConfigDict, BaseModel
+from pydantic import ConfigDict, BaseModel, Field
+
+MAX_BATCH_GET_IDS = 500
+MAX_BULK_DELETE_IDS = 5000
 
 
 class VideoResponse(BaseModel):
@@ -12,6 +15,8 @@ class VideoResponse(BaseModel):
     file_size: int
     format: str
     created_at: datetime
+    status: str = "uploaded"
+    progress: int = Field(default=0, ge=0, le=100)
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -20,3 +25,30 @@ class PaginatedVideoResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class BatchGetVideosRequest(BaseModel):
+    video_ids: List[UUID] = Field(min_length=1, max_length=MAX_BATCH_GET_IDS)
+
+
+class BatchGetVideosResponse(BaseModel):
+    videos: List[VideoResponse]
+    missing_ids: List[UUID]
+
+
+class BulkDeleteVideosRequest(BaseModel):
+    video_ids: List[UUID] = Field(min_length=1, max_length=MAX_BULK_DELETE_IDS)
+
+
+class BulkDeleteVideosResponse(BaseModel):
+    deleted_ids: List[UUID]
+    missing_ids: List[UUID]
+    storage_failed_ids: List[UUID]
+
+
+class UsageResponse(BaseModel):
+    video_count: int
+    total_bytes: int
+    # None when the limit is not enforced.
+    max_videos: Optional[int] = None
+    max_bytes: Optional[int] = None
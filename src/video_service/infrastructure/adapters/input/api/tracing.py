@@ -0,0 +1,55 @@
+"""Request tracing middleware.
+
+Opens the server span of each request, as a child of the caller's
+``traceparent`` header when there is one. The span is renamed to the matched
+route template (``GET /videos/{video_id}``) once routing is done, so span
+names stay low-cardinality.
+"""
+from video_service.infrastructure.tracing import Tracer, parse_traceparent, reset_context, set_context
+
+_TRACEPARENT_KEY = b"traceparent"
+
+
+class TracingMiddleware:
+    """ASGI middleware running each HTTP request inside a server span."""
+
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope.get("headers", []):
+            if name == _TRACEPARENT_KEY:
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = set_context(parent)
+        try:
+            with self.tracer.start_span(
+                f"{scope['method']} {scope['path']}", {"http.method": scope["method"]}
+            ) as span:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    if span is not None:
+                        route = scope.get("route")
+                        if route is not None:
+                            span.name = f"{scope['method']} {route.path}"
+                            span.set_attribute("http.route", route.path)
+                        span.set_attribute("http.status_code", status_code)
+                        if status_code is not None and status_code >= 500:
+                            span.error = f"HTTP {status_code}"
+        finally:
+            reset_context(token)
@@ -0,0 +1,75 @@
+"""Partition management command for the partitioned ``videos`` layout.
+
+Usage:
+    python -m video_service.infrastructure.adapters.input.cli.manage_partitions init
+    python -m video_service.infrastructure.adapters.input.cli.manage_partitions create [--months-ahead 3]
+    python -m video_service.infrastructure.adapters.input.cli.manage_partitions archive [--older-than-months 24] [--dry-run]
+
+``create`` and ``archive`` are meant to run periodically (e.g. a daily cron
+job); ``create`` must run often enough that next month's partition exists
+before the month starts.
+"""
+import argparse
+import asyncio
+from typing import Optional, Sequence
+
+from video_service.infrastructure.adapters.output.persistence import partitioning
+from video_service.infrastructure.adapters.output.persistence.database import create_schema, dispose_engine, get_engine
+from video_service.infrastructure.config import get_settings
+
+
+def build_parser() -> argparse.ArgumentParser:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Manage the monthly partitions of the videos table.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init", help="Create the schema with a partitioned videos table")
+    create = commands.add_parser("create", help="Create partitions for the coming months")
+    create.add_argument("--months-ahead", type=int, default=settings.DB_PARTITION_MONTHS_AHEAD)
+    archive = commands.add_parser("archive", help="Move old partitions into videos_archive")
+    archive.add_argument("--older-than-months", type=int, default=settings.DB_ARCHIVE_AFTER_MONTHS)
+    archive.add_argument("--dry-run", action="store_true", help="Only list the partitions that would be archived")
+    return parser
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = get_engine()
+    try:
+        if args.command == "init":
+            settings = get_settings().model_copy(update={"DB_PARTITION_VIDEOS": True})
+            from video_service.infrastructure.adapters.output.persistence import models  # noqa: F401
+
+            async with engine.begin() as conn:
+                await create_schema(conn, settings)
+            print("schema=ready")
+            return 0
+
+        async with engine.begin() as conn:
+            if not await partitioning.is_partitioned(conn):
+                print("error=videos is not a partitioned table")
+                return 1
+            if args.command == "create":
+                for name in await partitioning.ensure_partitions(conn, args.months_ahead):
+                    print(f"created\t{name}", flush=True)
+                return 0
+            attached = await partitioning.list_partitions(conn)
+            detached = await partitioning.list_detached_partitions(conn)
+
+        pending = dict(attached)
+        candidates = partitioning.archivable([name for name, _ in attached] + detached, args.older_than_months)
+        for name in candidates:
+            if args.dry_run:
+                print(f"would_archive\t{name}", flush=True)
+                continue
+            rows = await partitioning.archive_partition(engine, name, detach_pending=pending.get(name, False))
+            print(f"archived\t{name}\t{rows}", flush=True)
+        return 0
+    finally:
+        await dispose_engine()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    return asyncio.run(run(build_parser().parse_args(argv)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+"""Storage reconciliation command.
+
+Usage:
+    python -m video_service.infrastructure.adapters.input.cli.reconcile_storage [--delete] [--prefix videos/]
+
+Runs as a dry run unless ``--delete`` is given.
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+from typing import Optional, Sequence
+
+from video_service.application.use_cases.reconcile_storage import (
+    ReconcileStorageInput,
+    ReconcileStorageOutput,
+    ReconcileStorageUseCase,
+)
+from video_service.infrastructure.adapters.output.persistence.database import async_session
+from video_service.infrastructure.adapters.output.persistence.repositories import SQLAlchemyVideoRepository
+from video_service.infrastructure.adapters.output.storage.s3_storage import S3StorageService
+from video_service.infrastructure.config import get_settings
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Find S3 objects without video rows and rows without objects.")
+    parser.add_argument("--prefix", default="videos/", help="S3 key prefix to scan")
+    parser.add_argument("--delete", action="store_true", help="Delete orphaned objects (default: dry run)")
+    parser.add_argument(
+        "--min-age-minutes",
+        type=int,
+        default=60,
+        help="Ignore objects newer than this, as their upload may still be in progress",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Database cursor and DeleteObjects batch size")
+    return parser
+
+
+def _print_finding(kind: str, path: str) -> None:
+    print(f"{kind}\t{path}", flush=True)
+
+
+async def run(args: argparse.Namespace) -> ReconcileStorageOutput:
+    settings = get_settings()
+    storage_service = S3StorageService(
+        bucket=settings.S3_BUCKET,
+        endpoint_url=settings.AWS_ENDPOINT_URL or None,
+        region=settings.AWS_DEFAULT_REGION,
+    )
+    async with async_session() as session:
+        use_case = ReconcileStorageUseCase(
+            video_repository=SQLAlchemyVideoRepository(session),
+            storage_service=storage_service,
+        )
+        return await use_case.execute(
+            ReconcileStorageInput(
+                key_prefix=args.prefix,
+                dry_run=not args.delete,
+                min_object_age=timedelta(minutes=args.min_age_minutes),
+                delete_batch_size=args.batch_size,
+                row_batch_size=args.batch_size,
+            ),
+            on_finding=_print_finding,
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    result = asyncio.run(run(args))
+    mode = "delete" if args.delete else "dry-run"
+    print(
+        f"mode={mode} scanned_objects={result.scanned_objects} scanned_rows={result.scanned_rows} "
+        f"orphaned_objects={result.orphaned_objects} dangling_rows={result.dangling_rows} "
+        f"deleted_objects={result.deleted_objects} failed_deletions={result.failed_deletions}"
+    )
+    return 1 if result.failed_deletions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+"""Usage repair command.
+
+Usage:
+    python -m video_service.infrastructure.adapters.input.cli.repair_usage [--batch-size 500] [--pause-seconds 0]
+
+Recomputes every user's video count and stored bytes from the videos table,
+one batch of users per transaction; meant to run periodically (e.g. a cron job).
+"""
+import argparse
+import asyncio
+from typing import Optional, Sequence
+
+from video_service.application.use_cases.repair_usage import RepairUsageInput, RepairUsageUseCase
+from video_service.infrastructure.adapters.output.persistence.database import session_scope
+from video_service.infrastructure.adapters.output.persistence.repositories import SQLAlchemyVideoRepository
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Reconcile per-user usage aggregates with the videos table.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users checked per transaction")
+    parser.add_argument(
+        "--pause-seconds",
+        type=float,
+        default=0.0,
+        help="Sleep between batches to limit the load on the database",
+    )
+    return parser
+
+
+async def run(args: argparse.Namespace) -> tuple:
+    """Walk all users; returns (checked, repaired)."""
+    checked = repaired = 0
+    after_user_id = None
+    while True:
+        async with session_scope() as session:
+            batch = await RepairUsageUseCase(SQLAlchemyVideoRepository(session)).execute(
+                RepairUsageInput(after_user_id=after_user_id, batch_size=args.batch_size)
+            )
+        checked += batch.checked
+        repaired += batch.repaired
+        if batch.last_user_id is None or batch.checked < args.batch_size:
+            return checked, repaired
+        after_user_id = batch.last_user_id
+        if args.pause_seconds:
+            await asyncio.sleep(args.pause_seconds)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    checked, repaired = asyncio.run(run(args))
+    print(f"checked_users={checked} repaired_users={repaired}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Messaging Input Adapters."""
@@ -0,0 +1,171 @@
+"""Processing results consumer.
+
+Long-polls the worker results queue and records each video's processing
+status and progress. Received messages are gathered into batches, applied
+with bulk UPDATEs in one transaction and only then deleted, ten per
+``DeleteMessageBatch`` call. When applying a batch fails nothing is deleted,
+so its messages come back after the visibility timeout; malformed messages
+are never deleted and are left to the queue's redrive policy.
+
+Accepted bodies are ``{"video_id": ..., "status": ..., "progress": ...}``,
+raw or wrapped in an SNS notification envelope, and encoded as named by
+their ``codec`` message attribute (plain JSON without one; see ``codecs``).
+"""
+import asyncio
+from functools import partial
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+from prometheus_client import Counter
+
+from video_service.application.ports.output.repositories.video_repository import VideoStatusUpdate
+from video_service.application.ports.output.video_change_notifier import IVideoChangeNotifier
+from video_service.application.use_cases.apply_processing_results import (
+    ApplyProcessingResultsOutput,
+    ApplyProcessingResultsUseCase,
+)
+from video_service.infrastructure.adapters.output.messaging.codecs import CODEC_ATTRIBUTE, codec_attribute, decode_body
+from video_service.infrastructure.adapters.output.messaging.redis_change_notifier import RedisVideoChangeNotifier
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.lazy_import import lazy_import
+from video_service.infrastructure.tracing import trace_use_case
+
+aioboto3 = lazy_import("aioboto3")
+
+logger = logging.getLogger(__name__)
+
+RESULTS_RECEIVED = Counter("video_processing_results_received_total", "Worker result messages received")
+RESULTS_APPLIED = Counter("video_processing_results_applied_total", "Video status updates written")
+RESULTS_MALFORMED = Counter("video_processing_results_malformed_total", "Worker result messages that could not be parsed")
+
+# SQS limits for ReceiveMessage and DeleteMessageBatch.
+MAX_RECEIVE_MESSAGES = 10
+DELETE_BATCH_SIZE = 10
+
+ApplyUpdates = Callable[[List[VideoStatusUpdate]], Awaitable[ApplyProcessingResultsOutput]]
+
+
+def parse_result_message(body: str, attributes: Optional[Dict[str, dict]] = None) -> VideoStatusUpdate:
+    payload = decode_body(body, codec_attribute(attributes))
+    if payload.get("Type") == "Notification" and "Message" in payload:
+        # SNS puts the published message attributes in the envelope.
+        payload = decode_body(payload["Message"], codec_attribute(payload.get("MessageAttributes")))
+    return VideoStatusUpdate(
+        video_id=UUID(str(payload["video_id"])),
+        status=str(payload["status"]),
+        progress=int(payload.get("progress") or 0),
+    )
+
+
+async def apply_in_new_session(
+    updates: List[VideoStatusUpdate],
+    change_notifier: Optional[IVideoChangeNotifier] = None,
+) -> ApplyProcessingResultsOutput:
+    from video_service.infrastructure.adapters.output.persistence.database import session_scope
+    from video_service.infrastructure.adapters.output.persistence.repositories import SQLAlchemyVideoRepository
+
+    async with session_scope() as session:
+        use_case = trace_use_case(
+            ApplyProcessingResultsUseCase(SQLAlchemyVideoRepository(session), change_notifier=change_notifier)
+        )
+        return await use_case.execute(updates)
+
+
+class ProcessingResultsConsumer:
+    """Background loop turning worker result messages into batched status updates."""
+
+    def __init__(
+        self,
+        queue_url: str,
+        apply_updates: ApplyUpdates = apply_in_new_session,
+        endpoint_url: Optional[str] = None,
+        region: str = "us-east-1",
+        wait_seconds: int = 20,
+        batch_size: int = 100,
+        error_backoff: float = 5.0,
+    ):
+        self._queue_url = queue_url
+        self._apply_updates = apply_updates
+        self._endpoint_url = endpoint_url
+        self._region = region
+        self._wait_seconds = wait_seconds
+        self._batch_size = batch_size
+        self._error_backoff = error_backoff
+        self._session = aioboto3.Session()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ProcessingResultsConsumer":
+        change_notifier = RedisVideoChangeNotifier.from_settings(settings) if settings.VIDEO_EVENTS_ENABLED else None
+        return cls(
+            queue_url=settings.PROCESSING_RESULTS_QUEUE_URL,
+            apply_updates=partial(apply_in_new_session, change_notifier=change_notifier),
+            endpoint_url=settings.AWS_ENDPOINT_URL or None,
+            region=settings.AWS_DEFAULT_REGION,
+            wait_seconds=settings.PROCESSING_RESULTS_WAIT_SECONDS,
+            batch_size=settings.PROCESSING_RESULTS_BATCH_SIZE,
+        )
+
+    async def run(self) -> None:
+        async with self._session.client(
+            "sqs",
+            endpoint_url=self._endpoint_url,
+            region_name=self._region,
+        ) as sqs:
+            while True:
+                try:
+                    await self.poll_once(sqs)
+                except Exception:
+                    logger.exception("Failed to process a batch of processing results")
+                    await asyncio.sleep(self._error_backoff)
+
+    async def poll_once(self, sqs) -> int:
+        """Receive, apply and delete one batch; returns how many messages were deleted."""
+        messages = await self._receive_batch(sqs)
+        updates: List[VideoStatusUpdate] = []
+        receipt_handles: List[str] = []
+        for message in messages:
+            try:
+                updates.append(parse_result_message(message["Body"], message.get("MessageAttributes")))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                RESULTS_MALFORMED.inc()
+                logger.warning("Skipping malformed processing result message %s", message.get("MessageId"))
+                continue
+            receipt_handles.append(message["ReceiptHandle"])
+
+        if updates:
+            result = await self._apply_updates(updates)
+            RESULTS_APPLIED.inc(result.applied)
+        await self._delete(sqs, receipt_handles)
+        return len(receipt_handles)
+
+    async def _receive_batch(self, sqs) -> list:
+        messages: list = []
+        wait_seconds = self._wait_seconds
+        while len(messages) < self._batch_size:
+            max_messages = min(MAX_RECEIVE_MESSAGES, self._batch_size - len(messages))
+            response = await sqs.receive_message(
+                QueueUrl=self._queue_url,
+                MaxNumberOfMessages=max_messages,
+                WaitTimeSeconds=wait_seconds,
+                MessageAttributeNames=[CODEC_ATTRIBUTE],
+            )
+            received = response.get("Messages", [])
+            messages.extend(received)
+            RESULTS_RECEIVED.inc(len(received))
+            if len(received) < max_messages:
+                break
+            # Only the first receive waits; later ones just drain what is already queued.
+            wait_seconds = 0
+        return messages
+
+    async def _delete(self, sqs, receipt_handles: List[str]) -> None:
+        for start in range(0, len(receipt_handles), DELETE_BATCH_SIZE):
+            chunk = receipt_handles[start:start + DELETE_BATCH_SIZE]
+            response = await sqs.delete_message_batch(
+                QueueUrl=self._queue_url,
+                Entries=[{"Id": str(i), "ReceiptHandle": handle} for i, handle in enumerate(chunk)],
+            )
+            for failure in response.get("Failed", []):
+                # Redelivery is harmless: updates that do not move a video forward are skipped.
+                logger.warning("Could not delete processing result message: %s", failure.get("Message"))
@@ -0,0 +1,95 @@
+"""Long-lived AWS clients.
+
+Entering an aioboto3 client builds its endpoint resolver and connection pool,
+and the first call on it pays the TCP/TLS handshake; with a client per call,
+as the adapters otherwise open, every S3, SNS or SQS call pays both.
+``open_aws_clients`` (run by the app lifespan) enters one client per service
+(SQS only when a job queue is configured) and keeps it until ``close_aws_clients``, with a pool of
+``AWS_MAX_POOL_CONNECTIONS`` connections. Adapters given these clients share
+them and fall back to a client per call when they are not open.
+"""
+from contextlib import AsyncExitStack, nullcontext
+from typing import Any, Dict, Iterable, List, Optional
+
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.lazy_import import lazy_import
+
+aioboto3 = lazy_import("aioboto3")
+
+
+class AwsClients:
+    def __init__(self, endpoint_url: Optional[str] = None, region: str = "us-east-1", max_pool_connections: int = 10):
+        self._endpoint_url = endpoint_url
+        self._region = region
+        self._max_pool_connections = max_pool_connections
+        self._session = aioboto3.Session()
+        self._stack = AsyncExitStack()
+        self._clients: Dict[str, Any] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AwsClients":
+        return cls(
+            endpoint_url=settings.AWS_ENDPOINT_URL or None,
+            region=settings.AWS_DEFAULT_REGION,
+            max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+        )
+
+    async def open(self, services: Iterable[str]) -> None:
+        # A submodule: lazy_import would import aiobotocore itself right away.
+        from aiobotocore.config import AioConfig
+
+        for service in services:
+            if service not in self._clients:
+                self._clients[service] = await self._stack.enter_async_context(
+                    self._session.client(
+                        service,
+                        endpoint_url=self._endpoint_url,
+                        region_name=self._region,
+                        config=AioConfig(max_pool_connections=self._max_pool_connections),
+                    )
+                )
+
+    def get(self, service: str) -> Optional[Any]:
+        return self._clients.get(service)
+
+    async def close(self) -> None:
+        self._clients.clear()
+        await self._stack.aclose()
+
+
+def client_scope(clients: Optional[AwsClients], session, service: str, endpoint_url: Optional[str], region: str):
+    """The shared client for ``service`` when open, else a new one closed on exit."""
+    shared = clients.get(service) if clients is not None else None
+    if shared is not None:
+        return nullcontext(shared)
+    return session.client(service, endpoint_url=endpoint_url, region_name=region)
+
+
+# Opened by the app lifespan; None until then and in processes that never open them.
+_clients: Optional[AwsClients] = None
+
+
+def get_aws_clients() -> Optional[AwsClients]:
+    return _clients
+
+
+def aws_services(settings: Settings) -> List[str]:
+    services = ["s3", "sns"]
+    if settings.SQS_JOB_QUEUE_URL or settings.SQS_JOB_LANES:
+        services.append("sqs")
+    return services
+
+
+async def open_aws_clients(settings: Settings, services: Optional[Iterable[str]] = None) -> AwsClients:
+    global _clients
+    clients = AwsClients.from_settings(settings)
+    await clients.open(aws_services(settings) if services is None else services)
+    _clients = clients
+    return clients
+
+
+async def close_aws_clients() -> None:
+    global _clients
+    clients, _clients = _clients, None
+    if clients is not None:
+        await clients.close()
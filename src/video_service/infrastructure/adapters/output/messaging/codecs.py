@@ -0,0 +1,137 @@
+"""Message codecs for SNS and SQS payloads.
+
+Publishers encode payloads with ``MESSAGE_CODEC``: ``json`` (the default,
+readable by every existing consumer) or ``msgpack``, MessagePack through the C
+``msgpack`` package, an optional dependency imported on first use. With
+``MESSAGE_COMPRESSION_ENABLED`` payloads of ``MESSAGE_COMPRESSION_MIN_BYTES`` or
+more are also zlib-compressed; smaller ones gain nothing from it.
+
+SNS and SQS bodies are text, so binary output is sent base64-encoded. The
+``codec`` message attribute names what was done to the body, e.g. ``json``,
+``json+zlib`` or ``msgpack+zlib``; a message without it is plain JSON. Every
+payload carries a ``schema_version`` field.
+"""
+from abc import ABC, abstractmethod
+import base64
+import importlib.util
+import json
+from typing import Any, Dict, Optional, Tuple
+import zlib
+
+from video_service.infrastructure.config import Settings
+
+CODEC_ATTRIBUTE = "codec"
+SCHEMA_VERSION_FIELD = "schema_version"
+ZLIB = "zlib"
+
+
+class MessageCodec(ABC):
+    name: str
+    # Binary output is base64-encoded in the message body.
+    binary: bool = True
+    # Optional package the codec needs, checked when it is configured.
+    requires: Optional[str] = None
+
+    @abstractmethod
+    def encode(self, payload: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        pass
+
+
+class JsonCodec(MessageCodec):
+    name = "json"
+    binary = False
+
+    def encode(self, payload: Any) -> bytes:
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgPackCodec(MessageCodec):
+    name = "msgpack"
+    requires = "msgpack"
+
+    def encode(self, payload: Any) -> bytes:
+        import msgpack
+
+        return msgpack.packb(payload, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        import msgpack
+
+        # Malformed input raises ValueError subclasses, like invalid JSON.
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS: Dict[str, MessageCodec] = {codec.name: codec for codec in (JsonCodec(), MsgPackCodec())}
+
+
+class MessageEncoder:
+    """Turns payloads into message bodies plus the ``codec`` attribute that describes them."""
+
+    def __init__(
+        self,
+        codec: MessageCodec,
+        compression: bool = False,
+        compress_min_bytes: int = 1024,
+        compression_level: int = 6,
+    ):
+        self._codec = codec
+        self._compression = compression
+        self._compress_min_bytes = compress_min_bytes
+        self._compression_level = compression_level
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "MessageEncoder":
+        if settings.MESSAGE_CODEC not in CODECS:
+            raise ValueError(f"Unknown MESSAGE_CODEC {settings.MESSAGE_CODEC!r}; expected one of {sorted(CODECS)}")
+        codec = CODECS[settings.MESSAGE_CODEC]
+        if codec.requires and importlib.util.find_spec(codec.requires) is None:
+            raise ValueError(f"MESSAGE_CODEC {codec.name!r} needs the {codec.requires!r} package installed")
+        return cls(
+            codec,
+            compression=settings.MESSAGE_COMPRESSION_ENABLED,
+            compress_min_bytes=settings.MESSAGE_COMPRESSION_MIN_BYTES,
+        )
+
+    def encode(self, payload: Dict[str, Any], schema_version: int) -> Tuple[str, Dict[str, dict]]:
+        """``(body, message attributes)`` for a payload, stamped with its schema version."""
+        data = self._codec.encode({SCHEMA_VERSION_FIELD: schema_version, **payload})
+        name = self._codec.name
+        binary = self._codec.binary
+        if self._compression and len(data) >= self._compress_min_bytes:
+            data = zlib.compress(data, self._compression_level)
+            name = f"{name}+{ZLIB}"
+            binary = True
+        body = base64.b64encode(data).decode("ascii") if binary else data.decode()
+        return body, {CODEC_ATTRIBUTE: {"DataType": "String", "StringValue": name}}
+
+
+def decode_body(body: str, codec_name: Optional[str] = None) -> Any:
+    """Payload of a message body encoded as ``codec_name`` (plain JSON when absent)."""
+    name, _, compression = (codec_name or JsonCodec.name).partition("+")
+    codec = CODECS.get(name)
+    if codec is None or compression not in ("", ZLIB):
+        raise ValueError(f"Unknown message codec {codec_name!r}")
+    if not codec.binary and not compression:
+        return codec.decode(body.encode())
+    data = base64.b64decode(body, validate=True)
+    if compression:
+        try:
+            data = zlib.decompress(data)
+        except zlib.error as exc:
+            raise ValueError("Malformed compressed message") from exc
+    return codec.decode(data)
+
+
+def codec_attribute(attributes: Optional[Dict[str, dict]]) -> Optional[str]:
+    """The ``codec`` attribute from SQS (``StringValue``) or SNS envelope (``Value``) attributes."""
+    attribute = (attributes or {}).get(CODEC_ATTRIBUTE)
+    if not attribute:
+        return None
+    return attribute.get("StringValue") or attribute.get("Value")
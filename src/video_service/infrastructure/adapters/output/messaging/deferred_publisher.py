@@ -0,0 +1,128 @@
+"""Deferred event publishing behind a circuit breaker.
+
+Only delivery failures are deferred: an open breaker, a deadline or timeout,
+connection errors and botocore/aiohttp errors. Anything else is a bug in
+building the message, which a retry would not fix; it is raised to the caller
+(or, in the backlog, logged and dropped).
+"""
+import asyncio
+import contextvars
+from collections import deque
+import logging
+from typing import Deque, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from video_service.application.ports.output.event_publisher import IEventPublisher
+from video_service.infrastructure.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    is_transport_error,
+)
+from video_service.infrastructure.tracing import SpanContext, current_context, reset_context, set_context
+from video_processor_shared.domain.events import DomainEvent
+
+BACKLOG_SIZE = Gauge("video_event_backlog_size", "Events waiting to be published")
+EVENTS_DEFERRED = Counter("video_events_deferred_total", "Events deferred because publishing failed or was open")
+EVENTS_DROPPED = Counter("video_event_backlog_dropped_total", "Deferred events dropped because the backlog was full")
+PUBLISH_FAILURES = Counter(
+    "video_event_publish_failures_total",
+    "Failed event publish attempts (circuit_open, delivery, or error for non-retryable failures)",
+    ["reason"],
+)
+
+logger = logging.getLogger(__name__)
+
+def is_delivery_error(error: BaseException) -> bool:
+    """Whether publishing failed on the way to the broker, so that a later retry may succeed."""
+    return isinstance(error, (CircuitOpenError, DeadlineExceededError)) or is_transport_error(error)
+
+
+def _record_failure(error: BaseException, event: DomainEvent) -> None:
+    if isinstance(error, CircuitOpenError):
+        # Expected while the broker is down; the breaker has its own metrics and logs.
+        PUBLISH_FAILURES.labels(reason="circuit_open").inc()
+        return
+    PUBLISH_FAILURES.labels(reason="delivery").inc()
+    logger.warning("Publishing %s failed, deferring it", type(event).__name__, exc_info=error)
+
+
+class EventBacklog:
+    """Process-wide, bounded, in-memory backlog of events drained in the background.
+
+    The drainer waits for the breaker to allow a call (half-open trial) before
+    retrying, so a degraded broker is probed instead of hammered. Events still
+    queued when the process exits are lost; the backlog only bridges outages.
+    """
+
+    def __init__(self, circuit_breaker: CircuitBreaker, max_size: int = 10000, retry_interval: float = 1.0):
+        self.circuit_breaker = circuit_breaker
+        self._max_size = max_size
+        self._retry_interval = retry_interval
+        self._items: Deque[Tuple[DomainEvent, IEventPublisher, Optional[SpanContext]]] = deque()
+        self._drain_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._items)
+
+    def add(self, event: DomainEvent, publisher: IEventPublisher) -> None:
+        if len(self._items) >= self._max_size:
+            self._items.popleft()
+            EVENTS_DROPPED.inc()
+        # The event is published under the trace of the request that produced it.
+        self._items.append((event, publisher, current_context()))
+        EVENTS_DEFERRED.inc()
+        BACKLOG_SIZE.set(len(self._items))
+        if self._drain_task is None or self._drain_task.done():
+            # A fresh context keeps the drainer free of the triggering request's deadline.
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain(), context=contextvars.Context())
+
+    async def _drain(self) -> None:
+        while self._items:
+            wait = self.circuit_breaker.retry_after()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            event, publisher, trace_context = self._items[0]
+            token = set_context(trace_context)
+            try:
+                async with self.circuit_breaker.guard():
+                    await publisher.publish(event)
+            except Exception as exc:
+                if is_delivery_error(exc):
+                    _record_failure(exc, event)
+                    await asyncio.sleep(self._retry_interval)
+                    continue
+                PUBLISH_FAILURES.labels(reason="error").inc()
+                logger.error("Dropping deferred %s that cannot be published", type(event).__name__, exc_info=exc)
+            finally:
+                reset_context(token)
+            self._items.popleft()
+            BACKLOG_SIZE.set(len(self._items))
+
+
+class DeferredEventPublisher(IEventPublisher):
+    """Publishes through a circuit breaker, deferring events instead of blocking the caller.
+
+    While the backlog is non-empty new events are appended to it, keeping
+    publication order.
+    """
+
+    def __init__(self, publisher: IEventPublisher, backlog: EventBacklog):
+        self._publisher = publisher
+        self._backlog = backlog
+
+    async def publish(self, event: DomainEvent) -> None:
+        if not self._backlog.pending:
+            try:
+                async with self._backlog.circuit_breaker.guard():
+                    await self._publisher.publish(event)
+                return
+            except Exception as exc:
+                if not is_delivery_error(exc):
+                    PUBLISH_FAILURES.labels(reason="error").inc()
+                    raise
+                _record_failure(exc, event)
+        self._backlog.add(event, self._publisher)
@@ -0,0 +1,82 @@
+"""Routing of processing jobs to SQS lanes.
+
+A lane is a queue plus limits on the jobs it takes: file size, duration and
+format. ``SQS_JOB_LANES`` lists them in order and a job goes to the first lane
+whose limits it fits, or to the ``default`` lane (``SQS_JOB_QUEUE_URL``) when
+none does. A lane only takes a job it knows fits: when a lane limits a value the
+job does not carry (duration is often unknown at upload time), the lane is
+skipped, so such jobs fall through to a lane without that limit or the default.
+Workers scale per queue, so short clips in a fast lane are not stuck behind
+bulk work queued elsewhere.
+
+Only ``SQSJobPublisher.send_job`` routes jobs; the upload path announces new
+videos on SNS and does not enqueue jobs itself.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+DEFAULT_LANE = "default"
+
+
+@dataclass(frozen=True)
+class JobLane:
+    name: str
+    queue_url: str
+    max_file_size: Optional[int] = None
+    max_duration: Optional[float] = None
+    # None accepts every format.
+    formats: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobLane":
+        unknown = set(data) - {"name", "queue_url", "max_file_size", "max_duration", "formats"}
+        if unknown or not data.get("name") or not data.get("queue_url"):
+            raise ValueError(f"Invalid job lane {data!r}: needs name and queue_url, got unknown keys {sorted(unknown)}")
+        formats = data.get("formats")
+        return cls(
+            name=data["name"],
+            queue_url=data["queue_url"],
+            max_file_size=data.get("max_file_size"),
+            max_duration=data.get("max_duration"),
+            formats=frozenset(f.lower() for f in formats) if formats is not None else None,
+        )
+
+    def accepts(self, file_size: Optional[int], duration: Optional[float], format: Optional[str]) -> bool:
+        """Whether the job fits every limit; an unknown value never fits a limit on it."""
+        if self.max_file_size is not None and (file_size is None or file_size > self.max_file_size):
+            return False
+        if self.max_duration is not None and (duration is None or duration > self.max_duration):
+            return False
+        if self.formats is not None and (format is None or format.lower() not in self.formats):
+            return False
+        return True
+
+
+class JobRouter:
+    """Picks the first lane a job fits, else the default lane."""
+
+    def __init__(self, default: JobLane, lanes: Iterable[JobLane] = ()):
+        self._default = default
+        self._lanes: List[JobLane] = list(lanes)
+        names = [lane.name for lane in self._lanes] + [default.name]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate job lane names in {names}")
+
+    @classmethod
+    def from_settings(cls, default_queue_url: Optional[str], lanes: Iterable[Dict[str, Any]]) -> "JobRouter":
+        return cls(JobLane(DEFAULT_LANE, default_queue_url or ""), [JobLane.from_dict(lane) for lane in lanes])
+
+    @property
+    def lanes(self) -> List[JobLane]:
+        return [*self._lanes, self._default]
+
+    def route(
+        self,
+        file_size: Optional[int] = None,
+        duration: Optional[float] = None,
+        format: Optional[str] = None,
+    ) -> JobLane:
+        for lane in self._lanes:
+            if lane.accepts(file_size, duration, format):
+                return lane
+        return self._default
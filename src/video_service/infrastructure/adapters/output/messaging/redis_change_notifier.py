@@ -0,0 +1,113 @@
+"""Redis Video Change Notifier.
+
+Each change is appended to the owner's capped Redis stream, which doubles as
+the replay buffer for ``Last-Event-ID`` resumes, and published on the owner's
+pub/sub channel as ``"<stream id>\\n<json>"``. Both happen in one Lua script
+so every published event has a replayable id.
+"""
+from functools import lru_cache
+import json
+import logging
+from typing import List
+from uuid import UUID
+
+from prometheus_client import Counter
+
+from video_service.application.ports.output.video_change_notifier import IVideoChangeNotifier, VideoChange
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.lazy_import import lazy_import
+from video_service.infrastructure.tracing import traced
+
+# The redis package imports its asyncio client; both load on first use.
+redis = lazy_import("redis")
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_FAILURES = Counter("video_events_notify_failures_total", "Video change notifications that could not be sent")
+
+_PUBLISH_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('PUBLISH', ARGV[4], id .. '\\n' .. ARGV[2])
+return id
+"""
+
+
+def events_channel(user_id: UUID) -> str:
+    return f"video-events:{user_id}"
+
+
+def events_stream_key(user_id: UUID) -> str:
+    return f"video-events:{user_id}:recent"
+
+
+def change_payload(change: VideoChange) -> str:
+    return json.dumps(
+        {
+            "type": change.kind,
+            "video_id": str(change.video_id),
+            "status": change.status,
+            "progress": change.progress,
+        }
+    )
+
+
+@lru_cache()
+def get_redis_client(url: str, socket_timeout: float = 1.0, connect_timeout: float = 0.5):
+    """Process-wide client (and connection pool) per URL; connects on first use.
+
+    The timeouts bound every command, so an unreachable Redis fails fast and the
+    callers' fallbacks (unprotected upload, dropped notification) kick in.
+    """
+    return redis.asyncio.from_url(
+        url,
+        decode_responses=True,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=connect_timeout,
+    )
+
+
+def redis_client_from_settings(settings: Settings):
+    return get_redis_client(
+        settings.REDIS_URL,
+        settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    )
+
+
+class RedisVideoChangeNotifier(IVideoChangeNotifier):
+    def __init__(self, redis, replay_size: int = 100, replay_ttl_seconds: int = 3600):
+        self._redis = redis
+        self._replay_size = replay_size
+        self._replay_ttl_seconds = replay_ttl_seconds
+        self._script = redis.register_script(_PUBLISH_SCRIPT)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RedisVideoChangeNotifier":
+        return cls(
+            redis_client_from_settings(settings),
+            replay_size=settings.VIDEO_EVENTS_REPLAY_SIZE,
+            replay_ttl_seconds=settings.VIDEO_EVENTS_REPLAY_TTL_SECONDS,
+        )
+
+    @traced("redis.notify")
+    async def notify(self, changes: List[VideoChange]) -> None:
+        if not changes:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for change in changes:
+                    await self._script(
+                        keys=[events_stream_key(change.user_id)],
+                        args=[
+                            self._replay_size,
+                            change_payload(change),
+                            self._replay_ttl_seconds,
+                            events_channel(change.user_id),
+                        ],
+                        client=pipe,
+                    )
+                await pipe.execute()
+        except Exception:
+            NOTIFY_FAILURES.inc(len(changes))
+            logger.warning("Could not publish %d video change notification(s)", len(changes), exc_info=True)
@@ -1,35 +1,51 @@
 """SNS Event Publisher."""
 from typing import Optional
-import json
-import aioboto3
 
 from video_service.application.ports.output.event_publisher import IEventPublisher
+from video_service.infrastructure.adapters.output.aws_clients import AwsClients, client_scope
+from video_service.infrastructure.adapters.output.messaging.codecs import JsonCodec, MessageEncoder
+from video_service.infrastructure.lazy_import import lazy_import
+from video_service.infrastructure.resilience import deadline_bound
+from video_service.infrastructure.tracing import inject_message_attributes, traced
 from video_processor_shared.domain.events import DomainEvent
 
+aioboto3 = lazy_import("aioboto3")
+
 
 class SNSEventPublisher(IEventPublisher):
-    def __init__(self, topic_arn: str, endpoint_url: Optional[str] = None, region: str = "us-east-1"):
+    SCHEMA_VERSION = 1
+
+    def __init__(
+        self,
+        topic_arn: str,
+        endpoint_url: Optional[str] = None,
+        region: str = "us-east-1",
+        clients: Optional[AwsClients] = None,
+        encoder: Optional[MessageEncoder] = None,
+    ):
         self._topic_arn = topic_arn
         self._endpoint_url = endpoint_url
         self._region = region
+        self._clients = clients
+        self._encoder = encoder or MessageEncoder(JsonCodec())
         self._session = aioboto3.Session()
 
+    @traced("sns.publish")
+    @deadline_bound("sns")
     async def publish(self, event: DomainEvent) -> None:
         if not self._topic_arn:
             return
 
-        async with self._session.client(
-            'sns',
-            endpoint_url=self._endpoint_url,
-            region_name=self._region,
-        ) as sns:
+        message, attributes = self._encoder.encode(event.to_dict(), self.SCHEMA_VERSION)
+        async with client_scope(self._clients, self._session, 'sns', self._endpoint_url, self._region) as sns:
             await sns.publish(
                 TopicArn=self._topic_arn,
-                Message=json.dumps(event.to_dict()),
-                MessageAttributes={
+                Message=message,
+                MessageAttributes=inject_message_attributes({
                     'event_type': {
                         'DataType': 'String',
                         'StringValue': event.event_type,
-                    }
-                },
+                    },
+                    **attributes,
+                }),
             )
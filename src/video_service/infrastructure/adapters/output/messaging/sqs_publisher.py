@@ -1,24 +1,55 @@
 """SQS Job Publisher for sending processing jobs to queue."""
 from typing import Optional
-import json
 import os
-import aioboto3
+
+from prometheus_client import Counter
+
+from video_service.infrastructure.adapters.output.aws_clients import AwsClients, client_scope
+from video_service.infrastructure.adapters.output.messaging.codecs import JsonCodec, MessageEncoder
+from video_service.infrastructure.adapters.output.messaging.job_routing import JobRouter
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.lazy_import import lazy_import
+from video_service.infrastructure.tracing import inject_message_attributes, traced
+
+aioboto3 = lazy_import("aioboto3")
+
+JOBS_ENQUEUED = Counter("video_jobs_enqueued_total", "Processing jobs sent, by lane", ["lane"])
+JOB_BYTES_ENQUEUED = Counter("video_job_bytes_enqueued_total", "File bytes of the processing jobs sent, by lane", ["lane"])
+JOB_ENQUEUE_FAILURES = Counter("video_job_enqueue_failures_total", "Processing jobs that could not be sent, by lane", ["lane"])
 
 
 class SQSJobPublisher:
     """Publishes video processing jobs to SQS queue."""
-    
+
+    SCHEMA_VERSION = 1
+
     def __init__(
         self,
         queue_url: Optional[str] = None,
         endpoint_url: Optional[str] = None,
         region: str = "us-east-1",
+        encoder: Optional[MessageEncoder] = None,
+        router: Optional[JobRouter] = None,
+        clients: Optional[AwsClients] = None,
     ):
-        self._queue_url = queue_url or os.getenv("SQS_JOB_QUEUE_URL")
         self._endpoint_url = endpoint_url or os.getenv("AWS_ENDPOINT_URL")
         self._region = region
+        self._clients = clients
+        self._encoder = encoder or MessageEncoder(JsonCodec())
+        self._router = router or JobRouter.from_settings(queue_url or os.getenv("SQS_JOB_QUEUE_URL"), [])
         self._session = aioboto3.Session()
+
+    @classmethod
+    def from_settings(cls, settings: Settings, clients: Optional[AwsClients] = None) -> "SQSJobPublisher":
+        return cls(
+            endpoint_url=settings.AWS_ENDPOINT_URL or None,
+            region=settings.AWS_DEFAULT_REGION,
+            encoder=MessageEncoder.from_settings(settings),
+            router=JobRouter.from_settings(settings.SQS_JOB_QUEUE_URL, settings.SQS_JOB_LANES),
+            clients=clients,
+        )
     
+    @traced("sqs.send_job")
     async def send_job(
         self,
         job_id: str,
@@ -26,9 +57,12 @@ class SQSJobPublisher:
         user_id: str,
         s3_key: str,
         user_email: str,
+        file_size: Optional[int] = None,
+        duration: Optional[float] = None,
+        format: Optional[str] = None,
     ) -> str:
         """
-        Send a video processing job to the queue.
+        Send a video processing job to the queue of its lane.
         
         Args:
             job_id: Unique job identifier
@@ -36,6 +70,9 @@ class SQSJobPublisher:
             user_id: User who uploaded the video
             s3_key: S3 key where video is stored
             user_email: Email to notify when processing completes
+            file_size: Size of the video in bytes, when known
+            duration: Duration of the video in seconds, when known
+            format: Container format, e.g. ``mp4``, when known
         
         Returns:
             SQS Message ID
@@ -47,20 +84,30 @@ class SQSJobPublisher:
             "s3_key": s3_key,
             "user_email": user_email,
         }
-        
-        async with self._session.client(
-            "sqs",
-            endpoint_url=self._endpoint_url,
-            region_name=self._region,
-        ) as sqs:
-            response = await sqs.send_message(
-                QueueUrl=self._queue_url,
-                MessageBody=json.dumps(message_body),
-                MessageAttributes={
-                    "job_type": {
-                        "DataType": "String",
-                        "StringValue": "video_processing",
-                    }
-                },
-            )
-            return response["MessageId"]
+        body, attributes = self._encoder.encode(message_body, self.SCHEMA_VERSION)
+        lane = self._router.route(file_size=file_size, duration=duration, format=format)
+
+        try:
+            async with client_scope(self._clients, self._session, "sqs", self._endpoint_url, self._region) as sqs:
+                response = await sqs.send_message(
+                    QueueUrl=lane.queue_url,
+                    MessageBody=body,
+                    MessageAttributes=inject_message_attributes({
+                        "job_type": {
+                            "DataType": "String",
+                            "StringValue": "video_processing",
+                        },
+                        "lane": {
+                            "DataType": "String",
+                            "StringValue": lane.name,
+                        },
+                        **attributes,
+                    }),
+                )
+        except Exception:
+            JOB_ENQUEUE_FAILURES.labels(lane=lane.name).inc()
+            raise
+        JOBS_ENQUEUED.labels(lane=lane.name).inc()
+        if file_size:
+            JOB_BYTES_ENQUEUED.labels(lane=lane.name).inc(file_size)
+        return response["MessageId"]
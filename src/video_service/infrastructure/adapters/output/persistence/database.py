@@ -1,25 +1,102 @@
 """Database Configuration."""
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
-from video_service.infrastructure.config import get_settings
+from video_service.infrastructure.adapters.output.persistence.query_metrics import instrument_engine
+from video_service.infrastructure.config import get_settings, Settings
 
 
 class Base(DeclarativeBase):
     pass
 
 
-settings = get_settings()
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+def _connect_args(database_url: str, prepared_statement_cache_size: int) -> dict:
+    """asyncpg keeps a per-connection LRU of prepared statements for hot queries."""
+    if "+asyncpg" in database_url:
+        return {"prepared_statement_cache_size": prepared_statement_cache_size}
+    return {}
+
+
+# Created on first use (normally by the app lifespan), never at import time.
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine, _session_factory
+    if _engine is None:
+        settings = get_settings()
+        _engine = create_async_engine(
+            settings.DATABASE_URL,
+            echo=settings.DEBUG,
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+            connect_args=_connect_args(settings.DATABASE_URL, settings.DB_PREPARED_STATEMENT_CACHE_SIZE),
+        )
+        if settings.DB_QUERY_METRICS_ENABLED:
+            instrument_engine(_engine, settings.DB_SLOW_QUERY_SECONDS)
+        _session_factory = async_sessionmaker(_engine, class_=AsyncSession, expire_on_commit=False)
+    return _engine
+
+
+def async_session() -> AsyncSession:
+    get_engine()
+    return _session_factory()
+
+
+async def dispose_engine() -> None:
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
+
+
+async def ping() -> None:
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_up_pool(connections: int) -> None:
+    """Open ``connections`` pool connections at once, so the first requests find them ready."""
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+def should_create_schema(settings: Settings) -> bool:
+    """Schema creation runs outside production unless DB_CREATE_SCHEMA says otherwise."""
+    if settings.DB_CREATE_SCHEMA is not None:
+        return settings.DB_CREATE_SCHEMA
+    return settings.APP_ENV != "production"
 
 
 async def init_db():
+    engine = get_engine()
+    settings = get_settings()
+    if not should_create_schema(settings):
+        return
+    # Register the mapped tables; nothing else may have imported the models yet.
+    from video_service.infrastructure.adapters.output.persistence import models  # noqa: F401
+
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await create_schema(conn, settings)
 
 
-async def get_db():
+async def create_schema(conn, settings: Settings) -> None:
+    """Create missing tables; ``videos`` is created partitioned when DB_PARTITION_VIDEOS is set."""
+    if settings.DB_PARTITION_VIDEOS and conn.dialect.name == "postgresql":
+        from video_service.infrastructure.adapters.output.persistence.partitioning import create_partitioned_schema
+
+        await create_partitioned_schema(conn, settings.DB_PARTITION_MONTHS_AHEAD)
+    await conn.run_sync(Base.metadata.create_all)
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Session that commits on success and rolls back on error."""
     async with async_session() as session:
         try:
             yield session
@@ -27,3 +104,9 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_db():
+    """FastAPI dependency: one session per request (the API imports it lazily)."""
+    async with session_scope() as session:
+        yield session
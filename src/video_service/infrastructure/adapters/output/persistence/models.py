@@ -2,7 +2,7 @@
 from datetime import UTC, datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy import DDL, BigInteger, DateTime, Float, Index, Integer, String, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,9 +11,31 @@ from video_service.infrastructure.adapters.output.persistence.database import Ba
 
 class VideoModel(Base):
     __tablename__ = "videos"
+    # One index per list ordering and filter, each led by user_id; id last keeps
+    # the (sort key, id) pagination order index-only.
+    __table_args__ = (
+        Index("ix_videos_user_created", "user_id", "created_at", "id"),
+        Index("ix_videos_user_size", "user_id", "file_size", "id"),
+        Index("ix_videos_user_filename", "user_id", "original_filename", "id"),
+        Index("ix_videos_user_format_created", "user_id", "format", "created_at", "id"),
+        # Asynchronous uploads not yet transferred, for the abandoned upload sweep.
+        Index(
+            "ix_videos_pending_created",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        # Filename substring search (ILIKE '%...%'); needs the pg_trgm extension.
+        Index(
+            "ix_videos_filename_trgm",
+            "original_filename",
+            postgresql_using="gin",
+            postgresql_ops={"original_filename": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     original_filename: Mapped[str] = mapped_column(String(512), nullable=False)
     file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
     file_size: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -24,3 +46,45 @@ class VideoModel(Base):
         default=lambda: datetime.now(UTC).replace(tzinfo=None),
         index=True,
     )
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="uploaded", server_default="uploaded")
+    progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+event.listen(
+    VideoModel.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+class VideoArchiveModel(Base):
+    """Cold videos moved out of ``videos`` a whole month at a time (see ``partitioning``).
+
+    Keeps only what is needed to find and remove a video's object later, with
+    no list indexes, so it stays small and cheap to append to.
+    """
+
+    __tablename__ = "videos_archive"
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    original_filename: Mapped[str] = mapped_column(String(512), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    file_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    format: Mapped[str] = mapped_column(String(50), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+
+
+class UserVideoStatsModel(Base):
+    """Per-user aggregate row, updated in the same transaction as the user's videos."""
+
+    __tablename__ = "user_video_stats"
+
+    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    # Bumped on every change to the user's videos; cheap marker for list ETags.
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    # Usage for quota checks; repair_usage reconciles drift against the videos table.
+    video_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    total_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
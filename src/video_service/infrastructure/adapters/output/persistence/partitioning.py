@@ -0,0 +1,159 @@
+"""Monthly range partitions of ``videos`` on ``created_at`` (PostgreSQL).
+
+Opt-in with ``DB_PARTITION_VIDEOS`` on a new database. The partitioned table
+has the model's columns and indexes, but ``(id, created_at)`` as primary key,
+since PostgreSQL requires the partition key in it. Partitions are named
+``videos_pYYYY_MM`` and must exist before rows for their month arrive, so
+``ensure_partitions`` is run ahead of time (see ``cli.manage_partitions``).
+There is no default partition, which keeps ``DETACH ... CONCURRENTLY``
+available for archival.
+
+Old months are archived whole: the partition is detached without blocking
+queries on ``videos``, then in one transaction its rows are copied into
+``videos_archive``, subtracted from the owners' usage and the partition is
+dropped. No row-by-row DELETE, so no vacuum debt on the live table.
+"""
+from datetime import UTC, date, datetime
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from video_service.infrastructure.adapters.output.persistence.models import VideoArchiveModel, VideoModel
+
+PARTITION_PREFIX = "videos_p"
+_PARTITION_NAME = re.compile(r"^videos_p(\d{4})_(\d{2})$")
+# Partitions already prune by created_at; a global created_at index would only add write cost.
+_UNPARTITIONED_ONLY_INDEXES = {"ix_videos_created_at"}
+ARCHIVE_COLUMNS = ", ".join(column.name for column in VideoArchiveModel.__table__.columns)
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def partitioned_videos_table() -> Table:
+    """``videos`` as declared by VideoModel, re-declared ``PARTITION BY RANGE (created_at)``."""
+    table = VideoModel.__table__.to_metadata(MetaData())
+    table.dialect_options["postgresql"]["partition_by"] = "RANGE (created_at)"
+    table.c.created_at.nullable = False
+    table.c.created_at.primary_key = True
+    table.append_constraint(PrimaryKeyConstraint(table.c.id, table.c.created_at))
+    for index in list(table.indexes):
+        if index.name in _UNPARTITIONED_ONLY_INDEXES:
+            table.indexes.discard(index)
+    return table
+
+
+def create_partition_sql(month: date) -> str:
+    month = month_start(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF videos "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    result = await conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('videos'))")
+    )
+    return bool(result.scalar())
+
+
+async def create_partitioned_schema(conn: AsyncConnection, months_ahead: int, today: Optional[date] = None) -> None:
+    """Create the partitioned ``videos`` and its first partitions; a no-op when it already exists."""
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    await conn.run_sync(lambda sync_conn: partitioned_videos_table().create(sync_conn, checkfirst=True))
+    await ensure_partitions(conn, months_ahead, today)
+
+
+async def list_partitions(conn: AsyncConnection) -> List[Tuple[str, bool]]:
+    """``(name, detach_pending)`` of each partition attached to ``videos``, oldest first."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname, i.inhdetachpending FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('videos') ORDER BY c.relname"
+        )
+    )
+    return [(row[0], bool(row[1])) for row in result.all()]
+
+
+async def list_detached_partitions(conn: AsyncConnection) -> List[str]:
+    """Month tables left behind by an interrupted archival (detached, not yet dropped)."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relname LIKE 'videos\\_p%' "
+            "AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid) ORDER BY c.relname"
+        )
+    )
+    return [row[0] for row in result.all() if partition_month(row[0]) is not None]
+
+
+async def ensure_partitions(conn: AsyncConnection, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """Create the partitions for the current month and months_ahead more; returns the new ones."""
+    current = month_start(today or datetime.now(UTC).date())
+    existing = {name for name, _ in await list_partitions(conn)}
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if partition_name(month) not in existing:
+            await conn.execute(text(create_partition_sql(month)))
+            created.append(partition_name(month))
+    return created
+
+
+def archivable(names: List[str], older_than_months: int, today: Optional[date] = None) -> List[str]:
+    """Partitions whose whole month is more than older_than_months before the current month."""
+    cutoff = add_months(month_start(today or datetime.now(UTC).date()), -older_than_months)
+    return [name for name in names if (month := partition_month(name)) is not None and month < cutoff]
+
+
+async def archive_partition(engine: AsyncEngine, name: str, detach_pending: bool = False) -> int:
+    """Move one month into ``videos_archive``; returns the number of rows archived."""
+    if partition_month(name) is None:
+        raise ValueError(f"Not a videos partition: {name}")
+
+    # DETACH CONCURRENTLY cannot run inside a transaction block.
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if detach_pending:
+            await conn.execute(text(f"ALTER TABLE videos DETACH PARTITION {name} FINALIZE"))
+        elif (name, False) in await list_partitions(conn):
+            await conn.execute(text(f"ALTER TABLE videos DETACH PARTITION {name} CONCURRENTLY"))
+
+    async with engine.begin() as conn:
+        # The rows leave the user's visible library: shrink usage and change the list ETag.
+        await conn.execute(
+            text(
+                "UPDATE user_video_stats AS s SET video_count = s.video_count - a.videos, "
+                "total_bytes = s.total_bytes - a.bytes, version = s.version + 1 "
+                f"FROM (SELECT user_id, count(*) AS videos, coalesce(sum(file_size), 0) AS bytes FROM {name} "
+                "GROUP BY user_id) AS a WHERE s.user_id = a.user_id"
+            )
+        )
+        # "WHERE true" lets SQLite parse ON CONFLICT after a SELECT; PostgreSQL ignores it.
+        result = await conn.execute(
+            text(
+                f"INSERT INTO videos_archive ({ARCHIVE_COLUMNS}) SELECT {ARCHIVE_COLUMNS} FROM {name} "
+                "WHERE true ON CONFLICT (id) DO NOTHING"
+            )
+        )
+        await conn.execute(text(f"DROP TABLE {name}"))
+    return result.rowcount
@@ -0,0 +1,170 @@
+"""SQL statement metrics, slow-query log and N+1 detection.
+
+``instrument_engine`` hooks the engine's cursor events. Each statement is
+normalized (placeholders unified, IN lists and multi-row VALUES collapsed)
+and identified by a short fingerprint, which labels its latency histogram;
+the normalized SQL of a fingerprint is logged once, the first time it runs.
+Statements slower than ``DB_SLOW_QUERY_SECONDS`` are logged with the types
+and sizes of their bind parameters, never the values.
+
+During an API request (see ``QueryStatsMiddleware``) the statements run are
+also counted per request; one statement run ``DB_N_PLUS_ONE_THRESHOLD`` times
+or more in the same request is reported as a likely N+1. An executemany
+counts once.
+
+The API imports this module for the request accounting, so SQLAlchemy itself
+is only imported by ``instrument_engine``.
+"""
+from contextvars import ContextVar
+from functools import lru_cache
+import hashlib
+import logging
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_DURATION = Histogram(
+    "video_db_statement_duration_seconds",
+    "SQL statement latency by normalized statement fingerprint",
+    ["operation", "statement"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+SLOW_STATEMENTS = Counter("video_db_slow_statements_total", "SQL statements over the slow-query threshold", ["statement"])
+QUERIES_PER_REQUEST = Histogram(
+    "video_db_queries_per_request",
+    "SQL statements run per API request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+N_PLUS_ONE = Counter(
+    "video_db_n_plus_one_total",
+    "Requests that ran one statement at least DB_N_PLUS_ONE_THRESHOLD times",
+    ["route", "statement"],
+)
+
+# Bounds the label cardinality should something build SQL with inlined literals.
+MAX_STATEMENTS = 1000
+OTHER_STATEMENT = "other"
+
+_PLACEHOLDER = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?|%\(\w+\)s|%s|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_ROW_LIST = re.compile(r"(\(\?(?:, \?)*\))(?:, \(\?(?:, \?)*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_statements: Dict[str, str] = {}
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "by_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.by_statement: Dict[str, int] = {}
+
+    def record(self, fingerprint: str) -> None:
+        self.count += 1
+        self.by_statement[fingerprint] = self.by_statement.get(fingerprint, 0) + 1
+
+
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def set_request_stats(stats: Optional[RequestQueryStats]):
+    return _request_stats.set(stats)
+
+
+def reset_request_stats(token) -> None:
+    _request_stats.reset(token)
+
+
+@lru_cache(maxsize=2048)
+def normalize(statement: str) -> str:
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _ROW_LIST.sub(r"\1, ...", sql)
+    return _PLACEHOLDER_LIST.sub("(?, ...)", sql)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """``(operation, fingerprint)`` of a raw statement."""
+    sql = normalize(statement)
+    operation = sql.split(" ", 1)[0].upper() or "?"
+    key = hashlib.blake2b(sql.encode(), digest_size=6).hexdigest()
+    if key not in _statements:
+        if len(_statements) >= MAX_STATEMENTS:
+            return operation, OTHER_STATEMENT
+        _statements[key] = sql
+        logger.info("SQL statement %s: %s", key, sql)
+    return operation, key
+
+
+def statement_sql(key: str) -> Optional[str]:
+    return _statements.get(key)
+
+
+def _shape(value: Any) -> str:
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types and sizes of the bind parameters, e.g. ``(UUID, str[12], int)``."""
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {parameter_shape(rows[0])}" if rows else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}: {_shape(value)}" for name, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_shape(value) for value in parameters) + ")"
+    return _shape(parameters)
+
+
+def record_statement(statement: str, parameters: Any, executemany: bool, elapsed: float, slow_seconds: float) -> None:
+    operation, key = fingerprint(statement)
+    STATEMENT_DURATION.labels(operation=operation, statement=key).observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(key)
+    if elapsed >= slow_seconds:
+        SLOW_STATEMENTS.labels(statement=key).inc()
+        logger.warning(
+            "Slow SQL statement %s took %.1f ms with parameters %s: %s",
+            key,
+            elapsed * 1000,
+            parameter_shape(parameters, executemany),
+            normalize(statement),
+        )
+
+
+def report_request(stats: RequestQueryStats, route: str, n_plus_one_threshold: int) -> None:
+    QUERIES_PER_REQUEST.labels(route=route).observe(stats.count)
+    for key, runs in stats.by_statement.items():
+        if runs >= n_plus_one_threshold:
+            N_PLUS_ONE.labels(route=route, statement=key).inc()
+            logger.warning(
+                "Possible N+1 in %s: statement %s ran %d times: %s", route, key, runs, statement_sql(key)
+            )
+
+
+def instrument_engine(engine, slow_seconds: float) -> None:
+    """Record every statement run through ``engine`` (sync or async)."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._video_query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_video_query_started", None)
+        if started is not None:
+            record_statement(statement, parameters, executemany, time.perf_counter() - started, slow_seconds)
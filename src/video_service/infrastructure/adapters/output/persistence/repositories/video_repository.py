@@ -1,21 +1,324 @@
 """SQLAlchemy Video Repository."""
-from datetime import UTC, datetime
-from typing import List, Optional
+from datetime import UTC, datetime, timedelta
+from typing import AsyncIterator, Collection, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    StatementLambdaElement,
+    String,
+    and_,
+    any_,
+    bindparam,
+    case,
+    delete,
+    func,
+    lambda_stmt,
+    or_,
+    select,
+    union,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from video_service.domain.entities.storage_quota import StorageQuota
 from video_service.domain.entities.video import Video
-from video_service.application.ports.output.repositories.video_repository import IVideoRepository
-from video_service.infrastructure.adapters.output.persistence.models import VideoModel
+from video_service.domain.exceptions import QuotaExceededError
+from video_service.application.ports.output.repositories.video_repository import (
+    IVideoRepository,
+    UsageRepairBatch,
+    UserUsage,
+    VideoQuery,
+    VideoStatusUpdate,
+)
+from video_service.infrastructure.adapters.output.persistence.models import (
+    UserVideoStatsModel,
+    VideoArchiveModel,
+    VideoModel,
+)
+from video_service.infrastructure.resilience import deadline_bound
+from video_service.infrastructure.tracing import traced
+
+
+# Read queries select plain columns instead of mapped objects: rows skip the
+# session identity map and are turned straight into entities.
+VIDEO_COLUMNS = (
+    VideoModel.id,
+    VideoModel.user_id,
+    VideoModel.original_filename,
+    VideoModel.file_path,
+    VideoModel.file_size,
+    VideoModel.format,
+    VideoModel.duration,
+    VideoModel.created_at,
+    VideoModel.version,
+    VideoModel.status,
+    VideoModel.progress,
+)
+
+
+def _created_at_range(video_ids: List[UUID]) -> Optional[Tuple[datetime, datetime]]:
+    """``[first, last + 1ms)`` of the creation times embedded in the ids, or None if an id has none.
+
+    Ids from ``Video.new_id`` carry the row's ``created_at``, the partition key
+    of a partitioned ``videos``: a range over it lets lookups by id skip the
+    other months. Older random ids give no range, and their lookups probe every
+    partition.
+    """
+    stamps = [Video.id_timestamp(video_id) for video_id in video_ids]
+    if not stamps or None in stamps:
+        return None
+    first = SQLAlchemyVideoRepository._to_db_datetime(min(stamps))
+    last = SQLAlchemyVideoRepository._to_db_datetime(max(stamps))
+    return first, last + timedelta(milliseconds=1)
+
+
+def _ids_condition(video_ids: List[UUID], dialect_name: str) -> ColumnElement[bool]:
+    """Ids matching any of video_ids, bounded by their created_at range when known."""
+    condition = _id_matches_any(video_ids, dialect_name)
+    created = _created_at_range(video_ids)
+    if created is None:
+        return condition
+    return and_(condition, VideoModel.created_at >= created[0], VideoModel.created_at < created[1])
+
+
+def _find_by_id_stmt(video_id: UUID) -> StatementLambdaElement:
+    created = _created_at_range([video_id])
+    if created is None:
+        return lambda_stmt(lambda: select(*VIDEO_COLUMNS).where(VideoModel.id == video_id))
+    first, end = created
+    return lambda_stmt(
+        lambda: select(*VIDEO_COLUMNS).where(
+            VideoModel.id == video_id, VideoModel.created_at >= first, VideoModel.created_at < end
+        )
+    )
+
+
+def _id_matches_any(video_ids: List[UUID], dialect_name: str) -> ColumnElement[bool]:
+    """``id = ANY(:video_ids)`` on PostgreSQL: one array parameter, one prepared statement.
+
+    Other dialects fall back to an expanding ``IN`` list.
+    """
+    if dialect_name == "postgresql":
+        return VideoModel.id == any_(bindparam("video_ids", video_ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+    return VideoModel.id.in_(video_ids)
+
+
+def _find_by_user_id_stmt(user_id: UUID, skip: int, limit: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(*VIDEO_COLUMNS)
+        .where(VideoModel.user_id == user_id)
+        .order_by(VideoModel.created_at.desc(), VideoModel.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def _count_by_user_id_stmt(user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(func.count()).where(VideoModel.user_id == user_id))
+
+
+SORT_COLUMNS = {
+    "created_at": VideoModel.created_at,
+    "file_size": VideoModel.file_size,
+    "original_filename": VideoModel.original_filename,
+}
+
+
+def _like_pattern(text: str) -> str:
+    """``%text%`` with LIKE wildcards in text escaped by backslash."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _query_conditions(user_id: UUID, query: VideoQuery) -> List[ColumnElement[bool]]:
+    """WHERE terms for a filtered list; each combination is served by a user_id-led index."""
+    conditions = [VideoModel.user_id == user_id]
+    if query.format:
+        conditions.append(VideoModel.format == query.format.lower())
+    if query.created_from is not None:
+        conditions.append(VideoModel.created_at >= SQLAlchemyVideoRepository._to_db_datetime(query.created_from))
+    if query.created_to is not None:
+        conditions.append(VideoModel.created_at <= SQLAlchemyVideoRepository._to_db_datetime(query.created_to))
+    if query.min_size is not None:
+        conditions.append(VideoModel.file_size >= query.min_size)
+    if query.max_size is not None:
+        conditions.append(VideoModel.file_size <= query.max_size)
+    if query.filename_contains:
+        conditions.append(VideoModel.original_filename.ilike(_like_pattern(query.filename_contains), escape="\\"))
+    return conditions
+
+
+def _find_by_query_stmt(user_id: UUID, query: VideoQuery, skip: int, limit: int):
+    sort_column = SORT_COLUMNS[query.sort_by]
+    order = (sort_column.desc(), VideoModel.id.desc()) if query.descending else (sort_column.asc(), VideoModel.id.asc())
+    return select(*VIDEO_COLUMNS).where(*_query_conditions(user_id, query)).order_by(*order).offset(skip).limit(limit)
+
+
+def _count_by_query_stmt(user_id: UUID, query: VideoQuery):
+    return select(func.count()).select_from(VideoModel).where(*_query_conditions(user_id, query))
+
+
+def _change_marker_stmt(user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(UserVideoStatsModel.version).where(UserVideoStatsModel.user_id == user_id))
+
+
+def _usage_stmt(user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(UserVideoStatsModel.video_count, UserVideoStatsModel.total_bytes).where(
+            UserVideoStatsModel.user_id == user_id
+        )
+    )
+
+
+def _upsert_user_stats(
+    dialect_name: str,
+    user_id: UUID,
+    video_count: int = 0,
+    total_bytes: int = 0,
+    quota: Optional[StorageQuota] = None,
+):
+    """``INSERT ... ON CONFLICT (user_id) DO UPDATE`` bumping the user's change version.
+
+    The usage deltas are applied in the same statement, so they commit or roll
+    back together with the video rows they account for. With a quota the update
+    only happens while the new totals fit (``DO UPDATE ... WHERE``), checked
+    against the locked row; ``RETURNING`` then yields no row when they do not.
+    """
+    insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+    stmt = insert(UserVideoStatsModel).values(
+        user_id=user_id,
+        version=1,
+        video_count=max(video_count, 0),
+        total_bytes=max(total_bytes, 0),
+    )
+    fits = []
+    if quota is not None and quota.max_videos:
+        fits.append(UserVideoStatsModel.video_count + video_count <= quota.max_videos)
+    if quota is not None and quota.max_bytes:
+        fits.append(UserVideoStatsModel.total_bytes + total_bytes <= quota.max_bytes)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserVideoStatsModel.user_id],
+        set_={
+            "version": UserVideoStatsModel.version + 1,
+            "video_count": UserVideoStatsModel.video_count + video_count,
+            "total_bytes": UserVideoStatsModel.total_bytes + total_bytes,
+        },
+        where=and_(*fits) if fits else None,
+    )
+    return stmt.returning(UserVideoStatsModel.user_id) if fits else stmt
+
+
+def _usage_user_ids_stmt(after_user_id: Optional[UUID], batch_size: int):
+    """Next batch of user ids found in either table, each side bounded by its own LIMIT."""
+    video_users = select(VideoModel.user_id.label("user_id")).distinct()
+    stats_users = select(UserVideoStatsModel.user_id.label("user_id"))
+    if after_user_id is not None:
+        video_users = video_users.where(VideoModel.user_id > after_user_id)
+        stats_users = stats_users.where(UserVideoStatsModel.user_id > after_user_id)
+    branches = [
+        branch.order_by("user_id").limit(batch_size).subquery() for branch in (video_users, stats_users)
+    ]
+    users = union(*(select(branch.c.user_id) for branch in branches)).subquery()
+    return select(users.c.user_id).order_by(users.c.user_id).limit(batch_size)
+
+
+_repair_usage_stmt = (
+    update(UserVideoStatsModel.__table__)
+    .where(UserVideoStatsModel.__table__.c.user_id == bindparam("b_user_id"))
+    .values(video_count=bindparam("b_video_count"), total_bytes=bindparam("b_total_bytes"))
+)
+
+
+def _status_rank(status) -> ColumnElement[int]:
+    return case(Video.STATUS_RANKS, value=status, else_=0)
+
+
+def _advances(status, progress) -> ColumnElement[bool]:
+    """The new (status, progress) moves the stored video forward and the video is not finished yet."""
+    return and_(
+        VideoModel.status.not_in(Video.TERMINAL_STATUSES),
+        or_(
+            _status_rank(status) > _status_rank(VideoModel.status),
+            and_(status == VideoModel.status, progress > VideoModel.progress),
+        ),
+    )
+
+
+def _apply_status_updates_stmt(updates: List[VideoStatusUpdate]):
+    """One ``UPDATE ... FROM unnest(:ids, :statuses, :progress)`` for the whole batch (PostgreSQL)."""
+    batch = (
+        select(
+            func.unnest(bindparam("ids", [u.video_id for u in updates], type_=ARRAY(PG_UUID(as_uuid=True)))).label("id"),
+            func.unnest(bindparam("statuses", [u.status for u in updates], type_=ARRAY(String))).label("status"),
+            func.unnest(bindparam("progress", [u.progress for u in updates], type_=ARRAY(Integer))).label("progress"),
+        )
+        .subquery("batch")
+    )
+    conditions = [VideoModel.id == batch.c.id, _advances(batch.c.status, batch.c.progress)]
+    created = _created_at_range([u.video_id for u in updates])
+    if created is not None:
+        conditions += [VideoModel.created_at >= created[0], VideoModel.created_at < created[1]]
+    return (
+        update(VideoModel)
+        .where(*conditions)
+        .values(status=batch.c.status, progress=batch.c.progress, version=VideoModel.version + 1)
+        .returning(VideoModel.id, VideoModel.user_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _apply_status_update_stmt(update_: VideoStatusUpdate):
+    conditions = [VideoModel.id == update_.video_id, _advances(update_.status, update_.progress)]
+    created = _created_at_range([update_.video_id])
+    if created is not None:
+        conditions += [VideoModel.created_at >= created[0], VideoModel.created_at < created[1]]
+    return (
+        update(VideoModel)
+        .where(*conditions)
+        .values(status=update_.status, progress=update_.progress, version=VideoModel.version + 1)
+        .returning(VideoModel.id, VideoModel.user_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _fail_stale_pending_stmt(created_before: datetime, keep: Collection[UUID], limit: int, dialect_name: str):
+    """Fail the oldest pending rows; the outer ``status`` check skips rows a transfer finished meanwhile."""
+    stale = (
+        select(VideoModel.id)
+        .where(VideoModel.status == Video.STATUS_PENDING, VideoModel.created_at < created_before)
+        .order_by(VideoModel.created_at)
+        .limit(limit)
+    )
+    if keep:
+        stale = stale.where(~_id_matches_any(list(keep), dialect_name))
+    return (
+        update(VideoModel)
+        .where(
+            VideoModel.id.in_(stale.scalar_subquery()),
+            VideoModel.status == Video.STATUS_PENDING,
+            VideoModel.created_at < created_before,
+        )
+        .values(status=Video.STATUS_FAILED, version=VideoModel.version + 1)
+        .returning(VideoModel.id, VideoModel.user_id)
+        .execution_options(synchronize_session=False)
+    )
 
 
 class SQLAlchemyVideoRepository(IVideoRepository):
     def __init__(self, session: AsyncSession):
         self._session = session
 
-    async def save(self, video: Video) -> Video:
+    @traced("db.save")
+    @deadline_bound("db")
+    async def save(self, video: Video, quota: Optional[StorageQuota] = None) -> Video:
+        if quota is not None and not quota.is_unlimited:
+            # A first video creates the usage row unchecked, so it must fit an empty quota.
+            quota.check(0, 0, video.file_size)
         model = VideoModel(
             id=video.id,
             user_id=video.user_id,
@@ -25,53 +328,234 @@ class SQLAlchemyVideoRepository(IVideoRepository):
             format=video.format,
             duration=video.duration,
             created_at=self._to_db_datetime(video.created_at),
+            version=video.version,
+            status=video.status,
+            progress=video.progress,
         )
         self._session.add(model)
         await self._session.flush()
+        # Last statement before commit: it locks the user's stats row until then.
+        if quota is None or quota.is_unlimited:
+            await self._bump_change_marker(video.user_id, video_count=1, total_bytes=video.file_size)
+            return video
+        result = await self._session.execute(
+            _upsert_user_stats(self._dialect_name(), video.user_id, 1, video.file_size, quota)
+        )
+        if result.one_or_none() is None:
+            # The usage row is locked now, so this reports the totals that did not fit.
+            usage = await self.get_usage(video.user_id)
+            quota.check(usage.video_count, usage.total_bytes, video.file_size)
+            raise QuotaExceededError("Storage quota exceeded")
         return video
 
+    @traced("db.find_by_id")
+    @deadline_bound("db")
     async def find_by_id(self, video_id: UUID) -> Optional[Video]:
-        stmt = select(VideoModel).where(VideoModel.id == video_id)
+        result = await self._session.execute(_find_by_id_stmt(video_id))
+        row = result.one_or_none()
+        return self._to_entity(row) if row else None
+
+    @traced("db.find_by_ids")
+    @deadline_bound("db")
+    async def find_by_ids(self, video_ids: List[UUID]) -> List[Video]:
+        if not video_ids:
+            return []
+        stmt = select(*VIDEO_COLUMNS).where(_ids_condition(list(video_ids), self._dialect_name()))
         result = await self._session.execute(stmt)
-        model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        return [self._to_entity(row) for row in result.all()]
 
-    async def find_by_user_id(self, user_id: UUID, skip: int = 0, limit: int = 10) -> List[Video]:
-        stmt = (
-            select(VideoModel)
-            .where(VideoModel.user_id == user_id)
-            .order_by(VideoModel.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
+    @traced("db.find_by_user_id")
+    @deadline_bound("db")
+    async def find_by_user_id(
+        self,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 10,
+        query: Optional[VideoQuery] = None,
+    ) -> List[Video]:
+        if query is None or query.is_default:
+            stmt = _find_by_user_id_stmt(user_id, skip, limit)
+        else:
+            stmt = _find_by_query_stmt(user_id, query, skip, limit)
         result = await self._session.execute(stmt)
-        return [self._to_entity(m) for m in result.scalars().all()]
+        return [self._to_entity(row) for row in result.all()]
 
+    @traced("db.delete")
+    @deadline_bound("db")
     async def delete(self, video_id: UUID) -> bool:
-        stmt = select(VideoModel).where(VideoModel.id == video_id)
+        stmt = select(VideoModel).where(_ids_condition([video_id], self._dialect_name()))
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
         if model:
             await self._session.delete(model)
             await self._session.flush()
+            await self._bump_change_marker(model.user_id, video_count=-1, total_bytes=-model.file_size)
             return True
         return False
 
-    async def count_by_user_id(self, user_id: UUID) -> int:
-        stmt = select(func.count()).where(VideoModel.user_id == user_id)
+    @traced("db.delete_by_ids")
+    @deadline_bound("db")
+    async def delete_by_ids(self, video_ids: List[UUID], user_id: UUID) -> List[Tuple[UUID, str]]:
+        if not video_ids:
+            return []
+        stmt = (
+            delete(VideoModel)
+            .where(_ids_condition(list(video_ids), self._dialect_name()), VideoModel.user_id == user_id)
+            .returning(VideoModel.id, VideoModel.file_path, VideoModel.file_size)
+            .execution_options(synchronize_session=False)
+        )
         result = await self._session.execute(stmt)
+        rows = result.all()
+        if rows:
+            await self._bump_change_marker(
+                user_id,
+                video_count=-len(rows),
+                total_bytes=-sum(row.file_size for row in rows),
+            )
+        return [(row.id, row.file_path) for row in rows]
+
+    @traced("db.count_by_user_id")
+    @deadline_bound("db")
+    async def count_by_user_id(self, user_id: UUID, query: Optional[VideoQuery] = None) -> int:
+        if query is None or query.is_default:
+            stmt = _count_by_user_id_stmt(user_id)
+        else:
+            stmt = _count_by_query_stmt(user_id, query)
+        result = await self._session.execute(stmt)
+        return result.scalar() or 0
+
+    @traced("db.get_change_marker")
+    @deadline_bound("db")
+    async def get_change_marker(self, user_id: UUID) -> int:
+        result = await self._session.execute(_change_marker_stmt(user_id))
         return result.scalar() or 0
 
-    def _to_entity(self, model: VideoModel) -> Video:
+    @traced("db.get_usage")
+    @deadline_bound("db")
+    async def get_usage(self, user_id: UUID) -> UserUsage:
+        result = await self._session.execute(_usage_stmt(user_id))
+        row = result.one_or_none()
+        return UserUsage(video_count=row.video_count, total_bytes=row.total_bytes) if row else UserUsage()
+
+    @traced("db.repair_usage")
+    @deadline_bound("db")
+    async def repair_usage(self, after_user_id: Optional[UUID] = None, batch_size: int = 500) -> UsageRepairBatch:
+        result = await self._session.execute(_usage_user_ids_stmt(after_user_id, batch_size))
+        user_ids = list(result.scalars().all())
+        if not user_ids:
+            return UsageRepairBatch()
+
+        insert = sqlite.insert if self._dialect_name() == "sqlite" else postgresql.insert
+        await self._session.execute(
+            insert(UserVideoStatsModel)
+            .values([{"user_id": user_id} for user_id in user_ids])
+            .on_conflict_do_nothing(index_elements=[UserVideoStatsModel.user_id])
+        )
+        # Locking the aggregate rows first makes concurrent saves and deletes wait
+        # for this batch, so their deltas land on top of the recomputed totals.
+        stored = await self._session.execute(
+            select(UserVideoStatsModel.user_id, UserVideoStatsModel.video_count, UserVideoStatsModel.total_bytes)
+            .where(UserVideoStatsModel.user_id.in_(user_ids))
+            .with_for_update()
+        )
+        stored_usage = {row.user_id: (row.video_count, row.total_bytes) for row in stored.all()}
+        actual = await self._session.execute(
+            select(VideoModel.user_id, func.count(), func.coalesce(func.sum(VideoModel.file_size), 0))
+            .where(VideoModel.user_id.in_(user_ids))
+            .group_by(VideoModel.user_id)
+        )
+        actual_usage = {user_id: (count, total) for user_id, count, total in actual.all()}
+
+        repairs = []
+        for user_id in user_ids:
+            count, total = actual_usage.get(user_id, (0, 0))
+            if stored_usage.get(user_id) != (count, total):
+                repairs.append({"b_user_id": user_id, "b_video_count": count, "b_total_bytes": total})
+        if repairs:
+            await self._session.execute(_repair_usage_stmt, repairs)
+        return UsageRepairBatch(last_user_id=user_ids[-1], checked=len(user_ids), repaired=len(repairs))
+
+    @traced("db.apply_status_updates")
+    @deadline_bound("db")
+    async def apply_status_updates(self, updates: List[VideoStatusUpdate]) -> List[Tuple[UUID, UUID]]:
+        if not updates:
+            return []
+        if self._dialect_name() == "postgresql":
+            result = await self._session.execute(_apply_status_updates_stmt(updates))
+            applied = [(row.id, row.user_id) for row in result.all()]
+        else:
+            applied = []
+            for update_ in updates:
+                result = await self._session.execute(_apply_status_update_stmt(update_))
+                applied.extend((row.id, row.user_id) for row in result.all())
+        # List ETags must change when a video's status does.
+        for user_id in sorted({user_id for _, user_id in applied}):
+            await self._bump_change_marker(user_id)
+        return applied
+
+    @traced("db.fail_stale_pending")
+    @deadline_bound("db")
+    async def fail_stale_pending(
+        self, created_before: datetime, keep: Collection[UUID] = (), limit: int = 100
+    ) -> List[Tuple[UUID, UUID]]:
+        result = await self._session.execute(
+            _fail_stale_pending_stmt(self._to_db_datetime(created_before), keep, limit, self._dialect_name())
+        )
+        failed = [(row.id, row.user_id) for row in result.all()]
+        for user_id in sorted({user_id for _, user_id in failed}):
+            await self._bump_change_marker(user_id)
+        return failed
+
+    @traced("db.commit")
+    @deadline_bound("db")
+    async def commit(self) -> None:
+        await self._session.commit()
+
+    async def iter_file_paths(self, path_prefix: str, batch_size: int = 1000) -> AsyncIterator[str]:
+        # Archived videos keep their objects, so their paths count as referenced too.
+        paths = union_all(
+            *(
+                select(model.file_path.label("file_path")).where(
+                    model.file_path.startswith(path_prefix, autoescape=True)
+                )
+                for model in (VideoModel, VideoArchiveModel)
+            )
+        ).subquery("paths")
+        # Byte-order sorting must match S3 listing order; "C" collation gives that on PostgreSQL.
+        order_column = paths.c.file_path
+        if self._dialect_name() == "postgresql":
+            order_column = paths.c.file_path.collate("C")
+        stmt = (
+            select(paths.c.file_path)
+            .order_by(order_column)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream_scalars(stmt)
+        async for file_path in result:
+            yield file_path
+
+    async def _bump_change_marker(self, user_id: UUID, video_count: int = 0, total_bytes: int = 0) -> None:
+        await self._session.execute(_upsert_user_stats(self._dialect_name(), user_id, video_count, total_bytes))
+
+    def _dialect_name(self) -> str:
+        bind = getattr(self._session, "bind", None)
+        dialect = getattr(bind, "dialect", None)
+        return getattr(dialect, "name", "postgresql")
+
+    def _to_entity(self, row) -> Video:
+        """Build an entity from a projected row (or any object exposing the video columns)."""
         return Video(
-            id=model.id,
-            user_id=model.user_id,
-            original_filename=model.original_filename,
-            file_path=model.file_path,
-            file_size=model.file_size,
-            format=model.format,
-            duration=model.duration,
-            created_at=self._from_db_datetime(model.created_at),
+            id=row.id,
+            user_id=row.user_id,
+            original_filename=row.original_filename,
+            file_path=row.file_path,
+            file_size=row.file_size,
+            format=row.format,
+            duration=row.duration,
+            created_at=self._from_db_datetime(row.created_at),
+            version=row.version,
+            status=row.status,
+            progress=row.progress,
         )
 
     @staticmethod
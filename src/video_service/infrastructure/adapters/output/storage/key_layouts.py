@@ -0,0 +1,61 @@
+"""S3 key layouts.
+
+``S3_KEY_LAYOUT`` picks how new uploads are keyed. ``user`` (the default) is
+``videos/{user_id}/{video_id}.{format}``, so one heavy user's uploads share a
+prefix and S3's per-prefix request rate. ``hashed`` puts the first
+``S3_KEY_HASH_CHARS`` hex characters of a hash of the video id after the root,
+``videos/{hash}/{user_id}/{video_id}.{format}``, spreading every user's
+uploads over ``16 ** S3_KEY_HASH_CHARS`` prefixes. Both keep the ``videos/``
+root, so storage reconciliation scans old and new keys alike.
+"""
+import hashlib
+from uuid import UUID
+
+from video_service.application.ports.output.storage_key_layout import IStorageKeyLayout
+from video_service.infrastructure.config import Settings
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+class UserKeyLayout(IStorageKeyLayout):
+    """``videos/{user_id}/{video_id}.{format}``: each user's files under one prefix."""
+
+    ROOT = "videos"
+
+    def key_for(self, user_id: UUID, video_id: UUID, file_format: str) -> str:
+        return f"{self.ROOT}/{user_id}/{video_id}.{file_format}"
+
+    def partition(self, key: str) -> str:
+        # One value per user would be unbounded.
+        return key.split("/", 1)[0]
+
+
+class HashedKeyLayout(IStorageKeyLayout):
+    def __init__(self, hash_chars: int = 2, root: str = UserKeyLayout.ROOT):
+        if not 1 <= hash_chars <= 8:
+            raise ValueError(f"hash_chars must be between 1 and 8, got {hash_chars}")
+        self._hash_chars = hash_chars
+        self._root = root
+
+    def key_for(self, user_id: UUID, video_id: UUID, file_format: str) -> str:
+        digest = hashlib.sha256(video_id.bytes).hexdigest()[: self._hash_chars]
+        return f"{self._root}/{digest}/{user_id}/{video_id}.{file_format}"
+
+    def partition(self, key: str) -> str:
+        root, _, rest = key.partition("/")
+        shard = rest.split("/", 1)[0]
+        if root == self._root and len(shard) == self._hash_chars and set(shard) <= _HEX_DIGITS:
+            return f"{root}/{shard}"
+        # Keys from an earlier layout.
+        return root
+
+
+KEY_LAYOUTS = ("user", "hashed")
+
+
+def key_layout_from_settings(settings: Settings) -> IStorageKeyLayout:
+    if settings.S3_KEY_LAYOUT == "hashed":
+        return HashedKeyLayout(settings.S3_KEY_HASH_CHARS)
+    if settings.S3_KEY_LAYOUT == "user":
+        return UserKeyLayout()
+    raise ValueError(f"Unknown S3_KEY_LAYOUT {settings.S3_KEY_LAYOUT!r}; expected one of {sorted(KEY_LAYOUTS)}")
@@ -0,0 +1,128 @@
+"""Local disk staging for asynchronous uploads.
+
+Each upload is two files in the staging directory: ``{video_id}.video`` with
+the content and ``{video_id}.json`` with its ``StagedUpload`` metadata. Both
+are written to a ``.part`` file, fsynced and renamed into place, content
+first, and the directory is fsynced after the renames. An upload is staged once
+its metadata exists, so a crash while staging leaves only files that
+``list_staged`` removes. The directory must outlive the process and belong to
+one pod: a Deployment's pods cannot each keep a volume across restarts, so run
+the API as the StatefulSet in ``k8s/overlays/async-uploads``, whose
+``volumeClaimTemplates`` give every pod its own claim.
+"""
+import asyncio
+from io import BytesIO
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+from typing import BinaryIO, List, Optional
+from uuid import UUID
+
+from video_service.application.ports.output.upload_staging import IUploadStaging, StagedUpload
+
+logger = logging.getLogger(__name__)
+
+CONTENT_SUFFIX = ".video"
+METADATA_SUFFIX = ".json"
+PARTIAL_SUFFIX = ".part"
+
+
+def _fsync_directory(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_durably(path: Path, source: BinaryIO) -> None:
+    partial = path.with_name(path.name + PARTIAL_SUFFIX)
+    with open(partial, "wb") as out:
+        shutil.copyfileobj(source, out, 1024 * 1024)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(partial, path)
+
+
+class LocalUploadStaging(IUploadStaging):
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _content_path(self, video_id: UUID) -> Path:
+        return self._directory / f"{video_id}{CONTENT_SUFFIX}"
+
+    def _metadata_path(self, video_id: UUID) -> Path:
+        return self._directory / f"{video_id}{METADATA_SUFFIX}"
+
+    async def stage(self, upload: StagedUpload, file: BinaryIO) -> None:
+        await asyncio.to_thread(self._stage, upload, file)
+
+    def _stage(self, upload: StagedUpload, file: BinaryIO) -> None:
+        file.seek(0)
+        _write_durably(self._content_path(upload.video_id), file)
+        metadata = {
+            "video_id": str(upload.video_id),
+            "user_id": str(upload.user_id),
+            "filename": upload.filename,
+            "storage_key": upload.storage_key,
+            "content_type": upload.content_type,
+            "file_size": upload.file_size,
+            "region": upload.region,
+        }
+        _write_durably(self._metadata_path(upload.video_id), BytesIO(json.dumps(metadata).encode()))
+        _fsync_directory(self._directory)
+
+    def open(self, video_id: UUID) -> BinaryIO:
+        return open(self._content_path(video_id), "rb")
+
+    async def discard(self, video_id: UUID) -> None:
+        await asyncio.to_thread(self._discard, video_id)
+
+    def _discard(self, video_id: UUID) -> None:
+        # Metadata first: without it the content is no longer a staged upload.
+        self._metadata_path(video_id).unlink(missing_ok=True)
+        self._content_path(video_id).unlink(missing_ok=True)
+
+    async def list_staged(self) -> List[StagedUpload]:
+        return await asyncio.to_thread(self._list_staged)
+
+    def _list_staged(self) -> List[StagedUpload]:
+        staged: List[StagedUpload] = []
+        for path in sorted(self._directory.iterdir()):
+            if path.suffix == PARTIAL_SUFFIX:
+                path.unlink(missing_ok=True)
+            elif path.suffix == METADATA_SUFFIX:
+                upload = self._read_metadata(path)
+                if upload is not None:
+                    staged.append(upload)
+        kept = {f"{upload.video_id}{CONTENT_SUFFIX}" for upload in staged}
+        for path in self._directory.glob(f"*{CONTENT_SUFFIX}"):
+            if path.name not in kept:
+                path.unlink(missing_ok=True)
+        return staged
+
+    def _read_metadata(self, path: Path) -> Optional[StagedUpload]:
+        try:
+            data = json.loads(path.read_text())
+            upload = StagedUpload(
+                video_id=UUID(data["video_id"]),
+                user_id=UUID(data["user_id"]),
+                filename=data["filename"],
+                storage_key=data["storage_key"],
+                content_type=data["content_type"],
+                file_size=int(data["file_size"]),
+                region=data.get("region"),
+            )
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Discarding unreadable staged upload metadata %s", path.name)
+            path.unlink(missing_ok=True)
+            return None
+        if not self._content_path(upload.video_id).exists():
+            logger.warning("Discarding staged upload %s without content", upload.video_id)
+            path.unlink(missing_ok=True)
+            return None
+        return upload
+
@@ -0,0 +1,157 @@
+"""Storage spread over buckets in several regions.
+
+``S3_BUCKET`` in ``AWS_DEFAULT_REGION`` is the default region; ``STORAGE_REGIONS``
+adds others as ``{"name", "bucket", "region", "endpoint_url", "hints"}``. An
+upload goes to the region whose name, AWS region or one of whose ``hints``
+matches the request's region hint (the ``STORAGE_REGION_HINT_HEADER`` header,
+e.g. set by the CDN from the client's location), else to the default region.
+
+Paths are ``s3://{bucket}/{key}`` as with a single bucket, so ``file_path``
+records where each object lives and older paths resolve to the default
+bucket. Downloads are signed, and deletes sent, against the bucket in the
+path, with that region's endpoint and credentials scope. Listing
+(``iter_objects``) covers the default bucket only; reconcile other buckets by
+running the reconciliation with their ``S3_BUCKET`` and region.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from video_service.application.ports.output.storage_key_layout import IStorageKeyLayout
+from video_service.application.ports.output.storage_service import IStorageService, StoredObject
+from video_service.infrastructure.adapters.output.aws_clients import AwsClients
+from video_service.infrastructure.adapters.output.storage.s3_storage import S3StorageService
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.resilience import CircuitBreaker, get_circuit_breaker
+
+PATH_SCHEME = "s3://"
+
+
+@dataclass(frozen=True)
+class StorageRegion:
+    name: str
+    bucket: str
+    region: str
+    endpoint_url: Optional[str] = None
+    # Other region hints routed here, e.g. country codes.
+    hints: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], endpoint_url: Optional[str] = None) -> "StorageRegion":
+        unknown = set(data) - {"name", "bucket", "region", "endpoint_url", "hints"}
+        if unknown or not all(data.get(field) for field in ("name", "bucket", "region")):
+            raise ValueError(
+                f"Invalid storage region {data!r}: needs name, bucket and region, got unknown keys {sorted(unknown)}"
+            )
+        return cls(
+            name=data["name"],
+            bucket=data["bucket"],
+            region=data["region"],
+            endpoint_url=data.get("endpoint_url") or endpoint_url,
+            hints=frozenset(hint.lower() for hint in data.get("hints", ())),
+        )
+
+
+StoreFactory = Callable[[StorageRegion], IStorageService]
+
+
+def _s3_store(region: StorageRegion) -> IStorageService:
+    return S3StorageService(bucket=region.bucket, endpoint_url=region.endpoint_url, region=region.region)
+
+
+class MultiRegionStorageService(IStorageService):
+    """Routes uploads to a region by hint and every other call to the bucket in the path."""
+
+    def __init__(
+        self,
+        default: StorageRegion,
+        regions: Iterable[StorageRegion] = (),
+        store_factory: StoreFactory = _s3_store,
+    ):
+        self._default = default
+        self._regions: List[StorageRegion] = [default, *regions]
+        buckets = [region.bucket for region in self._regions]
+        names = [region.name for region in self._regions]
+        if len(set(buckets)) != len(buckets) or len(set(names)) != len(names):
+            raise ValueError(f"Storage regions need distinct names and buckets, got {names} / {buckets}")
+        self._stores: Dict[str, IStorageService] = {region.bucket: store_factory(region) for region in self._regions}
+        self._by_hint: Dict[str, StorageRegion] = {}
+        # Reversed, so the first region claiming a hint wins.
+        for region in reversed(self._regions):
+            for hint in (region.name, region.region, *region.hints):
+                self._by_hint[hint.lower()] = region
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        clients: Optional[AwsClients] = None,
+        key_layout: Optional[IStorageKeyLayout] = None,
+    ) -> "MultiRegionStorageService":
+        endpoint_url = settings.AWS_ENDPOINT_URL or None
+        default = StorageRegion(settings.AWS_DEFAULT_REGION, settings.S3_BUCKET, settings.AWS_DEFAULT_REGION, endpoint_url)
+
+        def store(region: StorageRegion) -> IStorageService:
+            # The shared clients and the "s3" breaker belong to the default region.
+            is_default = region is default
+            return S3StorageService(
+                bucket=region.bucket,
+                endpoint_url=region.endpoint_url,
+                region=region.region,
+                circuit_breaker=circuit_breaker if is_default else get_circuit_breaker(f"s3:{region.name}"),
+                clients=clients if is_default else None,
+                key_layout=key_layout,
+            )
+
+        regions = [StorageRegion.from_dict(data, endpoint_url) for data in settings.STORAGE_REGIONS]
+        return cls(default, regions, store_factory=store)
+
+    @property
+    def regions(self) -> List[StorageRegion]:
+        return list(self._regions)
+
+    def region_for(self, hint: Optional[str]) -> StorageRegion:
+        if not hint:
+            return self._default
+        return self._by_hint.get(hint.strip().lower(), self._default)
+
+    def _locate(self, key_or_path: str) -> Tuple[IStorageService, str]:
+        """Store and key of a storage path; bare keys are in the default bucket."""
+        if not key_or_path.startswith(PATH_SCHEME):
+            return self._stores[self._default.bucket], key_or_path
+        bucket, _, key = key_or_path[len(PATH_SCHEME):].partition("/")
+        store = self._stores.get(bucket)
+        if store is None:
+            raise ValueError(f"No storage region for bucket {bucket!r}")
+        return store, key
+
+    async def upload_file(self, file: BinaryIO, key: str, content_type: str, region: Optional[str] = None) -> str:
+        return await self._stores[self.region_for(region).bucket].upload_file(file, key, content_type)
+
+    async def get_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        store, key = self._locate(key)
+        return await store.get_presigned_url(key, expires_in)
+
+    async def delete_file(self, key: str) -> bool:
+        store, key = self._locate(key)
+        return await store.delete_file(key)
+
+    async def delete_files(self, paths: List[str]) -> List[str]:
+        by_store: Dict[int, Tuple[IStorageService, List[str]]] = {}
+        failed: List[str] = []
+        for path in paths:
+            try:
+                store, _ = self._locate(path)
+            except ValueError:
+                failed.append(path)
+                continue
+            by_store.setdefault(id(store), (store, []))[1].append(path)
+        results = await asyncio.gather(*(store.delete_files(group) for store, group in by_store.values()))
+        return failed + [path for result in results for path in result]
+
+    def storage_path(self, key: str, region: Optional[str] = None) -> str:
+        return self._stores[self.region_for(region).bucket].storage_path(key)
+
+    def iter_objects(self, prefix: str) -> AsyncIterator[StoredObject]:
+        return self._stores[self._default.bucket].iter_objects(prefix)
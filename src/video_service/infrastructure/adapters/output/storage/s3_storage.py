@@ -1,48 +1,156 @@
 """S3 Storage Service."""
-from typing import BinaryIO, Optional
-import aioboto3
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from typing import AsyncIterator, BinaryIO, Iterable, List, Optional
+import asyncio
 
-from video_service.application.ports.output.storage_service import IStorageService
+from prometheus_client import Counter
+
+from video_service.application.ports.output.storage_key_layout import IStorageKeyLayout
+from video_service.application.ports.output.storage_service import IStorageService, StoredObject
+from video_service.infrastructure.adapters.output.aws_clients import AwsClients, client_scope
+from video_service.infrastructure.adapters.output.storage.key_layouts import UserKeyLayout
+from video_service.infrastructure.lazy_import import lazy_import
+from video_service.infrastructure.resilience import CircuitBreaker, deadline_bound, deadline_scope
+from video_service.infrastructure.tracing import traced
+
+aioboto3 = lazy_import("aioboto3")
+
+# Counted once botocore's own retries gave up, so these are the throttles callers saw.
+S3_SLOWDOWNS = Counter(
+    "video_s3_slowdown_total",
+    "S3 requests throttled with 503 SlowDown, by key layout partition",
+    ["operation", "prefix"],
+)
+
+
+def is_slowdown(error: Exception) -> bool:
+    """Whether a botocore ClientError (checked by shape, botocore is not imported) is a 503 SlowDown."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    code = response.get("Error", {}).get("Code")
+    return code == "SlowDown" or response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 503
 
 
 class S3StorageService(IStorageService):
-    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: str = "us-east-1"):
+    DELETE_BATCH_SIZE = 1000  # DeleteObjects limit per call
+    DELETE_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: str = "us-east-1",
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        clients: Optional[AwsClients] = None,
+        key_layout: Optional[IStorageKeyLayout] = None,
+    ):
         self._bucket = bucket
         self._endpoint_url = endpoint_url
         self._region = region
+        self._circuit_breaker = circuit_breaker
+        self._clients = clients
+        self._key_layout = key_layout or UserKeyLayout()
         self._session = aioboto3.Session()
 
-    async def upload_file(self, file: BinaryIO, key: str, content_type: str) -> str:
-        async with self._session.client(
-            's3',
-            endpoint_url=self._endpoint_url,
-            region_name=self._region,
-        ) as s3:
-            await s3.upload_fileobj(
-                file,
-                self._bucket,
-                key,
-                ExtraArgs={'ContentType': content_type},
-            )
-        return f"s3://{self._bucket}/{key}"
+    @traced("s3.upload_file")
+    async def upload_file(self, file: BinaryIO, key: str, content_type: str, region: Optional[str] = None) -> str:
+        with self._count_slowdowns("upload", [key]):
+            async with self._call(), self._s3() as s3:
+                await s3.upload_fileobj(
+                    file,
+                    self._bucket,
+                    key,
+                    ExtraArgs={'ContentType': content_type},
+                )
+        return self.storage_path(key)
 
+    @traced("s3.get_presigned_url")
     async def get_presigned_url(self, key: str, expires_in: int = 3600) -> str:
-        async with self._session.client(
-            's3',
-            endpoint_url=self._endpoint_url,
-            region_name=self._region,
-        ) as s3:
+        async with self._call(), self._s3() as s3:
             return await s3.generate_presigned_url(
                 'get_object',
-                Params={'Bucket': self._bucket, 'Key': key},
+                Params={'Bucket': self._bucket, 'Key': self._key_from_path(key)},
                 ExpiresIn=expires_in,
             )
 
+    @traced("s3.delete_file")
     async def delete_file(self, key: str) -> bool:
-        async with self._session.client(
-            's3',
-            endpoint_url=self._endpoint_url,
-            region_name=self._region,
-        ) as s3:
-            await s3.delete_object(Bucket=self._bucket, Key=key)
-            return True
+        key = self._key_from_path(key)
+        with self._count_slowdowns("delete", [key]):
+            async with self._call(), self._s3() as s3:
+                await s3.delete_object(Bucket=self._bucket, Key=key)
+                return True
+
+    @traced("s3.delete_files")
+    @deadline_bound("s3")
+    async def delete_files(self, paths: List[str]) -> List[str]:
+        keys_to_paths = {self._key_from_path(path): path for path in paths}
+        keys = list(keys_to_paths)
+        if not keys:
+            return []
+
+        batches = [keys[i:i + self.DELETE_BATCH_SIZE] for i in range(0, len(keys), self.DELETE_BATCH_SIZE)]
+        semaphore = asyncio.Semaphore(self.DELETE_CONCURRENCY)
+
+        async with self._s3() as s3:
+
+            async def _delete_batch(batch: List[str]) -> List[str]:
+                async with semaphore:
+                    try:
+                        with self._count_slowdowns("delete", batch):
+                            async with self._guard():
+                                response = await s3.delete_objects(
+                                    Bucket=self._bucket,
+                                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True},
+                                )
+                    except Exception:
+                        return batch
+                errors = response.get('Errors', [])
+                self._record_slowdowns("delete", [e['Key'] for e in errors if e.get('Code') == 'SlowDown'])
+                return [error['Key'] for error in errors]
+
+            results = await asyncio.gather(*(_delete_batch(batch) for batch in batches))
+
+        return [keys_to_paths[key] for failed in results for key in failed]
+
+    def _key_from_path(self, path: str) -> str:
+        """Accept either a bare key or the ``s3://bucket/key`` path returned by upload_file."""
+        prefix = f"s3://{self._bucket}/"
+        return path[len(prefix):] if path.startswith(prefix) else path
+
+    @contextmanager
+    def _count_slowdowns(self, operation: str, keys: Iterable[str]):
+        try:
+            yield
+        except Exception as exc:
+            if is_slowdown(exc):
+                self._record_slowdowns(operation, keys)
+            raise
+
+    def _record_slowdowns(self, operation: str, keys: Iterable[str]) -> None:
+        for key in keys:
+            S3_SLOWDOWNS.labels(operation=operation, prefix=self._key_layout.partition(key)).inc()
+
+    def _s3(self):
+        return client_scope(self._clients, self._session, 's3', self._endpoint_url, self._region)
+
+    def _guard(self):
+        return self._circuit_breaker.guard() if self._circuit_breaker else nullcontext()
+
+    @asynccontextmanager
+    async def _call(self):
+        """Breaker around the remaining request budget, so the breaker sees deadline cut-offs."""
+        async with self._guard(), deadline_scope("s3"):
+            yield
+
+    def storage_path(self, key: str, region: Optional[str] = None) -> str:
+        return f"s3://{self._bucket}/{key}"
+
+    async def iter_objects(self, prefix: str) -> AsyncIterator[StoredObject]:
+        # ListObjectsV2 returns keys in UTF-8 binary order, one page (<= 1000 keys) at a time.
+        async with self._s3() as s3:
+            paginator = s3.get_paginator('list_objects_v2')
+            async for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    yield StoredObject(path=self.storage_path(obj['Key']), last_modified=obj['LastModified'])
@@ -0,0 +1,27 @@
+"""Deferred module imports.
+
+Heavy client libraries (aioboto3/botocore, httpx) are only needed once an
+adapter is used, so modules bind them with :func:`lazy_import` and the real
+import runs on first attribute access instead of at application import.
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return ``name`` as a module that is executed on first attribute access.
+
+    Pass a top-level package: finding ``pkg.sub`` imports ``pkg`` eagerly.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,30 @@
+"""Resilience primitives for outbound calls."""
+from video_service.infrastructure.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    get_circuit_breaker,
+    is_dependency_failure,
+    is_transport_error,
+)
+from video_service.infrastructure.resilience.deadline import (
+    DeadlineExceededError,
+    deadline_bound,
+    deadline_scope,
+    remaining,
+    reset_deadline,
+    set_deadline,
+)
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "get_circuit_breaker",
+    "is_dependency_failure",
+    "is_transport_error",
+    "DeadlineExceededError",
+    "deadline_bound",
+    "deadline_scope",
+    "remaining",
+    "reset_deadline",
+    "set_deadline",
+]
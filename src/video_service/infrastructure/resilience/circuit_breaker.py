@@ -0,0 +1,246 @@
+"""Circuit breaker for outbound dependencies.
+
+A breaker watches the outcome of the last ``window_size`` calls. Once at least
+``min_calls`` were seen and either the failure rate or the slow-call rate
+reaches its threshold, it opens and fails calls fast with CircuitOpenError for
+``open_seconds``. It then lets ``half_open_calls`` trial calls through: if all
+succeed it closes again, any failure re-opens it.
+
+Only errors that say the dependency is unhealthy are failures: transport
+errors, timeouts, 5xx answers and throttling. A 4xx answer (a missing key, a
+denied request) is the caller's problem and counts as a completed call.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from prometheus_client import Counter, Gauge
+
+from video_service.infrastructure.config import get_settings
+from video_service.infrastructure.resilience.deadline import DeadlineExceededError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+BREAKER_STATE = Gauge(
+    "video_circuit_breaker_state",
+    "Circuit breaker state (0=closed, 1=open, 2=half-open)",
+    ["name"],
+)
+BREAKER_CALLS = Counter(
+    "video_circuit_breaker_calls_total",
+    "Calls seen by a circuit breaker by outcome",
+    ["name", "outcome"],
+)
+BREAKER_TRANSITIONS = Counter(
+    "video_circuit_breaker_transitions_total",
+    "Circuit breaker state transitions",
+    ["name", "state"],
+)
+
+
+# Top-level packages whose exceptions are transport errors; checked by name, they are not imported here.
+_TRANSPORT_PACKAGES = ("botocore", "aiobotocore", "aiohttp")
+# AWS error codes for throttling, which some services send with a 400 status.
+_THROTTLING_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "SlowDown",
+    }
+)
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """Timeouts, connection errors and errors raised by the AWS/HTTP client libraries."""
+    if isinstance(error, (asyncio.TimeoutError, OSError)):
+        return True
+    return any(cls.__module__.split(".", 1)[0] in _TRANSPORT_PACKAGES for cls in type(error).__mro__)
+
+
+def is_dependency_failure(error: BaseException) -> bool:
+    """Whether an error counts against the dependency's health.
+
+    A botocore ClientError (checked by shape) counts only with a 5xx or 429
+    status or a throttling code; other errors count when they are transport errors.
+    """
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return status >= 500 or status == 429 or response.get("Error", {}).get("Code") in _THROTTLING_CODES
+    return is_transport_error(error)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 0.5,
+        slow_call_seconds: Optional[float] = None,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 3,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self._min_calls = min_calls
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._slow_call_seconds = slow_call_seconds
+        self._open_seconds = open_seconds
+        self._half_open_calls = half_open_calls
+        self._clock = clock
+        # (failed, slow) per recorded call
+        self._window: Deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials_started = 0
+        self._trials_succeeded = 0
+        BREAKER_STATE.labels(name=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self.retry_after() == 0:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial call through (0 when not open)."""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_seconds - self._clock())
+
+    def before_call(self) -> float:
+        """Reserve a call, raising CircuitOpenError when it must fail fast. Returns the start time."""
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._trials_started >= self._half_open_calls):
+            BREAKER_CALLS.labels(name=self.name, outcome="rejected").inc()
+            raise CircuitOpenError(self.name, self.retry_after() or self._open_seconds)
+        if state == HALF_OPEN:
+            self._trials_started += 1
+        return self._clock()
+
+    def record_success(self, started_at: float) -> None:
+        slow = self._slow_call_seconds is not None and self._clock() - started_at >= self._slow_call_seconds
+        self._record(failed=False, slow=slow)
+
+    def record_failure(self) -> None:
+        self._record(failed=True, slow=False)
+
+    def record_deadline_exceeded(self, started_at: float) -> None:
+        """A call cut short by the caller's deadline counts as slow once past the threshold, else it is abandoned."""
+        if self._slow_call_seconds is not None and self._clock() - started_at >= self._slow_call_seconds:
+            self._record(failed=False, slow=True)
+        else:
+            self.abandon()
+
+    def abandon(self) -> None:
+        """Give back a reserved call that ended without an outcome (e.g. cancellation)."""
+        if self._state == HALF_OPEN and self._trials_started > 0:
+            self._trials_started -= 1
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Run the enclosed call through the breaker.
+
+        Dependency failures count as failures; any other exception means the
+        dependency answered, so the call counts as completed.
+        """
+        started_at = self.before_call()
+        try:
+            yield
+        except DeadlineExceededError:
+            self.record_deadline_exceeded(started_at)
+            raise
+        except Exception as exc:
+            if is_dependency_failure(exc):
+                self.record_failure()
+            else:
+                self.record_success(started_at)
+            raise
+        except BaseException:
+            self.abandon()
+            raise
+        self.record_success(started_at)
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        outcome = "failure" if failed else ("slow" if slow else "success")
+        BREAKER_CALLS.labels(name=self.name, outcome=outcome).inc()
+
+        if self._state == HALF_OPEN:
+            if failed or slow:
+                self._open()
+                return
+            self._trials_succeeded += 1
+            if self._trials_succeeded >= self._half_open_calls:
+                self._transition(CLOSED)
+            return
+        if self._state == OPEN:
+            # A call admitted before the breaker opened finished late; nothing to decide.
+            return
+
+        self._window.append((failed, slow))
+        if len(self._window) < self._min_calls:
+            return
+        failures = sum(1 for f, _ in self._window if f)
+        slow_calls = sum(1 for _, s in self._window if s)
+        if (
+            failures / len(self._window) >= self._failure_rate_threshold
+            or slow_calls / len(self._window) >= self._slow_call_rate_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        self._trials_started = 0
+        self._trials_succeeded = 0
+        if state == CLOSED:
+            self._window.clear()
+        BREAKER_STATE.labels(name=self.name).set(_STATE_VALUES[state])
+        BREAKER_TRANSITIONS.labels(name=self.name, state=state).inc()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str, slow_call_seconds: Optional[float] = None) -> Optional[CircuitBreaker]:
+    """Process-wide breaker for a dependency, or None when breakers are disabled."""
+    settings = get_settings()
+    if not settings.CIRCUIT_BREAKER_ENABLED:
+        return None
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(
+            name,
+            window_size=settings.CIRCUIT_BREAKER_WINDOW_SIZE,
+            min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+            failure_rate_threshold=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+            slow_call_rate_threshold=settings.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+            slow_call_seconds=slow_call_seconds,
+            open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+        )
+    return _breakers[name]
@@ -0,0 +1,81 @@
+"""Per-request deadlines for outbound calls.
+
+The API sets an absolute deadline for the current request (see
+``DeadlineMiddleware``). Every outbound call runs inside ``deadline_scope``,
+which gives the call only the remaining budget as its timeout and raises
+DeadlineExceededError, without starting the call, once the budget is gone.
+Outside a request (CLI, background tasks) there is no deadline and calls run
+unbounded.
+"""
+import asyncio
+import functools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from prometheus_client import Counter
+
+DEADLINE_EXCEEDED = Counter(
+    "video_deadline_exceeded_total",
+    "Requests that ran out of deadline budget, by the stage that hit it",
+    ["stage"],
+)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    def __init__(self, stage: str):
+        super().__init__(f"Request deadline exceeded during '{stage}'")
+        self.stage = stage
+
+
+def set_deadline(budget_seconds: Optional[float]):
+    """Start a deadline ``budget_seconds`` from now for the current context; returns a reset token."""
+    deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current deadline, or None when there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+@asynccontextmanager
+async def deadline_scope(stage: str) -> AsyncIterator[None]:
+    """Bound the enclosed call by the remaining request budget."""
+    budget = remaining()
+    if budget is None:
+        yield
+        return
+    if budget <= 0:
+        DEADLINE_EXCEEDED.labels(stage=stage).inc()
+        raise DeadlineExceededError(stage)
+    try:
+        async with asyncio.timeout(budget):
+            yield
+    except TimeoutError:
+        DEADLINE_EXCEEDED.labels(stage=stage).inc()
+        raise DeadlineExceededError(stage) from None
+
+
+def deadline_bound(stage: str):
+    """Decorator running an adapter coroutine method inside ``deadline_scope(stage)``."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with deadline_scope(stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,50 @@
+"""Tracing spans and trace context propagation."""
+from video_service.infrastructure.tracing.exporters import (
+    InMemorySpanExporter,
+    LoggingSpanExporter,
+    SpanExporter,
+)
+from video_service.infrastructure.tracing.propagation import (
+    TRACEPARENT,
+    extract_message_attributes,
+    format_traceparent,
+    inject_headers,
+    inject_message_attributes,
+    parse_traceparent,
+)
+from video_service.infrastructure.tracing.tracer import (
+    Span,
+    SpanContext,
+    Tracer,
+    configure_tracer,
+    current_context,
+    get_tracer,
+    reset_context,
+    set_context,
+    span,
+    trace_use_case,
+    traced,
+)
+
+__all__ = [
+    "InMemorySpanExporter",
+    "LoggingSpanExporter",
+    "SpanExporter",
+    "TRACEPARENT",
+    "extract_message_attributes",
+    "format_traceparent",
+    "inject_headers",
+    "inject_message_attributes",
+    "parse_traceparent",
+    "Span",
+    "SpanContext",
+    "Tracer",
+    "configure_tracer",
+    "current_context",
+    "get_tracer",
+    "reset_context",
+    "set_context",
+    "span",
+    "trace_use_case",
+    "traced",
+]
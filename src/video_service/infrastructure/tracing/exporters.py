@@ -0,0 +1,57 @@
+"""Span exporters."""
+from abc import ABC, abstractmethod
+from collections import deque
+import json
+import logging
+from typing import TYPE_CHECKING, Deque, List
+
+if TYPE_CHECKING:
+    from video_service.infrastructure.tracing.tracer import Span
+
+logger = logging.getLogger("video_service.tracing.spans")
+
+
+class SpanExporter(ABC):
+    """Receives every finished, sampled span; called on the event loop, so it must not block."""
+
+    @abstractmethod
+    def export(self, span: "Span") -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the last max_spans spans, oldest first; meant for tests."""
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: Deque["Span"] = deque(maxlen=max_spans)
+
+    def export(self, span: "Span") -> None:
+        self._spans.append(span)
+
+    @property
+    def spans(self) -> List["Span"]:
+        return list(self._spans)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class LoggingSpanExporter(SpanExporter):
+    """One JSON log line per span, for a log-shipping collector to pick up."""
+
+    def export(self, span: "Span") -> None:
+        logger.info(
+            json.dumps(
+                {
+                    "name": span.name,
+                    "trace_id": span.context.trace_id,
+                    "span_id": span.context.span_id,
+                    "parent_id": span.parent_id,
+                    "start_time": span.start_time,
+                    "duration_ms": round(span.duration_seconds * 1000, 3),
+                    "attributes": span.attributes,
+                    "error": span.error,
+                },
+                default=str,
+            )
+        )
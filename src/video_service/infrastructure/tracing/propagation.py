@@ -0,0 +1,44 @@
+"""W3C Trace Context (``traceparent``) in HTTP headers and SNS/SQS message attributes."""
+import re
+from typing import Any, Dict, Mapping, Optional
+
+from video_service.infrastructure.tracing.tracer import SpanContext, current_context
+
+TRACEPARENT = "traceparent"
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    match = _TRACEPARENT.match(value.strip().lower()) if value else None
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+def inject_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    context = current_context()
+    if context is not None:
+        headers[TRACEPARENT] = format_traceparent(context)
+    return headers
+
+
+def inject_message_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """Add ``traceparent`` to SNS/SQS ``MessageAttributes`` (both limit a message to 10 attributes)."""
+    context = current_context()
+    if context is not None:
+        attributes[TRACEPARENT] = {"DataType": "String", "StringValue": format_traceparent(context)}
+    return attributes
+
+
+def extract_message_attributes(attributes: Mapping[str, Any]) -> Optional[SpanContext]:
+    attribute = attributes.get(TRACEPARENT) or {}
+    return parse_traceparent(attribute.get("StringValue"))
@@ -0,0 +1,162 @@
+"""Tracing spans for use cases and outbound adapters.
+
+The process has at most one Tracer (``configure_tracer``); with none, every
+``span``/``traced`` call is a pass-through. Sampling is decided once per trace,
+at its root: a root span is sampled at the tracer's ``sample_rate``, spans
+under a parent (local or from the caller's ``traceparent``) follow the
+parent's decision. Unsampled traces still carry their ids, so the decision is
+propagated downstream, but no span objects are built or exported.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import functools
+import random
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from video_service.infrastructure.config import Settings
+from video_service.infrastructure.tracing.exporters import InMemorySpanExporter, LoggingSpanExporter, SpanExporter
+
+EXPORTERS = {"log": LoggingSpanExporter, "memory": InMemorySpanExporter}
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_id: Optional[str]
+    start_time: float
+    duration_seconds: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+_current: ContextVar[Optional[SpanContext]] = ContextVar("trace_context", default=None)
+_tracer: Optional["Tracer"] = None
+
+
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128) or 1:032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+class Tracer:
+    def __init__(self, exporter: SpanExporter, sample_rate: float = 1.0, rand: Callable[[], float] = random.random):
+        self.exporter = exporter
+        self._sample_rate = sample_rate
+        self._rand = rand
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Tracer":
+        exporter = EXPORTERS.get(settings.TRACING_EXPORTER)
+        if exporter is None:
+            raise ValueError(f"Unknown TRACING_EXPORTER '{settings.TRACING_EXPORTER}', expected one of {sorted(EXPORTERS)}")
+        return cls(exporter(), sample_rate=settings.TRACING_SAMPLE_RATE)
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Span]]:
+        """A child of the current span, or a new trace; yields None when the trace is not sampled."""
+        parent = _current.get()
+        if parent is None:
+            sampled = self._rand() < self._sample_rate
+            context = SpanContext(new_trace_id(), new_span_id(), sampled)
+        elif not parent.sampled:
+            yield None
+            return
+        else:
+            context = SpanContext(parent.trace_id, new_span_id(), True)
+
+        token = _current.set(context)
+        if not context.sampled:
+            try:
+                yield None
+            finally:
+                _current.reset(token)
+            return
+
+        span = Span(
+            name=name,
+            context=context,
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            attributes=dict(attributes or {}),
+        )
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = type(exc).__name__
+            raise
+        finally:
+            _current.reset(token)
+            span.duration_seconds = time.perf_counter() - started
+            self.exporter.export(span)
+
+
+def configure_tracer(tracer: Optional[Tracer]) -> None:
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def current_context() -> Optional[SpanContext]:
+    return _current.get()
+
+
+def set_context(context: Optional[SpanContext]):
+    """Make ``context`` (e.g. from an incoming ``traceparent``) the current parent; returns a reset token."""
+    return _current.set(context)
+
+
+def reset_context(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    tracer = _tracer
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_span(name, attributes) as current:
+        yield current
+
+
+def traced(name: str):
+    """Decorator running an async function inside ``span(name)``."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return await func(*args, **kwargs)
+            with tracer.start_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_use_case(use_case):
+    """Trace ``use_case.execute`` as ``use_case.<ClassName>``; the application layer stays tracing-free."""
+    use_case.execute = traced(f"use_case.{type(use_case).__name__}")(use_case.execute)
+    return use_case
@@ -1,4 +1,16 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from video_service.infrastructure.adapters.input.api import main
+from video_service.infrastructure.adapters.input.api.admission import UploadAdmissionMiddleware
+from video_service.infrastructure.adapters.input.api.deadline import DeadlineMiddleware
 from video_service.infrastructure.adapters.input.api.main import create_app
+from video_service.infrastructure.resilience import CircuitOpenError
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
 
 def test_create_app_basic_configuration(monkeypatch):
@@ -12,3 +24,86 @@ def test_create_app_basic_configuration(monkeypatch):
     assert app.title == "Video Service"
     assert app.version == "0.1.0"
     assert app.router is not None
+
+
+def test_deadline_middleware_wraps_upload_admission():
+    app = create_app()
+
+    # user_middleware lists the outermost middleware first.
+    order = [middleware.cls for middleware in app.user_middleware]
+    assert order.index(DeadlineMiddleware) < order.index(UploadAdmissionMiddleware)
+
+
+def test_lifespan_initializes_and_closes_database(monkeypatch):
+    calls = []
+
+    async def _fake_init_db():
+        calls.append("init")
+
+    async def _fake_close_db():
+        calls.append("close")
+
+    async def _fake_start_readiness():
+        calls.append("start_readiness")
+
+    async def _fake_stop_readiness():
+        calls.append("stop_readiness")
+
+    async def _fake_start_async_uploads():
+        calls.append("start_async_uploads")
+
+    async def _fake_stop_async_uploads():
+        calls.append("stop_async_uploads")
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.close_db", _fake_close_db)
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.start_readiness", _fake_start_readiness)
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.stop_readiness", _fake_stop_readiness)
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.start_async_uploads", _fake_start_async_uploads)
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.stop_async_uploads", _fake_stop_async_uploads)
+
+    with TestClient(create_app()) as client:
+        assert client.get("/health").status_code == 200
+        assert calls == ["init", "start_readiness", "start_async_uploads"]
+
+    assert calls == [
+        "init",
+        "start_readiness",
+        "start_async_uploads",
+        "stop_async_uploads",
+        "stop_readiness",
+        "close",
+    ]
+
+
+def test_importing_app_defers_adapter_libraries():
+    # Fresh interpreter: the heavy client libraries must load on first use, not on import.
+    # lazy_import registers a placeholder in sys.modules; it only counts once it has run.
+    code = (
+        "import sys; sys.path[:0] = ['src', '.']; import tests.conftest; "
+        "import video_service.infrastructure.adapters.input.api.main; "
+        "names = ('aiobotocore', 'botocore', 'httpx._client', 'redis', 'sqlalchemy'); "
+        "loaded = [m for m in names if m in sys.modules and type(sys.modules[m]).__name__ != '_LazyModule']; "
+        "print(','.join(loaded))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
+    assert callable(main.close_db)
+
+
+def test_circuit_open_error_maps_to_503_with_retry_after(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+    app = create_app()
+
+    @app.get("/boom")
+    async def _boom():
+        raise CircuitOpenError("s3", retry_after=2.5)
+
+    response = TestClient(app).get("/boom")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
@@ -1,42 +1,105 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
 from typing import Optional
 from uuid import UUID, uuid4
 
 from fastapi.testclient import TestClient
 
-from video_service.domain.entities.video import Video
+from video_service.application.ports.output.repositories import UserUsage, VideoStatusUpdate
+from video_service.application.use_cases import AcceptVideoUploadUseCase, CompleteVideoUploadUseCase
+from video_service.domain.entities import StorageQuota, Video
 from video_service.infrastructure.adapters.input.api.dependencies import (
+    get_change_notifier,
     get_current_user_id,
+    get_event_hub,
     get_event_publisher,
+    get_storage_quota,
     get_storage_service,
     get_video_repository,
 )
+from video_service.infrastructure.adapters.input.api.idempotency import (
+    IdempotencyGuard,
+    IdempotencyRecord,
+    IdempotencyStore,
+    get_idempotency_guard,
+)
+from video_service.infrastructure.adapters.input.api.async_upload import (
+    UploadTransferPool,
+    UploadUseCases,
+    get_upload_pool,
+)
 from video_service.infrastructure.adapters.input.api.main import create_app
+from video_service.infrastructure.adapters.output.storage.key_layouts import UserKeyLayout
+from video_service.infrastructure.adapters.output.storage.local_staging import LocalUploadStaging
 
 
 class InMemoryVideoRepository:
     def __init__(self):
         self.items: dict[UUID, Video] = {}
+        self.markers: dict[UUID, int] = {}
+        self.commits = 0
+
+    def _bump(self, user_id: UUID) -> None:
+        self.markers[user_id] = self.markers.get(user_id, 0) + 1
 
-    async def save(self, video: Video) -> Video:
+    async def save(self, video: Video, quota=None) -> Video:
         self.items[video.id] = video
+        self._bump(video.user_id)
         return video
 
     async def find_by_id(self, video_id: UUID) -> Optional[Video]:
         return self.items.get(video_id)
 
-    async def find_by_user_id(self, user_id: UUID, skip: int = 0, limit: int = 10):
+    async def find_by_ids(self, video_ids: list[UUID]):
+        return [self.items[video_id] for video_id in video_ids if video_id in self.items]
+
+    async def find_by_user_id(self, user_id: UUID, skip: int = 0, limit: int = 10, query=None):
+        self.last_query = query
         filtered = [v for v in self.items.values() if v.user_id == user_id]
+        if query is not None and query.format:
+            filtered = [v for v in filtered if v.format == query.format]
         return filtered[skip : skip + limit]
 
     async def delete(self, video_id: UUID) -> bool:
         return self.items.pop(video_id, None) is not None
 
-    async def count_by_user_id(self, user_id: UUID) -> int:
+    async def delete_by_ids(self, video_ids: list[UUID], user_id: UUID):
+        deleted = []
+        for video_id in video_ids:
+            video = self.items.get(video_id)
+            if video and video.user_id == user_id:
+                del self.items[video_id]
+                deleted.append((video_id, video.file_path))
+        if deleted:
+            self._bump(user_id)
+        return deleted
+
+    async def get_change_marker(self, user_id: UUID) -> int:
+        return self.markers.get(user_id, 0)
+
+    async def count_by_user_id(self, user_id: UUID, query=None) -> int:
         return len([v for v in self.items.values() if v.user_id == user_id])
 
+    async def get_usage(self, user_id: UUID) -> UserUsage:
+        sizes = [v.file_size for v in self.items.values() if v.user_id == user_id]
+        return UserUsage(video_count=len(sizes), total_bytes=sum(sizes))
+
+    async def apply_status_updates(self, updates):
+        applied = []
+        for update in updates:
+            video = self.items[update.video_id]
+            video.status, video.progress, video.version = update.status, update.progress, video.version + 1
+            self._bump(video.user_id)
+            applied.append((video.id, video.user_id))
+        return applied
+
+    async def commit(self) -> None:
+        self.commits += 1
+
 
 class InMemoryStorageService:
-    async def upload_file(self, file, key: str, content_type: str) -> str:
+    async def upload_file(self, file, key: str, content_type: str, region=None) -> str:
         return f"s3://bucket/{key}"
 
     async def get_presigned_url(self, key: str, expires_in: int = 3600) -> str:
@@ -45,6 +108,29 @@ class InMemoryStorageService:
     async def delete_file(self, key: str) -> bool:
         return True
 
+    async def delete_files(self, paths: list[str]) -> list[str]:
+        return []
+
+    def storage_path(self, key: str, region=None) -> str:
+        return f"s3://bucket/{key}"
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self):
+        self.records: dict[str, tuple[str, IdempotencyRecord]] = {}
+
+    async def try_lock(self, key, fingerprint, owner, ttl_seconds):
+        if key in self.records:
+            return self.records[key][1]
+        self.records[key] = (owner, IdempotencyRecord(fingerprint))
+        return None
+
+    async def complete(self, key, owner, record, ttl_seconds):
+        self.records[key] = (owner, record)
+
+    async def release(self, key, owner):
+        self.records.pop(key, None)
+
 
 class NullEventPublisher:
     async def publish(self, event) -> None:
@@ -59,6 +145,8 @@ def _build_client(user_id: UUID):
     app.dependency_overrides[get_video_repository] = lambda: repo
     app.dependency_overrides[get_storage_service] = lambda: InMemoryStorageService()
     app.dependency_overrides[get_event_publisher] = lambda: NullEventPublisher()
+    app.dependency_overrides[get_change_notifier] = lambda: None
+    app.dependency_overrides[get_idempotency_guard] = lambda: None
 
     return TestClient(app), repo
 
@@ -143,3 +231,302 @@ def test_list_videos_query_validation(monkeypatch):
 
     response = client.get("/videos?page=0&page_size=101")
     assert response.status_code == 422
+
+
+def test_batch_get_returns_found_and_missing_ids(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, _ = _build_client(user_id=uuid4())
+
+    upload_response = client.post(
+        "/videos/upload",
+        files=[("files", ("movie.mp4", b"binary-content", "video/mp4"))],
+    )
+    video_id = upload_response.json()[0]["id"]
+    missing_id = str(uuid4())
+
+    response = client.post("/videos/batch-get", json={"video_ids": [video_id, missing_id]})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert [v["id"] for v in payload["videos"]] == [video_id]
+    assert payload["missing_ids"] == [missing_id]
+
+    too_many = client.post("/videos/batch-get", json={"video_ids": [str(uuid4()) for _ in range(501)]})
+    assert too_many.status_code == 422
+
+
+def test_bulk_delete_removes_owned_videos(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+
+    upload_response = client.post(
+        "/videos/upload",
+        files=[("files", ("movie.mp4", b"binary-content", "video/mp4"))],
+    )
+    video_id = upload_response.json()[0]["id"]
+    missing_id = str(uuid4())
+
+    response = client.post("/videos/bulk-delete", json={"video_ids": [video_id, missing_id]})
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted_ids": [video_id], "missing_ids": [missing_id], "storage_failed_ids": []}
+    assert repo.items == {}
+
+
+def test_get_and_list_support_conditional_requests(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    upload_response = client.post(
+        "/videos/upload",
+        files=[("files", ("movie.mp4", b"binary-content", "video/mp4"))],
+    )
+    video_id = upload_response.json()[0]["id"]
+
+    get_response = client.get(f"/videos/{video_id}")
+    etag = get_response.headers["etag"]
+    assert etag.startswith('"')
+
+    not_modified = client.get(f"/videos/{video_id}", headers={"If-None-Match": f'W/"x", {etag}'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    list_response = client.get("/videos?page=1&page_size=10")
+    list_etag = list_response.headers["etag"]
+    assert client.get("/videos?page=1&page_size=10", headers={"If-None-Match": list_etag}).status_code == 304
+    assert client.get("/videos?page=2&page_size=10", headers={"If-None-Match": list_etag}).status_code == 200
+
+    client.post("/videos/upload", files=[("files", ("other.mp4", b"binary-content", "video/mp4"))])
+    changed = client.get("/videos?page=1&page_size=10", headers={"If-None-Match": list_etag})
+    assert changed.status_code == 200
+    assert changed.json()["total"] == 2
+    assert changed.headers["etag"] != list_etag
+
+
+def test_get_video_reports_processing_status(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    video_id = client.post(
+        "/videos/upload",
+        files=[("files", ("movie.mp4", b"binary-content", "video/mp4"))],
+    ).json()[0]["id"]
+
+    first = client.get(f"/videos/{video_id}")
+    assert (first.json()["status"], first.json()["progress"]) == ("uploaded", 0)
+
+    asyncio.run(repo.apply_status_updates([VideoStatusUpdate(UUID(video_id), "processing", 40)]))
+    second = client.get(f"/videos/{video_id}", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert (second.json()["status"], second.json()["progress"]) == ("processing", 40)
+
+
+def test_video_events_streams_changes_for_the_caller(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    class _OneEventHub:
+        is_full = False
+
+        async def connect(self, user_id):
+            queue = asyncio.Queue()
+            queue.put_nowait(("1-0", '{"type": "video.uploaded"}'))
+            queue.put_nowait(None)
+            return SimpleNamespace(user_id=user_id, queue=queue)
+
+        async def disconnect(self, connection):
+            return None
+
+    client, _ = _build_client(user_id=uuid4())
+    client.app.dependency_overrides[get_event_hub] = lambda: _OneEventHub()
+
+    response = client.get("/videos/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert 'id: 1-0\ndata: {"type": "video.uploaded"}\n\n' in response.text
+
+
+def test_upload_over_quota_returns_403_and_usage_reports_it(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    client.app.dependency_overrides[get_storage_quota] = lambda: StorageQuota(max_bytes=20)
+
+    assert client.post("/videos/upload", files=[("files", ("a.mp4", b"x" * 15, "video/mp4"))]).status_code == 201
+    response = client.post("/videos/upload", files=[("files", ("b.mp4", b"x" * 10, "video/mp4"))])
+
+    assert response.status_code == 403
+    assert len(repo.items) == 1
+    usage = client.get("/videos/usage")
+    assert usage.status_code == 200
+    assert usage.json() == {"video_count": 1, "total_bytes": 15, "max_videos": None, "max_bytes": 20}
+
+
+def test_list_videos_passes_filters_and_sort(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    client.post(
+        "/videos/upload",
+        files=[("files", ("a.mp4", b"x", "video/mp4")), ("files", ("b.mkv", b"y", "video/x-matroska"))],
+    )
+
+    response = client.get(
+        "/videos/",
+        params={"format": "mkv", "min_size": 1, "filename": "b", "sort": "original_filename", "created_from": "2024-01-01T00:00:00Z"},
+    )
+    assert response.status_code == 200
+    assert [v["original_filename"] for v in response.json()["videos"]] == ["b.mkv"]
+    query = repo.last_query
+    assert (query.format, query.min_size, query.filename_contains) == ("mkv", 1, "b")
+    assert (query.sort_by, query.descending) == ("original_filename", False)
+    assert query.created_from.year == 2024
+
+    unfiltered = client.get("/videos/")
+    assert unfiltered.headers["ETag"] != response.headers["ETag"]
+    assert client.get("/videos/", params={"sort": "duration"}).status_code == 422
+
+
+def test_upload_retry_with_idempotency_key_replays_first_response(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    guard = IdempotencyGuard(InMemoryIdempotencyStore(), wait_seconds=0)
+    client.app.dependency_overrides[get_idempotency_guard] = lambda: guard
+    files = [("files", ("a.mp4", b"x" * 15, "video/mp4"))]
+
+    first = client.post("/videos/upload", files=files, headers={"Idempotency-Key": "retry-1"})
+    retry = client.post("/videos/upload", files=files, headers={"Idempotency-Key": "retry-1"})
+    reused = client.post(
+        "/videos/upload", files=[("files", ("b.mp4", b"y", "video/mp4"))], headers={"Idempotency-Key": "retry-1"}
+    )
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(repo.items) == 1
+    assert reused.status_code == 422
+    assert client.post("/videos/upload", files=files, headers={"Idempotency-Key": ""}).status_code == 400
+
+
+def test_upload_retry_after_a_partial_failure_replays_the_partial_result(monkeypatch):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    guard = IdempotencyGuard(InMemoryIdempotencyStore(), wait_seconds=0)
+    client.app.dependency_overrides[get_idempotency_guard] = lambda: guard
+    files = [("files", ("a.mp4", b"x" * 15, "video/mp4")), ("files", ("b.txt", b"y", "text/plain"))]
+
+    first = client.post("/videos/upload", files=files, headers={"Idempotency-Key": "partial-1"})
+    retry = client.post("/videos/upload", files=files, headers={"Idempotency-Key": "partial-1"})
+
+    assert first.status_code == retry.status_code == 400
+    assert [video["original_filename"] for video in first.json()["uploaded"]] == ["a.mp4"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(repo.items) == 1
+
+
+def _async_upload_pool(repo, staging_dir, max_pending=100):
+    staging = LocalUploadStaging(staging_dir)
+    storage = InMemoryStorageService()
+
+    @asynccontextmanager
+    async def use_cases():
+        yield UploadUseCases(
+            accept=AcceptVideoUploadUseCase(repo, storage, staging, UserKeyLayout()),
+            complete=CompleteVideoUploadUseCase(repo, storage, NullEventPublisher(), staging),
+        )
+
+    return UploadTransferPool(staging, use_cases, max_pending=max_pending), staging
+
+
+def test_upload_with_respond_async_returns_202_and_a_pending_video(monkeypatch, tmp_path):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    pool, staging = _async_upload_pool(repo, str(tmp_path))
+    client.app.dependency_overrides[get_upload_pool] = lambda: pool
+
+    response = client.post(
+        "/videos/upload",
+        files=[("files", ("a.mp4", b"video", "video/mp4"))],
+        headers={"Prefer": "respond-async, wait=10"},
+    )
+
+    assert response.status_code == 202
+    assert response.headers["Preference-Applied"] == "respond-async"
+    (video,) = response.json()
+    assert video["status"] == "pending"
+    assert client.get(f"/videos/{video['id']}").json()["status"] == "pending"
+    assert pool.pending == 1
+    (staged,) = asyncio.run(staging.list_staged())
+    assert str(staged.video_id) == video["id"]
+
+    async def transfer():
+        await pool.start()
+        while pool.pending:
+            await asyncio.sleep(0.001)
+        await pool.stop()
+
+    asyncio.run(transfer())
+    assert client.get(f"/videos/{video['id']}").json()["status"] == "uploaded"
+    assert asyncio.run(staging.list_staged()) == []
+
+    sync = client.post("/videos/upload", files=[("files", ("b.mp4", b"video", "video/mp4"))])
+    assert sync.status_code == 201
+
+
+def test_upload_with_respond_async_is_refused_when_the_pool_is_full(monkeypatch, tmp_path):
+    async def _fake_init_db():
+        return None
+
+    monkeypatch.setattr("video_service.infrastructure.adapters.input.api.main.init_db", _fake_init_db)
+
+    client, repo = _build_client(user_id=uuid4())
+    pool, _ = _async_upload_pool(repo, str(tmp_path), max_pending=1)
+    client.app.dependency_overrides[get_upload_pool] = lambda: pool
+
+    response = client.post(
+        "/videos/upload",
+        files=[("files", ("a.mp4", b"video", "video/mp4")), ("files", ("b.mp4", b"video", "video/mp4"))],
+        headers={"Prefer": "respond-async"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert repo.items == {}
@@ -0,0 +1,81 @@
+from io import BytesIO
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from video_service.application.ports.output.repositories import UserUsage
+from video_service.application.use_cases.accept_video_upload import AcceptVideoUploadUseCase
+from video_service.application.use_cases.upload_video import UploadVideoInput
+from video_service.domain.entities.storage_quota import StorageQuota
+from video_service.domain.entities.video import Video
+from video_service.domain.exceptions import QuotaExceededError
+from video_service.infrastructure.adapters.output.storage.key_layouts import UserKeyLayout
+
+
+def _input(user_id, file_size=3):
+    return UploadVideoInput(
+        user_id=user_id,
+        filename="movie.MP4",
+        file=BytesIO(b"abc"),
+        file_size=file_size,
+        content_type="video/mp4",
+    )
+
+
+def _storage():
+    storage = MagicMock()
+    storage.storage_path.side_effect = lambda key, region=None: f"s3://bucket/{key}"
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_accept_stages_the_file_and_saves_a_pending_video():
+    user_id = uuid4()
+    repo = AsyncMock()
+    repo.save.side_effect = lambda video, quota=None: video
+    staging = AsyncMock()
+    storage = _storage()
+
+    result = await AcceptVideoUploadUseCase(repo, storage, staging, UserKeyLayout()).execute(_input(user_id))
+
+    upload = result.upload
+    assert upload.storage_key == f"videos/{user_id}/{upload.video_id}.mp4"
+    assert (upload.user_id, upload.filename, upload.file_size) == (user_id, "movie.MP4", 3)
+    staging.stage.assert_awaited_once()
+    assert staging.stage.await_args.args[0] == upload
+    (video,), _ = repo.save.await_args
+    assert (video.id, video.status, video.file_path) == (
+        upload.video_id,
+        Video.STATUS_PENDING,
+        f"s3://bucket/{upload.storage_key}",
+    )
+    assert (result.video.id, result.video.status) == (upload.video_id, Video.STATUS_PENDING)
+    storage.upload_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_accept_discards_the_staged_file_when_saving_fails():
+    repo = AsyncMock()
+    repo.save.side_effect = RuntimeError("db down")
+    staging = AsyncMock()
+
+    with pytest.raises(RuntimeError):
+        await AcceptVideoUploadUseCase(repo, _storage(), staging, UserKeyLayout()).execute(_input(uuid4()))
+
+    upload = staging.stage.await_args.args[0]
+    staging.discard.assert_awaited_once_with(upload.video_id)
+
+
+@pytest.mark.asyncio
+async def test_accept_checks_the_quota_before_staging():
+    repo = AsyncMock()
+    repo.get_usage.return_value = UserUsage(video_count=1, total_bytes=999)
+    staging = AsyncMock()
+
+    with pytest.raises(QuotaExceededError):
+        await AcceptVideoUploadUseCase(repo, _storage(), staging, UserKeyLayout(), quota=StorageQuota(max_bytes=1000)).execute(
+            _input(uuid4(), file_size=2)
+        )
+
+    staging.stage.assert_not_awaited()
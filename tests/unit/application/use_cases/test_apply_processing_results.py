@@ -0,0 +1,54 @@
+from uuid import uuid4
+from unittest.mock import AsyncMock
+
+import pytest
+
+from video_service.application.ports.output.repositories import VideoStatusUpdate
+from video_service.application.ports.output.video_change_notifier import VIDEO_STATUS_CHANGED, VideoChange
+from video_service.application.use_cases.apply_processing_results import ApplyProcessingResultsUseCase
+
+
+@pytest.mark.asyncio
+async def test_keeps_most_advanced_update_per_video_and_ignores_unknown_statuses():
+    first, second, owner = uuid4(), uuid4(), uuid4()
+    repo = AsyncMock()
+    repo.apply_status_updates.return_value = [(second, owner)]
+    notifier = AsyncMock()
+
+    result = await ApplyProcessingResultsUseCase(video_repository=repo, change_notifier=notifier).execute(
+        [
+            VideoStatusUpdate(first, "processing", 60),
+            VideoStatusUpdate(first, "processing", 30),
+            VideoStatusUpdate(second, "processing", 90),
+            VideoStatusUpdate(second, "completed", 0),
+            VideoStatusUpdate(second, "processing", 95),
+            VideoStatusUpdate(uuid4(), "exploded", 10),
+            VideoStatusUpdate(first, "processing", 250),
+        ]
+    )
+
+    assert (result.received, result.applied, result.ignored) == (7, 1, 1)
+    repo.apply_status_updates.assert_awaited_once_with(
+        [VideoStatusUpdate(first, "processing", 100), VideoStatusUpdate(second, "completed", 100)]
+    )
+    notifier.notify.assert_awaited_once_with([VideoChange(owner, second, VIDEO_STATUS_CHANGED, "completed", 100)])
+
+
+@pytest.mark.asyncio
+async def test_changes_are_announced_after_the_commit_and_not_on_failure():
+    video_id, owner = uuid4(), uuid4()
+    calls = []
+    repo = AsyncMock()
+    repo.apply_status_updates.return_value = [(video_id, owner)]
+    repo.commit.side_effect = lambda: calls.append("commit")
+    notifier = AsyncMock()
+    notifier.notify.side_effect = lambda changes: calls.append("notify")
+    use_case = ApplyProcessingResultsUseCase(video_repository=repo, change_notifier=notifier)
+
+    await use_case.execute([VideoStatusUpdate(video_id, "processing", 10)])
+    assert calls == ["commit", "notify"]
+
+    repo.commit.side_effect = RuntimeError("commit failed")
+    with pytest.raises(RuntimeError):
+        await use_case.execute([VideoStatusUpdate(video_id, "processing", 20)])
+    assert calls == ["commit", "notify"]
@@ -0,0 +1,37 @@
+from uuid import uuid4
+from unittest.mock import AsyncMock
+
+import pytest
+
+from video_service.application.use_cases.batch_get_videos import BatchGetVideosUseCase
+from video_service.domain.entities.video import Video
+
+
+def _video(user_id, name="movie.mp4"):
+    return Video(
+        id=uuid4(),
+        user_id=user_id,
+        original_filename=name,
+        file_path=f"s3://bucket/{name}",
+        file_size=123,
+        format="mp4",
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_get_returns_owned_videos_in_request_order_and_missing_ids():
+    user_id = uuid4()
+    first = _video(user_id, "a.mp4")
+    second = _video(user_id, "b.mp4")
+    foreign = _video(uuid4(), "c.mp4")
+    unknown_id = uuid4()
+
+    repo = AsyncMock()
+    repo.find_by_ids.return_value = [second, foreign, first]
+
+    use_case = BatchGetVideosUseCase(video_repository=repo)
+    result = await use_case.execute([first.id, unknown_id, second.id, foreign.id, first.id], user_id)
+
+    assert [v.id for v in result.videos] == [first.id, second.id]
+    assert result.missing_ids == [unknown_id, foreign.id]
+    repo.find_by_ids.assert_awaited_once_with([first.id, unknown_id, second.id, foreign.id])
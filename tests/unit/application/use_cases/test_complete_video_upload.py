@@ -0,0 +1,121 @@
+from datetime import UTC, datetime
+from io import BytesIO
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from video_service.application.ports.output.repositories import VideoStatusUpdate
+from video_service.application.ports.output.upload_staging import StagedUpload
+from video_service.application.ports.output.video_change_notifier import (
+    VIDEO_STATUS_CHANGED,
+    VIDEO_UPLOADED,
+    VideoChange,
+)
+from video_service.application.use_cases.complete_video_upload import CompleteVideoUploadUseCase
+from video_service.domain.entities.video import Video
+
+
+def _upload():
+    video_id, user_id = uuid4(), uuid4()
+    return StagedUpload(video_id, user_id, "movie.mp4", f"videos/{user_id}/{video_id}.mp4", "video/mp4", 3)
+
+
+def _video(upload, status):
+    return Video(
+        id=upload.video_id,
+        user_id=upload.user_id,
+        original_filename=upload.filename,
+        file_path=f"s3://bucket/{upload.storage_key}",
+        file_size=upload.file_size,
+        format="mp4",
+        status=status,
+    )
+
+
+def _use_case(repo, storage=None, publisher=None, notifier=None):
+    staging = MagicMock()
+    staging.open.side_effect = lambda video_id: BytesIO(b"abc")
+    return CompleteVideoUploadUseCase(repo, storage or AsyncMock(), publisher or AsyncMock(), staging, notifier)
+
+
+@pytest.mark.asyncio
+async def test_complete_transfers_publishes_and_marks_the_video_uploaded():
+    upload = _upload()
+    repo = AsyncMock()
+    repo.find_by_id.return_value = _video(upload, Video.STATUS_PENDING)
+    repo.apply_status_updates.return_value = [(upload.video_id, upload.user_id)]
+    storage, publisher, notifier = AsyncMock(), AsyncMock(), AsyncMock()
+
+    assert await _use_case(repo, storage, publisher, notifier).execute(upload) is True
+
+    assert storage.upload_file.await_args.kwargs["key"] == upload.storage_key
+    (event,), _ = publisher.publish.await_args
+    assert (event.video_id, event.user_id) == (upload.video_id, upload.user_id)
+    repo.apply_status_updates.assert_awaited_once_with([VideoStatusUpdate(upload.video_id, Video.STATUS_UPLOADED)])
+    notifier.notify.assert_awaited_once_with(
+        [VideoChange(upload.user_id, upload.video_id, VIDEO_UPLOADED, Video.STATUS_UPLOADED, 0)]
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("video", [None, Video.STATUS_UPLOADED, Video.STATUS_FAILED])
+async def test_complete_skips_videos_gone_or_no_longer_pending(video):
+    upload = _upload()
+    repo = AsyncMock()
+    repo.find_by_id.return_value = video and _video(upload, video)
+    storage, publisher = AsyncMock(), AsyncMock()
+
+    assert await _use_case(repo, storage, publisher).execute(upload) is False
+
+    storage.upload_file.assert_not_awaited()
+    publisher.publish.assert_not_awaited()
+    repo.apply_status_updates.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_fail_marks_the_video_failed():
+    upload = _upload()
+    repo = AsyncMock()
+    repo.apply_status_updates.return_value = [(upload.video_id, upload.user_id)]
+    notifier = AsyncMock()
+
+    notifier.notify.side_effect = lambda changes: repo.commit.assert_awaited_once()
+
+    await _use_case(repo, notifier=notifier).fail(upload)
+
+    repo.apply_status_updates.assert_awaited_once_with([VideoStatusUpdate(upload.video_id, Video.STATUS_FAILED)])
+    notifier.notify.assert_awaited_once_with(
+        [VideoChange(upload.user_id, upload.video_id, VIDEO_STATUS_CHANGED, Video.STATUS_FAILED, 0)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_complete_leaves_the_video_pending_when_the_event_is_not_sent():
+    upload = _upload()
+    repo = AsyncMock()
+    repo.find_by_id.return_value = _video(upload, Video.STATUS_PENDING)
+    publisher = AsyncMock()
+    publisher.publish.side_effect = ConnectionError("sns down")
+
+    with pytest.raises(ConnectionError):
+        await _use_case(repo, publisher=publisher).execute(upload)
+
+    repo.apply_status_updates.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_fail_abandoned_fails_stale_pending_videos_not_kept():
+    kept, lost = _upload(), _upload()
+    cutoff = datetime(2024, 1, 1, tzinfo=UTC)
+    repo = AsyncMock()
+    repo.fail_stale_pending.return_value = [(lost.video_id, lost.user_id)]
+    notifier = AsyncMock()
+    notifier.notify.side_effect = lambda changes: repo.commit.assert_awaited_once()
+
+    assert await _use_case(repo, notifier=notifier).fail_abandoned(cutoff, keep={kept.video_id}) == 1
+
+    repo.fail_stale_pending.assert_awaited_once_with(cutoff, {kept.video_id})
+    notifier.notify.assert_awaited_once_with(
+        [VideoChange(lost.user_id, lost.video_id, VIDEO_STATUS_CHANGED, Video.STATUS_FAILED, 0)]
+    )
@@ -0,0 +1,53 @@
+from uuid import uuid4
+from unittest.mock import AsyncMock
+
+import pytest
+
+from video_service.application.use_cases.delete_videos import DeleteVideosUseCase
+
+
+@pytest.mark.asyncio
+async def test_delete_videos_reports_deleted_missing_and_storage_failures():
+    user_id = uuid4()
+    ok_id, failing_id, missing_id = uuid4(), uuid4(), uuid4()
+
+    repo = AsyncMock()
+    repo.delete_by_ids.return_value = [(ok_id, "s3://bucket/ok.mp4"), (failing_id, "s3://bucket/fail.mp4")]
+    storage = AsyncMock()
+    storage.delete_files.return_value = ["s3://bucket/fail.mp4"]
+
+    use_case = DeleteVideosUseCase(video_repository=repo, storage_service=storage)
+    result = await use_case.execute([ok_id, missing_id, failing_id, ok_id], user_id)
+
+    assert result.deleted_ids == [ok_id, failing_id]
+    assert result.missing_ids == [missing_id]
+    assert result.storage_failed_ids == [failing_id]
+    repo.delete_by_ids.assert_awaited_once_with([ok_id, missing_id, failing_id], user_id)
+    storage.delete_files.assert_awaited_once_with(["s3://bucket/ok.mp4", "s3://bucket/fail.mp4"])
+
+
+@pytest.mark.asyncio
+async def test_delete_videos_removes_files_only_after_the_rows_are_committed():
+    calls = []
+    repo = AsyncMock()
+    repo.delete_by_ids.return_value = [(uuid4(), "s3://bucket/a.mp4")]
+    repo.commit.side_effect = lambda: calls.append("commit")
+    storage = AsyncMock()
+    storage.delete_files.side_effect = lambda paths: calls.append("delete_files") or []
+
+    await DeleteVideosUseCase(video_repository=repo, storage_service=storage).execute([uuid4()], uuid4())
+
+    assert calls == ["commit", "delete_files"]
+
+
+@pytest.mark.asyncio
+async def test_delete_videos_keeps_files_when_the_commit_fails():
+    repo = AsyncMock()
+    repo.delete_by_ids.return_value = [(uuid4(), "s3://bucket/a.mp4")]
+    repo.commit.side_effect = RuntimeError("commit failed")
+    storage = AsyncMock()
+
+    with pytest.raises(RuntimeError):
+        await DeleteVideosUseCase(video_repository=repo, storage_service=storage).execute([uuid4()], uuid4())
+
+    storage.delete_files.assert_not_awaited()
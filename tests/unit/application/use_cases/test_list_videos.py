@@ -45,5 +45,5 @@ async def test_list_videos_with_pagination():
     assert len(result.videos) == 2
     assert result.videos[0].original_filename == "v1.mp4"
 
-    repo.find_by_user_id.assert_awaited_once_with(user_id, 5, 5)
-    repo.count_by_user_id.assert_awaited_once_with(user_id)
+    repo.find_by_user_id.assert_awaited_once_with(user_id, 5, 5, None)
+    repo.count_by_user_id.assert_awaited_once_with(user_id, None)
@@ -0,0 +1,74 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from video_service.application.ports.output.storage_service import StoredObject
+from video_service.application.use_cases.reconcile_storage import (
+    DANGLING_ROW,
+    ORPHANED_OBJECT,
+    ReconcileStorageInput,
+    ReconcileStorageUseCase,
+)
+
+OLD = datetime.now(UTC) - timedelta(days=1)
+NEW = datetime.now(UTC)
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+def _build(objects, rows, failed=None):
+    storage = MagicMock()
+    storage.storage_path.side_effect = lambda key: f"s3://bucket/{key}"
+    storage.iter_objects.side_effect = lambda prefix: _aiter(objects)
+    storage.delete_files = AsyncMock(side_effect=lambda paths: [p for p in paths if p in (failed or [])])
+    repo = MagicMock()
+    repo.iter_file_paths.side_effect = lambda prefix, batch_size: _aiter(rows)
+    return ReconcileStorageUseCase(video_repository=repo, storage_service=storage), storage, repo
+
+
+@pytest.mark.asyncio
+async def test_reconcile_dry_run_reports_orphans_and_dangling_rows_without_deleting():
+    objects = [
+        StoredObject("s3://bucket/videos/a.mp4", OLD),
+        StoredObject("s3://bucket/videos/b.mp4", OLD),
+        StoredObject("s3://bucket/videos/c.mp4", NEW),
+        StoredObject("s3://bucket/videos/e.mp4", OLD),
+    ]
+    rows = ["s3://bucket/videos/a.mp4", "s3://bucket/videos/a.mp4", "s3://bucket/videos/d.mp4"]
+    use_case, storage, repo = _build(objects, rows)
+    findings = []
+
+    result = await use_case.execute(ReconcileStorageInput(), on_finding=lambda kind, path: findings.append((kind, path)))
+
+    assert findings == [
+        (ORPHANED_OBJECT, "s3://bucket/videos/b.mp4"),
+        (DANGLING_ROW, "s3://bucket/videos/d.mp4"),
+        (ORPHANED_OBJECT, "s3://bucket/videos/e.mp4"),
+    ]
+    assert result.scanned_objects == 4
+    assert result.scanned_rows == 3
+    assert result.orphaned_objects == 2
+    assert result.dangling_rows == 1
+    assert result.deleted_objects == 0
+    storage.delete_files.assert_not_awaited()
+    repo.iter_file_paths.assert_called_once_with("s3://bucket/videos/", batch_size=1000)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_delete_mode_flushes_in_batches_and_counts_failures():
+    objects = [StoredObject(f"s3://bucket/videos/{i}.mp4", OLD) for i in range(5)]
+    use_case, storage, _ = _build(objects, [], failed=["s3://bucket/videos/3.mp4"])
+
+    result = await use_case.execute(ReconcileStorageInput(dry_run=False, delete_batch_size=2))
+
+    assert [call.args[0] for call in storage.delete_files.await_args_list] == [
+        ["s3://bucket/videos/0.mp4", "s3://bucket/videos/1.mp4"],
+        ["s3://bucket/videos/2.mp4", "s3://bucket/videos/3.mp4"],
+        ["s3://bucket/videos/4.mp4"],
+    ]
+    assert result.deleted_objects == 4
+    assert result.failed_deletions == 1
@@ -1,12 +1,16 @@
 from datetime import UTC, datetime
 from io import BytesIO
 from uuid import uuid4
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from video_service.application.use_cases.upload_video import UploadVideoUseCase, UploadVideoInput
+from video_service.application.ports.output.repositories import UserUsage
+from video_service.domain.entities.storage_quota import StorageQuota
 from video_service.domain.entities.video import Video
+from video_service.domain.exceptions import QuotaExceededError
+from video_service.infrastructure.adapters.output.storage.key_layouts import UserKeyLayout
 from video_processor_shared.domain.exceptions import InvalidVideoFormatError, VideoTooLargeError
 
 
@@ -18,6 +22,7 @@ async def test_upload_video_success_persists_and_publishes_event():
     repo = AsyncMock()
     storage = AsyncMock()
     publisher = AsyncMock()
+    notifier = AsyncMock()
 
     created_at = datetime.now(UTC)
     saved_video = Video(
@@ -33,9 +38,9 @@ async def test_upload_video_success_persists_and_publishes_event():
     storage.upload_file.return_value = saved_video.file_path
     repo.save.return_value = saved_video
 
-    use_case = UploadVideoUseCase(repo, storage, publisher)
+    use_case = UploadVideoUseCase(repo, storage, publisher, UserKeyLayout(), change_notifier=notifier)
 
-    with patch("video_service.application.use_cases.upload_video.uuid4", return_value=generated_id):
+    with patch.object(Video, "new_id", return_value=generated_id):
         result = await use_case.execute(
             UploadVideoInput(
                 user_id=user_id,
@@ -51,12 +56,41 @@ async def test_upload_video_success_persists_and_publishes_event():
 
     storage.upload_file.assert_awaited_once()
     repo.save.assert_awaited_once()
+    repo.commit.assert_awaited_once()
     publisher.publish.assert_awaited_once()
+    (change,), = notifier.notify.await_args.args
+    assert (change.user_id, change.video_id, change.kind) == (user_id, generated_id, "video.uploaded")
+
+
+@pytest.mark.asyncio
+async def test_upload_video_commits_before_publishing_and_notifying():
+    calls = []
+    repo = AsyncMock()
+    repo.save.side_effect = lambda video, quota=None: calls.append("save") or video
+    repo.commit.side_effect = lambda: calls.append("commit")
+    storage = AsyncMock()
+    storage.upload_file.side_effect = lambda **kwargs: calls.append("upload") or "s3://bucket/key"
+    publisher = AsyncMock()
+    publisher.publish.side_effect = lambda event: calls.append("publish")
+    notifier = AsyncMock()
+    notifier.notify.side_effect = lambda changes: calls.append("notify")
+
+    await UploadVideoUseCase(repo, storage, publisher, UserKeyLayout(), change_notifier=notifier).execute(
+        UploadVideoInput(
+            user_id=uuid4(),
+            filename="movie.mp4",
+            file=BytesIO(b"abc"),
+            file_size=3,
+            content_type="video/mp4",
+        )
+    )
+
+    assert calls == ["upload", "save", "commit", "publish", "notify"]
 
 
 @pytest.mark.asyncio
 async def test_upload_video_invalid_format_raises_error():
-    use_case = UploadVideoUseCase(AsyncMock(), AsyncMock(), AsyncMock())
+    use_case = UploadVideoUseCase(AsyncMock(), AsyncMock(), AsyncMock(), UserKeyLayout())
 
     with pytest.raises(InvalidVideoFormatError):
         await use_case.execute(
@@ -72,7 +106,7 @@ async def test_upload_video_invalid_format_raises_error():
 
 @pytest.mark.asyncio
 async def test_upload_video_too_large_raises_error():
-    use_case = UploadVideoUseCase(AsyncMock(), AsyncMock(), AsyncMock())
+    use_case = UploadVideoUseCase(AsyncMock(), AsyncMock(), AsyncMock(), UserKeyLayout())
 
     with pytest.raises(VideoTooLargeError):
         await use_case.execute(
@@ -84,3 +118,71 @@ async def test_upload_video_too_large_raises_error():
                 content_type="video/mp4",
             )
         )
+
+
+@pytest.mark.asyncio
+async def test_upload_video_over_quota_raises_before_storage():
+    repo = AsyncMock()
+    repo.get_usage.return_value = UserUsage(video_count=2, total_bytes=900)
+    storage = AsyncMock()
+    use_case = UploadVideoUseCase(repo, storage, AsyncMock(), UserKeyLayout(), quota=StorageQuota(max_bytes=1000))
+
+    with pytest.raises(QuotaExceededError):
+        await use_case.execute(
+            UploadVideoInput(
+                user_id=uuid4(),
+                filename="movie.mp4",
+                file=BytesIO(b"abc"),
+                file_size=101,
+                content_type="video/mp4",
+            )
+        )
+
+    storage.upload_file.assert_not_awaited()
+    repo.save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_upload_video_removes_the_stored_file_when_a_concurrent_upload_took_the_quota():
+    repo = AsyncMock()
+    repo.get_usage.return_value = UserUsage(video_count=0, total_bytes=0)
+    repo.save.side_effect = QuotaExceededError("Storage quota exceeded")
+    storage = AsyncMock()
+    storage.upload_file.return_value = "s3://bucket/videos/movie.mp4"
+    publisher = AsyncMock()
+    quota = StorageQuota(max_bytes=1000)
+
+    with pytest.raises(QuotaExceededError):
+        await UploadVideoUseCase(repo, storage, publisher, UserKeyLayout(), quota=quota).execute(
+            UploadVideoInput(
+                user_id=uuid4(),
+                filename="movie.mp4",
+                file=BytesIO(b"abc"),
+                file_size=101,
+                content_type="video/mp4",
+            )
+        )
+
+    assert repo.save.await_args.kwargs["quota"] == quota
+    storage.delete_file.assert_awaited_once_with("s3://bucket/videos/movie.mp4")
+    repo.commit.assert_not_awaited()
+    publisher.publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_upload_video_stores_under_the_key_layout():
+    user_id = uuid4()
+    layout = MagicMock()
+    layout.key_for.return_value = "videos/ab/file.mp4"
+    storage = AsyncMock()
+    storage.upload_file.return_value = "s3://video-uploads/videos/ab/file.mp4"
+    repo = AsyncMock()
+    repo.save.side_effect = lambda video, quota=None: video
+
+    result = await UploadVideoUseCase(repo, storage, AsyncMock(), layout).execute(
+        UploadVideoInput(user_id=user_id, filename="movie.mp4", file=BytesIO(b"abc"), file_size=3, content_type="video/mp4")
+    )
+
+    layout.key_for.assert_called_once_with(user_id, result.id, "mp4")
+    assert storage.upload_file.await_args.kwargs["key"] == "videos/ab/file.mp4"
+    assert result.file_path == "s3://video-uploads/videos/ab/file.mp4"
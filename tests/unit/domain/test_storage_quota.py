@@ -0,0 +1,16 @@
+import pytest
+
+from video_service.domain.entities.storage_quota import StorageQuota
+from video_service.domain.exceptions import QuotaExceededError
+
+
+def test_storage_quota_checks_count_and_bytes():
+    assert StorageQuota().is_unlimited is True
+    StorageQuota().check(video_count=10**6, total_bytes=10**15, file_size=10**9)
+
+    quota = StorageQuota(max_bytes=100, max_videos=2)
+    quota.check(video_count=1, total_bytes=50, file_size=50)
+    with pytest.raises(QuotaExceededError, match="2 videos"):
+        quota.check(video_count=2, total_bytes=0, file_size=1)
+    with pytest.raises(QuotaExceededError, match="100 bytes"):
+        quota.check(video_count=0, total_bytes=50, file_size=51)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 from video_service.domain.entities.video import Video
@@ -62,3 +62,15 @@ def test_video_equality_hash_and_created_at_default():
     assert video1 == video2
     assert hash(video1) == hash(video2)
     assert (video1 == object()) is False
+
+
+def test_new_ids_are_time_ordered_and_carry_their_creation_time():
+    at = datetime(2024, 2, 29, 23, 59, 59, 999999, tzinfo=UTC)
+
+    video_id = Video.new_id(at)
+
+    assert video_id.version == 7
+    assert Video.id_timestamp(video_id) == datetime(2024, 2, 29, 23, 59, 59, 999000, tzinfo=UTC)
+    assert Video.new_id(at) != video_id
+    assert Video.new_id(at + timedelta(milliseconds=1)) > video_id
+    assert Video.id_timestamp(uuid4()) is None
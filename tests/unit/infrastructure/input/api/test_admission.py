@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from video_service.infrastructure.adapters.input.api.admission import (
+    AdmissionRejected,
+    UploadAdmissionController,
+    UploadAdmissionMiddleware,
+)
+
+
+def _controller(**overrides):
+    options = dict(max_inflight_bytes=100, max_concurrent=2, max_queue=2, queue_timeout=0.5, max_retry_after=30)
+    options.update(overrides)
+    return UploadAdmissionController(**options)
+
+
+@pytest.mark.asyncio
+async def test_admits_within_budget_and_queues_until_release():
+    controller = _controller()
+    await controller.acquire(60)
+    waiter = asyncio.create_task(controller.acquire(60))
+    await asyncio.sleep(0)
+
+    assert controller.queue_depth == 1
+    assert controller.inflight_bytes == 60
+
+    controller.release(60, duration=1.0)
+    await waiter
+
+    assert controller.queue_depth == 0
+    assert controller.inflight == 1
+    assert controller.inflight_bytes == 60
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_admitted_when_idle():
+    controller = _controller()
+    await controller.acquire(1000)
+    assert controller.inflight_bytes == 1000
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full_or_wait_times_out():
+    controller = _controller(max_concurrent=1, max_queue=1, queue_timeout=0.01)
+    await controller.acquire(10)
+    queued = asyncio.create_task(controller.acquire(10))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as full:
+        await controller.acquire(10)
+    assert full.value.reason == "queue_full"
+    assert full.value.retry_after == 1
+
+    with pytest.raises(AdmissionRejected) as timed_out:
+        await queued
+    assert timed_out.value.reason == "queue_timeout"
+    assert controller.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue_and_unblocks_followers():
+    controller = _controller(max_inflight_bytes=100, max_concurrent=5)
+    await controller.acquire(50)
+    big = asyncio.create_task(controller.acquire(80))
+    small = asyncio.create_task(controller.acquire(40))
+    await asyncio.sleep(0)
+    assert controller.queue_depth == 2
+
+    big.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await big
+    await small
+
+    assert controller.queue_depth == 0
+    assert controller.inflight_bytes == 90
+
+
+def test_retry_after_scales_with_recent_durations_and_is_clamped():
+    controller = _controller(max_concurrent=1)
+    assert controller.retry_after(10) == 1
+
+    controller._inflight = 1
+    controller.release(0, duration=4.0)
+    assert controller.retry_after(10) == 4
+
+    controller.release(0, duration=400.0)
+    assert controller.retry_after(10) == 30
+
+
+def test_middleware_returns_429_with_retry_after_and_skips_other_routes():
+    controller = _controller(max_concurrent=0, max_queue=0)
+    app = FastAPI()
+
+    @app.post("/videos/upload")
+    async def upload():
+        return {"ok": True}
+
+    @app.get("/videos/")
+    async def list_videos():
+        return {"ok": True}
+
+    app.add_middleware(UploadAdmissionMiddleware, controller=controller)
+    client = TestClient(app)
+
+    rejected = client.post("/videos/upload", content=b"x" * 10)
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "1"
+    assert client.get("/videos/").status_code == 200
+
+
+def test_middleware_releases_budget_after_request():
+    controller = UploadAdmissionController.from_settings(
+        SimpleNamespace(
+            UPLOAD_MAX_INFLIGHT_BYTES=100,
+            UPLOAD_MAX_CONCURRENT=1,
+            UPLOAD_MAX_QUEUE=0,
+            UPLOAD_QUEUE_TIMEOUT_SECONDS=0.1,
+            UPLOAD_RETRY_AFTER_MAX_SECONDS=10,
+        )
+    )
+    app = FastAPI()
+
+    @app.post("/videos/upload")
+    async def upload():
+        return {"inflight_bytes": controller.inflight_bytes}
+
+    app.add_middleware(UploadAdmissionMiddleware, controller=controller, default_request_bytes=77)
+    client = TestClient(app)
+
+    assert client.post("/videos/upload", content=b"x" * 10).json() == {"inflight_bytes": 10}
+    assert controller.inflight == 0
+
+    chunked = client.post("/videos/upload", content=iter([b"x", b"y"]))
+    assert chunked.json() == {"inflight_bytes": 77}
+    assert controller.inflight_bytes == 0
@@ -0,0 +1,190 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+
+from video_service.application.ports.output.upload_staging import StagedUpload
+from video_service.application.use_cases.accept_video_upload import AcceptVideoUploadOutput
+from video_service.application.use_cases.upload_video import UploadVideoInput
+from video_service.infrastructure.adapters.input.api import async_upload
+from video_service.infrastructure.adapters.input.api.async_upload import UploadTransferPool, UploadUseCases
+
+
+def _upload():
+    video_id, user_id = uuid4(), uuid4()
+    return StagedUpload(video_id, user_id, "movie.mp4", f"videos/{user_id}/{video_id}.mp4", "video/mp4", 3)
+
+
+class _Staging:
+    def __init__(self, staged=()):
+        self.staged = {upload.video_id: upload for upload in staged}
+        self.discarded = []
+
+    async def stage(self, upload, file):
+        self.staged[upload.video_id] = upload
+
+    def open(self, video_id):
+        return BytesIO(b"abc")
+
+    async def discard(self, video_id):
+        self.discarded.append(video_id)
+        self.staged.pop(video_id, None)
+
+    async def list_staged(self):
+        return list(self.staged.values())
+
+
+class _Complete:
+    def __init__(self, failures=0, result=True):
+        self.failures = failures
+        self.result = result
+        self.calls = []
+        self.failed = []
+        self.sweeps = []
+
+    async def execute(self, upload):
+        self.calls.append(upload.video_id)
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("s3 down")
+        return self.result
+
+    async def fail(self, upload):
+        self.failed.append(upload.video_id)
+
+    async def fail_abandoned(self, created_before, keep):
+        self.sweeps.append((created_before, keep))
+        if len(self.sweeps) == 1:
+            raise ConnectionError("db down")
+        return 1
+
+
+class _Accept:
+    def __init__(self, upload):
+        self.upload = upload
+
+    async def execute(self, input_data):
+        return AcceptVideoUploadOutput(video=self.upload.video_id, upload=self.upload)
+
+
+def _use_cases(complete, accept=None, commits=None):
+    @asynccontextmanager
+    async def factory():
+        yield UploadUseCases(accept=accept, complete=complete)
+        if isinstance(commits, Exception):
+            raise commits
+
+    return factory
+
+
+async def _drain(pool):
+    while pool.pending:
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_start_recovers_staged_uploads_and_transfers_them():
+    uploads = [_upload(), _upload()]
+    staging = _Staging(uploads)
+    complete = _Complete()
+    pool = UploadTransferPool(staging, _use_cases(complete), workers=2)
+
+    assert await pool.start() == 2
+    await _drain(pool)
+    await pool.stop()
+
+    assert sorted(complete.calls) == sorted(u.video_id for u in uploads)
+    assert sorted(staging.discarded) == sorted(u.video_id for u in uploads)
+
+
+@pytest.mark.asyncio
+async def test_failed_transfers_are_retried_with_backoff_then_marked_failed():
+    upload = _upload()
+    staging = _Staging([upload])
+    complete = _Complete(failures=10)
+    pool = UploadTransferPool(staging, _use_cases(complete), workers=1, max_attempts=3, retry_seconds=0.001)
+
+    await pool.start()
+    await _drain(pool)
+    await pool.stop()
+
+    assert complete.calls == [upload.video_id] * 3
+    assert complete.failed == [upload.video_id]
+    assert staging.discarded == [upload.video_id]
+
+
+@pytest.mark.asyncio
+async def test_a_transfer_that_succeeds_on_retry_is_not_failed():
+    upload = _upload()
+    complete = _Complete(failures=1)
+    pool = UploadTransferPool(_Staging([upload]), _use_cases(complete), workers=1, retry_seconds=0.001)
+
+    await pool.start()
+    await _drain(pool)
+    await pool.stop()
+
+    assert complete.calls == [upload.video_id] * 2
+    assert complete.failed == []
+
+
+@pytest.mark.asyncio
+async def test_the_sweep_fails_abandoned_uploads_except_those_staged_here():
+    upload = _upload()
+    complete = _Complete()
+    pool = UploadTransferPool(
+        _Staging([upload]), _use_cases(complete), workers=0, abandoned_after=3600, sweep_seconds=0.001
+    )
+
+    await pool.start()
+    while len(complete.sweeps) < 2:
+        await asyncio.sleep(0.001)
+    await pool.stop()
+
+    created_before, keep = complete.sweeps[1]
+    assert keep == {upload.video_id}
+    assert datetime.now(UTC) - created_before >= timedelta(seconds=3600)
+
+
+@pytest.mark.asyncio
+async def test_accept_queues_the_transfer_and_counts_towards_capacity():
+    upload = _upload()
+    pool = UploadTransferPool(_Staging(), _use_cases(_Complete(), accept=_Accept(upload)), max_pending=2)
+    input_data = UploadVideoInput(upload.user_id, "movie.mp4", BytesIO(b"abc"), 3, "video/mp4")
+
+    assert await pool.accept(input_data) == upload.video_id
+    pool.submit(upload)
+
+    assert pool.pending == 1
+    assert pool.has_capacity(1) is True
+    assert pool.has_capacity(2) is False
+
+
+@pytest.mark.asyncio
+async def test_accept_discards_the_staged_file_when_the_commit_fails():
+    upload = _upload()
+    staging = _Staging()
+    pool = UploadTransferPool(staging, _use_cases(_Complete(), accept=_Accept(upload), commits=RuntimeError("commit")))
+
+    with pytest.raises(RuntimeError):
+        await pool.accept(UploadVideoInput(upload.user_id, "movie.mp4", BytesIO(b"abc"), 3, "video/mp4"))
+
+    assert staging.discarded == [upload.video_id]
+    assert pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_start_async_uploads_only_when_enabled(tmp_path, monkeypatch):
+    settings = async_upload.Settings(UPLOAD_ASYNC_ENABLED=False, UPLOAD_STAGING_DIR=str(tmp_path))
+    assert await async_upload.start_async_uploads(settings) is None
+    assert async_upload.get_upload_pool() is None
+
+    settings = async_upload.Settings(UPLOAD_ASYNC_ENABLED=True, UPLOAD_STAGING_DIR=str(tmp_path), UPLOAD_ASYNC_WORKERS=1)
+    pool = await async_upload.start_async_uploads(settings)
+    try:
+        assert async_upload.get_upload_pool() is pool
+        assert pool.pending == 0
+    finally:
+        await async_upload.stop_async_uploads()
+    assert async_upload.get_upload_pool() is None
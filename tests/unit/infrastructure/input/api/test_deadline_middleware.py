@@ -0,0 +1,98 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from video_service.infrastructure.adapters.input.api.admission import (
+    UploadAdmissionController,
+    UploadAdmissionMiddleware,
+)
+from video_service.infrastructure.adapters.input.api.deadline import DeadlineMiddleware
+from video_service.infrastructure.adapters.input.api.main import deadline_exceeded_handler
+from video_service.infrastructure.resilience import DeadlineExceededError, deadline_scope, remaining
+
+
+def _app(default_budget=1.0, route_budgets=None):
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware, default_budget=default_budget, route_budgets=route_budgets)
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
+
+    @app.get("/items/special")
+    async def special():
+        return {"remaining": remaining()}
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"remaining": remaining()}
+
+    @app.get("/slow-dependency")
+    async def slow_dependency():
+        async with deadline_scope("db"):
+            await asyncio.sleep(5)
+
+    @app.get("/busy")
+    async def busy():
+        await asyncio.sleep(5)
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            yield b"a"
+            await asyncio.sleep(0.3)
+            yield b"b"
+
+        return StreamingResponse(body())
+
+    return app
+
+
+def test_budget_comes_from_route_and_client_header_can_only_shorten_it():
+    client = TestClient(_app(route_budgets={"GET /items/{item_id}": 30.0, "GET /items/special": 2.0}))
+
+    assert 29 < client.get("/items/1").json()["remaining"] <= 30
+    assert client.get("/items/special").json()["remaining"] <= 2
+    assert client.get("/items/1", headers={"X-Request-Timeout": "0.5"}).json()["remaining"] <= 0.5
+    assert client.get("/items/1", headers={"X-Request-Timeout": "600"}).json()["remaining"] <= 30
+    assert client.get("/items/1", headers={"X-Request-Timeout": "soon"}).json()["remaining"] > 29
+
+
+def test_stage_deadline_returns_504():
+    response = TestClient(_app(default_budget=0.05)).get("/slow-dependency")
+
+    assert response.status_code == 504
+
+
+def test_middleware_cancels_request_that_never_responds():
+    response = TestClient(_app(default_budget=0.05)).get("/busy")
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+
+
+def test_started_stream_is_not_cut_off():
+    response = TestClient(_app(default_budget=0.05)).get("/stream")
+
+    assert response.status_code == 200
+    assert response.content == b"ab"
+
+
+def test_time_queued_for_upload_admission_counts_against_the_deadline():
+    controller = UploadAdmissionController(max_inflight_bytes=10, max_concurrent=1, max_queue=5, queue_timeout=5.0)
+    app = FastAPI()
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
+
+    @app.post("/videos/upload")
+    async def upload():
+        return {"remaining": remaining()}
+
+    # Same order as create_app: the deadline is added after, so around, admission.
+    app.add_middleware(UploadAdmissionMiddleware, controller=controller)
+    app.add_middleware(DeadlineMiddleware, default_budget=0.2)
+
+    # The only upload slot is taken, so the request waits in the admission queue.
+    asyncio.run(controller.acquire(1))
+    response = TestClient(app).post("/videos/upload", headers={"Content-Length": "1"})
+
+    assert response.status_code == 504
+    assert controller.queue_depth == 0
@@ -8,6 +8,11 @@ from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
 
 from video_service.infrastructure.adapters.input.api import dependencies as deps
+from video_service.infrastructure.adapters.output.messaging.deferred_publisher import (
+    DeferredEventPublisher,
+    EventBacklog,
+)
+from video_service.infrastructure.resilience import CircuitBreaker
 
 
 class _FakeAsyncClient:
@@ -76,9 +81,96 @@ async def test_factory_dependencies_create_expected_adapters():
     repo = await deps.get_video_repository(db=db)
     assert repo.__class__.__name__ == "SQLAlchemyVideoRepository"
 
-    settings = SimpleNamespace(S3_BUCKET="bucket", AWS_ENDPOINT_URL="", AWS_DEFAULT_REGION="us-east-1", SNS_TOPIC_ARN="arn")
+    settings = SimpleNamespace(
+        S3_BUCKET="bucket",
+        AWS_ENDPOINT_URL="",
+        AWS_DEFAULT_REGION="us-east-1",
+        SNS_TOPIC_ARN="arn",
+        STORAGE_REGIONS=[],
+    )
     storage = await deps.get_storage_service(settings=settings)
     publisher = await deps.get_event_publisher(settings=settings)
 
     assert storage.__class__.__name__ == "S3StorageService"
     assert publisher.__class__.__name__ == "SNSEventPublisher"
+
+    regions = [{"name": "eu", "bucket": "bucket-eu", "region": "eu-west-1"}]
+    storage = await deps.get_storage_service(settings=SimpleNamespace(**{**vars(settings), "STORAGE_REGIONS": regions}))
+    assert storage.__class__.__name__ == "MultiRegionStorageService"
+    assert storage.storage_path("videos/a.mp4", "eu-west-1") == "s3://bucket-eu/videos/a.mp4"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_records_auth_outcomes_on_circuit_breaker():
+    breaker = CircuitBreaker("auth-test", window_size=1, min_calls=1, open_seconds=30.0)
+    response = SimpleNamespace(status_code=502, json=lambda: {})
+
+    with patch("video_service.infrastructure.adapters.input.api.dependencies.httpx.AsyncClient", return_value=_FakeAsyncClient(response=response)):
+        with pytest.raises(HTTPException) as exc_info:
+            await deps.get_current_user_id(
+                credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials="token"),
+                settings=SimpleNamespace(AUTH_SERVICE_URL="http://auth"),
+                circuit_breaker=breaker,
+            )
+    assert exc_info.value.status_code == 503
+    assert breaker.state == "open"
+
+    with patch("video_service.infrastructure.adapters.input.api.dependencies.httpx.AsyncClient") as client:
+        with pytest.raises(HTTPException) as exc_info:
+            await deps.get_current_user_id(
+                credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials="token"),
+                settings=SimpleNamespace(AUTH_SERVICE_URL="http://auth"),
+                circuit_breaker=breaker,
+            )
+    client.assert_not_called()
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "30"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_uses_shared_auth_client():
+    user_id = uuid4()
+    shared = _FakeAsyncClient(response=SimpleNamespace(status_code=200, json=lambda: {"id": str(user_id)}))
+
+    with patch("video_service.infrastructure.adapters.input.api.dependencies.httpx.AsyncClient") as client:
+        result = await deps.get_current_user_id(
+            credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials="token"),
+            settings=SimpleNamespace(AUTH_SERVICE_URL="http://auth"),
+            auth_client=shared,
+        )
+
+    client.assert_not_called()
+    assert result == user_id
+
+
+@pytest.mark.asyncio
+async def test_get_event_publisher_wraps_publisher_when_backlog_configured():
+    settings = SimpleNamespace(AWS_ENDPOINT_URL="", AWS_DEFAULT_REGION="us-east-1", SNS_TOPIC_ARN="arn")
+    backlog = EventBacklog(CircuitBreaker("sns-deps-test"))
+
+    publisher = await deps.get_event_publisher(settings=settings, backlog=backlog)
+
+    assert isinstance(publisher, DeferredEventPublisher)
+
+
+@pytest.mark.asyncio
+async def test_get_db_delegates_to_the_persistence_session_dependency(monkeypatch):
+    from video_service.infrastructure.adapters.output.persistence import database
+
+    events = []
+
+    async def fake_get_db():
+        events.append("open")
+        try:
+            yield "session"
+        except RuntimeError:
+            events.append("rollback")
+            raise
+
+    monkeypatch.setattr(database, "get_db", fake_get_db)
+    dependency = deps.get_db()
+
+    assert await dependency.__anext__() == "session"
+    with pytest.raises(RuntimeError):
+        await dependency.athrow(RuntimeError("request failed"))
+    assert events == ["open", "rollback"]
@@ -0,0 +1,18 @@
+from video_service.infrastructure.adapters.input.api.etag import if_none_match_matches, make_etag
+
+
+def test_make_etag_is_strong_and_depends_on_parts():
+    etag = make_etag("video", 1)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("video", 1)
+    assert etag != make_etag("video", 2)
+
+
+def test_if_none_match_uses_weak_comparison_and_wildcard():
+    etag = make_etag("video", 1)
+
+    assert if_none_match_matches(None, etag) is False
+    assert if_none_match_matches('"other"', etag) is False
+    assert if_none_match_matches(f'"other", W/{etag}', etag) is True
+    assert if_none_match_matches("*", etag) is True
@@ -0,0 +1,168 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from video_service.infrastructure.adapters.input.api.event_stream import (
+    RESET_EVENT,
+    VideoEventHub,
+    stream_events,
+)
+from video_service.infrastructure.adapters.output.messaging.redis_change_notifier import (
+    events_channel,
+    events_stream_key,
+)
+
+
+class _FakePubSub:
+    def __init__(self):
+        self.channels = []
+        self.inbox: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.remove(channel)
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        try:
+            return await asyncio.wait_for(self.inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        pass
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._results = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xrange(self, *args, **kwargs):
+        self._results.append(self._redis.xrange(*args, **kwargs))
+
+    async def execute(self):
+        return self._results
+
+
+class _FakeRedis:
+    def __init__(self, streams=None):
+        self.pubsub_instance = _FakePubSub()
+        self.streams = streams or {}
+
+    def pubsub(self):
+        return self.pubsub_instance
+
+    def pipeline(self, transaction):
+        return _FakePipeline(self)
+
+    def xrange(self, key, min="-", count=None):
+        entries = self.streams.get(key, [])
+        if min.startswith("("):
+            after = tuple(int(part) for part in min[1:].split("-"))
+            entries = [entry for entry in entries if tuple(int(part) for part in entry[0].split("-")) > after]
+        return entries[:count]
+
+    def publish(self, user_id, event_id, data):
+        self.pubsub_instance.inbox.put_nowait(
+            {"type": "message", "channel": events_channel(user_id), "data": f"{event_id}\n{data}"}
+        )
+
+
+async def _next(stream, timeout=1.0):
+    return await asyncio.wait_for(anext(stream), timeout)
+
+
+@pytest.mark.asyncio
+async def test_stream_delivers_live_events_and_heartbeats_and_unsubscribes():
+    redis = _FakeRedis()
+    hub = VideoEventHub(redis)
+    user_id = uuid4()
+    stream = stream_events(hub, user_id, None, heartbeat_seconds=0.05)
+
+    assert (await _next(stream)).startswith("retry:")
+    assert await _next(stream) == ": ping\n\n"
+
+    redis.publish(user_id, "5-0", '{"type": "video.status_changed"}')
+    redis.publish(uuid4(), "6-0", '{"other": "user"}')
+    assert await _next(stream) == 'id: 5-0\ndata: {"type": "video.status_changed"}\n\n'
+
+    await stream.aclose()
+    assert redis.pubsub_instance.channels == []
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_buffered_events_and_skips_live_duplicates():
+    user_id = uuid4()
+    redis = _FakeRedis({events_stream_key(user_id): [("1-0", {"data": "a"}), ("2-0", {"data": "b"}), ("3-0", {"data": "c"})]})
+    hub = VideoEventHub(redis)
+    stream = stream_events(hub, user_id, "1-0", heartbeat_seconds=5)
+
+    await _next(stream)
+    assert await _next(stream) == "id: 2-0\ndata: b\n\n"
+    assert await _next(stream) == "id: 3-0\ndata: c\n\n"
+
+    redis.publish(user_id, "3-0", "c")
+    redis.publish(user_id, "4-0", "d")
+    assert await _next(stream) == "id: 4-0\ndata: d\n\n"
+
+    await stream.aclose()
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_past_the_replay_buffer_asks_client_to_reset():
+    user_id = uuid4()
+    redis = _FakeRedis({events_stream_key(user_id): [("7-0", {"data": "g"})]})
+    hub = VideoEventHub(redis)
+    stream = stream_events(hub, user_id, "2-0", heartbeat_seconds=5)
+
+    await _next(stream)
+    assert await _next(stream) == RESET_EVENT
+
+    await stream.aclose()
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_near_the_end_of_a_stream_longer_than_the_replay_size():
+    user_id = uuid4()
+    # Approximate trimming leaves more than replay_size entries in the stream.
+    entries = [(f"{i}-0", {"data": str(i)}) for i in range(1, 11)]
+    hub = VideoEventHub(_FakeRedis({events_stream_key(user_id): entries}), replay_size=3)
+
+    assert await hub.replay(user_id, "8-0") == [("9-0", "9"), ("10-0", "10")]
+    assert await hub.replay(user_id, "10-0") == []
+    # More missed events than a replay sends: the client reloads instead.
+    assert await hub.replay(user_id, "5-0") is None
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_disconnected_when_its_queue_fills_up():
+    redis = _FakeRedis()
+    hub = VideoEventHub(redis, max_queued=2, max_connections=1)
+    user_id = uuid4()
+    stream = stream_events(hub, user_id, None, heartbeat_seconds=5)
+    await _next(stream)
+    assert hub.is_full
+
+    for i in range(4):
+        redis.publish(user_id, f"{i + 1}-0", str(i))
+    await asyncio.sleep(0.05)
+
+    assert await _next(stream) == "id: 1-0\ndata: 0\n\n"
+    assert await _next(stream) == "id: 2-0\ndata: 1\n\n"
+    with pytest.raises(StopAsyncIteration):
+        await _next(stream)
+    assert not hub.is_full
+    await hub.close()
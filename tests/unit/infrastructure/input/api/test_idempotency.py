@@ -0,0 +1,139 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from video_service.infrastructure.adapters.input.api.idempotency import (
+    IdempotencyGuard,
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    RedisIdempotencyStore,
+    StoredResponse,
+    upload_fingerprint,
+    valid_key,
+)
+
+
+class _FakeRedis:
+    """SET NX/GET plus a Python stand-in for the owner-checked finish script."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key], self.ttls[key] = value, ex
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    def register_script(self, script):
+        async def _finish(keys, args):
+            (key,), (owner, value, ttl) = keys, args
+            current = self.values.get(key)
+            if current is None or json.loads(current)["owner"] != owner:
+                return 0
+            if value == "":
+                del self.values[key]
+            else:
+                self.values[key], self.ttls[key] = value, ttl
+            return 1
+
+        return _finish
+
+
+class _BrokenRedis(_FakeRedis):
+    async def set(self, key, value, nx=False, ex=None):
+        raise ConnectionError("redis down")
+
+
+def _guard(redis, **kwargs):
+    return IdempotencyGuard(RedisIdempotencyStore(redis), lock_seconds=30, response_ttl_seconds=600, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_after_completion_replays_stored_response():
+    redis = _FakeRedis()
+    guard = _guard(redis)
+    user_id = uuid4()
+    calls = []
+
+    async def action():
+        calls.append(1)
+        return StoredResponse(201, [{"id": "v1"}])
+
+    first = await guard.run(user_id, "key-1", "fp", action)
+    second = await guard.run(user_id, "key-1", "fp", action)
+    other_user = await guard.run(uuid4(), "key-1", "fp", action)
+
+    assert first == (StoredResponse(201, [{"id": "v1"}]), False)
+    assert second == (StoredResponse(201, [{"id": "v1"}]), True)
+    assert other_user[1] is False
+    assert len(calls) == 2
+    assert redis.ttls[f"idempotency:upload:{user_id}:key-1"] == 600
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_different_request_is_rejected():
+    guard = _guard(_FakeRedis())
+    user_id = uuid4()
+
+    async def action():
+        return StoredResponse(201, [])
+
+    await guard.run(user_id, "key", "fp-a", action)
+    with pytest.raises(IdempotencyKeyReusedError):
+        await guard.run(user_id, "key", "fp-b", action)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_in_progress_waits_then_conflicts():
+    redis = _FakeRedis()
+    guard = _guard(redis, wait_seconds=0.05, poll_interval=0.01)
+    user_id = uuid4()
+    release = asyncio.Event()
+
+    async def slow_action():
+        await release.wait()
+        return StoredResponse(201, ["done"])
+
+    first = asyncio.create_task(guard.run(user_id, "key", "fp", slow_action))
+    await asyncio.sleep(0)
+    with pytest.raises(IdempotencyInProgressError):
+        await guard.run(user_id, "key", "fp", slow_action)
+
+    patient = _guard(redis, wait_seconds=5, poll_interval=0.01)
+    waiting = asyncio.create_task(patient.run(user_id, "key", "fp", slow_action))
+    await asyncio.sleep(0.02)
+    release.set()
+
+    assert (await first)[1] is False
+    assert await waiting == (StoredResponse(201, ["done"]), True)
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_releases_key_and_store_outage_fails_open():
+    guard = _guard(_FakeRedis())
+    user_id = uuid4()
+
+    async def failing():
+        raise RuntimeError("s3 down")
+
+    async def action():
+        return StoredResponse(201, ["ok"])
+
+    with pytest.raises(RuntimeError):
+        await guard.run(user_id, "key", "fp", failing)
+    assert await guard.run(user_id, "key", "fp", action) == (StoredResponse(201, ["ok"]), False)
+
+    assert await _guard(_BrokenRedis()).run(user_id, "key", "fp", action) == (StoredResponse(201, ["ok"]), False)
+
+
+def test_fingerprint_and_key_validation():
+    assert upload_fingerprint([("a.mp4", 1, "video/mp4")]) != upload_fingerprint([("a.mp4", 2, "video/mp4")])
+    assert valid_key("3f2c-retry")
+    assert not valid_key("") and not valid_key("x" * 256) and not valid_key("bad\nkey")
@@ -0,0 +1,119 @@
+import asyncio
+from datetime import UTC, datetime
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from video_service.infrastructure.adapters.input.api.profiling import (
+    AWAITING,
+    Profile,
+    ProfileStore,
+    ProfilingMiddleware,
+    StackSampler,
+    get_profile_store,
+)
+from video_service.infrastructure.adapters.input.api.routes import admin_router
+from video_service.infrastructure.config import Settings, get_settings
+
+TOKEN = "s3cret"
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def wait_for_dependency() -> None:
+    await asyncio.sleep(0.1)
+
+
+def _app(store: ProfileStore, sample_rate: float = 0.0, rand=lambda: 1.0):
+    app = FastAPI()
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=store,
+        sampler=StackSampler(interval=0.002, max_seconds=30),
+        token=TOKEN,
+        sample_rate=sample_rate,
+        rand=rand,
+    )
+    app.include_router(admin_router, prefix="/admin")
+    app.dependency_overrides[get_profile_store] = lambda: store
+    app.dependency_overrides[get_settings] = lambda: Settings(PROFILING_TOKEN=TOKEN)
+
+    @app.get("/work")
+    async def work():
+        busy_wait(0.1)
+        await wait_for_dependency()
+        return {"ok": True}
+
+    return app
+
+
+def test_unselected_requests_are_not_profiled():
+    store = ProfileStore(max_profiles=10)
+    client = TestClient(_app(store))
+
+    response = client.get("/work", headers={"X-Profile-Token": "wrong"})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert store.list() == []
+
+
+def test_token_header_profiles_request_across_awaits_and_serves_collapsed_stacks():
+    store = ProfileStore(max_profiles=10)
+    client = TestClient(_app(store))
+
+    profile_id = client.get("/work", headers={"X-Profile-Token": TOKEN}).headers["x-profile-id"]
+
+    profile = store.get(profile_id)
+    assert profile.trigger == "header"
+    assert profile.path == "/work"
+    assert profile.samples > 0
+    running = [stack for stack in profile.stacks if "busy_wait" in stack]
+    waiting = [stack for stack in profile.stacks if "wait_for_dependency" in stack and stack.endswith(AWAITING)]
+    assert running and waiting
+    assert all(stack.startswith("ProfilingMiddleware.__call__") for stack in profile.stacks)
+
+    listed = client.get("/admin/profiles", headers={"X-Profile-Token": TOKEN}).json()
+    assert [item["id"] for item in listed] == [profile_id]
+    collapsed = client.get(f"/admin/profiles/{profile_id}", headers={"X-Profile-Token": TOKEN})
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    lines = collapsed.text.splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profile.samples
+
+
+def test_admin_endpoints_require_token():
+    client = TestClient(_app(ProfileStore(max_profiles=10)))
+
+    assert client.get("/admin/profiles").status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Profile-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/profiles/missing", headers={"X-Profile-Token": TOKEN}).status_code == 404
+
+
+def test_sampling_rate_picks_requests_and_store_keeps_only_the_latest():
+    store = ProfileStore(max_profiles=2)
+    client = TestClient(_app(store, sample_rate=0.5, rand=lambda: 0.1))
+
+    ids = [client.get("/work").headers["x-profile-id"] for _ in range(3)]
+
+    assert [profile.id for profile in store.list()] == ids[:0:-1]
+    assert {profile.trigger for profile in store.list()} == {"sampled"}
+
+
+def test_sampler_skips_targets_past_their_time_limit():
+    sampler = StackSampler(interval=0.01, max_seconds=0)
+    profile = Profile(id="p", method="GET", path="/", trigger="header", started_at=datetime.now(UTC))
+
+    async def run():
+        sampler.start(profile, asyncio.current_task(), None)
+        time.sleep(0.001)
+        sampler.sample()
+        sampler.stop(profile)
+
+    asyncio.run(run())
+
+    assert profile.samples == 0
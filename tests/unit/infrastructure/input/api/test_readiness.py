@@ -0,0 +1,148 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from video_service.infrastructure.adapters.input.api import readiness
+from video_service.infrastructure.adapters.input.api.readiness import ReadinessMonitor, build_probes
+from video_service.infrastructure.adapters.input.api.routes import health_router
+
+
+async def _ok():
+    return None
+
+
+async def _fail():
+    raise ConnectionError("refused")
+
+
+async def _hang():
+    await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_monitor_is_ready_once_required_probes_pass():
+    monitor = ReadinessMonitor({"db": _ok, "s3": _fail, "auth": _hang}, required=["db", "sns"], timeout=0.01)
+
+    assert monitor.status() == (False, {})
+
+    await monitor.check()
+    ready, results = monitor.status()
+
+    assert ready is True
+    assert monitor.required == {"db"}
+    assert results["db"].ok is True
+    assert (results["s3"].ok, results["s3"].error) == (False, "ConnectionError")
+    assert (results["auth"].ok, results["auth"].error) == (False, "timeout")
+
+
+@pytest.mark.asyncio
+async def test_monitor_is_not_ready_while_a_required_probe_fails():
+    state = {"probe": _fail}
+    monitor = ReadinessMonitor({"db": lambda: state["probe"]()}, required=["db"])
+
+    await monitor.check()
+    assert monitor.status()[0] is False
+
+    state["probe"] = _ok
+    await monitor.check()
+    assert monitor.status()[0] is True
+
+
+@pytest.mark.asyncio
+async def test_monitor_warms_up_then_probes_in_the_background():
+    calls = []
+
+    async def warm_up():
+        calls.append("warm_up")
+        raise ConnectionError("db down")
+
+    async def probe():
+        calls.append("probe")
+
+    monitor = ReadinessMonitor({"db": probe}, required=["db"], interval=0.01, warm_up=warm_up)
+    monitor.start()
+    while calls.count("probe") < 2:
+        await asyncio.sleep(0.005)
+    await monitor.stop()
+
+    assert calls[:2] == ["warm_up", "probe"]
+    assert monitor.status()[0] is True
+
+
+@pytest.mark.asyncio
+async def test_build_probes_covers_configured_dependencies():
+    calls = []
+
+    class _Client:
+        def __init__(self, name):
+            self._name = name
+
+        async def head_bucket(self, **kwargs):
+            calls.append((self._name, kwargs))
+
+        async def get_topic_attributes(self, **kwargs):
+            calls.append((self._name, kwargs))
+
+    class _AuthClient:
+        async def get(self, url):
+            calls.append(("auth", url))
+            return SimpleNamespace(status_code=503)
+
+    aws = SimpleNamespace(get={"s3": _Client("s3"), "sns": _Client("sns")}.get)
+    settings = SimpleNamespace(
+        S3_BUCKET="bucket",
+        SNS_TOPIC_ARN="arn:topic",
+        AUTH_SERVICE_URL="http://auth",
+        AUTH_HEALTH_PATH="/health",
+    )
+
+    probes = build_probes(settings, aws, _AuthClient())
+    await probes["s3"]()
+    await probes["sns"]()
+    with pytest.raises(RuntimeError):
+        await probes["auth"]()
+
+    assert set(probes) == {"db", "s3", "sns", "auth"}
+    assert calls == [("s3", {"Bucket": "bucket"}), ("sns", {"TopicArn": "arn:topic"}), ("auth", "http://auth/health")]
+    assert "sns" not in build_probes(SimpleNamespace(**{**vars(settings), "SNS_TOPIC_ARN": ""}), aws, _AuthClient())
+
+
+def _client(monitor):
+    app = FastAPI()
+    app.include_router(health_router)
+    app.dependency_overrides[readiness.get_readiness_monitor] = lambda: monitor
+    return TestClient(app)
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_serves_cached_results():
+    probes = {"db": _ok, "auth": _fail}
+    monitor = ReadinessMonitor(probes, required=["db"])
+    client = _client(monitor)
+
+    assert client.get("/ready").status_code == 503
+
+    await monitor.check()
+    probes["db"] = _fail
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["dependencies"]["db"]["required"] is True
+    assert body["dependencies"]["auth"] == {
+        **body["dependencies"]["auth"],
+        "ok": False,
+        "required": False,
+        "error": "ConnectionError",
+    }
+
+
+def test_ready_endpoint_is_unavailable_before_startup():
+    response = _client(None).get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["dependencies"] == {}
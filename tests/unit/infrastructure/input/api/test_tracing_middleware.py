@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from video_service.infrastructure.adapters.input.api.tracing import TracingMiddleware
+from video_service.infrastructure.tracing import InMemorySpanExporter, Tracer, configure_tracer, get_tracer, traced
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracer(Tracer(exporter, sample_rate=1.0))
+    yield exporter
+    configure_tracer(None)
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware, tracer=get_tracer())
+
+    @traced("db.find_by_id")
+    async def find(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return await find(item_id)
+
+    @app.get("/broken")
+    async def broken():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_server_span_continues_caller_trace_and_uses_route_template(exporter):
+    client = TestClient(_app())
+
+    response = client.get(
+        "/items/42", headers={"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"}
+    )
+
+    assert response.status_code == 200
+    db_span, server_span = exporter.spans
+    assert server_span.name == "GET /items/{item_id}"
+    assert server_span.attributes["http.status_code"] == 200
+    assert server_span.context.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert server_span.parent_id == "00f067aa0ba902b7"
+    assert db_span.parent_id == server_span.context.span_id
+
+
+def test_server_error_marks_span(exporter):
+    client = TestClient(_app(), raise_server_exceptions=False)
+
+    assert client.get("/broken").status_code == 500
+
+    (server_span,) = exporter.spans
+    assert server_span.parent_id is None
+    assert server_span.error
@@ -0,0 +1,44 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+from video_service.infrastructure.adapters.input.cli import manage_partitions as cli
+
+
+class _FakeEngine:
+    @asynccontextmanager
+    async def begin(self):
+        yield object()
+
+
+def _patch(monkeypatch, partitioned=True):
+    engine = _FakeEngine()
+    monkeypatch.setattr(cli, "get_engine", lambda: engine)
+    monkeypatch.setattr(cli, "dispose_engine", AsyncMock())
+    monkeypatch.setattr(cli.partitioning, "is_partitioned", AsyncMock(return_value=partitioned))
+    return engine
+
+
+def test_archive_dry_run_lists_old_and_detached_partitions(monkeypatch, capsys):
+    _patch(monkeypatch)
+    monkeypatch.setattr(
+        cli.partitioning,
+        "list_partitions",
+        AsyncMock(return_value=[("videos_p2000_01", False), ("videos_p2999_01", False)]),
+    )
+    monkeypatch.setattr(cli.partitioning, "list_detached_partitions", AsyncMock(return_value=["videos_p1999_12"]))
+    archive = AsyncMock()
+    monkeypatch.setattr(cli.partitioning, "archive_partition", archive)
+
+    assert cli.main(["archive", "--older-than-months", "12", "--dry-run"]) == 0
+
+    out = capsys.readouterr().out
+    assert "would_archive\tvideos_p2000_01" in out and "would_archive\tvideos_p1999_12" in out
+    assert "videos_p2999_01" not in out
+    archive.assert_not_awaited()
+
+
+def test_create_requires_partitioned_table(monkeypatch, capsys):
+    _patch(monkeypatch, partitioned=False)
+
+    assert cli.main(["create", "--months-ahead", "2"]) == 1
+    assert "not a partitioned table" in capsys.readouterr().out
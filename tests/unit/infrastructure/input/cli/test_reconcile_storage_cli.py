@@ -0,0 +1,40 @@
+from unittest.mock import AsyncMock
+
+from video_service.application.use_cases.reconcile_storage import ReconcileStorageOutput
+from video_service.infrastructure.adapters.input.cli import reconcile_storage as cli
+
+
+class _FakeSessionContext:
+    async def __aenter__(self):
+        return object()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def test_reconcile_cli_defaults_to_dry_run(monkeypatch, capsys):
+    execute = AsyncMock(return_value=ReconcileStorageOutput(scanned_objects=3, orphaned_objects=1))
+    monkeypatch.setattr(cli, "async_session", lambda: _FakeSessionContext())
+    monkeypatch.setattr(cli.ReconcileStorageUseCase, "execute", execute)
+
+    exit_code = cli.main(["--prefix", "videos/u1/", "--min-age-minutes", "5"])
+
+    assert exit_code == 0
+    input_data = execute.await_args.args[0]
+    assert input_data.dry_run is True
+    assert input_data.key_prefix == "videos/u1/"
+    assert input_data.min_object_age.total_seconds() == 300
+    assert "mode=dry-run" in capsys.readouterr().out
+
+
+def test_reconcile_cli_delete_mode_fails_on_failed_deletions(monkeypatch, capsys):
+    execute = AsyncMock(return_value=ReconcileStorageOutput(orphaned_objects=2, failed_deletions=1))
+    monkeypatch.setattr(cli, "async_session", lambda: _FakeSessionContext())
+    monkeypatch.setattr(cli.ReconcileStorageUseCase, "execute", execute)
+
+    exit_code = cli.main(["--delete"])
+
+    assert exit_code == 1
+    assert execute.await_args.args[0].dry_run is False
+    cli._print_finding("orphaned_object", "s3://bucket/videos/a.mp4")
+    assert "orphaned_object\ts3://bucket/videos/a.mp4" in capsys.readouterr().out
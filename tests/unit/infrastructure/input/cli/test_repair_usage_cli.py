@@ -0,0 +1,30 @@
+from contextlib import asynccontextmanager
+from uuid import uuid4
+from unittest.mock import AsyncMock
+
+from video_service.application.ports.output.repositories import UsageRepairBatch
+from video_service.infrastructure.adapters.input.cli import repair_usage as cli
+
+
+@asynccontextmanager
+async def _fake_session_scope():
+    yield object()
+
+
+def test_repair_usage_cli_walks_batches_until_a_short_one(monkeypatch, capsys):
+    first, second = uuid4(), uuid4()
+    execute = AsyncMock(
+        side_effect=[
+            UsageRepairBatch(last_user_id=first, checked=2, repaired=1),
+            UsageRepairBatch(last_user_id=second, checked=1, repaired=0),
+        ]
+    )
+    monkeypatch.setattr(cli, "session_scope", _fake_session_scope)
+    monkeypatch.setattr(cli.RepairUsageUseCase, "execute", execute)
+
+    assert cli.main(["--batch-size", "2"]) == 0
+
+    inputs = [call.args[0] for call in execute.await_args_list]
+    assert [i.after_user_id for i in inputs] == [None, first]
+    assert all(i.batch_size == 2 for i in inputs)
+    assert "checked_users=3 repaired_users=1" in capsys.readouterr().out
@@ -0,0 +1,103 @@
+import json
+from uuid import uuid4
+
+import pytest
+
+from video_service.application.use_cases.apply_processing_results import ApplyProcessingResultsOutput
+from video_service.infrastructure.adapters.output.messaging.codecs import JsonCodec, MessageEncoder, MsgPackCodec
+from video_service.infrastructure.adapters.input.messaging.processing_results_consumer import (
+    ProcessingResultsConsumer,
+    parse_result_message,
+)
+
+
+class _InMemoryQueue:
+    """Stands in for an aioboto3 SQS client bound to a single queue."""
+
+    def __init__(self, bodies):
+        self.messages = [
+            {"MessageId": str(i), "ReceiptHandle": f"rh-{i}", "Body": body} for i, body in enumerate(bodies)
+        ]
+        self.receive_calls = []
+        self.deleted = []
+
+    async def receive_message(self, QueueUrl, MaxNumberOfMessages, WaitTimeSeconds, MessageAttributeNames):
+        self.receive_calls.append((MaxNumberOfMessages, WaitTimeSeconds))
+        batch, self.messages = self.messages[:MaxNumberOfMessages], self.messages[MaxNumberOfMessages:]
+        return {"Messages": batch} if batch else {}
+
+    async def delete_message_batch(self, QueueUrl, Entries):
+        assert len(Entries) <= 10
+        self.deleted.extend(entry["ReceiptHandle"] for entry in Entries)
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries]}
+
+
+def _result(video_id, status="processing", progress=10):
+    return json.dumps({"video_id": str(video_id), "status": status, "progress": progress})
+
+
+def _consumer(apply_updates, batch_size=25):
+    return ProcessingResultsConsumer(queue_url="queue", apply_updates=apply_updates, batch_size=batch_size)
+
+
+def test_parse_result_message_accepts_raw_and_sns_wrapped_bodies():
+    video_id = uuid4()
+
+    raw = parse_result_message(_result(video_id, "completed", 100))
+    wrapped = parse_result_message(json.dumps({"Type": "Notification", "Message": _result(video_id)}))
+
+    assert (raw.video_id, raw.status, raw.progress) == (video_id, "completed", 100)
+    assert (wrapped.video_id, wrapped.status, wrapped.progress) == (video_id, "processing", 10)
+
+
+@pytest.mark.parametrize("codec, compression", [(JsonCodec(), True), (MsgPackCodec(), False), (MsgPackCodec(), True)])
+def test_parse_result_message_decodes_by_codec_attribute(codec, compression):
+    if codec.requires:
+        pytest.importorskip(codec.requires)
+    video_id = uuid4()
+    body, attributes = MessageEncoder(codec, compression=compression, compress_min_bytes=0).encode(
+        {"video_id": str(video_id), "status": "completed", "progress": 100}, schema_version=1
+    )
+    envelope = json.dumps(
+        {
+            "Type": "Notification",
+            "Message": body,
+            "MessageAttributes": {"codec": {"Type": "String", "Value": attributes["codec"]["StringValue"]}},
+        }
+    )
+
+    raw = parse_result_message(body, attributes)
+    wrapped = parse_result_message(envelope)
+
+    assert raw == wrapped
+    assert (raw.video_id, raw.status, raw.progress) == (video_id, "completed", 100)
+
+
+@pytest.mark.asyncio
+async def test_poll_once_batches_receives_applies_once_and_deletes_in_chunks():
+    queue = _InMemoryQueue([_result(uuid4()) for _ in range(22)] + ["not json"])
+    applied = []
+
+    async def _apply(updates):
+        applied.append(updates)
+        return ApplyProcessingResultsOutput(received=len(updates), applied=len(updates))
+
+    deleted = await _consumer(_apply).poll_once(queue)
+
+    assert queue.receive_calls == [(10, 20), (10, 0), (5, 0)]
+    assert len(applied) == 1 and len(applied[0]) == 22
+    assert deleted == 22
+    assert len(queue.deleted) == 22 and "rh-22" not in queue.deleted
+
+
+@pytest.mark.asyncio
+async def test_poll_once_keeps_messages_when_apply_fails():
+    queue = _InMemoryQueue([_result(uuid4())])
+
+    async def _apply(updates):
+        raise RuntimeError("database down")
+
+    with pytest.raises(RuntimeError):
+        await _consumer(_apply).poll_once(queue)
+
+    assert queue.deleted == []
@@ -1,6 +1,10 @@
+from types import SimpleNamespace
 from uuid import uuid4
 
-from video_service.infrastructure.adapters.output.persistence.database import Base
+import pytest
+
+from video_service.infrastructure.adapters.output.persistence import database
+from video_service.infrastructure.adapters.output.persistence.database import Base, _connect_args
 from video_service.infrastructure.adapters.output.persistence.models import VideoModel
 
 
@@ -19,3 +23,82 @@ def test_database_base_and_video_model_mapping():
 
     assert str(video.file_path).startswith("s3://")
     assert video.original_filename.endswith(".mp4")
+
+
+def test_connect_args_enable_prepared_statement_cache_for_asyncpg_only():
+    assert _connect_args("postgresql+asyncpg://u:p@h/db", 250) == {"prepared_statement_cache_size": 250}
+    assert _connect_args("sqlite+aiosqlite:///:memory:", 250) == {}
+
+
+def test_should_create_schema_defaults_off_in_production_only():
+    assert database.should_create_schema(SimpleNamespace(DB_CREATE_SCHEMA=None, APP_ENV="development")) is True
+    assert database.should_create_schema(SimpleNamespace(DB_CREATE_SCHEMA=None, APP_ENV="production")) is False
+    assert database.should_create_schema(SimpleNamespace(DB_CREATE_SCHEMA=True, APP_ENV="production")) is True
+
+
+@pytest.mark.asyncio
+async def test_engine_is_created_lazily_and_disposed():
+    await database.dispose_engine()
+    assert database._engine is None
+
+    engine = database.get_engine()
+    assert database.get_engine() is engine
+    session = database.async_session()
+    assert session.bind is engine
+    await session.close()
+
+    await database.dispose_engine()
+    assert database._engine is None
+
+
+@pytest.mark.asyncio
+async def test_init_db_skips_schema_creation_when_disabled(monkeypatch):
+    monkeypatch.setattr(database, "get_settings", lambda: SimpleNamespace(DB_CREATE_SCHEMA=False, APP_ENV="production"))
+    engine = SimpleNamespace(begin=lambda: pytest.fail("schema creation must be skipped"))
+    monkeypatch.setattr(database, "get_engine", lambda: engine)
+
+    await database.init_db()
+
+
+@pytest.mark.asyncio
+async def test_session_scope_commits_or_rolls_back(monkeypatch):
+    class _Session:
+        def __init__(self):
+            self.calls = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def commit(self):
+            self.calls.append("commit")
+
+        async def rollback(self):
+            self.calls.append("rollback")
+
+    session = _Session()
+    monkeypatch.setattr(database, "async_session", lambda: session)
+
+    async with database.session_scope():
+        pass
+    with pytest.raises(RuntimeError):
+        async with database.session_scope():
+            raise RuntimeError("boom")
+
+    assert session.calls == ["commit", "rollback"]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_leaves_connections_open_in_the_pool(monkeypatch, tmp_path):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/warm.db", poolclass=AsyncAdaptedQueuePool)
+    monkeypatch.setattr(database, "get_engine", lambda: engine)
+
+    await database.warm_up_pool(3)
+
+    assert engine.pool.checkedin() == 3
+    await engine.dispose()
@@ -0,0 +1,68 @@
+import pytest
+
+from video_service.infrastructure.adapters.output.messaging.job_routing import JobLane, JobRouter
+
+MB = 1024 * 1024
+
+LANES = [
+    {"name": "fast", "queue_url": "q-fast", "max_file_size": 50 * MB, "max_duration": 120, "formats": ["MP4", "mov"]},
+    {"name": "medium", "queue_url": "q-medium", "max_file_size": 200 * MB},
+]
+
+
+@pytest.mark.parametrize(
+    "file_size, duration, format, lane",
+    [
+        (10 * MB, 30.0, "mp4", "fast"),
+        (10 * MB, 30.0, "MOV", "fast"),
+        (10 * MB, 600.0, "mp4", "medium"),
+        (10 * MB, 30.0, "mkv", "medium"),
+        (100 * MB, None, "mp4", "medium"),
+        (500 * MB, None, "mp4", "default"),
+        (10 * MB, None, "mp4", "medium"),
+        (10 * MB, 30.0, None, "medium"),
+        (None, 30.0, "mp4", "default"),
+        (None, None, None, "default"),
+    ],
+)
+def test_router_picks_first_lane_the_job_fits(file_size, duration, format, lane):
+    router = JobRouter.from_settings("q-default", LANES)
+
+    chosen = router.route(file_size=file_size, duration=duration, format=format)
+
+    assert chosen.name == lane
+    assert chosen.queue_url == {"fast": "q-fast", "medium": "q-medium", "default": "q-default"}[lane]
+
+
+def test_router_lists_lanes_with_default_last():
+    router = JobRouter.from_settings("q-default", LANES)
+
+    assert [lane.name for lane in router.lanes] == ["fast", "medium", "default"]
+    assert router.lanes[0].formats == {"mp4", "mov"}
+
+
+@pytest.mark.parametrize(
+    "lanes",
+    [
+        [{"name": "fast"}],
+        [{"name": "fast", "queue_url": "q", "max_size": 1}],
+        [{"name": "fast", "queue_url": "q"}, {"name": "fast", "queue_url": "q2"}],
+        [{"name": "default", "queue_url": "q"}],
+    ],
+)
+def test_router_rejects_invalid_lanes(lanes):
+    with pytest.raises(ValueError):
+        JobRouter.from_settings("q-default", lanes)
+
+
+def test_lane_without_limits_accepts_everything():
+    lane = JobLane("any", "q")
+
+    assert lane.accepts(10**12, 10**6, "webm")
+
+
+def test_lane_with_a_limit_rejects_jobs_missing_that_value():
+    lane = JobLane("short", "q", max_duration=120)
+
+    assert not lane.accepts(10 * MB, None, "mp4")
+    assert lane.accepts(None, 60.0, None)
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+
+from video_service.infrastructure.adapters.output.storage.key_layouts import (
+    HashedKeyLayout,
+    UserKeyLayout,
+    key_layout_from_settings,
+)
+
+
+def test_user_layout_keeps_the_original_keys():
+    user_id, video_id = uuid4(), uuid4()
+    layout = UserKeyLayout()
+
+    key = layout.key_for(user_id, video_id, "mp4")
+
+    assert key == f"videos/{user_id}/{video_id}.mp4"
+    assert layout.partition(key) == "videos"
+
+
+def test_hashed_layout_spreads_one_users_keys_over_prefixes():
+    user_id = uuid4()
+    layout = HashedKeyLayout(hash_chars=2)
+
+    keys = [layout.key_for(user_id, uuid4(), "mp4") for _ in range(200)]
+    partitions = {layout.partition(key) for key in keys}
+
+    assert len(partitions) > 100
+    assert all(p.startswith("videos/") and len(p) == len("videos/") + 2 for p in partitions)
+    assert all(key.startswith(f"{layout.partition(key)}/{user_id}/") for key in keys)
+
+
+def test_hashed_layout_is_stable_and_groups_older_keys_under_the_root():
+    video_id = UUID("12345678-1234-5678-1234-567812345678")
+    layout = HashedKeyLayout(hash_chars=3)
+
+    assert layout.key_for(uuid4(), video_id, "mov").split("/")[1] == HashedKeyLayout(3).key_for(
+        uuid4(), video_id, "mov"
+    ).split("/")[1]
+    assert layout.partition(f"videos/{uuid4()}/{video_id}.mp4") == "videos"
+    assert layout.partition("videos/xyz/a.mp4") == "videos"
+    with pytest.raises(ValueError):
+        HashedKeyLayout(hash_chars=0)
+
+
+def test_key_layout_from_settings():
+    assert isinstance(key_layout_from_settings(SimpleNamespace(S3_KEY_LAYOUT="user", S3_KEY_HASH_CHARS=2)), UserKeyLayout)
+    layout = key_layout_from_settings(SimpleNamespace(S3_KEY_LAYOUT="hashed", S3_KEY_HASH_CHARS=4))
+    assert isinstance(layout, HashedKeyLayout)
+    assert len(layout.partition(layout.key_for(uuid4(), uuid4(), "mp4"))) == len("videos/") + 4
+    with pytest.raises(ValueError):
+        key_layout_from_settings(SimpleNamespace(S3_KEY_LAYOUT="random", S3_KEY_HASH_CHARS=2))
@@ -0,0 +1,58 @@
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+
+from video_service.application.ports.output.upload_staging import StagedUpload
+from video_service.infrastructure.adapters.output.storage.local_staging import LocalUploadStaging
+
+
+def _upload():
+    video_id, user_id = uuid4(), uuid4()
+    return StagedUpload(video_id, user_id, "movie.mp4", f"videos/{user_id}/{video_id}.mp4", "video/mp4", 5)
+
+
+@pytest.mark.asyncio
+async def test_staged_uploads_survive_a_new_instance(tmp_path):
+    upload = _upload()
+    file = BytesIO(b"video")
+    file.seek(3)
+    await LocalUploadStaging(str(tmp_path)).stage(upload, file)
+
+    staging = LocalUploadStaging(str(tmp_path))
+    assert await staging.list_staged() == [upload]
+    with staging.open(upload.video_id) as staged:
+        assert staged.read() == b"video"
+
+    await staging.discard(upload.video_id)
+    await staging.discard(upload.video_id)
+    assert await staging.list_staged() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_list_staged_removes_leftovers_of_interrupted_staging(tmp_path):
+    staging = LocalUploadStaging(str(tmp_path / "staging"))
+    upload = _upload()
+    await staging.stage(upload, BytesIO(b"video"))
+    orphan, missing = uuid4(), uuid4()
+    (tmp_path / "staging" / f"{uuid4()}.video.part").write_bytes(b"vi")
+    (tmp_path / "staging" / f"{orphan}.video").write_bytes(b"video")
+    (tmp_path / "staging" / f"{missing}.json").write_text('{"video_id": "%s"}' % missing)
+    (tmp_path / "staging" / "garbage.json").write_text("{")
+
+    assert await staging.list_staged() == [upload]
+    assert sorted(path.name for path in (tmp_path / "staging").iterdir()) == sorted(
+        [f"{upload.video_id}.json", f"{upload.video_id}.video"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_metadata_without_content_is_discarded(tmp_path):
+    staging = LocalUploadStaging(str(tmp_path))
+    upload = _upload()
+    await staging.stage(upload, BytesIO(b"video"))
+    (tmp_path / f"{upload.video_id}.video").unlink()
+
+    assert await staging.list_staged() == []
+    assert list(tmp_path.iterdir()) == []
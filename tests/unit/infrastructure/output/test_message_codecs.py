@@ -0,0 +1,94 @@
+import base64
+from types import SimpleNamespace
+import zlib
+
+import pytest
+
+from video_service.infrastructure.adapters.output.messaging.codecs import (
+    CODECS,
+    JsonCodec,
+    MessageEncoder,
+    MsgPackCodec,
+    codec_attribute,
+    decode_body,
+)
+
+
+def test_encoder_stamps_schema_version_and_names_the_codec():
+    body, attributes = MessageEncoder(JsonCodec()).encode({"video_id": "v"}, schema_version=2)
+
+    assert body == '{"schema_version":2,"video_id":"v"}'
+    assert codec_attribute(attributes) == "json"
+    assert decode_body(body) == decode_body(body, "json") == {"schema_version": 2, "video_id": "v"}
+
+
+def test_encoder_compresses_only_large_payloads():
+    encoder = MessageEncoder(JsonCodec(), compression=True, compress_min_bytes=100)
+
+    small, small_attributes = encoder.encode({"a": 1}, schema_version=1)
+    large, large_attributes = encoder.encode({"a": "z" * 500}, schema_version=1)
+
+    assert codec_attribute(small_attributes) == "json"
+    assert codec_attribute(large_attributes) == "json+zlib"
+    assert len(large) < 100
+    assert decode_body(large, "json+zlib")["a"] == "z" * 500
+
+
+@pytest.mark.parametrize("compression", [False, True])
+def test_msgpack_round_trips_through_the_message_body(compression):
+    msgpack = pytest.importorskip("msgpack")
+    payload = {"video_id": "v", "progress": 40, "ratio": 0.5, "tags": ["a", "é"], "done": False, "error": None}
+    encoder = MessageEncoder(MsgPackCodec(), compression=compression, compress_min_bytes=0)
+
+    body, attributes = encoder.encode(payload, schema_version=3)
+
+    assert codec_attribute(attributes) == ("msgpack+zlib" if compression else "msgpack")
+    assert decode_body(body, codec_attribute(attributes)) == {"schema_version": 3, **payload}
+    if not compression:
+        assert msgpack.unpackb(base64.b64decode(body)) == {"schema_version": 3, **payload}
+
+
+@pytest.mark.parametrize("data", ["c1", "a3616263ff", "92", "d9ff"])
+def test_msgpack_rejects_malformed_data(data):
+    pytest.importorskip("msgpack")
+
+    with pytest.raises(ValueError):
+        decode_body(base64.b64encode(bytes.fromhex(data)).decode(), "msgpack")
+
+
+def test_encoder_from_settings_validates_the_codec():
+    settings = SimpleNamespace(MESSAGE_CODEC="json", MESSAGE_COMPRESSION_ENABLED=True, MESSAGE_COMPRESSION_MIN_BYTES=0)
+    body, attributes = MessageEncoder.from_settings(settings).encode({"a": 1}, schema_version=1)
+
+    assert codec_attribute(attributes) == "json+zlib"
+    assert JsonCodec().decode(zlib.decompress(base64.b64decode(body))) == {"schema_version": 1, "a": 1}
+    with pytest.raises(ValueError):
+        MessageEncoder.from_settings(SimpleNamespace(**{**vars(settings), "MESSAGE_CODEC": "avro"}))
+
+
+def test_encoder_from_settings_requires_the_msgpack_package(monkeypatch):
+    from video_service.infrastructure.adapters.output.messaging import codecs
+
+    settings = SimpleNamespace(MESSAGE_CODEC="msgpack", MESSAGE_COMPRESSION_ENABLED=False, MESSAGE_COMPRESSION_MIN_BYTES=0)
+    monkeypatch.setattr(codecs.importlib.util, "find_spec", lambda name: None)
+
+    with pytest.raises(ValueError, match="msgpack"):
+        MessageEncoder.from_settings(settings)
+
+
+@pytest.mark.parametrize("codec", ["avro", "json+gzip", "msgpack+gzip"])
+def test_decode_body_rejects_unknown_codecs(codec):
+    with pytest.raises(ValueError):
+        decode_body("{}", codec)
+
+
+def test_decode_body_rejects_corrupt_compressed_bodies():
+    with pytest.raises(ValueError):
+        decode_body(base64.b64encode(b"not zlib").decode(), "json+zlib")
+
+
+def test_codec_attribute_reads_sqs_and_sns_shapes():
+    assert codec_attribute(None) is None
+    assert codec_attribute({"codec": {"DataType": "String", "StringValue": "json"}}) == "json"
+    assert codec_attribute({"codec": {"Type": "String", "Value": "json+zlib"}}) == "json+zlib"
+    assert set(CODECS) == {"json", "msgpack"}
@@ -0,0 +1,136 @@
+from io import BytesIO
+import socket
+from urllib.parse import urlparse
+import urllib.request
+
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import boto3
+from moto.server import ThreadedMotoServer
+import pytest
+
+from video_service.application.use_cases.upload_video import UploadVideoInput, UploadVideoUseCase
+from video_service.domain.exceptions import QuotaExceededError
+from video_service.infrastructure.adapters.output.storage.key_layouts import UserKeyLayout
+from video_service.infrastructure.adapters.output.storage.s3_storage import S3StorageService
+from video_service.infrastructure.adapters.output.storage.multi_region import (
+    MultiRegionStorageService,
+    StorageRegion,
+)
+
+BUCKETS = {"us-east-1": "videos-us", "eu-west-1": "videos-eu", "ap-southeast-2": "videos-ap"}
+
+
+@pytest.fixture(scope="module")
+def moto_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    yield f"http://127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def storage(moto_url, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    for region, bucket in BUCKETS.items():
+        s3 = boto3.client("s3", endpoint_url=moto_url, region_name=region)
+        if region == "us-east-1":
+            s3.create_bucket(Bucket=bucket)
+        else:
+            s3.create_bucket(Bucket=bucket, CreateBucketConfiguration={"LocationConstraint": region})
+    yield MultiRegionStorageService(
+        StorageRegion("us", BUCKETS["us-east-1"], "us-east-1", moto_url),
+        [
+            StorageRegion("eu", BUCKETS["eu-west-1"], "eu-west-1", moto_url, hints=frozenset({"de", "fr"})),
+            StorageRegion("ap", BUCKETS["ap-southeast-2"], "ap-southeast-2", moto_url),
+        ],
+    )
+    for region, bucket in BUCKETS.items():
+        s3 = boto3.client("s3", endpoint_url=moto_url, region_name=region)
+        for obj in s3.list_objects_v2(Bucket=bucket).get("Contents", []):
+            s3.delete_object(Bucket=bucket, Key=obj["Key"])
+        s3.delete_bucket(Bucket=bucket)
+
+
+def _keys(moto_url, region):
+    s3 = boto3.client("s3", endpoint_url=moto_url, region_name=region)
+    return [obj["Key"] for obj in s3.list_objects_v2(Bucket=BUCKETS[region]).get("Contents", [])]
+
+
+@pytest.mark.asyncio
+async def test_uploads_go_to_the_hinted_region_and_paths_record_the_bucket(storage, moto_url):
+    eu = await storage.upload_file(BytesIO(b"eu"), "videos/a.mp4", "video/mp4", region="DE")
+    ap = await storage.upload_file(BytesIO(b"ap"), "videos/b.mp4", "video/mp4", region="ap-southeast-2")
+    default = await storage.upload_file(BytesIO(b"us"), "videos/c.mp4", "video/mp4", region="mars")
+
+    assert (eu, ap, default) == (
+        "s3://videos-eu/videos/a.mp4",
+        "s3://videos-ap/videos/b.mp4",
+        "s3://videos-us/videos/c.mp4",
+    )
+    assert storage.storage_path("videos/a.mp4", "fr") == eu
+    assert _keys(moto_url, "eu-west-1") == ["videos/a.mp4"]
+    assert _keys(moto_url, "ap-southeast-2") == ["videos/b.mp4"]
+    assert _keys(moto_url, "us-east-1") == ["videos/c.mp4"]
+
+
+@pytest.mark.asyncio
+async def test_downloads_are_signed_against_the_bucket_holding_the_object(storage):
+    path = await storage.upload_file(BytesIO(b"eu-content"), "videos/a.mp4", "video/mp4", region="eu")
+
+    url = await storage.get_presigned_url(path, expires_in=60)
+
+    parsed = urlparse(url)
+    assert parsed.path == "/videos-eu/videos/a.mp4"
+    with urllib.request.urlopen(url) as response:
+        assert response.read() == b"eu-content"
+
+
+@pytest.mark.asyncio
+async def test_deletes_are_routed_per_bucket(storage, moto_url):
+    eu = await storage.upload_file(BytesIO(b"eu"), "videos/a.mp4", "video/mp4", region="eu")
+    us = await storage.upload_file(BytesIO(b"us"), "videos/b.mp4", "video/mp4")
+    ap = await storage.upload_file(BytesIO(b"ap"), "videos/c.mp4", "video/mp4", region="ap")
+
+    failed = await storage.delete_files([eu, us, "s3://unknown-bucket/videos/x.mp4"])
+    assert await storage.delete_file(ap) is True
+
+    assert failed == ["s3://unknown-bucket/videos/x.mp4"]
+    assert all(_keys(moto_url, region) == [] for region in BUCKETS)
+    with pytest.raises(ValueError):
+        await storage.get_presigned_url("s3://unknown-bucket/videos/x.mp4")
+
+
+@pytest.mark.asyncio
+async def test_an_upload_over_the_quota_removes_its_stored_object(storage, moto_url):
+    s3 = S3StorageService(bucket=BUCKETS["us-east-1"], endpoint_url=moto_url)
+    repo = AsyncMock()
+    repo.get_usage.return_value.video_count = 0
+    repo.get_usage.return_value.total_bytes = 0
+    repo.save.side_effect = QuotaExceededError("Storage quota exceeded")
+
+    with pytest.raises(QuotaExceededError):
+        await UploadVideoUseCase(repo, s3, AsyncMock(), UserKeyLayout()).execute(
+            UploadVideoInput(uuid4(), "movie.mp4", BytesIO(b"abc"), 3, "video/mp4")
+        )
+
+    assert _keys(moto_url, "us-east-1") == []
+
+
+def test_regions_need_distinct_buckets_and_valid_settings():
+    default = StorageRegion("us", "videos-us", "us-east-1")
+
+    with pytest.raises(ValueError):
+        MultiRegionStorageService(default, [StorageRegion("eu", "videos-us", "eu-west-1")])
+    with pytest.raises(ValueError):
+        StorageRegion.from_dict({"name": "eu", "bucket": "videos-eu"})
+
+    region = StorageRegion.from_dict(
+        {"name": "eu", "bucket": "videos-eu", "region": "eu-west-1", "hints": ["DE"]}, endpoint_url="http://local"
+    )
+    assert (region.endpoint_url, region.hints) == ("http://local", frozenset({"de"}))
@@ -0,0 +1,176 @@
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime
+from uuid import uuid4
+import warnings
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from video_service.application.ports.output.storage_service import StoredObject
+from video_service.application.use_cases.reconcile_storage import ReconcileStorageInput, ReconcileStorageUseCase
+from video_service.domain.entities.video import Video
+from video_service.infrastructure.adapters.output.persistence import partitioning
+from video_service.infrastructure.adapters.output.persistence.database import Base
+from video_service.infrastructure.adapters.output.persistence.repositories.video_repository import (
+    SQLAlchemyVideoRepository,
+)
+
+
+class _Result:
+    def __init__(self, rows=(), scalar=None, rowcount=0):
+        self._rows = list(rows)
+        self._scalar = scalar
+        self.rowcount = rowcount
+
+    def all(self):
+        return self._rows
+
+    def scalar(self):
+        return self._scalar
+
+
+class _RecordingConnection:
+    def __init__(self, partitions=()):
+        self.partitions = list(partitions)
+        self.statements = []
+
+    async def execute(self, stmt):
+        sql = str(stmt)
+        self.statements.append(sql)
+        if "FROM pg_inherits" in sql:
+            return _Result(rows=self.partitions)
+        if sql.startswith("INSERT INTO videos_archive"):
+            return _Result(rowcount=7)
+        return _Result()
+
+    async def execution_options(self, **options):
+        return self
+
+
+class _RecordingEngine:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def connect(self):
+        yield self.conn
+
+    @asynccontextmanager
+    async def begin(self):
+        yield self.conn
+
+
+def test_month_helpers_and_partition_names():
+    assert partitioning.add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert partitioning.add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert partitioning.partition_name(date(2024, 3, 17)) == "videos_p2024_03"
+    assert partitioning.partition_month("videos_p2024_03") == date(2024, 3, 1)
+    assert partitioning.partition_month("videos_archive") is None
+    assert partitioning.create_partition_sql(date(2024, 12, 5)).endswith(
+        "PARTITION OF videos FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+    )
+    names = ["videos_p2022_12", "videos_p2023_01", "videos_p2023_02", "videos_other"]
+    assert partitioning.archivable(names, 12, today=date(2024, 2, 10)) == ["videos_p2022_12", "videos_p2023_01"]
+
+
+def test_partitioned_table_keeps_columns_and_list_indexes():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        table = partitioning.partitioned_videos_table()
+
+    ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+    assert "PARTITION BY RANGE (created_at)" in ddl
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL" in ddl
+    names = {index.name for index in table.indexes}
+    assert "ix_videos_user_created" in names and "ix_videos_created_at" not in names
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_only_missing_months():
+    conn = _RecordingConnection(partitions=[("videos_p2024_05", False)])
+
+    created = await partitioning.ensure_partitions(conn, months_ahead=2, today=date(2024, 5, 20))
+
+    assert created == ["videos_p2024_06", "videos_p2024_07"]
+    assert sum("CREATE TABLE IF NOT EXISTS" in sql for sql in conn.statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_archive_partition_detaches_copies_and_drops():
+    conn = _RecordingConnection(partitions=[("videos_p2022_01", False)])
+
+    rows = await partitioning.archive_partition(_RecordingEngine(conn), "videos_p2022_01")
+
+    assert rows == 7
+    detach, stats, copy, drop = [sql for sql in conn.statements if "pg_inherits" not in sql]
+    assert detach == "ALTER TABLE videos DETACH PARTITION videos_p2022_01 CONCURRENTLY"
+    assert stats.startswith("UPDATE user_video_stats") and "FROM videos_p2022_01" in stats
+    assert copy.startswith("INSERT INTO videos_archive") and "ON CONFLICT (id) DO NOTHING" in copy
+    assert drop == "DROP TABLE videos_p2022_01"
+
+    with pytest.raises(ValueError):
+        await partitioning.archive_partition(_RecordingEngine(conn), "videos; DROP TABLE videos")
+
+
+class _ListedStorage:
+    def __init__(self, paths):
+        self.paths = paths
+        self.deleted = []
+
+    def storage_path(self, key, region=None):
+        return f"s3://b/{key}"
+
+    async def iter_objects(self, prefix):
+        for path in sorted(self.paths):
+            yield StoredObject(path, datetime(2020, 1, 1, tzinfo=UTC))
+
+    async def delete_files(self, paths):
+        self.deleted.extend(paths)
+        return []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_keeps_the_objects_of_archived_partitions(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'videos.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine)() as session:
+        repo = SQLAlchemyVideoRepository(session=session)
+        for name, created_at in (("old", datetime(2022, 1, 5, tzinfo=UTC)), ("new", datetime.now(UTC))):
+            await repo.save(
+                Video(
+                    id=uuid4(),
+                    user_id=uuid4(),
+                    original_filename=f"{name}.mp4",
+                    file_path=f"s3://b/videos/{name}.mp4",
+                    file_size=1,
+                    format="mp4",
+                    created_at=created_at,
+                )
+            )
+        await repo.commit()
+
+    # sqlite has no partitions: stand in for the detached month with a plain table.
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE videos_p2022_01 AS SELECT * FROM videos WHERE file_path LIKE '%old%'"))
+        await conn.execute(text("DELETE FROM videos WHERE file_path LIKE '%old%'"))
+
+    async def no_partitions(conn):
+        return []
+
+    monkeypatch.setattr(partitioning, "list_partitions", no_partitions)
+    assert await partitioning.archive_partition(engine, "videos_p2022_01") == 1
+
+    storage = _ListedStorage(["s3://b/videos/new.mp4", "s3://b/videos/old.mp4", "s3://b/videos/orphan.mp4"])
+    async with async_sessionmaker(engine)() as session:
+        output = await ReconcileStorageUseCase(SQLAlchemyVideoRepository(session=session), storage).execute(
+            ReconcileStorageInput(dry_run=False)
+        )
+
+    assert storage.deleted == ["s3://b/videos/orphan.mp4"]
+    assert output.scanned_rows == 2 and output.dangling_rows == 0
+    await engine.dispose()
@@ -0,0 +1,86 @@
+import logging
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from video_service.infrastructure.adapters.input.api.query_stats import QueryStatsMiddleware
+from video_service.infrastructure.adapters.output.persistence.query_metrics import (
+    RequestQueryStats,
+    fingerprint,
+    instrument_engine,
+    normalize,
+    parameter_shape,
+    reset_request_stats,
+    set_request_stats,
+    statement_sql,
+)
+
+
+def test_normalize_collapses_lists_and_placeholders():
+    assert normalize("SELECT id FROM videos\n  WHERE id IN (?, ?, ?)") == "SELECT id FROM videos WHERE id IN (?, ...)"
+    assert normalize("SELECT id FROM videos WHERE id IN ($1::UUID, $2::UUID) LIMIT $3") == (
+        "SELECT id FROM videos WHERE id IN (?, ...) LIMIT ?"
+    )
+    assert normalize("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+    assert fingerprint("SELECT 1 WHERE x IN (?, ?)") == fingerprint("SELECT 1 WHERE x IN (?, ?, ?, ?)")
+
+
+def test_parameter_shape_reports_types_and_sizes_only():
+    user_id = uuid4()
+    assert parameter_shape((user_id, "secret-name", 25)) == "(UUID, str[11], int)"
+    assert parameter_shape({"ids": [1, 2, 3]}) == "{ids: list[3]}"
+    assert parameter_shape([(1,), (2,)], executemany=True) == "2 x (int)"
+
+
+@pytest.mark.asyncio
+async def test_engine_hooks_record_latency_request_counts_and_slow_statements(caplog):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine, slow_seconds=0.0)
+    stats = RequestQueryStats()
+    token = set_request_stats(stats)
+    try:
+        with caplog.at_level(logging.WARNING):
+            async with engine.connect() as conn:
+                for _ in range(3):
+                    await conn.execute(text("SELECT :name AS name"), {"name": "top-secret"})
+    finally:
+        reset_request_stats(token)
+    await engine.dispose()
+
+    operation, key = fingerprint("SELECT ? AS name")
+    assert statement_sql(key) == "SELECT ? AS name"
+    assert stats.by_statement[key] == 3
+    assert REGISTRY.get_sample_value(
+        "video_db_statement_duration_seconds_count", {"operation": operation, "statement": key}
+    ) >= 3
+    slow = [record.getMessage() for record in caplog.records if "Slow SQL statement" in record.getMessage()]
+    assert slow and "(str[10])" in slow[0]
+    assert "top-secret" not in caplog.text
+
+
+def test_middleware_flags_repeated_statement_as_n_plus_one(caplog):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine, slow_seconds=60)
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/items/{count}")
+    async def items(count: int):
+        async with engine.connect() as conn:
+            for n in range(count):
+                await conn.execute(text("SELECT :n AS n_plus_one_probe"), {"n": n})
+        return {}
+
+    client = TestClient(app)
+    with caplog.at_level(logging.WARNING):
+        client.get("/items/2")
+        assert "Possible N+1" not in caplog.text
+        client.get("/items/3")
+
+    assert "Possible N+1 in GET /items/{count}: statement" in caplog.text
+    assert REGISTRY.get_sample_value("video_db_queries_per_request_count", {"route": "GET /items/{count}"}) == 2
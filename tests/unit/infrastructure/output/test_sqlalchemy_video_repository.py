@@ -4,10 +4,19 @@ from uuid import uuid4
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
+from video_service.application.ports.output.repositories import UserUsage, VideoQuery, VideoStatusUpdate
+from video_service.domain.entities.storage_quota import StorageQuota
 from video_service.domain.entities.video import Video
+from video_service.domain.exceptions import QuotaExceededError
 from video_service.infrastructure.adapters.output.persistence.repositories.video_repository import (
     SQLAlchemyVideoRepository,
+    VIDEO_COLUMNS,
+    _id_matches_any,
+    _find_by_id_stmt,
+    _find_by_user_id_stmt,
+    _upsert_user_stats,
 )
 
 
@@ -28,6 +37,12 @@ class _Result:
     def scalar_one_or_none(self):
         return self._one
 
+    def one_or_none(self):
+        return self._one
+
+    def all(self):
+        return self._rows
+
     def scalars(self):
         return _ScalarRows(self._rows)
 
@@ -54,6 +69,19 @@ async def test_save_adds_and_flushes_session():
     assert result == video
     session.add.assert_called_once()
     session.flush.assert_awaited_once()
+    marker_stmt = session.execute.await_args.args[0]
+    assert "ON CONFLICT (user_id) DO UPDATE" in str(marker_stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_get_change_marker_defaults_to_zero():
+    session = SimpleNamespace(execute=AsyncMock(return_value=_Result(scalar_value=None)))
+    repo = SQLAlchemyVideoRepository(session=session)
+
+    assert await repo.get_change_marker(uuid4()) == 0
+
+    session.execute.return_value = _Result(scalar_value=4)
+    assert await repo.get_change_marker(uuid4()) == 4
 
 
 @pytest.mark.asyncio
@@ -70,6 +98,9 @@ async def test_find_by_id_returns_entity_or_none():
         format="mp4",
         duration=10.0,
         created_at=datetime.now(UTC),
+        version=1,
+        status="uploaded",
+        progress=0,
     )
 
     session.execute.return_value = _Result(one=model)
@@ -96,6 +127,9 @@ async def test_find_by_user_id_delete_and_count():
         format="mp4",
         duration=None,
         created_at=datetime.now(UTC),
+        version=1,
+        status="uploaded",
+        progress=0,
     )
     m2 = SimpleNamespace(
         id=uuid4(),
@@ -106,6 +140,9 @@ async def test_find_by_user_id_delete_and_count():
         format="mp4",
         duration=None,
         created_at=datetime.now(UTC),
+        version=1,
+        status="uploaded",
+        progress=0,
     )
 
     session.execute.return_value = _Result(rows=[m1, m2])
@@ -133,3 +170,385 @@ async def test_find_by_user_id_delete_and_count():
     session.execute.return_value = _Result(scalar_value=None)
     count = await repo.count_by_user_id(m1.user_id)
     assert count == 0
+
+
+def test_read_statements_project_columns_and_share_cache_key():
+    first = _find_by_user_id_stmt(uuid4(), 0, 10)
+    second = _find_by_user_id_stmt(uuid4(), 20, 50)
+
+    compiled = str(first.compile())
+    assert "FROM videos" in compiled
+    assert len(first._resolved.selected_columns) == len(VIDEO_COLUMNS)
+    assert first._generate_cache_key().key == second._generate_cache_key().key
+
+    by_id = str(_find_by_id_stmt(uuid4()).compile())
+    assert "videos.id = " in by_id
+
+
+@pytest.mark.asyncio
+async def test_find_by_ids_uses_single_query_and_skips_empty_input():
+    session = SimpleNamespace(add=MagicMock(), flush=AsyncMock(), execute=AsyncMock(), delete=AsyncMock())
+    repo = SQLAlchemyVideoRepository(session=session)
+
+    assert await repo.find_by_ids([]) == []
+    session.execute.assert_not_awaited()
+
+    row = SimpleNamespace(
+        id=uuid4(),
+        user_id=uuid4(),
+        original_filename="movie.mp4",
+        file_path="s3://bucket/movie.mp4",
+        file_size=100,
+        format="mp4",
+        duration=None,
+        created_at=datetime.now(UTC),
+        version=1,
+        status="uploaded",
+        progress=0,
+    )
+    session.execute.return_value = _Result(rows=[row])
+
+    videos = await repo.find_by_ids([row.id, uuid4()])
+
+    assert [v.id for v in videos] == [row.id]
+    session.execute.assert_awaited_once()
+
+
+def test_id_matches_any_uses_array_on_postgres_and_in_elsewhere():
+    from sqlalchemy.dialects import sqlite
+
+    ids = [uuid4(), uuid4()]
+    pg_sql = str(_id_matches_any(ids, "postgresql").compile(dialect=postgresql.dialect()))
+    sqlite_sql = str(_id_matches_any(ids, "sqlite").compile(dialect=sqlite.dialect()))
+
+    assert "= ANY (" in pg_sql
+    assert " IN (" in sqlite_sql
+
+
+@pytest.mark.asyncio
+async def test_delete_by_ids_returns_deleted_ids_and_paths():
+    session = SimpleNamespace(add=MagicMock(), flush=AsyncMock(), execute=AsyncMock(), delete=AsyncMock())
+    repo = SQLAlchemyVideoRepository(session=session)
+
+    assert await repo.delete_by_ids([], uuid4()) == []
+    session.execute.assert_not_awaited()
+
+    video_id = uuid4()
+    session.execute.return_value = _Result(
+        rows=[SimpleNamespace(id=video_id, file_path="s3://bucket/a.mp4", file_size=100)]
+    )
+
+    deleted = await repo.delete_by_ids([video_id, uuid4()], uuid4())
+
+    assert deleted == [(video_id, "s3://bucket/a.mp4")]
+    delete_stmt, marker_stmt = (call.args[0] for call in session.execute.await_args_list)
+    assert "RETURNING" in str(delete_stmt.compile())
+    assert "ON CONFLICT (user_id) DO UPDATE" in str(marker_stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_iter_file_paths_streams_in_byte_order():
+    async def _stream():
+        for path in ["s3://bucket/videos/a.mp4", "s3://bucket/videos/b.mp4"]:
+            yield path
+
+    session = SimpleNamespace(stream_scalars=AsyncMock(return_value=_stream()))
+    repo = SQLAlchemyVideoRepository(session=session)
+
+    paths = [path async for path in repo.iter_file_paths("s3://bucket/videos/", batch_size=50)]
+
+    assert paths == ["s3://bucket/videos/a.mp4", "s3://bucket/videos/b.mp4"]
+    stmt = session.stream_scalars.await_args.args[0]
+    assert 'COLLATE "C"' in str(stmt.compile())
+    assert stmt.get_execution_options()["yield_per"] == 50
+
+
+@pytest.mark.asyncio
+async def test_apply_status_updates_uses_one_bulk_update_on_postgres():
+    session = SimpleNamespace(execute=AsyncMock())
+    repo = SQLAlchemyVideoRepository(session=session)
+
+    assert await repo.apply_status_updates([]) == []
+    session.execute.assert_not_awaited()
+
+    user_id = uuid4()
+    updates = [VideoStatusUpdate(uuid4(), "processing", 40), VideoStatusUpdate(uuid4(), "completed", 100)]
+    session.execute.return_value = _Result(rows=[SimpleNamespace(id=u.video_id, user_id=user_id) for u in updates])
+
+    assert await repo.apply_status_updates(updates) == [(u.video_id, user_id) for u in updates]
+
+    update_stmt, marker_stmt = (call.args[0] for call in session.execute.await_args_list)
+    sql = str(update_stmt.compile(dialect=postgresql.dialect()))
+    assert "UPDATE videos SET" in sql and "unnest" in sql and "RETURNING videos.id, videos.user_id" in sql
+    assert "ON CONFLICT (user_id) DO UPDATE" in str(marker_stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_apply_status_updates_only_moves_videos_forward():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from video_service.infrastructure.adapters.output.persistence.database import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    user_id = uuid4()
+    videos = [
+        Video(id=uuid4(), user_id=user_id, original_filename=f"{i}.mp4", file_path=f"s3://b/{i}.mp4", file_size=1, format="mp4")
+        for i in range(3)
+    ]
+    videos.append(
+        Video(
+            id=uuid4(),
+            user_id=user_id,
+            original_filename="3.mp4",
+            file_path="s3://b/3.mp4",
+            file_size=1,
+            format="mp4",
+            status="pending",
+        )
+    )
+    async with async_sessionmaker(engine)() as session:
+        repo = SQLAlchemyVideoRepository(session=session)
+        for video in videos:
+            await repo.save(video)
+        await repo.apply_status_updates(
+            [VideoStatusUpdate(videos[0].id, "processing", 50), VideoStatusUpdate(videos[1].id, "failed", 0)]
+        )
+        marker = await repo.get_change_marker(user_id)
+
+        applied = await repo.apply_status_updates(
+            [
+                VideoStatusUpdate(videos[0].id, "processing", 20),
+                VideoStatusUpdate(videos[1].id, "completed", 100),
+                VideoStatusUpdate(videos[2].id, "processing", 10),
+                VideoStatusUpdate(videos[3].id, "uploaded", 0),
+            ]
+        )
+
+        assert sorted(applied) == sorted([(videos[2].id, user_id), (videos[3].id, user_id)])
+        states = {v.id: (v.status, v.progress, v.version) for v in await repo.find_by_ids([v.id for v in videos])}
+        assert states[videos[0].id] == ("processing", 50, 2)
+        assert states[videos[1].id] == ("failed", 0, 2)
+        assert states[videos[2].id] == ("processing", 10, 2)
+        assert states[videos[3].id] == ("uploaded", 0, 2)
+        assert await repo.get_change_marker(user_id) == marker + 1
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_usage_follows_saves_and_deletes_and_repair_fixes_drift():
+    from sqlalchemy import delete, insert, update
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from video_service.infrastructure.adapters.output.persistence.database import Base
+    from video_service.infrastructure.adapters.output.persistence.models import UserVideoStatsModel
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    owner, other, gone = uuid4(), uuid4(), uuid4()
+    videos = [
+        Video(id=uuid4(), user_id=owner, original_filename=f"{i}.mp4", file_path=f"s3://b/{i}.mp4", file_size=10 * (i + 1), format="mp4")
+        for i in range(4)
+    ]
+    async with async_sessionmaker(engine)() as session:
+        repo = SQLAlchemyVideoRepository(session=session)
+        for video in videos:
+            await repo.save(video)
+        await repo.save(Video(id=uuid4(), user_id=other, original_filename="o.mp4", file_path="s3://b/o.mp4", file_size=7, format="mp4"))
+        assert await repo.delete(videos[0].id) is True
+        await repo.delete_by_ids([videos[1].id, videos[2].id], owner)
+
+        assert await repo.get_usage(owner) == UserUsage(video_count=1, total_bytes=40)
+        assert await repo.get_usage(other) == UserUsage(video_count=1, total_bytes=7)
+        assert await repo.get_usage(gone) == UserUsage()
+
+        # Drift: a wrong total, a missing aggregate row and a stale one.
+        await session.execute(update(UserVideoStatsModel).where(UserVideoStatsModel.user_id == owner).values(total_bytes=999))
+        await session.execute(delete(UserVideoStatsModel).where(UserVideoStatsModel.user_id == other))
+        await session.execute(insert(UserVideoStatsModel).values(user_id=gone, video_count=3, total_bytes=30))
+
+        after, checked, repaired = None, 0, 0
+        while True:
+            batch = await repo.repair_usage(after, batch_size=2)
+            if batch.last_user_id is None:
+                break
+            checked, repaired, after = checked + batch.checked, repaired + batch.repaired, batch.last_user_id
+
+        assert (checked, repaired) == (3, 3)
+        assert await repo.get_usage(owner) == UserUsage(video_count=1, total_bytes=40)
+        assert await repo.get_usage(other) == UserUsage(video_count=1, total_bytes=7)
+        assert await repo.get_usage(gone) == UserUsage()
+        assert (await repo.repair_usage(batch_size=10)).repaired == 0
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_save_enforces_the_quota_in_the_usage_upsert():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from video_service.infrastructure.adapters.output.persistence.database import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    owner = uuid4()
+    quota = StorageQuota(max_bytes=100, max_videos=3)
+
+    def video(size):
+        return Video(id=uuid4(), user_id=owner, original_filename="v.mp4", file_path="s3://b/v.mp4", file_size=size, format="mp4")
+
+    async with async_sessionmaker(engine)() as session:
+        repo = SQLAlchemyVideoRepository(session=session)
+        await repo.save(video(60), quota=quota)
+        await repo.commit()
+        with pytest.raises(QuotaExceededError, match="100 bytes"):
+            await repo.save(video(50), quota=quota)
+        await session.rollback()
+        await repo.save(video(40), quota=quota)
+        await repo.commit()
+        assert await repo.get_usage(owner) == UserUsage(video_count=2, total_bytes=100)
+
+        with pytest.raises(QuotaExceededError):
+            await repo.save(video(101), quota=StorageQuota(max_bytes=100))
+        await session.rollback()
+        assert await repo.get_usage(owner) == UserUsage(video_count=2, total_bytes=100)
+
+    upsert = _upsert_user_stats("postgresql", owner, 1, 10, quota)
+    compiled = str(upsert.compile(dialect=postgresql.dialect()))
+    assert "DO UPDATE SET" in compiled and "WHERE user_video_stats.video_count + " in compiled
+    assert "RETURNING user_video_stats.user_id" in compiled
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_lookups_by_time_ordered_ids_are_bounded_by_created_at():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from video_service.infrastructure.adapters.output.persistence.database import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    owner = uuid4()
+    ids = [Video.new_id(datetime(2024, month, 15, tzinfo=UTC)) for month in (1, 3)]
+    videos = [
+        Video(id=video_id, user_id=owner, original_filename="v.mp4", file_path=f"s3://b/{video_id}.mp4",
+              file_size=1, format="mp4", created_at=Video.id_timestamp(video_id))
+        for video_id in ids
+    ]
+    async with async_sessionmaker(engine)() as session:
+        repo = SQLAlchemyVideoRepository(session=session)
+        for video in videos:
+            await repo.save(video)
+
+        assert (await repo.find_by_id(ids[0])).created_at == Video.id_timestamp(ids[0])
+        assert {v.id for v in await repo.find_by_ids(ids)} == set(ids)
+        assert await repo.apply_status_updates([VideoStatusUpdate(ids[1], "processing", 5)]) == [(ids[1], owner)]
+        assert await repo.delete_by_ids([ids[1]], owner) == [(ids[1], videos[1].file_path)]
+        assert await repo.delete(ids[0]) is True
+
+    where = str(_find_by_id_stmt(ids[0]).compile(dialect=postgresql.dialect()))
+    assert "videos.created_at >=" in where and "videos.created_at <" in where
+    assert "created_at" not in str(_find_by_id_stmt(uuid4()).compile(dialect=postgresql.dialect())).split("WHERE")[1]
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_fail_stale_pending_fails_only_old_pending_videos_not_kept():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from video_service.infrastructure.adapters.output.persistence.database import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    old, new = datetime(2024, 1, 1, tzinfo=UTC), datetime(2024, 1, 3, tzinfo=UTC)
+    owner = uuid4()
+    videos = {
+        name: Video(id=uuid4(), user_id=owner, original_filename=f"{name}.mp4", file_path=f"s3://b/{name}.mp4",
+                    file_size=1, format="mp4", created_at=created_at, status=status)
+        for name, created_at, status in [
+            ("kept", old, Video.STATUS_PENDING),
+            ("lost", old, Video.STATUS_PENDING),
+            ("recent", new, Video.STATUS_PENDING),
+            ("uploaded", old, Video.STATUS_UPLOADED),
+        ]
+    }
+    async with async_sessionmaker(engine)() as session:
+        repo = SQLAlchemyVideoRepository(session=session)
+        for video in videos.values():
+            await repo.save(video)
+
+        failed = await repo.fail_stale_pending(datetime(2024, 1, 2, tzinfo=UTC), keep={videos["kept"].id})
+        statuses = {name: (await repo.find_by_id(video.id)).status for name, video in videos.items()}
+
+    assert failed == [(videos["lost"].id, owner)]
+    assert statuses == {"kept": "pending", "lost": "failed", "recent": "pending", "uploaded": "uploaded"}
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_find_by_user_id_applies_filters_and_sort():
+    from datetime import timedelta
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from video_service.infrastructure.adapters.output.persistence.database import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    user_id = uuid4()
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    specs = [("Beach.mp4", 300, 0), ("beach_100%.mkv", 100, 1), ("city.mp4", 200, 2), ("Beachfront.mov", 50, 3)]
+    async with async_sessionmaker(engine)() as session:
+        repo = SQLAlchemyVideoRepository(session=session)
+        for name, size, day in specs:
+            await repo.save(
+                Video(
+                    id=uuid4(),
+                    user_id=user_id,
+                    original_filename=name,
+                    file_path=f"s3://b/{name}",
+                    file_size=size,
+                    format=name.rsplit(".", 1)[-1],
+                    created_at=start + timedelta(days=day),
+                )
+            )
+        await repo.save(Video(id=uuid4(), user_id=uuid4(), original_filename="beach.mp4", file_path="s3://b/x", file_size=1, format="mp4"))
+
+        async def names(query, skip=0, limit=10):
+            return [v.original_filename for v in await repo.find_by_user_id(user_id, skip, limit, query)]
+
+        assert await names(None) == ["Beachfront.mov", "city.mp4", "beach_100%.mkv", "Beach.mp4"]
+        assert await names(VideoQuery(filename_contains="BEACH", sort_by="file_size", descending=False)) == [
+            "Beachfront.mov",
+            "beach_100%.mkv",
+            "Beach.mp4",
+        ]
+        assert await names(VideoQuery(filename_contains="100%")) == ["beach_100%.mkv"]
+        assert await names(VideoQuery(filename_contains="h_")) == ["beach_100%.mkv"]
+        assert await names(VideoQuery(format="MP4", min_size=250)) == ["Beach.mp4"]
+        assert await names(
+            VideoQuery(created_from=start + timedelta(days=1), created_to=start + timedelta(days=2), max_size=150)
+        ) == ["beach_100%.mkv"]
+        assert await names(VideoQuery(sort_by="original_filename", descending=False), skip=1, limit=2) == [
+            "Beachfront.mov",
+            "beach_100%.mkv",
+        ]
+        assert await repo.count_by_user_id(user_id, VideoQuery(filename_contains="beach")) == 3
+        assert await repo.count_by_user_id(user_id, VideoQuery()) == 4
+
+    await engine.dispose()
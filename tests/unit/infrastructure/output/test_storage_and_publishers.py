@@ -1,11 +1,26 @@
+from datetime import UTC, datetime
 from io import BytesIO
 from types import SimpleNamespace
+from uuid import uuid4
+import json
 
 import pytest
 
+from video_service.infrastructure.adapters.output.messaging.deferred_publisher import (
+    DeferredEventPublisher,
+    EventBacklog,
+)
+from video_service.application.ports.output.video_change_notifier import VIDEO_UPLOADED, VideoChange
+from video_service.infrastructure.adapters.output.messaging.redis_change_notifier import (
+    RedisVideoChangeNotifier,
+    events_channel,
+    events_stream_key,
+    redis_client_from_settings,
+)
 from video_service.infrastructure.adapters.output.messaging.sns_publisher import SNSEventPublisher
 from video_service.infrastructure.adapters.output.messaging.sqs_publisher import SQSJobPublisher
 from video_service.infrastructure.adapters.output.storage.s3_storage import S3StorageService
+from video_service.infrastructure.resilience import CircuitBreaker, CircuitOpenError
 
 
 class _FakeClient:
@@ -29,6 +44,24 @@ class _FakeClient:
     async def delete_object(self, Bucket, Key):
         self._record.append((self._service_name, "delete_object", Bucket, Key))
 
+    async def delete_objects(self, Bucket, Delete):
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        self._record.append((self._service_name, "delete_objects", Bucket, keys))
+        if "videos/boom.mp4" in keys:
+            raise RuntimeError("batch failed")
+        return {"Errors": [{"Key": key, "Code": "AccessDenied"} for key in keys if key.endswith("denied.mp4")]}
+
+    def get_paginator(self, operation):
+        record = self._record
+
+        class _Paginator:
+            async def paginate(self, **kwargs):
+                record.append(("s3", "paginate", operation, kwargs))
+                yield {"Contents": [{"Key": "videos/a.mp4", "LastModified": datetime(2024, 1, 1, tzinfo=UTC)}]}
+                yield {}
+
+        return _Paginator()
+
     async def publish(self, **kwargs):
         self._record.append((self._service_name, "publish", kwargs))
 
@@ -68,6 +101,94 @@ async def test_s3_storage_service_methods(monkeypatch):
     assert any(item[1] == "delete_object" for item in record)
 
 
+@pytest.mark.asyncio
+async def test_s3_delete_files_batches_keys_and_reports_failures(monkeypatch):
+    record = []
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.storage.s3_storage.aioboto3.Session",
+        lambda: _FakeSession(record),
+    )
+    monkeypatch.setattr(S3StorageService, "DELETE_BATCH_SIZE", 2)
+
+    service = S3StorageService(bucket="bucket")
+
+    assert await service.delete_files([]) == []
+
+    failed = await service.delete_files(
+        [
+            "s3://bucket/videos/a.mp4",
+            "s3://bucket/videos/denied.mp4",
+            "videos/boom.mp4",
+            "s3://bucket/videos/b.mp4",
+            "s3://bucket/videos/c.mp4",
+        ]
+    )
+
+    batches = [item[3] for item in record if item[1] == "delete_objects"]
+    assert batches == [
+        ["videos/a.mp4", "videos/denied.mp4"],
+        ["videos/boom.mp4", "videos/b.mp4"],
+        ["videos/c.mp4"],
+    ]
+    assert failed == ["s3://bucket/videos/denied.mp4", "videos/boom.mp4", "s3://bucket/videos/b.mp4"]
+    assert sum(1 for item in record if item[1] == "client") == 1
+
+
+class _SlowDown(Exception):
+    response = {"Error": {"Code": "SlowDown"}, "ResponseMetadata": {"HTTPStatusCode": 503}}
+
+
+@pytest.mark.asyncio
+async def test_s3_counts_slowdowns_by_key_layout_partition(monkeypatch):
+    from video_service.infrastructure.adapters.output.storage import s3_storage
+    from video_service.infrastructure.adapters.output.storage.key_layouts import HashedKeyLayout
+
+    class _ThrottledSession(_FakeSession):
+        def client(self, service_name, **kwargs):
+            client = _FakeClient(service_name, self._record)
+
+            async def _throttled(*args, **kwargs):
+                raise _SlowDown()
+
+            async def _delete_objects(Bucket, Delete):
+                return {"Errors": [{"Key": obj["Key"], "Code": "SlowDown"} for obj in Delete["Objects"]]}
+
+            client.upload_fileobj = _throttled
+            client.delete_objects = _delete_objects
+            return client
+
+    monkeypatch.setattr(s3_storage.aioboto3, "Session", lambda: _ThrottledSession([]))
+    layout = HashedKeyLayout(hash_chars=2)
+    key = layout.key_for(uuid4(), uuid4(), "mp4")
+    prefix = layout.partition(key)
+    service = S3StorageService(bucket="bucket", key_layout=layout)
+    uploads = s3_storage.S3_SLOWDOWNS.labels(operation="upload", prefix=prefix)
+    deletes = s3_storage.S3_SLOWDOWNS.labels(operation="delete", prefix=prefix)
+    before = uploads._value.get(), deletes._value.get()
+
+    with pytest.raises(_SlowDown):
+        await service.upload_file(BytesIO(b"123"), key, "video/mp4")
+    assert await service.delete_files([f"s3://bucket/{key}"]) == [f"s3://bucket/{key}"]
+
+    assert (uploads._value.get() - before[0], deletes._value.get() - before[1]) == (1, 1)
+    assert s3_storage.is_slowdown(RuntimeError("down")) is False
+
+
+@pytest.mark.asyncio
+async def test_s3_iter_objects_pages_through_listing(monkeypatch):
+    record = []
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.storage.s3_storage.aioboto3.Session",
+        lambda: _FakeSession(record),
+    )
+
+    service = S3StorageService(bucket="bucket")
+    objects = [obj async for obj in service.iter_objects("videos/")]
+
+    assert [obj.path for obj in objects] == ["s3://bucket/videos/a.mp4"]
+    assert ("s3", "paginate", "list_objects_v2", {"Bucket": "bucket", "Prefix": "videos/"}) in record
+
+
 @pytest.mark.asyncio
 async def test_sns_publisher_with_and_without_topic(monkeypatch):
     record = []
@@ -111,3 +232,303 @@ async def test_sqs_job_publisher_send_job(monkeypatch):
 
     assert message_id == "msg-1"
     assert any(item[1] == "send_message" for item in record)
+
+
+@pytest.mark.asyncio
+async def test_sqs_job_publisher_routes_jobs_to_lanes(monkeypatch):
+    from video_service.infrastructure.adapters.output.messaging import sqs_publisher
+    from video_service.infrastructure.adapters.output.messaging.job_routing import JobRouter
+
+    record = []
+    monkeypatch.setattr(sqs_publisher.aioboto3, "Session", lambda: _FakeSession(record))
+    router = JobRouter.from_settings("q-bulk", [{"name": "fast", "queue_url": "q-fast", "max_file_size": 1000}])
+    publisher = SQSJobPublisher(router=router)
+
+    def _sent(lane):
+        return sqs_publisher.JOBS_ENQUEUED.labels(lane=lane)._value.get()
+
+    fast_before, bulk_before = _sent("fast"), _sent("default")
+    await publisher.send_job("j-1", "v-1", "u-1", "k", "e", file_size=10, format="mp4")
+    await publisher.send_job("j-2", "v-2", "u-1", "k", "e", file_size=5000)
+
+    sent = [item[2] for item in record if item[1] == "send_message"]
+    assert [(call["QueueUrl"], call["MessageAttributes"]["lane"]["StringValue"]) for call in sent] == [
+        ("q-fast", "fast"),
+        ("q-bulk", "default"),
+    ]
+    assert (_sent("fast") - fast_before, _sent("default") - bulk_before) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_sqs_job_publisher_counts_failed_sends(monkeypatch):
+    from video_service.infrastructure.adapters.output.messaging import sqs_publisher
+
+    class _FailingSession(_FakeSession):
+        def client(self, service_name, **kwargs):
+            client = _FakeClient(service_name, self._record)
+
+            async def _fail(**kwargs):
+                raise RuntimeError("sqs down")
+
+            client.send_message = _fail
+            return client
+
+    monkeypatch.setattr(sqs_publisher.aioboto3, "Session", lambda: _FailingSession([]))
+    failures = sqs_publisher.JOB_ENQUEUE_FAILURES.labels(lane="default")
+    before = failures._value.get()
+
+    with pytest.raises(RuntimeError):
+        await SQSJobPublisher(queue_url="q").send_job("j", "v", "u", "k", "e")
+
+    assert failures._value.get() - before == 1
+
+
+def test_sqs_job_publisher_from_settings_builds_lanes():
+    from video_service.infrastructure.config import Settings
+
+    settings = Settings(SQS_JOB_QUEUE_URL="q-bulk", SQS_JOB_LANES=[{"name": "fast", "queue_url": "q-fast"}])
+
+    publisher = SQSJobPublisher.from_settings(settings)
+
+    assert [lane.queue_url for lane in publisher._router.lanes] == ["q-fast", "q-bulk"]
+
+
+@pytest.mark.asyncio
+async def test_publishers_encode_with_configured_codec(monkeypatch):
+    from video_service.infrastructure.adapters.output.messaging.codecs import (
+        JsonCodec,
+        MessageEncoder,
+        decode_body,
+    )
+
+    record = []
+    for module in ("sns_publisher", "sqs_publisher"):
+        monkeypatch.setattr(
+            f"video_service.infrastructure.adapters.output.messaging.{module}.aioboto3.Session",
+            lambda: _FakeSession(record),
+        )
+    encoder = MessageEncoder(JsonCodec(), compression=True, compress_min_bytes=0)
+
+    await SNSEventPublisher(topic_arn="arn", encoder=encoder).publish(
+        SimpleNamespace(event_type="VideoUploaded", to_dict=lambda: {"video_id": "v-1"})
+    )
+    await SQSJobPublisher(queue_url="queue-url", encoder=encoder).send_job("job-1", "v-1", "u-1", "k", "e@x")
+
+    sent = [item[2] for item in record if item[1] in ("publish", "send_message")]
+    sns, sqs = sent
+    assert sns["MessageAttributes"]["codec"] == {"DataType": "String", "StringValue": "json+zlib"}
+    assert sns["MessageAttributes"]["event_type"]["StringValue"] == "VideoUploaded"
+    assert decode_body(sns["Message"], "json+zlib") == {"schema_version": 1, "video_id": "v-1"}
+    assert decode_body(sqs["MessageBody"], "json+zlib")["job_id"] == "job-1"
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_fails_fast_when_circuit_open(monkeypatch):
+    record = []
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.storage.s3_storage.aioboto3.Session",
+        lambda: _FakeSession(record),
+    )
+    breaker = CircuitBreaker("s3-test", window_size=1, min_calls=1)
+    breaker.before_call()
+    breaker.record_failure()
+
+    service = S3StorageService(bucket="bucket", circuit_breaker=breaker)
+
+    with pytest.raises(CircuitOpenError):
+        await service.upload_file(BytesIO(b"123"), "videos/file.mp4", "video/mp4")
+    assert await service.delete_files(["s3://bucket/videos/a.mp4"]) == ["s3://bucket/videos/a.mp4"]
+    assert not any(item[1] in ("upload_fileobj", "delete_objects") for item in record)
+
+
+class _FlakyPublisher:
+    def __init__(self, failures):
+        self.failures = failures
+        self.published = []
+
+    async def publish(self, event):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker down")
+        self.published.append(event)
+
+
+@pytest.mark.asyncio
+async def test_deferred_publisher_queues_on_failure_and_drains_in_order():
+    breaker = CircuitBreaker("sns-test", window_size=10, min_calls=10)
+    backlog = EventBacklog(breaker, max_size=10, retry_interval=0)
+    inner = _FlakyPublisher(failures=1)
+    publisher = DeferredEventPublisher(inner, backlog)
+
+    await publisher.publish("first")
+    await publisher.publish("second")
+    assert backlog.pending == 2
+
+    await backlog._drain_task
+    assert inner.published == ["first", "second"]
+    assert backlog.pending == 0
+
+    await publisher.publish("third")
+    assert inner.published[-1] == "third"
+
+
+@pytest.mark.asyncio
+async def test_deferred_publisher_raises_errors_that_are_not_delivery_failures():
+    breaker = CircuitBreaker("sns-test-bug", window_size=10, min_calls=10)
+    backlog = EventBacklog(breaker, max_size=10, retry_interval=0)
+
+    class _BrokenPublisher:
+        async def publish(self, event):
+            raise TypeError("not serializable")
+
+    with pytest.raises(TypeError):
+        await DeferredEventPublisher(_BrokenPublisher(), backlog).publish("event")
+    assert backlog.pending == 0
+
+    # Already deferred events that turn out unpublishable are dropped, not retried forever.
+    backlog.add("event", _BrokenPublisher())
+    await backlog._drain_task
+    assert backlog.pending == 0
+
+
+def test_delivery_errors_are_recognized_by_type_and_package():
+    from video_service.infrastructure.adapters.output.messaging.deferred_publisher import is_delivery_error
+
+    botocore_error = type("EndpointConnectionError", (Exception,), {"__module__": "botocore.exceptions"})
+
+    assert is_delivery_error(CircuitOpenError("sns", 1.0))
+    assert is_delivery_error(ConnectionError())
+    assert is_delivery_error(botocore_error())
+    assert not is_delivery_error(TypeError())
+
+
+@pytest.mark.asyncio
+async def test_event_backlog_drops_oldest_when_full():
+    breaker = CircuitBreaker("sns-test-full", window_size=1, min_calls=1)
+    breaker.before_call()
+    breaker.record_failure()
+    backlog = EventBacklog(breaker, max_size=2)
+    inner = _FlakyPublisher(failures=0)
+    publisher = DeferredEventPublisher(inner, backlog)
+
+    for event in ("a", "b", "c"):
+        await publisher.publish(event)
+
+    assert [event for event, _, _ in backlog._items] == ["b", "c"]
+    backlog._drain_task.cancel()
+
+
+class _FakeRedisPipeline:
+    def __init__(self, calls, fail):
+        self._calls = calls
+        self._fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self):
+        if self._fail:
+            raise ConnectionError("redis down")
+        self._calls.append("execute")
+
+
+class _FakeScriptRedis:
+    def __init__(self, fail=False):
+        self.calls = []
+        self._fail = fail
+
+    def register_script(self, script):
+        async def _script(keys, args, client):
+            self.calls.append((keys, args))
+
+        return _script
+
+    def pipeline(self, transaction):
+        return _FakeRedisPipeline(self.calls, self._fail)
+
+
+@pytest.mark.asyncio
+async def test_redis_change_notifier_pipelines_one_script_call_per_change():
+    redis = _FakeScriptRedis()
+    notifier = RedisVideoChangeNotifier(redis, replay_size=50, replay_ttl_seconds=60)
+    user_id, video_id = uuid4(), uuid4()
+
+    await notifier.notify([])
+    await notifier.notify([VideoChange(user_id, video_id, VIDEO_UPLOADED, "uploaded", 0)])
+
+    (keys, args), executed = redis.calls
+    assert keys == [events_stream_key(user_id)]
+    assert args[0] == 50 and args[2] == 60 and args[3] == events_channel(user_id)
+    assert json.loads(args[1]) == {"type": VIDEO_UPLOADED, "video_id": str(video_id), "status": "uploaded", "progress": 0}
+    assert executed == "execute"
+
+    await RedisVideoChangeNotifier(_FakeScriptRedis(fail=True)).notify(
+        [VideoChange(user_id, video_id, VIDEO_UPLOADED, "uploaded", 0)]
+    )
+
+
+def test_redis_client_uses_short_socket_timeouts(monkeypatch):
+    opened = []
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.messaging.redis_change_notifier.redis",
+        SimpleNamespace(asyncio=SimpleNamespace(from_url=lambda url, **kwargs: opened.append((url, kwargs)) or object())),
+    )
+    settings = SimpleNamespace(
+        REDIS_URL="redis://timeouts-test:6379/1", REDIS_SOCKET_TIMEOUT_SECONDS=0.25, REDIS_CONNECT_TIMEOUT_SECONDS=0.1
+    )
+
+    assert redis_client_from_settings(settings) is redis_client_from_settings(settings)
+    [(url, kwargs)] = opened
+    assert url == "redis://timeouts-test:6379/1"
+    assert (kwargs["socket_timeout"], kwargs["socket_connect_timeout"]) == (0.25, 0.1)
+
+
+def test_sqs_client_is_opened_only_with_a_job_queue():
+    from video_service.infrastructure.adapters.output.aws_clients import aws_services
+
+    assert aws_services(SimpleNamespace(SQS_JOB_QUEUE_URL="", SQS_JOB_LANES=[])) == ["s3", "sns"]
+    assert aws_services(SimpleNamespace(SQS_JOB_QUEUE_URL="q", SQS_JOB_LANES=[])) == ["s3", "sns", "sqs"]
+
+
+@pytest.mark.asyncio
+async def test_adapters_share_clients_opened_once(monkeypatch):
+    from video_service.infrastructure.adapters.output.aws_clients import AwsClients
+
+    record = []
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.aws_clients.aioboto3.Session",
+        lambda: _FakeSession(record),
+    )
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.storage.s3_storage.aioboto3.Session",
+        lambda: _FakeSession(record),
+    )
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.messaging.sns_publisher.aioboto3.Session",
+        lambda: _FakeSession(record),
+    )
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.messaging.sqs_publisher.aioboto3.Session",
+        lambda: _FakeSession(record),
+    )
+    clients = AwsClients(endpoint_url="http://local", max_pool_connections=7)
+    await clients.open(["s3", "sns", "sqs"])
+
+    storage = S3StorageService(bucket="bucket", clients=clients)
+    publisher = SNSEventPublisher(topic_arn="arn:topic", clients=clients)
+    jobs = SQSJobPublisher(queue_url="queue-url", clients=clients)
+    await storage.upload_file(BytesIO(b"123"), "videos/a.mp4", "video/mp4")
+    await storage.get_presigned_url("videos/a.mp4")
+    await publisher.publish(SimpleNamespace(event_type="VideoUploaded", to_dict=lambda: {}))
+    await jobs.send_job("job-1", "v-1", "u-1", "k", "e@x")
+    await jobs.send_job("job-2", "v-2", "u-1", "k", "e@x")
+    await clients.close()
+
+    opened = [item for item in record if item[1] == "client"]
+    assert [item[0] for item in opened] == ["s3", "sns", "sqs"]
+    assert [item[1] for item in record].count("send_message") == 2
+    assert opened[0][2]["config"].max_pool_connections == 7
+    assert clients.get("s3") is None
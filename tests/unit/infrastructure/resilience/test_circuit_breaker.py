@@ -0,0 +1,142 @@
+import asyncio
+
+from botocore.exceptions import ClientError
+import pytest
+
+from video_service.infrastructure.resilience import CircuitBreaker, CircuitOpenError, is_dependency_failure
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **kwargs):
+    options = dict(window_size=4, min_calls=4, open_seconds=10.0, half_open_calls=2, clock=clock)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def test_opens_when_failure_rate_reached_and_fails_fast():
+    clock = _Clock()
+    breaker = _breaker(clock)
+
+    for _ in range(2):
+        breaker.record_success(breaker.before_call())
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 4.0
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == 6.0
+
+
+def test_opens_when_slow_call_rate_reached():
+    clock = _Clock()
+    breaker = _breaker(clock, slow_call_seconds=1.0)
+
+    for _ in range(4):
+        started_at = breaker.before_call()
+        clock.now += 2.0
+        breaker.record_success(started_at)
+
+    assert breaker.state == "open"
+
+
+def test_half_open_closes_after_successful_trials():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1, window_size=1)
+    breaker.before_call()
+    breaker.record_failure()
+
+    clock.now = 10.0
+    assert breaker.state == "half_open"
+    first, second = breaker.before_call(), breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success(first)
+    breaker.record_success(second)
+    assert breaker.state == "closed"
+
+
+def test_half_open_failure_reopens_and_abandon_frees_trial():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1, window_size=1, half_open_calls=1)
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now = 10.0
+
+    breaker.before_call()
+    breaker.abandon()
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.retry_after() == 10.0
+
+
+@pytest.mark.asyncio
+async def test_guard_records_failures_but_not_cancellation():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1, window_size=1, half_open_calls=1)
+
+    with pytest.raises(ConnectionError):
+        async with breaker.guard():
+            raise ConnectionError("boom")
+    assert breaker.state == "open"
+
+    clock.now = 10.0
+    with pytest.raises(asyncio.CancelledError):
+        async with breaker.guard():
+            raise asyncio.CancelledError()
+    assert breaker.state == "half_open"
+
+    async with breaker.guard():
+        pass
+    assert breaker.state == "closed"
+
+
+def _client_error(status, code):
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "PutObject")
+
+
+@pytest.mark.asyncio
+async def test_guard_ignores_client_errors_that_are_not_the_dependencys_fault():
+    breaker = _breaker(_Clock(), min_calls=1, window_size=1)
+
+    for error in (_client_error(404, "NoSuchKey"), _client_error(403, "AccessDenied"), ValueError("bad input")):
+        with pytest.raises(type(error)):
+            async with breaker.guard():
+                raise error
+        assert breaker.state == "closed"
+
+    with pytest.raises(ClientError):
+        async with breaker.guard():
+            raise _client_error(503, "SlowDown")
+    assert breaker.state == "open"
+
+
+@pytest.mark.parametrize(
+    "error, failure",
+    [
+        (_client_error(500, "InternalError"), True),
+        (_client_error(429, "TooManyRequests"), True),
+        (_client_error(400, "ThrottlingException"), True),
+        (_client_error(400, "InvalidParameter"), False),
+        (asyncio.TimeoutError(), True),
+        (ConnectionResetError(), True),
+        (KeyError("id"), False),
+    ],
+)
+def test_is_dependency_failure(error, failure):
+    assert is_dependency_failure(error) is failure
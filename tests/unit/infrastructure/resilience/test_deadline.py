@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+
+from video_service.infrastructure.resilience import (
+    CircuitBreaker,
+    DeadlineExceededError,
+    deadline_bound,
+    deadline_scope,
+    remaining,
+    reset_deadline,
+    set_deadline,
+)
+
+
+@contextmanager
+def deadline(budget):
+    token = set_deadline(budget)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+@pytest.mark.asyncio
+async def test_scope_without_deadline_is_unbounded():
+    assert remaining() is None
+    async with deadline_scope("db"):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_scope_cuts_call_at_remaining_budget():
+    with deadline(0.05), pytest.raises(DeadlineExceededError) as exc_info:
+        async with deadline_scope("s3"):
+            await asyncio.sleep(5)
+
+    assert exc_info.value.stage == "s3"
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_skips_call():
+    calls = []
+
+    @deadline_bound("db")
+    async def _query():
+        calls.append("query")
+
+    with deadline(0), pytest.raises(DeadlineExceededError):
+        await _query()
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_breaker_does_not_count_fast_deadline_cutoffs_as_failures():
+    breaker = CircuitBreaker("deadline-test", window_size=1, min_calls=1, slow_call_seconds=10.0)
+
+    with deadline(0.01), pytest.raises(DeadlineExceededError):
+        async with breaker.guard(), deadline_scope("sns"):
+            await asyncio.sleep(5)
+
+    assert breaker.state == "closed"
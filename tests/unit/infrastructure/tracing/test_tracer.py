@@ -0,0 +1,161 @@
+import pytest
+
+from video_service.infrastructure.adapters.output.messaging.deferred_publisher import (
+    DeferredEventPublisher,
+    EventBacklog,
+)
+from video_service.infrastructure.adapters.output.messaging.sqs_publisher import SQSJobPublisher
+from video_service.infrastructure.resilience import CircuitBreaker
+from video_service.infrastructure.tracing import (
+    InMemorySpanExporter,
+    SpanContext,
+    Tracer,
+    configure_tracer,
+    current_context,
+    format_traceparent,
+    parse_traceparent,
+    reset_context,
+    set_context,
+    span,
+    trace_use_case,
+    traced,
+)
+
+REMOTE = SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracer(Tracer(exporter, sample_rate=1.0))
+    yield exporter
+    configure_tracer(None)
+
+
+class _ListVideos:
+    @traced("db.find_by_user_id")
+    async def find(self):
+        return current_context()
+
+    async def execute(self):
+        return await self.find()
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_under_the_current_span(exporter):
+    with span("GET /videos", user="u") as root:
+        inner = await trace_use_case(_ListVideos()).execute()
+
+    repository, use_case, server = exporter.spans
+    assert [s.name for s in exporter.spans] == ["db.find_by_user_id", "use_case._ListVideos", "GET /videos"]
+    assert server is root and server.parent_id is None and server.attributes == {"user": "u"}
+    assert use_case.parent_id == server.context.span_id
+    assert repository.parent_id == use_case.context.span_id
+    assert inner == repository.context
+    assert {s.context.trace_id for s in exporter.spans} == {root.context.trace_id}
+    assert current_context() is None
+
+
+@pytest.mark.asyncio
+async def test_failed_span_records_error_and_is_exported(exporter):
+    @traced("s3.upload_file")
+    async def upload():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await upload()
+
+    assert exporter.spans[0].error == "RuntimeError"
+
+
+def test_unsampled_trace_exports_nothing_but_keeps_its_ids():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, sample_rate=0.5, rand=lambda: 0.9)
+
+    with tracer.start_span("root") as root:
+        context = current_context()
+        with tracer.start_span("child") as child:
+            assert current_context() == context
+
+    assert root is None and child is None
+    assert context is not None and not context.sampled
+    assert exporter.spans == []
+
+
+def test_remote_parent_decides_sampling():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, sample_rate=0.0)
+
+    token = set_context(REMOTE)
+    try:
+        with tracer.start_span("GET /videos"):
+            pass
+    finally:
+        reset_context(token)
+
+    assert exporter.spans[0].context.trace_id == REMOTE.trace_id
+    assert exporter.spans[0].parent_id == REMOTE.span_id
+
+
+def test_traceparent_round_trip_and_invalid_values():
+    assert parse_traceparent(format_traceparent(REMOTE)) == REMOTE
+    assert parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00").sampled is False
+    for value in (None, "", "garbage", "ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+                  f"00-{'0' * 32}-00f067aa0ba902b7-01", f"00-4bf92f3577b34da6a3ce929d0e0e4736-{'0' * 16}-01"):
+        assert parse_traceparent(value) is None
+
+
+@pytest.mark.asyncio
+async def test_sqs_message_carries_traceparent(monkeypatch, exporter):
+    sent = {}
+
+    class _Client:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def send_message(self, **kwargs):
+            sent.update(kwargs)
+            return {"MessageId": "m"}
+
+    class _Session:
+        def client(self, *args, **kwargs):
+            return _Client()
+
+    monkeypatch.setattr(
+        "video_service.infrastructure.adapters.output.messaging.sqs_publisher.aioboto3.Session", _Session
+    )
+
+    await SQSJobPublisher(queue_url="q").send_job("j", "v", "u", "k", "e")
+
+    (send_span,) = exporter.spans
+    assert send_span.name == "sqs.send_job"
+    assert parse_traceparent(sent["MessageAttributes"]["traceparent"]["StringValue"]) == send_span.context
+    assert sent["MessageAttributes"]["job_type"]["StringValue"] == "video_processing"
+
+
+@pytest.mark.asyncio
+async def test_deferred_event_is_published_under_the_original_trace():
+    breaker = CircuitBreaker("sns-trace-test", window_size=10, min_calls=10)
+    backlog = EventBacklog(breaker, max_size=10, retry_interval=0)
+
+    class _Publisher:
+        def __init__(self):
+            self.contexts = []
+
+        async def publish(self, event):
+            self.contexts.append(current_context())
+            if len(self.contexts) == 1:
+                raise ConnectionError("sns down")
+
+    inner = _Publisher()
+    token = set_context(REMOTE)
+    try:
+        await DeferredEventPublisher(inner, backlog).publish("event")
+    finally:
+        reset_context(token)
+    await backlog._drain_task
+
+    assert inner.contexts[-1] == REMOTE